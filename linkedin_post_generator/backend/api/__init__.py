@@ -3,10 +3,12 @@ API package.
 
 Modular route organization:
 - provider_factory.py: Factory functions for providers
+- provider_health.py: Background provider health probes
 - routes_health.py: Health and utility endpoints
 - routes_text.py: Text generation endpoints
 - routes_image.py: Image generation and post card endpoints
-- routes_session.py: Session and usage endpoints
+- routes_session.py: Session, generated file and usage endpoints
+- routes_jobs.py: Background image job endpoints
 - routes.py: Combined router
 - schemas.py: Pydantic request/response models
 """
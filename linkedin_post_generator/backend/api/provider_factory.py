@@ -1,13 +1,193 @@
 """
 Provider Factory
 =================
-Factory functions for creating text and image provider instances.
+Factory functions for text and image provider instances.
+
+Providers are long-lived: a ProviderRegistry built in main.lifespan holds
+one instance per provider plus the shared, pooled clients they use
+(one keep-alive httpx.AsyncClient per local service, one boto3
+bedrock-runtime client for Claude/Nova/Titan). The registry closes those
+clients on shutdown.
 """
 
+import logging
+from typing import Optional, Union
+
+import boto3
+import httpx
+from botocore.config import Config
 from fastapi import HTTPException, status
 
-from ..providers import BedrockTextProvider, OllamaTextProvider, TitanImageProvider, NovaCanvasProvider, SDXLWebUIProvider
+from ..config import settings
+from ..providers import (
+    BedrockTextProvider,
+    OllamaTextProvider,
+    TitanImageProvider,
+    NovaCanvasProvider,
+    SDXLWebUIProvider,
+    TextModelProvider,
+    ImageModelProvider,
+)
 from ..utils.constants import TextProvider, ImageProvider
+from .provider_health import provider_health
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderRegistry:
+    """
+    Long-lived provider instances backed by shared connection pools.
+
+    Started from main.lifespan (or lazily on first lookup) and closed on
+    shutdown. Replaces per-request construction, which leaked an
+    unclosed httpx.AsyncClient per Ollama/SDXL call and re-created a
+    boto3 client (and re-resolved credentials) per Bedrock call.
+    """
+
+    def __init__(self):
+        self._bedrock_client = None
+        self._ollama_client: Optional[httpx.AsyncClient] = None
+        self._sdxl_client: Optional[httpx.AsyncClient] = None
+        self._text_providers: dict[str, TextModelProvider] = {}
+        self._image_providers: dict[str, ImageModelProvider] = {}
+        self._lookups: dict[str, int] = {}
+        self._started = False
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def _http_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+
+    def start(self) -> None:
+        """Create shared clients and provider instances."""
+        if self._started:
+            return
+
+        # One bedrock-runtime client shared by Claude, Nova and Titan.
+        # boto3 clients are thread-safe; the pool matches the Bedrock executor size.
+        self._bedrock_client = boto3.client(
+            "bedrock-runtime",
+            config=Config(
+                region_name=settings.aws_region,
+                retries={"max_attempts": 3, "mode": "adaptive"},
+                max_pool_connections=settings.bedrock_max_workers,
+            ),
+        )
+
+        # Ollama and the SDXL WebUI are plain-HTTP local services, so
+        # HTTP/1.1 keep-alive pools apply (HTTP/2 needs TLS/ALPN).
+        self._ollama_client = httpx.AsyncClient(
+            base_url=settings.ollama_base_url,
+            timeout=180.0,  # Pipeline takes longer (3 steps)
+            limits=self._http_limits(),
+        )
+        self._sdxl_client = httpx.AsyncClient(
+            timeout=300.0,  # 5 min timeout for generation
+            limits=self._http_limits(),
+        )
+
+        self._text_providers = {
+            TextProvider.OLLAMA.value: OllamaTextProvider(client=self._ollama_client),
+            TextProvider.BEDROCK.value: BedrockTextProvider(client=self._bedrock_client),
+        }
+        self._image_providers = {
+            ImageProvider.NOVA.value: NovaCanvasProvider(client=self._bedrock_client),
+            ImageProvider.TITAN.value: TitanImageProvider(client=self._bedrock_client),
+            ImageProvider.SDXL.value: SDXLWebUIProvider(client=self._sdxl_client),
+        }
+
+        self._started = True
+        logger.info("Provider registry started")
+
+    async def aclose(self) -> None:
+        """Close shared clients (called from main.lifespan on shutdown)."""
+        if not self._started:
+            return
+
+        for client in (self._ollama_client, self._sdxl_client):
+            if client is not None:
+                await client.aclose()
+        if self._bedrock_client is not None:
+            self._bedrock_client.close()
+
+        self._bedrock_client = None
+        self._ollama_client = None
+        self._sdxl_client = None
+        self._text_providers = {}
+        self._image_providers = {}
+        self._started = False
+        logger.info("Provider registry closed")
+
+    def get_text(self, provider_str: str) -> Optional[TextModelProvider]:
+        """Get the shared text provider instance, or None if unknown."""
+        self.start()
+        provider = self._text_providers.get(provider_str)
+        if provider is not None:
+            self._lookups[provider_str] = self._lookups.get(provider_str, 0) + 1
+        return provider
+
+    def get_image(self, provider_str: str) -> Optional[ImageModelProvider]:
+        """Get the shared image provider instance, or None if unknown."""
+        self.start()
+        provider = self._image_providers.get(provider_str)
+        if provider is not None:
+            self._lookups[provider_str] = self._lookups.get(provider_str, 0) + 1
+        return provider
+
+    def peek(self, provider_str: str) -> Optional[Union[TextModelProvider, ImageModelProvider]]:
+        """Get a shared provider instance without counting a lookup (health probes)."""
+        self.start()
+        return self._text_providers.get(provider_str) or self._image_providers.get(provider_str)
+
+    @staticmethod
+    def _http_pool_stats(client: Optional[httpx.AsyncClient]) -> Optional[dict]:
+        """Connection counts for an httpx client (reads httpcore's pool)."""
+        if client is None:
+            return None
+
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in connections if getattr(c, "is_idle", lambda: False)())
+
+        return {
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "max_connections": settings.http_max_connections,
+            "max_keepalive_connections": settings.http_max_keepalive_connections,
+            "closed": client.is_closed,
+        }
+
+    def get_stats(self) -> dict:
+        """Get registry and connection pool statistics."""
+        bedrock_pool = None
+        if self._bedrock_client is not None:
+            bedrock_pool = {
+                "max_pool_connections": self._bedrock_client.meta.config.max_pool_connections,
+                "region": self._bedrock_client.meta.region_name,
+            }
+
+        return {
+            "started": self._started,
+            "text_providers": sorted(self._text_providers),
+            "image_providers": sorted(self._image_providers),
+            "lookups": dict(self._lookups),
+            "pools": {
+                "ollama": self._http_pool_stats(self._ollama_client),
+                "sdxl": self._http_pool_stats(self._sdxl_client),
+                "bedrock": bedrock_pool,
+            },
+        }
+
+
+# Global instance
+provider_registry = ProviderRegistry()
 
 
 def get_text_provider(provider: TextProvider):
@@ -22,19 +202,19 @@ def get_text_provider(provider: TextProvider):
         provider: The text provider enum value (or string that will be converted)
 
     Returns:
-        An instance of the text provider
+        The shared instance of the text provider
 
     Raises:
-        HTTPException: If provider is unknown
+        HTTPException: If provider is unknown (400) or known to be down (503)
     """
     # Handle both enum and string inputs
     provider_str = provider.value if hasattr(provider, 'value') else str(provider)
 
-    if provider_str == TextProvider.OLLAMA.value or provider_str == "ollama":
-        # OllamaTextProvider now uses 3-step pipeline internally
-        return OllamaTextProvider()
-    elif provider_str == TextProvider.BEDROCK.value or provider_str == "bedrock":
-        return BedrockTextProvider()
+    # OllamaTextProvider uses 3-step pipeline internally
+    text_provider = provider_registry.get_text(provider_str)
+    if text_provider is not None:
+        provider_health.ensure_available(provider_str)
+        return text_provider
 
     raise HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
@@ -50,20 +230,19 @@ def get_image_provider(provider: ImageProvider):
         provider: The image provider enum value
 
     Returns:
-        An instance of the image provider
+        The shared instance of the image provider
 
     Raises:
-        HTTPException: If provider is unknown
+        HTTPException: If provider is unknown (400) or known to be down (503)
     """
-    if provider == ImageProvider.NOVA:
-        return NovaCanvasProvider()
-    elif provider == ImageProvider.TITAN:
-        return TitanImageProvider()
-    elif provider == ImageProvider.SDXL:
-        return SDXLWebUIProvider()
+    provider_str = provider.value if hasattr(provider, 'value') else str(provider)
+
+    image_provider = provider_registry.get_image(provider_str)
+    if image_provider is not None:
+        provider_health.ensure_available(provider_str)
+        return image_provider
 
     raise HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
         detail=f"Unknown image provider: {provider}. Use 'nova' (recommended), 'titan', or 'sdxl'.",
     )
-
@@ -0,0 +1,240 @@
+"""
+Provider Health
+================
+Background health probes for the model providers.
+
+/health used to report every provider as up. A prober task (started in
+main.lifespan) now checks each backing service every
+settings.health_probe_interval_seconds:
+
+- ollama: OllamaTextProvider._check_ollama_connection (GET /api/tags)
+- sdxl:   SDXLWebUIProvider._check_webui_health (GET /sdapi/v1/options)
+- bedrock: GetFoundationModel on the Titan image model, a free
+  control-plane call that needs working credentials and a reachable
+  regional endpoint. Claude (bedrock), Nova and Titan share that result.
+
+Each probe is capped at settings.health_probe_timeout_seconds. A provider
+is down after settings.health_down_after_failures failed probes in a row
+and up again after one success. Never-probed providers count as up.
+
+get_text_provider / get_image_provider call ensure_available(), so a
+request for a known-down provider gets an immediate 503 instead of
+waiting out a 180-300 s client timeout.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
+from fastapi import HTTPException, status
+
+from ..config import settings
+from ..providers.bedrock_executor import run_bedrock_call
+from ..utils.constants import ImageProvider, TextProvider
+from ..utils.metrics import MetricFamily, metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+# Service probed for each provider
+PROBED_SERVICE = {
+    TextProvider.OLLAMA.value: "ollama",
+    TextProvider.BEDROCK.value: "bedrock",
+    ImageProvider.NOVA.value: "bedrock",
+    ImageProvider.TITAN.value: "bedrock",
+    ImageProvider.SDXL.value: "sdxl",
+}
+
+# Bedrock errors that prove the endpoint answered and the caller is authenticated
+_BEDROCK_REACHABLE_ERRORS = {"AccessDeniedException", "ResourceNotFoundException", "ValidationException"}
+
+
+@dataclass
+class ProbeResult:
+    """Latest probe outcome for one service."""
+
+    healthy: bool = True
+    latency_ms: Optional[int] = None
+    checked_at: Optional[float] = None
+    consecutive_failures: int = 0
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "latency_ms": self.latency_ms,
+            "checked_at": self.checked_at,
+            "consecutive_failures": self.consecutive_failures,
+            "error": self.error,
+        }
+
+
+class ProviderHealth:
+    """Periodically probes provider services and caches the results."""
+
+    def __init__(
+        self,
+        interval_seconds: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        down_after_failures: Optional[int] = None,
+    ):
+        self.interval = interval_seconds or settings.health_probe_interval_seconds
+        self.timeout = timeout_seconds or settings.health_probe_timeout_seconds
+        self.down_after = max(1, down_after_failures or settings.health_down_after_failures)
+
+        self._results: dict[str, ProbeResult] = {service: ProbeResult() for service in set(PROBED_SERVICE.values())}
+        self._registry = None
+        self._bedrock_control = None
+        self._task: Optional[asyncio.Task] = None
+        self._rejected = 0
+
+    # =========================================================================
+    # PROBES
+    # =========================================================================
+
+    async def _probe_ollama(self) -> Optional[str]:
+        provider = self._registry.peek(TextProvider.OLLAMA.value)
+        if not await provider._check_ollama_connection():
+            return f"Ollama not reachable at {settings.ollama_base_url}"
+        return None
+
+    async def _probe_sdxl(self) -> Optional[str]:
+        provider = self._registry.peek(ImageProvider.SDXL.value)
+        if not await provider._check_webui_health():
+            return f"SDXL WebUI not reachable at {settings.sdxl_webui_url}"
+        return None
+
+    def _get_foundation_model(self):
+        if self._bedrock_control is None:
+            self._bedrock_control = boto3.client("bedrock", region_name=settings.aws_region)
+        try:
+            self._bedrock_control.get_foundation_model(modelIdentifier=settings.bedrock_titan_image_model)
+        except ClientError as e:
+            # Missing bedrock:GetFoundationModel permission is not an outage
+            if e.response.get("Error", {}).get("Code") not in _BEDROCK_REACHABLE_ERRORS:
+                raise
+
+    async def _probe_bedrock(self) -> Optional[str]:
+        try:
+            await run_bedrock_call(self._get_foundation_model)
+        except (BotoCoreError, ClientError) as e:
+            return f"Bedrock unavailable in {settings.aws_region}: {e}"
+        return None
+
+    async def _probe(self, service: str, probe: Callable[[], Awaitable[Optional[str]]]):
+        start = time.perf_counter()
+        try:
+            error = await asyncio.wait_for(probe(), self.timeout)
+        except asyncio.TimeoutError:
+            error = f"Probe timed out after {self.timeout:g}s"
+        except Exception as e:
+            error = f"Probe failed: {e}"
+
+        result = self._results[service]
+        was_healthy = result.healthy
+        result.latency_ms = int((time.perf_counter() - start) * 1000)
+        result.checked_at = time.time()
+        result.error = error
+        if error is None:
+            result.consecutive_failures = 0
+            result.healthy = True
+        else:
+            result.consecutive_failures += 1
+            result.healthy = result.consecutive_failures < self.down_after
+
+        if was_healthy and not result.healthy:
+            logger.warning(f"Provider service {service} is down: {error}")
+        elif not was_healthy and result.healthy:
+            logger.info(f"Provider service {service} is back up ({result.latency_ms} ms)")
+
+    async def probe_all(self):
+        """Probe every service once, concurrently."""
+        await asyncio.gather(
+            self._probe("ollama", self._probe_ollama),
+            self._probe("sdxl", self._probe_sdxl),
+            self._probe("bedrock", self._probe_bedrock),
+        )
+
+    # =========================================================================
+    # STATUS
+    # =========================================================================
+
+    def is_available(self, provider_str: str) -> bool:
+        """False only if the provider's service is known to be down."""
+        service = PROBED_SERVICE.get(provider_str)
+        return service is None or self._results[service].healthy
+
+    def ensure_available(self, provider_str: str):
+        """Raise a 503 right away if the provider is known to be down."""
+        if self.is_available(provider_str):
+            return
+        self._rejected += 1
+        result = self._results[PROBED_SERVICE[provider_str]]
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Provider {provider_str} is unavailable: {result.error}",
+            headers={"Retry-After": str(self.interval)},
+        )
+
+    def get_status(self) -> dict[str, dict]:
+        """Cached probe result per provider."""
+        return {
+            provider: {"service": service, **self._results[service].to_dict()}
+            for provider, service in PROBED_SERVICE.items()
+        }
+
+    def collect_metrics(self) -> list[MetricFamily]:
+        """Provider up/down and probe latency gauges for /metrics."""
+        return [
+            ("provider_up", "1 if the provider's last health probes succeeded.", "gauge",
+             [({"service": service}, int(result.healthy)) for service, result in sorted(self._results.items())]),
+            ("provider_probe_latency_seconds", "Duration of the last health probe.", "gauge",
+             [({"service": service}, result.latency_ms / 1000 if result.latency_ms is not None else None)
+              for service, result in sorted(self._results.items())]),
+        ]
+
+    # =========================================================================
+    # BACKGROUND TASK
+    # =========================================================================
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Provider health probes failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self, registry):
+        """Start probing the registry's providers (first round right away; called from main.lifespan)."""
+        self._registry = registry
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="provider-health")
+
+    async def stop(self):
+        """Stop probing."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def get_stats(self) -> dict:
+        """Get prober configuration and fail-fast count."""
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "timeout_seconds": self.timeout,
+            "down_after_failures": self.down_after,
+            "rejected_requests": self._rejected,
+        }
+
+
+# Global instance
+provider_health = ProviderHealth()
+metrics.register_collector(provider_health.collect_metrics)
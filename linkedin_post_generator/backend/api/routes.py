@@ -7,7 +7,8 @@ Route modules:
 - routes_health.py: Health check and utility endpoints
 - routes_text.py: Text generation endpoints
 - routes_image.py: Image generation and post card endpoints
-- routes_session.py: Session management and usage endpoints
+- routes_session.py: Session management, generated file delivery and usage endpoints
+- routes_jobs.py: Background image generation jobs
 """
 
 from fastapi import APIRouter
@@ -16,6 +17,7 @@ from .routes_health import router as health_router
 from .routes_text import router as text_router
 from .routes_image import router as image_router
 from .routes_session import router as session_router
+from .routes_jobs import router as jobs_router
 
 
 # Create combined router
@@ -26,3 +28,4 @@ router.include_router(health_router)
 router.include_router(text_router)
 router.include_router(image_router)
 router.include_router(session_router)
+router.include_router(jobs_router)
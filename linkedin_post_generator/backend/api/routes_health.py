@@ -4,31 +4,49 @@ Health & Utility Routes
 Health check and utility endpoints.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
 
 from ..config import settings
+from ..providers.image_cache import image_cache
+from ..services.log_storage import log_storage
+from ..services.log_writer import log_writer
+from ..services.render_executor import render_executor
+from ..services.text_cache import text_cache
 from ..utils.constants import TEXT_MODELS, IMAGE_MODELS
+from ..utils.metrics import MetricFamily, metrics
+from .provider_factory import provider_registry
+from .provider_health import provider_health
 from .schemas import HealthCheckResponse, ModelsResponse
 
 
 router = APIRouter(tags=["Health & Utility"])
 
 
-@router.get("/health", response_model=HealthCheckResponse)
-async def health_check():
-    """Check API health and provider availability."""
-    providers_status = {
-        "ollama": True,   # Mistral/Llama text models (local)
-        "bedrock": True,  # Claude text models
-        "nova": True,     # Nova Canvas (recommended for images)
-        "titan": True,    # Titan (fallback for images)
-        "sdxl": True,    # SDXL WebUI (local)
-    }
+@router.get(
+    "/health",
+    response_model=HealthCheckResponse,
+    responses={503: {"model": HealthCheckResponse, "description": "A required provider is down"}},
+)
+async def health_check(response: Response):
+    """
+    Check API health and provider availability.
+
+    Provider status comes from the background probes (cached, never
+    probed inline). Answers 503 while a provider listed in
+    HEALTH_REQUIRED_PROVIDERS is down, so load balancers stop routing here.
+    """
+    details = provider_health.get_status()
+    providers_status = {provider: detail["healthy"] for provider, detail in details.items()}
+
+    required = [p.strip() for p in settings.health_required_providers.split(",") if p.strip()]
+    if any(not providers_status.get(provider, True) for provider in required):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
 
     return HealthCheckResponse(
-        status="healthy",
+        status="healthy" if all(providers_status.values()) else "degraded",
         version=settings.app_version,
         providers=providers_status,
+        provider_details=details,
     )
 
 
@@ -40,3 +58,57 @@ async def list_models():
         image_models={p.value: models for p, models in IMAGE_MODELS.items()},
     )
 
+
+
+@router.get("/providers/stats")
+async def provider_stats():
+    """Get provider registry, health probe, connection pool, render pool, log writer/storage and stage latency statistics."""
+    stats = provider_registry.get_stats()
+    stats["health"] = provider_health.get_stats()
+    stats["render_pool"] = render_executor.get_stats()
+    stats["log_writer"] = log_writer.get_stats()
+    stats["log_storage"] = log_storage.get_stats()
+    stats["metrics"] = metrics.get_stats()
+    return stats
+
+
+def collect_app_metrics() -> list[MetricFamily]:
+    """Gauges and counters for /metrics, read from the services' stats at scrape time."""
+    caches = {"text": text_cache.get_stats(include_entries=False), "image": image_cache.get_stats()}
+    pools = provider_registry.get_stats()["pools"]
+    render_pool = render_executor.get_stats()
+    writer = log_writer.get_stats()
+
+    def hit_ratio(stats: dict) -> float:
+        lookups = stats["hits"] + stats["misses"]
+        return stats["hits"] / lookups if lookups else 0.0
+
+    return [
+        ("cache_hit_ratio", "Cache hits / lookups since start.", "gauge",
+         [({"cache": name}, hit_ratio(stats)) for name, stats in caches.items()]),
+        ("cache_lookups_total", "Cache lookups by result.", "counter",
+         [({"cache": name, "result": result}, stats[key])
+          for name, stats in caches.items() for result, key in (("hit", "hits"), ("miss", "misses"))]),
+        ("provider_max_concurrency", "Max images generated at the same time per request.", "gauge",
+         [({"provider": "nova"}, settings.nova_max_concurrency),
+          ({"provider": "titan"}, settings.titan_max_concurrency),
+          ({"provider": "sdxl"}, settings.sdxl_max_concurrency)]),
+        ("http_pool_connections", "Open pooled HTTP connections to local providers.", "gauge",
+         [({"provider": name, "state": state}, pool[f"{state}_connections"])
+          for name, pool in pools.items() if pool and "open_connections" in pool
+          for state in ("open", "idle")]),
+        ("render_pool_workers", "Render pool worker processes (or threads).", "gauge",
+         [({}, render_pool["workers"])]),
+        ("render_pool_tasks_total", "Render tasks submitted to the pool.", "counter",
+         [({}, render_pool["tasks_submitted"])]),
+        ("font_cache_lookups_total", "Font registry lookups in render workers by result.", "counter",
+         [({"result": "hit"}, render_pool["font_cache"]["hits"]),
+          ({"result": "miss"}, render_pool["font_cache"]["misses"])]),
+        ("log_writer_buffered_records", "Log records waiting to be written.", "gauge",
+         [({}, writer["buffered"])]),
+        ("log_writer_dropped_records_total", "Log records dropped on a full buffer.", "counter",
+         [({}, writer["dropped"])]),
+    ]
+
+
+metrics.register_collector(collect_app_metrics)
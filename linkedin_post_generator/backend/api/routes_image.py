@@ -6,6 +6,7 @@ Endpoints for image generation and post cards.
 
 import logging
 import time
+from typing import Callable, Optional
 
 from fastapi import APIRouter, HTTPException, status
 
@@ -19,7 +20,13 @@ from ..providers import (
 )
 from ..prompts import get_image_prompt_generation_prompt
 from ..prompts.image_gen import get_image_prompt, PromptContext
-from ..services import session_manager, usage_logger, ImageProcessor, PostCardBuilder, PostCardStyle, InfographicRenderer, CarouselBuilder
+from ..services import PostCardStyle, InfographicRenderer
+from ..services.session_manager import session_manager
+from ..services.usage_logger import usage_logger
+from ..services.render_executor import render_executor
+from ..services.session_files import session_files
+from ..utils.image_data import encode_base64
+from ..utils.metrics import metrics
 from ..services.prompt_logger import get_prompt_logger
 from .provider_factory import get_text_provider, get_image_provider
 from .schemas import (
@@ -64,7 +71,7 @@ async def generate_image_prompts(request: ImagePromptRequestSchema):
     start_time = time.time()
 
     # Get session data
-    session = session_manager.get(request.session_id)
+    session = await session_manager.get(request.session_id)
 
     # Get post text
     post_text = request.post_text
@@ -118,17 +125,18 @@ async def generate_image_prompts(request: ImagePromptRequestSchema):
         image_model_name = provider_to_model.get(request.image_model.provider.value, "nova")
         system_prompt = get_image_prompt_generation_prompt(image_model=image_model_name)
 
-        result = await provider.generate_image_prompts(
-            request=gen_request,
-            model=request.text_model.model,
-            system_prompt=system_prompt,
-            max_tokens=2000,
-        )
+        with metrics.provider_call("image_prompts", request.text_model.provider.value):
+            result = await provider.generate_image_prompts(
+                request=gen_request,
+                model=request.text_model.model,
+                system_prompt=system_prompt,
+                max_tokens=2000,
+            )
 
         elapsed_ms = int((time.time() - start_time) * 1000)
 
         # Store in session
-        session_manager.update(
+        await session_manager.update(
             session_id=request.session_id,
             image_prompts=[p.model_dump() for p in result.image_prompts],
             image_fingerprint=result.image_fingerprint.model_dump(),
@@ -155,6 +163,9 @@ async def generate_image_prompts(request: ImagePromptRequestSchema):
             generation_time_ms=elapsed_ms,
         )
 
+    except HTTPException:
+        # Deliberate status codes (e.g. 503 for a provider known to be down)
+        raise
     except ProviderError as e:
         elapsed_ms = int((time.time() - start_time) * 1000)
 
@@ -198,10 +209,33 @@ async def generate_images(request: ImageGenerationRequestSchema):
     4. Creates PDF if multiple images
 
     Must be called AFTER /generate-image-prompts.
+    For long SDXL runs or carousels, prefer POST /jobs/images.
     """
+    return await run_image_generation(request)
+
+
+async def run_image_generation(
+    request: ImageGenerationRequestSchema,
+    on_stage: Optional[Callable[[str], None]] = None,
+) -> ImageGenerationResponseSchema:
+    """
+    Run the full image generation flow for /generate-images and image jobs.
+
+    Args:
+        request: Image generation request
+        on_stage: Called with "generating", "processing" and "finalizing"
+            as the flow progresses (used for job progress)
+
+    Raises:
+        HTTPException: On invalid input or generation failure
+    """
+    def report_stage(stage: str):
+        if on_stage is not None:
+            on_stage(stage)
+
     start_time = time.time()
 
-    session = session_manager.get(request.session_id)
+    session = await session_manager.get(request.session_id)
 
     # Determine image prompts
     if request.image_prompts:
@@ -213,6 +247,7 @@ async def generate_images(request: ImageGenerationRequestSchema):
                 style_notes=p.style_notes,
                 composition_note=p.composition_note,
                 negative_prompt=getattr(p, 'negative_prompt', None),
+                seed=p.seed,
             )
             for p in request.image_prompts
         ]
@@ -226,6 +261,7 @@ async def generate_images(request: ImageGenerationRequestSchema):
                     style_notes=p.get("style_notes", ""),
                     composition_note=p.get("composition_note", ""),
                     negative_prompt=p.get("negative_prompt", None),
+                    seed=p.get("seed"),
                 )
                 for idx, p in enumerate(session.image_prompts, start=1)
                 if isinstance(p, dict) and p.get("prompt")
@@ -348,12 +384,19 @@ async def generate_images(request: ImageGenerationRequestSchema):
         carousel_width = 512 if request.generate_carousel else None
         carousel_height = 768 if request.generate_carousel else None
 
+        # Deterministic mode: fixed seed per prompt + on-disk image cache
+        deterministic = (
+            request.deterministic if request.deterministic is not None
+            else settings.image_cache_enabled
+        )
+
         gen_request = ImageGenerationRequest(
             prompts=image_prompts,
             fingerprint=fingerprint,
             post_text=post_text,
             width=carousel_width,
             height=carousel_height,
+            deterministic=deterministic,
         )
 
         # Log the prompts (including negative_prompt for SDXL)
@@ -371,10 +414,13 @@ async def generate_images(request: ImageGenerationRequestSchema):
             fingerprint=gen_request.fingerprint.model_dump(),
         )
 
-        result = await provider.generate(
-            request=gen_request,
-            model=request.image_model.model,
-        )
+        report_stage("generating")
+        with metrics.provider_call("image", request.image_model.provider.value):
+            result = await provider.generate(
+                request=gen_request,
+                model=request.image_model.model,
+            )
+        report_stage("processing")
 
         # Log the response
         prompt_logger.log_image_generation(
@@ -389,10 +435,23 @@ async def generate_images(request: ImageGenerationRequestSchema):
             fingerprint=gen_request.fingerprint.model_dump(),
             response={
                 "image_count": len(result.images),
+                "cached_count": sum(1 for img in result.images if img.cached),
                 "success": True,
             },
         )
 
+        # Record the seeds picked in deterministic mode so reloads reuse them
+        # (carousel rewrites the cover prompt, so only plain image prompts are recorded)
+        if deterministic and not request.generate_carousel and session and session.image_prompts:
+            seeds = {p.id: p.seed for p in image_prompts if p.seed is not None}
+            await session_manager.update(
+                session_id=request.session_id,
+                image_prompts=[
+                    {**p, "seed": seeds.get(p.get("id"), p.get("seed"))} if isinstance(p, dict) else p
+                    for p in session.image_prompts
+                ],
+            )
+
         # Process images
         # Check if we should use infographic renderer (SDXL + infographic style)
         # DO NOT apply infographic overlay for carousel - carousel has its own cover renderer
@@ -426,7 +485,7 @@ async def generate_images(request: ImageGenerationRequestSchema):
 
         processed_images = []
         for img in result.images:
-            img_data = img.base64_data
+            img_data = img.data
 
             # Apply infographic text overlay if needed
             if use_infographic_overlay and post_text:
@@ -481,8 +540,8 @@ async def generate_images(request: ImageGenerationRequestSchema):
                     # Apply infographic overlay with layout selection (Step 3)
                     # Default to "infographic" layout, can be made configurable
                     layout = "infographic"  # Options: "infographic", "checklist", "quote", "comparison"
-                    img_data = renderer.render_infographic(
-                        base_image_base64=img_data,
+                    img_data = await render_executor.render_infographic(
+                        base_image=img_data,
                         title=text_structure.get("title") or "Key Insight",
                         subtitle=text_structure.get("subtitle"),
                         sections=text_structure.get("sections", []),
@@ -503,20 +562,19 @@ async def generate_images(request: ImageGenerationRequestSchema):
 
             processed_images.append({
                 "id": img.id,
-                "base64_data": img_data,
+                "data": img_data,
                 "prompt_used": img.prompt_used,
                 "concept": concept,
                 "format": img.format,
                 "width": img.width,
                 "height": img.height,
+                "seed": img.seed,
             })
 
         # Check if carousel generation is requested
         if request.generate_carousel and processed_images and session:
             # Carousel mode: AI cover + post card sections
             try:
-                carousel_builder = CarouselBuilder()
-
                 # Get infographic_text from session
                 infographic_text = session.infographic_text or {}
                 if not isinstance(infographic_text, dict):
@@ -527,11 +585,11 @@ async def generate_images(request: ImageGenerationRequestSchema):
                         infographic_text = {}
 
                 # Use first AI image as cover
-                ai_cover = processed_images[0]["base64_data"]
+                ai_cover = processed_images[0]["data"]
 
                 # Build carousel: cover + post cards
-                carousel_images_base64 = carousel_builder.build_carousel(
-                    ai_cover_image_base64=ai_cover,
+                carousel_images = await render_executor.build_carousel(
+                    ai_cover_image=ai_cover,
                     infographic_text=infographic_text,
                     post_text=post_text or "",
                     short_post=short_post,
@@ -540,10 +598,10 @@ async def generate_images(request: ImageGenerationRequestSchema):
                 # Convert carousel images to processed_images format
                 # Carousel uses 512x768 (width x height) for better content layout
                 carousel_processed = []
-                for idx, img_b64 in enumerate(carousel_images_base64):
+                for idx, img_bytes in enumerate(carousel_images):
                     carousel_processed.append({
                         "id": idx + 1,
-                        "base64_data": img_b64,
+                        "data": img_bytes,
                         "prompt_used": f"Carousel slide {idx + 1}",
                         "concept": "carousel-cover" if idx == 0 else f"carousel-section-{idx}",
                         "format": "png",
@@ -557,8 +615,7 @@ async def generate_images(request: ImageGenerationRequestSchema):
                 # Carousel images already have footers - skip to PDF creation only
                 processed = {"images": processed_images}
                 if len(processed_images) > 1:
-                    processor = ImageProcessor()
-                    pdf_images = [img["base64_data"] for img in processed_images if img["base64_data"]]
+                    pdf_images = [img["data"] for img in processed_images if img["data"]]
                     if pdf_images:
                         # Priority order for PDF filename (same as image filenames):
                         # 1. infographic_text.title (if present)
@@ -587,7 +644,7 @@ async def generate_images(request: ImageGenerationRequestSchema):
 
                         # Use original title for PDF metadata, sanitized for filename
                         carousel_title = infographic_text.get('title', 'LinkedIn Carousel')
-                        processed["pdf_base64"] = processor.merge_to_pdf(pdf_images, title=carousel_title)
+                        processed["pdf"] = await render_executor.merge_to_pdf(pdf_images, title=carousel_title)
                         processed["pdf_title"] = pdf_filename
 
             except Exception as e:
@@ -601,8 +658,7 @@ async def generate_images(request: ImageGenerationRequestSchema):
             # Carousel already processed above, skip standard processing
             pass
         elif not use_infographic_overlay:
-            processor = ImageProcessor()
-            processed = processor.process_images(
+            processed = await render_executor.process_images(
                 images=processed_images,
                 add_footer=True,
                 create_pdf=len(processed_images) > 1,
@@ -611,18 +667,34 @@ async def generate_images(request: ImageGenerationRequestSchema):
             # Infographic renderer already added footer, just create PDF if needed
             processed = {"images": processed_images}
             if len(processed_images) > 1:
-                processor = ImageProcessor()
-                pdf_images = [img["base64_data"] for img in processed_images if img["base64_data"]]
+                pdf_images = [img["data"] for img in processed_images if img["data"]]
                 if pdf_images:
-                    processed["pdf_base64"] = processor.merge_to_pdf(pdf_images)
+                    processed["pdf"] = await render_executor.merge_to_pdf(pdf_images)
+
+        report_stage("finalizing")
 
+        # Store files server-side; the response carries URLs (base64 only if asked for)
+        stored_images, stored_pdf = await session_files.asave_generation(
+            session_id=request.session_id,
+            images=[img["data"] for img in processed["images"]],
+            pdf=processed.get("pdf"),
+        )
+        image_entries = [
+            {
+                **{k: v for k, v in img.items() if k != "data"},
+                "url": stored.url,
+                "etag": stored.etag,
+                "size_bytes": stored.size_bytes,
+            }
+            for img, stored in zip(processed["images"], stored_images)
+        ]
         elapsed_ms = int((time.time() - start_time) * 1000)
 
-        # Update session
-        session_manager.update(
+        # Update session (references only - the bytes live in session_files)
+        await session_manager.update(
             session_id=request.session_id,
-            generated_images=[img for img in processed["images"]],
-            pdf_data=processed.get("pdf_base64"),
+            generated_images=image_entries,
+            pdf_url=stored_pdf.url if stored_pdf else None,
             image_model_used=result.model_used,
         )
 
@@ -637,8 +709,15 @@ async def generate_images(request: ImageGenerationRequestSchema):
         )
 
         return ImageGenerationResponseSchema(
-            images=[GeneratedImageSchema(**img) for img in processed["images"]],
-            pdf_base64=processed.get("pdf_base64"),
+            images=[
+                GeneratedImageSchema(
+                    **entry,
+                    base64_data=encode_base64(img["data"]) if request.inline_data else None,
+                )
+                for entry, img in zip(image_entries, processed["images"])
+            ],
+            pdf_url=stored_pdf.url if stored_pdf else None,
+            pdf_base64=encode_base64(processed.get("pdf")) if request.inline_data else None,
             pdf_title=processed.get("pdf_title"),
             session_id=request.session_id,
             model_used=result.model_used,
@@ -646,6 +725,9 @@ async def generate_images(request: ImageGenerationRequestSchema):
             generation_time_ms=elapsed_ms,
         )
 
+    except HTTPException:
+        # Deliberate status codes (e.g. 503 for a provider known to be down)
+        raise
     except ProviderError as e:
         elapsed_ms = int((time.time() - start_time) * 1000)
 
@@ -712,17 +794,22 @@ async def generate_post_card(request: PostCardGenerationRequestSchema):
             verified=request.verified,
         )
 
-        builder = PostCardBuilder(style)
-        post_card_base64, calculated_height = builder.build(
+        post_card, calculated_height = await render_executor.build_post_card(
+            style,
             post_text=request.post_text,
             avatar_base64=request.avatar_base64,
             short_post=request.short_post,
         )
 
+        stored = await session_files.asave_post_card(request.session_id, post_card)
+        await session_manager.update(session_id=request.session_id, post_card_url=stored.url)
+
         generation_time = int((time.time() - start_time) * 1000)
 
         return PostCardGenerationResponseSchema(
-            post_card_base64=post_card_base64,
+            url=stored.url,
+            etag=stored.etag,
+            post_card_base64=encode_base64(post_card) if request.inline_data else None,
             format="png",
             width=1080,
             height=calculated_height,
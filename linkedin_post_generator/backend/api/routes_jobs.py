@@ -0,0 +1,177 @@
+"""
+Job Routes
+===========
+Endpoints for background image generation jobs.
+
+Submit with POST /jobs/images (same body as /generate-images), poll
+GET /jobs/{job_id} for per-image progress, then fetch the
+/generate-images response from GET /jobs/{job_id}/result.
+"""
+
+import logging
+from typing import Callable
+
+from fastapi import APIRouter, HTTPException, status
+
+from ..config import settings
+from ..services.session_manager import session_manager
+from ..services.job_manager import Job, JobStatus, job_manager
+from .routes_image import run_image_generation
+from .schemas import (
+    ImageGenerationRequestSchema,
+    ImageGenerationResponseSchema,
+    JobSubmitResponseSchema,
+    JobStatusSchema,
+    JobImageProgressSchema,
+    ErrorResponse,
+)
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter(tags=["Jobs"])
+
+
+async def run_image_job(job: Job, on_stage: Callable[[str], None]) -> dict:
+    """Job runner for "images" jobs - the /generate-images flow."""
+    request = ImageGenerationRequestSchema(**job.request)
+    response = await run_image_generation(request, on_stage=on_stage)
+    return response.model_dump(mode="json")
+
+
+job_manager.register_runner("images", run_image_job)
+
+
+async def _expected_image_ids(request: ImageGenerationRequestSchema) -> list[int]:
+    """Image ids the job will render (for initial progress entries)."""
+    if request.image_prompts:
+        prompts = [p.id for p in request.image_prompts]
+    else:
+        session = await session_manager.get(request.session_id)
+        if not session or not session.image_prompts:
+            return []
+        prompts = [
+            p.get("id", idx)
+            for idx, p in enumerate(session.image_prompts, start=1)
+            if isinstance(p, dict) and p.get("prompt")
+        ]
+
+    limit = 1 if request.generate_carousel else settings.max_images_per_request
+    return prompts[:limit]
+
+
+async def _get_job_or_404(job_id: str) -> Job:
+    job = await job_manager.aget(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+@router.post(
+    "/jobs/images",
+    response_model=JobSubmitResponseSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        503: {"model": ErrorResponse},
+    },
+)
+async def submit_image_job(request: ImageGenerationRequestSchema):
+    """
+    Queue image generation as a background job.
+
+    Returns immediately with a job id. The job runs the same flow as
+    /generate-images (including carousels and PDFs) independent of this
+    request, so long SDXL renders are not cut off by HTTP timeouts.
+    """
+    try:
+        job = await job_manager.submit(
+            kind="images",
+            session_id=request.session_id,
+            request=request.model_dump(mode="json"),
+            image_ids=await _expected_image_ids(request),
+        )
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
+
+    base = f"{settings.api_prefix}/jobs/{job.job_id}"
+    return JobSubmitResponseSchema(
+        job_id=job.job_id,
+        status=job.status.value,
+        session_id=job.session_id,
+        status_url=base,
+        result_url=f"{base}/result",
+    )
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatusSchema,
+    responses={
+        404: {"model": ErrorResponse},
+    },
+)
+async def get_job(job_id: str):
+    """Get job status and per-image progress."""
+    job = await _get_job_or_404(job_id)
+
+    return JobStatusSchema(
+        job_id=job.job_id,
+        kind=job.kind,
+        session_id=job.session_id,
+        status=job.status.value,
+        stage=job.stage,
+        queue_position=job_manager.queue_position(job.job_id),
+        images=[JobImageProgressSchema(**img) for img in job.images],
+        completed_images=sum(1 for img in job.images if img["status"] in ("done", "failed", "skipped")),
+        total_images=len(job.images),
+        error=job.error,
+        has_result=job.has_result,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=ImageGenerationResponseSchema,
+    responses={
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def get_job_result(job_id: str):
+    """
+    Get the result of a finished job (same shape as /generate-images).
+
+    Returns 409 while the job is still queued or running, and 500 with
+    the job's error if it failed.
+    """
+    job = await _get_job_or_404(job_id)
+
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=job.error or "Job failed",
+        )
+
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}",
+        )
+
+    result = await job_manager.aget_result(job_id)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job result is no longer available",
+        )
+
+    return result
@@ -1,12 +1,27 @@
 """
 Session & Usage Routes
 =======================
-Endpoints for session management and usage statistics.
+Endpoints for session management, generated file delivery and usage
+statistics.
+
+Generated images, PDFs and post cards are served as binary files with
+content ETags (If-None-Match -> 304) and HTTP range support.
 """
 
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
 
-from ..services import session_manager, usage_logger
+from ..config import settings
+from ..services.session_manager import session_manager
+from ..services.usage_logger import usage_logger
+from ..services.text_cache import text_cache
+from ..services.session_files import session_files
+from ..services.usage_analytics import usage_analytics
+from ..providers.image_cache import image_cache
 
 
 router = APIRouter(tags=["Session & Usage"])
@@ -15,7 +30,7 @@ router = APIRouter(tags=["Session & Usage"])
 @router.get("/session/{session_id}")
 async def get_session(session_id: str):
     """Get current session state (for debugging/recovery)."""
-    session = session_manager.get(session_id)
+    session = await session_manager.get(session_id)
 
     if not session:
         raise HTTPException(
@@ -29,15 +44,73 @@ async def get_session(session_id: str):
         "has_hashtags": session.hashtags is not None,
         "has_image_prompts": session.image_prompts is not None,
         "has_images": session.generated_images is not None,
+        "image_urls": [img.get("url") for img in session.generated_images or []],
+        "pdf_url": session.pdf_url,
+        "post_card_url": session.post_card_url,
         "text_model": session.text_model_used,
         "image_model": session.image_model_used,
     }
 
 
+async def _file_response(
+    request: Request,
+    path: Optional[Path],
+    media_type: str,
+    filename: str,
+) -> Response:
+    """Serve a stored session file (404 if missing, 304 if the ETag matches)."""
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+
+    # Hashes the file when its ETag isn't cached yet
+    etag = await asyncio.to_thread(session_files.etag, path)
+    # Stable URLs get new content on regeneration, so clients always revalidate
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        headers=headers,
+        content_disposition_type="inline",
+    )
+
+
+@router.get("/session/{session_id}/images/{n}.png", response_class=FileResponse)
+async def get_session_image(session_id: str, n: int, request: Request):
+    """Get the n-th (1-based) generated image of a session as PNG."""
+    return await _file_response(request, session_files.image_path(session_id, n), "image/png", f"image-{n}.png")
+
+
+@router.get("/session/{session_id}/carousel.pdf", response_class=FileResponse)
+async def get_session_pdf(session_id: str, request: Request):
+    """Get the session's merged PDF (carousel or multi-image)."""
+    return await _file_response(request, session_files.pdf_path(session_id), "application/pdf", "carousel.pdf")
+
+
+@router.get("/session/{session_id}/post-card.png", response_class=FileResponse)
+async def get_session_post_card(session_id: str, request: Request):
+    """Get the session's post card as PNG."""
+    return await _file_response(request, session_files.post_card_path(session_id), "image/png", "post-card.png")
+
+
+@router.get("/sessions/stats")
+async def session_stats():
+    """Get session store statistics (memory use, LRU evictions, hit rate, expiry)."""
+    return await session_manager.get_stats()
+
+
 @router.delete("/session/{session_id}")
 async def delete_session(session_id: str):
     """Delete a session."""
-    deleted = session_manager.delete(session_id)
+    deleted = await session_manager.delete(session_id)
 
     if not deleted:
         raise HTTPException(
@@ -50,6 +123,53 @@ async def delete_session(session_id: str):
 
 @router.get("/usage")
 async def get_usage():
-    """Get usage statistics."""
-    return usage_logger.get_usage()
+    """Get usage statistics (including text/image cache hit/miss counters)."""
+    usage = await usage_logger.get_usage()
+    usage["text_cache"] = await text_cache.aget_stats()
+    usage["image_cache"] = image_cache.get_stats()
+    usage["analytics"] = usage_analytics.get_stats()
+    return usage
+
+
+def _csv(value: Optional[str]) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
+@router.get("/usage/query")
+async def query_usage(
+    start: Optional[str] = Query(None, alias="from", description="ISO date/datetime, local time (default: 24h before 'to')"),
+    end: Optional[str] = Query(None, alias="to", description="ISO date/datetime, local time (default: now)"),
+    group_by: Optional[str] = Query(None, description="Comma-separated: provider, model, operation, success, cached, day, hour"),
+    metrics: Optional[str] = Query(
+        None,
+        description="Comma-separated: count, errors, error_rate, tokens, images, cached, avg_ms, max_ms, p50, p90, p95, p99",
+    ),
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    operation: Optional[str] = None,
+):
+    """
+    Aggregate usage over a time range.
+
+    Example: /usage/query?from=2026-01-01&group_by=model&metrics=p50,p95,tokens,errors
+    """
+    if not settings.usage_analytics_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usage analytics is disabled (USAGE_ANALYTICS_ENABLED=false)",
+        )
+
+    try:
+        return await usage_analytics.aquery(
+            start=start,
+            end=end,
+            group_by=_csv(group_by),
+            metrics=_csv(metrics),
+            filters={"provider": provider, "model": model, "operation": operation},
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
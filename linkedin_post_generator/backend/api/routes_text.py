@@ -4,16 +4,26 @@ Text Generation Routes
 Endpoints for LinkedIn post text generation.
 """
 
+import json
 import logging
 import time
+from typing import Optional
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from ..config import settings
-from ..providers import TextGenerationRequest, ProviderError
-from ..prompts import get_linkedin_text_prompt
-from ..services import session_manager, usage_logger
+from ..providers import TextGenerationRequest, TextGenerationResponse, ImagePromptOptions, ProviderError
+from ..prompts import (
+    get_linkedin_text_prompt,
+    get_image_prompt_generation_prompt,
+    get_pipeline_prompt_fingerprint,
+)
+from ..services.session_manager import session_manager
+from ..services.usage_logger import usage_logger
+from ..services.text_cache import hash_prompt, make_cache_key, text_cache
 from ..services.prompt_logger import get_prompt_logger
+from ..utils.metrics import metrics
 from .provider_factory import get_text_provider
 from .schemas import (
     TextGenerationRequestSchema,
@@ -33,6 +43,218 @@ router = APIRouter(tags=["Text Generation"])
 prompt_logger = get_prompt_logger()
 
 
+def _enum_str(value) -> str:
+    """Convert enum to string value (handles both enum instances and strings)."""
+    return value.value if hasattr(value, 'value') else str(value)
+
+
+def _prepare_generation(request: TextGenerationRequestSchema) -> tuple[TextGenerationRequest, str, str]:
+    """
+    Build the provider request and system prompt, and log the prompt.
+
+    Returns:
+        (gen_request, system_prompt, image_model_name)
+    """
+    post_length_str = _enum_str(request.post_length)
+    tone_str = _enum_str(request.tone)
+    cta_style_str = _enum_str(request.cta_style)
+
+    gen_request = TextGenerationRequest(
+        idea=request.idea,
+        post_angle=request.post_angle,
+        draft_post=request.draft_post,
+        post_length=post_length_str,
+        tone=tone_str,
+        audience=request.audience,
+        cta_style=cta_style_str,
+        session_id=request.session_id,  # For pipeline step logging
+    )
+
+    # Use appropriate prompt based on text provider
+    # Ollama (Mistral/Llama) needs simpler, more explicit prompts
+    # Bedrock (Claude) can handle complex prompts
+    provider_to_model = {
+        "nova": "nova",
+        "titan": "titan",
+        "sdxl": "sdxl"
+    }
+    image_model_name = provider_to_model.get(request.image_model.provider.value, "nova")
+
+    # Choose prompt based on text provider
+    text_provider_str = _enum_str(request.text_model.provider)
+    if text_provider_str == "ollama":
+        # Ollama now uses 3-step pipeline internally
+        # System prompt is for logging only - pipeline uses its own prompts
+        system_prompt = "[OLLAMA PIPELINE - Uses internal 3-step prompts for 95%+ success]"
+    else:
+        # Full prompts for Claude (Bedrock)
+        system_prompt = get_linkedin_text_prompt(
+            image_model=image_model_name,
+            generate_images=request.generate_images
+        )
+
+    # Log the prompt being sent
+    prompt_logger.log_text_generation(
+        session_id=request.session_id,
+        provider=request.text_model.provider.value,
+        model=request.text_model.model,
+        system_prompt=system_prompt,
+        user_input={
+            "idea": request.idea,
+            "post_angle": request.post_angle,
+            "draft_post": request.draft_post,
+            "post_length": post_length_str,
+            "tone": tone_str,
+            "audience": request.audience,
+            "cta_style": cta_style_str,
+        },
+    )
+
+    return gen_request, system_prompt, image_model_name
+
+
+def _image_prompt_options(
+    request: TextGenerationRequestSchema,
+    image_model_name: str,
+) -> Optional[ImagePromptOptions]:
+    """Options for the combined text + image prompts flow, or None if not requested."""
+    if not (request.include_image_prompts and request.generate_images):
+        return None
+
+    return ImagePromptOptions(
+        image_count=min(request.image_count or 1, settings.max_images_per_request),
+        system_prompt=get_image_prompt_generation_prompt(image_model=image_model_name),
+    )
+
+
+def _cache_key(
+    request: TextGenerationRequestSchema,
+    gen_request: TextGenerationRequest,
+    system_prompt: str,
+    image_prompts: Optional[ImagePromptOptions] = None,
+) -> str:
+    """Text response cache key: normalized request + model + prompt version."""
+    provider_str = _enum_str(request.text_model.provider)
+    if provider_str == "ollama":
+        # Ollama's system_prompt is a placeholder - the pipeline prompts are the real version
+        prompt_hash = get_pipeline_prompt_fingerprint()
+    else:
+        prompt_hash = hash_prompt(system_prompt)
+
+    return make_cache_key(
+        request=gen_request,
+        provider=provider_str,
+        model=request.text_model.model,
+        prompt_hash=prompt_hash,
+        max_tokens=settings.max_text_output_tokens,
+        extra={
+            "image_count": image_prompts.image_count,
+            "image_prompt_hash": hash_prompt(image_prompts.system_prompt),
+        } if image_prompts else None,
+    )
+
+
+async def _complete_generation(
+    request: TextGenerationRequestSchema,
+    result: TextGenerationResponse,
+    elapsed_ms: int,
+    image_model_name: str,
+    cached: bool = False,
+) -> TextGenerationResponseSchema:
+    """Log the response, store it in the session, log usage and build the API response."""
+    # Log the response
+    prompt_logger.log_text_generation(
+        session_id=request.session_id,
+        provider=request.text_model.provider.value,
+        model=request.text_model.model,
+        system_prompt="[SAME AS ABOVE]",
+        user_input={"idea": request.idea[:100] + "..."},
+        response={
+            "post_text_preview": result.post_text[:200] + "..." if len(result.post_text) > 200 else result.post_text,
+            "short_post": result.short_post,
+            "hashtags": result.hashtags,
+            "image_count": result.image_strategy.get("image_count") if isinstance(result.image_strategy, dict) else None,
+            "tokens_used": result.tokens_used,
+            "cached": cached,
+        },
+    )
+
+    # Store in session (for image generation)
+    await session_manager.update(
+        session_id=request.session_id,
+        post_text=result.post_text,
+        short_post=result.short_post,
+        hashtags=result.hashtags,
+        image_recommendation=result.image_recommendation,
+        image_strategy=result.image_strategy if result.image_strategy else None,
+        image_prompts=[p.model_dump() for p in result.image_prompts] if result.image_prompts else [],
+        image_fingerprint=result.image_fingerprint.model_dump() if result.image_fingerprint else None,
+        # Store infographic_text to avoid second LLM call during rendering
+        infographic_text=result.infographic_text.model_dump() if result.infographic_text else None,
+        tone=_enum_str(request.tone),
+        audience=request.audience,
+        text_model_used=result.model_used,
+    )
+
+    # Log usage
+    usage_logger.log_text_generation(
+        session_id=request.session_id,
+        provider=request.text_model.provider.value,
+        model=request.text_model.model,
+        tokens_used=result.tokens_used,
+        duration_ms=elapsed_ms,
+        success=True,
+        cached=cached,
+    )
+
+    # Build response
+    # Convert infographic_text if present
+    infographic_text_schema = None
+    if result.infographic_text:
+        sections = [
+            InfographicSectionSchema(title=s.title, bullets=s.bullets)
+            for s in result.infographic_text.sections
+        ]
+        infographic_text_schema = InfographicTextStructureSchema(
+            title=result.infographic_text.title,
+            subtitle=result.infographic_text.subtitle,
+            sections=sections,
+            takeaway=result.infographic_text.takeaway,
+        )
+
+    return TextGenerationResponseSchema(
+        post_text=result.post_text,
+        short_post=result.short_post,
+        hashtags=result.hashtags,
+        image_recommendation=ImageRecommendationSchema(**result.image_recommendation) if result.image_recommendation else None,
+        image_strategy=ImageStrategySchema(**result.image_strategy) if result.image_strategy else None,
+        image_prompts=[
+            ImagePromptSchema(**p.model_dump()) for p in result.image_prompts
+        ] if result.image_prompts else [],
+        image_fingerprint=ImageFingerprintSchema(**result.image_fingerprint.model_dump()) if result.image_fingerprint else None,
+        infographic_text=infographic_text_schema,  # Pre-extracted for infographic rendering
+        session_id=request.session_id,
+        model_used=result.model_used,
+        image_model_used=image_model_name if request.generate_images else "none",
+        tokens_used=result.tokens_used,
+        generation_time_ms=elapsed_ms,
+    )
+
+
+def _log_failure(request: TextGenerationRequestSchema, start_time: float, error: Exception):
+    """Log a failed text generation to usage logs."""
+    elapsed_ms = int((time.time() - start_time) * 1000)
+
+    usage_logger.log_text_generation(
+        session_id=request.session_id,
+        provider=request.text_model.provider.value if hasattr(request, 'text_model') else "unknown",
+        model=request.text_model.model if hasattr(request, 'text_model') else "unknown",
+        duration_ms=elapsed_ms,
+        success=False,
+        error_message=str(error),
+    )
+
+
 @router.post(
     "/generate-text",
     response_model=TextGenerationResponseSchema,
@@ -51,187 +273,148 @@ async def generate_text(request: TextGenerationRequestSchema):
     - image_strategy: Recommended image count and reason
     - image_prompts: ALWAYS generated (user decides to use)
     - image_fingerprint: Visual consistency params
+
+    With include_image_prompts, image_prompts/image_fingerprint come from a
+    dedicated image prompt generation grounded in the post (the same as
+    /generate-image-prompts), so no follow-up call is needed.
     """
     start_time = time.time()
 
     try:
         # Get provider
         provider = get_text_provider(request.text_model.provider)
+        gen_request, system_prompt, image_model_name = _prepare_generation(request)
 
-        # Build generation request
-        # Convert enum to string value (handles both enum instances and strings)
-        post_length_str = request.post_length.value if hasattr(request.post_length, 'value') else str(request.post_length)
-        tone_str = request.tone.value if hasattr(request.tone, 'value') else str(request.tone)
-        cta_style_str = request.cta_style.value if hasattr(request.cta_style, 'value') else str(request.cta_style)
-
-        gen_request = TextGenerationRequest(
-            idea=request.idea,
-            post_angle=request.post_angle,
-            draft_post=request.draft_post,
-            post_length=post_length_str,
-            tone=tone_str,
-            audience=request.audience,
-            cta_style=cta_style_str,
-            session_id=request.session_id,  # For pipeline step logging
-        )
+        image_prompts = _image_prompt_options(request, image_model_name)
 
-        # Use appropriate prompt based on text provider
-        # Ollama (Mistral/Llama) needs simpler, more explicit prompts
-        # Bedrock (Claude) can handle complex prompts
-        provider_to_model = {
-            "nova": "nova",
-            "titan": "titan",
-            "sdxl": "sdxl"
-        }
-        image_model_name = provider_to_model.get(request.image_model.provider.value, "nova")
-
-        # Choose prompt based on text provider
-        text_provider_str = request.text_model.provider.value if hasattr(request.text_model.provider, 'value') else str(request.text_model.provider)
-        if text_provider_str == "ollama":
-            # Ollama now uses 3-step pipeline internally
-            # System prompt is for logging only - pipeline uses its own prompts
-            system_prompt = "[OLLAMA PIPELINE - Uses internal 3-step prompts for 95%+ success]"
-        else:
-            # Full prompts for Claude (Bedrock)
-            system_prompt = get_linkedin_text_prompt(
-                image_model=image_model_name,
-                generate_images=request.generate_images
-            )
-
-        # Log the prompt being sent
-        prompt_logger.log_text_generation(
-            session_id=request.session_id,
-            provider=request.text_model.provider.value,
-            model=request.text_model.model,
-            system_prompt=system_prompt,
-            user_input={
-                "idea": request.idea,
-                "post_angle": request.post_angle,
-                "draft_post": request.draft_post,
-                "post_length": post_length_str,
-                "tone": tone_str,
-                "audience": request.audience,
-                "cta_style": cta_style_str,
-            },
-        )
+        # Identical requests (same inputs, model, prompt version) reuse the stored result
+        cache_key = _cache_key(request, gen_request, system_prompt, image_prompts)
+        result = await text_cache.aget(cache_key, bypass=request.bypass_cache)
+        cached = result is not None
 
-        # Generate
-        result = await provider.generate(
-            request=gen_request,
-            model=request.text_model.model,
-            system_prompt=system_prompt,
-            max_tokens=settings.max_text_output_tokens,
-        )
+        if not cached:
+            # Generate
+            with metrics.provider_call("text", request.text_model.provider.value):
+                if image_prompts is not None:
+                    result = await provider.generate_with_image_prompts(
+                        request=gen_request,
+                        model=request.text_model.model,
+                        system_prompt=system_prompt,
+                        image_prompts=image_prompts,
+                        max_tokens=settings.max_text_output_tokens,
+                    )
+                else:
+                    result = await provider.generate(
+                        request=gen_request,
+                        model=request.text_model.model,
+                        system_prompt=system_prompt,
+                        max_tokens=settings.max_text_output_tokens,
+                    )
+            await text_cache.aset(cache_key, result, bypass=request.bypass_cache)
 
         elapsed_ms = int((time.time() - start_time) * 1000)
+        return await _complete_generation(request, result, elapsed_ms, image_model_name, cached=cached)
 
-        # Log the response
-        prompt_logger.log_text_generation(
-            session_id=request.session_id,
-            provider=request.text_model.provider.value,
-            model=request.text_model.model,
-            system_prompt="[SAME AS ABOVE]",
-            user_input={"idea": request.idea[:100] + "..."},
-            response={
-                "post_text_preview": result.post_text[:200] + "..." if len(result.post_text) > 200 else result.post_text,
-                "short_post": result.short_post,
-                "hashtags": result.hashtags,
-                "image_count": result.image_strategy.get("image_count") if isinstance(result.image_strategy, dict) else None,
-                "tokens_used": result.tokens_used,
-            },
-        )
-
-        # Store in session (for image generation)
-        session_manager.update(
-            session_id=request.session_id,
-            post_text=result.post_text,
-            short_post=result.short_post,
-            hashtags=result.hashtags,
-            image_recommendation=result.image_recommendation,
-            image_strategy=result.image_strategy if result.image_strategy else None,
-            image_prompts=[p.model_dump() for p in result.image_prompts] if result.image_prompts else [],
-            image_fingerprint=result.image_fingerprint.model_dump() if result.image_fingerprint else None,
-            # Store infographic_text to avoid second LLM call during rendering
-            infographic_text=result.infographic_text.model_dump() if result.infographic_text else None,
-            tone=tone_str,
-            audience=request.audience,
-            text_model_used=result.model_used,
-        )
-
-        # Log usage
-        usage_logger.log_text_generation(
-            session_id=request.session_id,
-            provider=request.text_model.provider.value,
-            model=request.text_model.model,
-            tokens_used=result.tokens_used,
-            duration_ms=elapsed_ms,
-            success=True,
-        )
-
-        # Build response
-        # Convert infographic_text if present
-        infographic_text_schema = None
-        if result.infographic_text:
-            sections = [
-                InfographicSectionSchema(title=s.title, bullets=s.bullets)
-                for s in result.infographic_text.sections
-            ]
-            infographic_text_schema = InfographicTextStructureSchema(
-                title=result.infographic_text.title,
-                subtitle=result.infographic_text.subtitle,
-                sections=sections,
-                takeaway=result.infographic_text.takeaway,
-            )
-
-        return TextGenerationResponseSchema(
-            post_text=result.post_text,
-            short_post=result.short_post,
-            hashtags=result.hashtags,
-            image_recommendation=ImageRecommendationSchema(**result.image_recommendation) if result.image_recommendation else None,
-            image_strategy=ImageStrategySchema(**result.image_strategy) if result.image_strategy else None,
-            image_prompts=[
-                ImagePromptSchema(**p.model_dump()) for p in result.image_prompts
-            ] if result.image_prompts else [],
-            image_fingerprint=ImageFingerprintSchema(**result.image_fingerprint.model_dump()) if result.image_fingerprint else None,
-            infographic_text=infographic_text_schema,  # Pre-extracted for infographic rendering
-            session_id=request.session_id,
-            model_used=result.model_used,
-            image_model_used=image_model_name if request.generate_images else "none",
-            tokens_used=result.tokens_used,
-            generation_time_ms=elapsed_ms,
-        )
-
+    except HTTPException:
+        # Deliberate status codes (e.g. 503 for a provider known to be down)
+        raise
     except ProviderError as e:
-        elapsed_ms = int((time.time() - start_time) * 1000)
-
-        usage_logger.log_text_generation(
-            session_id=request.session_id,
-            provider=request.text_model.provider.value,
-            model=request.text_model.model,
-            duration_ms=elapsed_ms,
-            success=False,
-            error_message=str(e),
-        )
+        _log_failure(request, start_time, e)
 
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         )
     except Exception as e:
-        elapsed_ms = int((time.time() - start_time) * 1000)
         logger.error(f"Unexpected error in text generation: {str(e)}", exc_info=True)
-
-        usage_logger.log_text_generation(
-            session_id=request.session_id,
-            provider=request.text_model.provider.value if hasattr(request, 'text_model') else "unknown",
-            model=request.text_model.model if hasattr(request, 'text_model') else "unknown",
-            duration_ms=elapsed_ms,
-            success=False,
-            error_message=str(e),
-        )
+        _log_failure(request, start_time, e)
 
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unexpected error: {str(e)}",
         )
 
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post(
+    "/generate-text/stream",
+    responses={
+        200: {"content": {"text/event-stream": {}}},
+        400: {"model": ErrorResponse},
+    },
+)
+async def generate_text_stream(request: TextGenerationRequestSchema):
+    """
+    Generate LinkedIn post text, streamed as Server-Sent Events.
+
+    Events:
+    - step: pipeline step started ({"step": 1, "name": "Content Generation"})
+    - token: model output chunk as it arrives ({"text": "..."})
+    - result: final TextGenerationResponseSchema (terminal)
+    - error: generation failed ({"detail": "..."}) (terminal)
+
+    Ollama streams Step 1 content tokens; Bedrock streams Claude's output
+    via converse_stream. The result event carries the same payload as
+    /generate-text and the session is updated the same way. A cached
+    result is sent as a single result event with no tokens.
+    """
+    # Resolve provider before streaming starts so unknown providers still get a 400
+    provider = get_text_provider(request.text_model.provider)
+
+    async def event_stream():
+        start_time = time.time()
+
+        try:
+            gen_request, system_prompt, image_model_name = _prepare_generation(request)
+
+            image_prompts = _image_prompt_options(request, image_model_name)
+
+            cache_key = _cache_key(request, gen_request, system_prompt, image_prompts)
+            cached_result = await text_cache.aget(cache_key, bypass=request.bypass_cache)
+            if cached_result is not None:
+                elapsed_ms = int((time.time() - start_time) * 1000)
+                response = await _complete_generation(
+                    request, cached_result, elapsed_ms, image_model_name, cached=True
+                )
+                yield _sse("result", response.model_dump(mode="json"))
+                return
+
+            # Timed over the whole stream (includes the time the client takes to read it)
+            with metrics.provider_call("text_stream", request.text_model.provider.value):
+                async for event in provider.generate_stream(
+                    request=gen_request,
+                    model=request.text_model.model,
+                    system_prompt=system_prompt,
+                    max_tokens=settings.max_text_output_tokens,
+                    image_prompts=image_prompts,
+                ):
+                    if event.event == "token":
+                        yield _sse("token", {"text": event.text})
+                    elif event.event == "step":
+                        yield _sse("step", {"step": event.step, "name": event.text})
+                    elif event.event == "result":
+                        await text_cache.aset(cache_key, event.response, bypass=request.bypass_cache)
+                        elapsed_ms = int((time.time() - start_time) * 1000)
+                        response = await _complete_generation(request, event.response, elapsed_ms, image_model_name)
+                        yield _sse("result", response.model_dump(mode="json"))
+
+        except ProviderError as e:
+            _log_failure(request, start_time, e)
+            yield _sse("error", {"detail": str(e)})
+        except Exception as e:
+            logger.error(f"Unexpected error in streaming text generation: {str(e)}", exc_info=True)
+            _log_failure(request, start_time, e)
+            yield _sse("error", {"detail": f"Unexpected error: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        },
+    )
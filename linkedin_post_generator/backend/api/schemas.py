@@ -29,6 +29,7 @@ class ImagePromptSchema(BaseModel):
     style_notes: str = ""
     composition_note: str = Field(default="", description="How the layout leaves room for the footer")
     negative_prompt: Optional[str] = Field(default=None, description="Negative prompt for image generation (SDXL-specific)")
+    seed: Optional[int] = Field(default=None, ge=0, description="Generation seed recorded in deterministic mode")
 
 
 class ImageFingerprintSchema(BaseModel):
@@ -125,6 +126,14 @@ class TextGenerationRequestSchema(BaseModel):
     # Image model selection (only used if generate_images=True)
     image_model: ImageModelConfig = Field(default_factory=ImageModelConfig)
 
+    # Combined flow: also generate image prompts grounded in the post (replaces the
+    # separate /generate-image-prompts call; Ollama overlaps it with Step 3)
+    include_image_prompts: bool = Field(default=False, description="If True (and generate_images), return grounded image prompts in the same response.")
+    image_count: Optional[int] = Field(None, ge=1, le=7, description="Image prompts to generate with include_image_prompts (default: 1)")
+
+    # Skip the text response cache: always call the model and don't store the result
+    bypass_cache: bool = Field(default=False, description="If True, ignore any cached result, regenerate and don't cache the result.")
+
     @field_validator("audience")
     @classmethod
     def validate_audience(cls, v):
@@ -210,6 +219,14 @@ class ImageGenerationRequestSchema(BaseModel):
     image_fingerprint: Optional[ImageFingerprintSchema] = None
     image_model: ImageModelConfig = Field(default_factory=ImageModelConfig)
     generate_carousel: bool = Field(default=False, description="Generate carousel: AI cover + post card sections")
+    deterministic: Optional[bool] = Field(
+        default=None,
+        description="Fixed seed per prompt + image cache (repeat calls skip the model). Defaults to IMAGE_CACHE_ENABLED.",
+    )
+    inline_data: bool = Field(
+        default=False,
+        description="Also inline images/PDF as base64 (legacy clients). Default: URLs only.",
+    )
     # Note: post_text, short_post, and infographic_text are read from session
     # (stored during /generate-text call) to avoid duplication
 
@@ -217,18 +234,23 @@ class ImageGenerationRequestSchema(BaseModel):
 class GeneratedImageSchema(BaseModel):
     """Single generated image."""
     id: int
-    base64_data: str
+    url: str = Field(..., description="Binary PNG: GET /session/{id}/images/{n}.png")
+    etag: Optional[str] = None
+    size_bytes: Optional[int] = None
+    base64_data: Optional[str] = Field(default=None, description="Only set when inline_data=true")
     prompt_used: str
     concept: str = Field(default="")
     format: str = "png"
     width: int = 1024
     height: int = 1024
+    seed: Optional[int] = Field(default=None, description="Seed used (deterministic mode only)")
 
 
 class ImageGenerationResponseSchema(BaseModel):
     """Response schema for POST /generate-images."""
     images: list[GeneratedImageSchema]
-    pdf_base64: Optional[str] = None
+    pdf_url: Optional[str] = Field(None, description="Binary PDF: GET /session/{id}/carousel.pdf")
+    pdf_base64: Optional[str] = Field(None, description="Only set when inline_data=true")
     pdf_title: Optional[str] = Field(None, description="Title for PDF filename (for carousels)")
     session_id: str
     model_used: str
@@ -250,11 +272,14 @@ class PostCardGenerationRequestSchema(BaseModel):
     handle: str = "@yourusername"  # Set via VITE_BRAND_HANDLE in .env
     verified: bool = False
     theme: Literal['dark', 'light'] = 'dark'
+    inline_data: bool = Field(default=False, description="Also inline the PNG as base64 (legacy clients)")
 
 
 class PostCardGenerationResponseSchema(BaseModel):
     """Response schema for POST /generate-post-card."""
-    post_card_base64: str
+    url: str = Field(..., description="Binary PNG: GET /session/{id}/post-card.png")
+    etag: Optional[str] = None
+    post_card_base64: Optional[str] = Field(None, description="Only set when inline_data=true")
     format: str = "png"
     width: int = 1080
     height: int = 1080
@@ -263,6 +288,44 @@ class PostCardGenerationResponseSchema(BaseModel):
     generation_time_ms: Optional[int] = None
 
 
+# =============================================================================
+# JOB SCHEMAS
+# =============================================================================
+
+class JobSubmitResponseSchema(BaseModel):
+    """Response schema for POST /jobs/images."""
+    job_id: str
+    status: str
+    session_id: str
+    status_url: str
+    result_url: str
+
+
+class JobImageProgressSchema(BaseModel):
+    """Progress of a single image within a job."""
+    id: int
+    status: str = Field(..., description="pending | running | done | failed | skipped")
+    error: Optional[str] = None
+
+
+class JobStatusSchema(BaseModel):
+    """Response schema for GET /jobs/{job_id}."""
+    job_id: str
+    kind: str
+    session_id: str
+    status: str = Field(..., description="queued | running | succeeded | failed")
+    stage: Optional[str] = Field(None, description="generating | processing | finalizing")
+    queue_position: Optional[int] = None
+    images: list[JobImageProgressSchema] = Field(default_factory=list)
+    completed_images: int = 0
+    total_images: int = 0
+    error: Optional[str] = None
+    has_result: bool = False
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
 # =============================================================================
 # ERROR & UTILITY SCHEMAS
 # =============================================================================
@@ -277,10 +340,20 @@ class ErrorResponse(BaseModel):
     error: ErrorDetail
 
 
+class ProviderHealthSchema(BaseModel):
+    service: str  # Probed backing service (nova/titan share bedrock's)
+    healthy: bool
+    latency_ms: Optional[int] = None
+    checked_at: Optional[float] = None  # Unix time of the last probe (None = not probed yet)
+    consecutive_failures: int = 0
+    error: Optional[str] = None
+
+
 class HealthCheckResponse(BaseModel):
-    status: str = "healthy"
+    status: str = "healthy"  # healthy | degraded (some provider down)
     version: str
     providers: dict[str, bool]
+    provider_details: dict[str, ProviderHealthSchema] = {}
 
 
 class ModelsResponse(BaseModel):
@@ -42,6 +42,7 @@ class Settings(BaseSettings):
     bedrock_claude_opus_model: str = "us.anthropic.claude-opus-4-5-20251101-v1:0"
     bedrock_claude_sonnet_model: str = "us.anthropic.claude-3-5-sonnet-20241022-v2:0"
     bedrock_titan_image_model: str = "amazon.titan-image-generator-v2:0"
+    bedrock_max_workers: int = 16  # Thread pool size for blocking boto3 calls
 
     # Ollama
     ollama_base_url: str = "http://localhost:11434"
@@ -54,6 +55,35 @@ class Settings(BaseSettings):
     sdxl_width: int = 900
     sdxl_height: int = 1200
 
+    # Image fan-out (max prompts rendered concurrently per request)
+    nova_max_concurrency: int = 4
+    titan_max_concurrency: int = 4
+    sdxl_max_concurrency: int = 2  # WebUI queues internally; >1 overlaps I/O with rendering
+
+    # Deterministic image mode: fixed seed per prompt + on-disk PNG cache
+    image_cache_enabled: bool = False  # Default for requests that don't set "deterministic"
+    image_cache_dir: str = "logs/cache/images"
+    image_cache_max_mb: int = 500
+
+    # Shared HTTP connection pools (Ollama / SDXL WebUI)
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0
+
+    # Provider health probes (GET /health; requests to a known-down provider fail fast with 503)
+    health_probe_enabled: bool = True
+    health_probe_interval_seconds: int = 30
+    health_probe_timeout_seconds: float = 5.0
+    health_down_after_failures: int = 2  # Consecutive failed probes before a provider counts as down
+    health_required_providers: str = ""  # Comma-separated; /health answers 503 while any of them is down
+
+    # Deployment (uvicorn worker processes; uvicorn reads WEB_CONCURRENCY as its --workers default)
+    web_concurrency: int = 1  # >1 requires a shared session_backend (sqlite or redis)
+
+    # Rendering pool (Pillow/reportlab work runs off the event loop)
+    render_pool_enabled: bool = True  # False = render in threads instead of processes
+    render_workers: int = 0  # 0 = CPU cores split across web_concurrency workers
+
     # Generation Limits
     max_text_output_tokens: int = 4000
     max_images_per_request: int = 7
@@ -61,11 +91,51 @@ class Settings(BaseSettings):
 
     # Session
     session_ttl_seconds: int = 3600
+    session_max_mb: int = 256  # Memory budget; least recently used sessions are evicted beyond it
+    session_sweep_interval_seconds: int = 60  # Background removal of expired sessions
+    session_files_dir: str = "logs/sessions"  # Generated images/PDFs served from /session/{id}/...
+    session_backend: str = "memory"  # memory | sqlite | redis (also holds /usage counters; sqlite/redis are shared between workers)
+    session_sqlite_path: str = "logs/sessions.db"
+    session_redis_url: str = "redis://localhost:6379/0"
+
+    # Background image jobs (POST /jobs/images)
+    job_workers: int = 2  # Jobs run concurrently; provider concurrency limits still apply
+    job_dir: str = "logs/jobs"  # Persisted job state and results
+    job_retention_seconds: int = 86400  # Finished jobs are kept for 24 hours
+    job_progress_save_interval_ms: int = 250  # Progress updates are persisted at most this often
+    job_recovery_interval_seconds: int = 60  # Re-queue jobs of workers that exited
+
+    # Text response cache (identical /generate-text requests reuse the result)
+    text_cache_enabled: bool = True
+    text_cache_backend: str = "memory"  # "memory" or "sqlite"
+    text_cache_path: str = "logs/cache/text_cache.sqlite3"  # sqlite backend only
+    text_cache_max_entries: int = 500
+    text_cache_ttl_seconds: int = 86400  # 24 hours
+
+    # Usage analytics (usage logs ingested into SQLite for GET /usage/query)
+    usage_analytics_enabled: bool = True
+    usage_analytics_path: str = "logs/usage_analytics.db"
+    usage_analytics_ingest_interval_seconds: int = 60  # Queries also ingest new records first
 
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
 
+    # Usage/prompt log writer (batched background appends)
+    log_flush_interval_ms: int = 200
+    log_flush_batch_size: int = 256  # Flush early once this many records are buffered
+    log_queue_max_records: int = 10000
+    log_queue_overflow: str = "block"  # Buffer full: "block" (caller writes) or "drop" (record lost)
+
+    # Usage/prompt log storage (closed day files are gzipped; oldest deleted beyond the cap)
+    log_compression_enabled: bool = True
+    log_compress_grace_seconds: int = 600  # Leave a closed day file alone this long after its last write
+    log_max_mb: int = 1024  # Cap on all dated usage/prompt logs (today's files are never deleted)
+    log_maintenance_interval_seconds: int = 3600
+
+    # Per-stage latency histograms and gauges on GET /metrics (Prometheus text format)
+    metrics_enabled: bool = True
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
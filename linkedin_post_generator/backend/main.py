@@ -5,18 +5,41 @@ Main entry point for the backend API.
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 import logging
 
 from .config import settings
 from .api import router
+from .api.provider_factory import provider_registry
+from .api.provider_health import provider_health
+from .providers.bedrock_executor import shutdown_bedrock_executor
+from .services.job_manager import job_manager
+from .services.log_storage import log_storage
+from .services.log_writer import log_writer
+from .services.render_executor import render_executor
+from .services.session_files import session_files
+from .services.session_manager import session_manager
+from .services.usage_analytics import usage_analytics
+from .services.usage_logger import usage_logger
+from .utils.deployment import detect_worker_count
+from .utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 
+def check_deployment(workers: int):
+    """Refuse multi-worker deployments whose state would be split per process."""
+    if workers > 1 and settings.session_backend == "memory":
+        raise RuntimeError(
+            f"{workers} workers (WEB_CONCURRENCY or --workers) need a shared session store: "
+            "set SESSION_BACKEND=sqlite or SESSION_BACKEND=redis (the memory backend keeps "
+            "sessions and /usage counters per process)"
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
@@ -25,11 +48,57 @@ async def lifespan(app: FastAPI):
     print(f"   Debug mode: {settings.debug}")
     print(f"   AWS Region: {settings.aws_region}")
     print(f"   Ollama URL: {settings.ollama_base_url}")
+    workers = detect_worker_count()
+    print(f"   Workers: {workers} (session backend: {settings.session_backend})")
+
+    check_deployment(workers)
+
+    # Warm rendering workers (started first, before any client threads exist)
+    render_executor.start()
+
+    # Background usage/prompt log writes (stopped last: everything else may log)
+    log_writer.start()
+
+    # Background compression / size cap of closed day logs
+    log_storage.start()
+
+    # Usage analytics: catch up with the usage logs, then ingest periodically
+    if settings.usage_analytics_enabled:
+        usage_analytics.start()
+
+    # Long-lived providers with pooled clients (closed on shutdown)
+    provider_registry.start()
+
+    # Background provider health probes (requests to a known-down provider get a 503)
+    if settings.health_probe_enabled:
+        provider_health.start(provider_registry)
+
+    # Drop generated files of sessions that expired while the server was down
+    removed = session_files.cleanup_expired(settings.session_ttl_seconds)
+    if removed:
+        logger.info(f"Removed files of {removed} expired session(s)")
+
+    # Background removal of expired sessions
+    session_manager.start_sweeper()
+
+    # Background image job workers (re-queues jobs interrupted by a restart)
+    await job_manager.start()
 
     yield
 
     # Shutdown
     print(f"👋 Shutting down {settings.app_name}")
+    await job_manager.stop()
+    await session_manager.stop_sweeper()
+    await session_manager.close()
+    await usage_logger.close()
+    await usage_analytics.stop()
+    await log_storage.stop()
+    await log_writer.stop()
+    await provider_health.stop()
+    await provider_registry.aclose()
+    shutdown_bedrock_executor()
+    render_executor.shutdown()
 
 
 # Create FastAPI app
@@ -94,6 +163,15 @@ async def root():
     }
 
 
+# Prometheus scrape endpoint (per process: see utils.metrics)
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Stage latency histograms, in-flight gauges and cache hit ratios (text format 0.0.4)."""
+    if not metrics.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
 
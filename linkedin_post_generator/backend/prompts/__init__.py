@@ -20,6 +20,7 @@ from .pipeline_prompts import (
     validate_step1_output,
     validate_step2_output,
     validate_step3_output,
+    get_pipeline_prompt_fingerprint,
     PipelineConfig,
 )
 from .image_prompts import (
@@ -56,6 +57,7 @@ __all__ = [
     "validate_step1_output",
     "validate_step2_output",
     "validate_step3_output",
+    "get_pipeline_prompt_fingerprint",
     "PipelineConfig",
     # Image prompts
     "get_image_enhancement_prompt",
@@ -598,3 +598,27 @@ def extract_section(text: str, header: str) -> str:
         return match.group(1).strip()
     return ""
 
+
+
+# =============================================================================
+# PROMPT VERSION
+# =============================================================================
+
+_pipeline_fingerprint: Optional[str] = None
+
+
+def get_pipeline_prompt_fingerprint() -> str:
+    """
+    SHA-256 of this module's source.
+
+    The step user prompts are templates filled per request, so hashing
+    the source is the stable "prompt version" for the Ollama pipeline
+    (used to key the text response cache).
+    """
+    global _pipeline_fingerprint
+    if _pipeline_fingerprint is None:
+        import hashlib
+        from pathlib import Path
+
+        _pipeline_fingerprint = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    return _pipeline_fingerprint
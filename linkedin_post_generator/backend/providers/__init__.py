@@ -10,8 +10,11 @@ from .base import (
     ImageModelProvider,
     TextGenerationRequest,
     TextGenerationResponse,
+    TextStreamEvent,
+    StreamCallback,
     ImagePromptGenerationRequest,
     ImagePromptGenerationResponse,
+    ImagePromptOptions,
     ImageGenerationRequest,
     ImageGenerationResponse,
     ImagePrompt,
@@ -32,9 +35,12 @@ __all__ = [
     # Text generation
     "TextGenerationRequest",
     "TextGenerationResponse",
+    "TextStreamEvent",
+    "StreamCallback",
     # Image prompt generation
     "ImagePromptGenerationRequest",
     "ImagePromptGenerationResponse",
+    "ImagePromptOptions",
     # Image generation
     "ImageGenerationRequest",
     "ImageGenerationResponse",
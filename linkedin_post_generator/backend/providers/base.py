@@ -10,8 +10,11 @@ Two-Phase Generation Architecture:
 - Phase 3: Actual image generation (ImageGenerationResponse)
 """
 
+import asyncio
+import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Optional
 from pydantic import BaseModel, Field
 
 from ..utils.constants import (
@@ -20,6 +23,17 @@ from ..utils.constants import (
     DEFAULT_TONE,
     DEFAULT_CTA_STYLE,
 )
+from ..utils.metrics import metrics
+from .image_cache import derive_seed, image_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Per-image progress hook: called with (image_id, status, error) as each prompt
+# starts ("running") and finishes ("done" | "failed" | "skipped").
+# Set by the image job worker; None for plain requests.
+ImageProgressCallback = Callable[[int, str, Optional[str]], None]
+image_progress: ContextVar[Optional[ImageProgressCallback]] = ContextVar("image_progress", default=None)
 
 
 class TextGenerationRequest(BaseModel):
@@ -54,6 +68,10 @@ class ImagePrompt(BaseModel):
         default=None,
         description="Negative prompt for image generation (SDXL-specific)"
     )
+    seed: Optional[int] = Field(
+        default=None,
+        description="Generation seed (set in deterministic mode; None = random)"
+    )
 
 
 class ImageFingerprint(BaseModel):
@@ -140,6 +158,24 @@ class TextGenerationResponse(BaseModel):
     raw_response: Optional[str] = None
 
 
+class TextStreamEvent(BaseModel):
+    """
+    Single event from a streaming text generation.
+
+    - token: a chunk of model output as it arrives (text)
+    - step: a pipeline step started (step, text = step name)
+    - result: the final parsed response (response)
+    """
+    event: str
+    text: Optional[str] = None
+    step: Optional[int] = None
+    response: Optional[TextGenerationResponse] = None
+
+
+# Async callback providers use to push stream events while generating
+StreamCallback = Callable[[TextStreamEvent], Awaitable[None]]
+
+
 class ImagePromptGenerationRequest(BaseModel):
     """Standardized input for image prompt generation (Phase 2)."""
     post_text: str = Field(
@@ -167,6 +203,13 @@ class ImagePromptGenerationResponse(BaseModel):
     raw_response: Optional[str] = None
 
 
+class ImagePromptOptions(BaseModel):
+    """Image prompt generation settings for the combined text + image prompts flow."""
+    image_count: int = Field(1, ge=1, le=7)
+    system_prompt: str
+    max_tokens: int = 2000
+
+
 class ImageGenerationRequest(BaseModel):
     """Standardized input for image generation."""
     prompts: list[ImagePrompt]
@@ -174,16 +217,19 @@ class ImageGenerationRequest(BaseModel):
     post_text: str  # Context for image generation
     width: Optional[int] = None  # Optional width override (e.g., 512 for carousel)
     height: Optional[int] = None  # Optional height override (e.g., 512 for carousel)
+    deterministic: bool = False  # Fixed seed per prompt + on-disk image cache
 
 
 class GeneratedImage(BaseModel):
     """Single generated image."""
     id: int
-    base64_data: str
+    data: bytes  # Raw PNG bytes (base64-encoded only at the API boundary)
     prompt_used: str
     format: str = "png"
     width: int = 1024
     height: int = 1024
+    seed: Optional[int] = None  # Seed used (deterministic mode only)
+    cached: bool = False  # Served from the image cache (no model call)
 
 
 class ImageGenerationResponse(BaseModel):
@@ -193,6 +239,19 @@ class ImageGenerationResponse(BaseModel):
     generation_time_ms: Optional[int] = None
 
 
+def merge_image_prompts(
+    text_result: TextGenerationResponse,
+    image_result: ImagePromptGenerationResponse,
+) -> TextGenerationResponse:
+    """Replace a text result's packaged image prompts with grounded ones."""
+    tokens = [t for t in (text_result.tokens_used, image_result.tokens_used) if t]
+    return text_result.model_copy(update={
+        "image_prompts": image_result.image_prompts,
+        "image_fingerprint": image_result.image_fingerprint,
+        "tokens_used": sum(tokens) if tokens else None,
+    })
+
+
 class TextModelProvider(ABC):
     """
     Abstract base class for text generation providers.
@@ -208,6 +267,9 @@ class TextModelProvider(ABC):
     - generate_image_prompts(): Phase 2 - Image prompts grounded in text
     """
 
+    # Set True in providers whose generate() accepts an on_event callback
+    _supports_streaming: bool = False
+
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -245,6 +307,97 @@ class TextModelProvider(ABC):
         """
         pass
 
+    async def generate_with_image_prompts(
+        self,
+        request: TextGenerationRequest,
+        model: str,
+        system_prompt: str,
+        image_prompts: ImagePromptOptions,
+        max_tokens: int = 4000,
+        on_event: Optional[StreamCallback] = None,
+    ) -> TextGenerationResponse:
+        """
+        Generate post text and image prompts grounded in it (Phase 1 + 2).
+
+        The default runs the two phases back to back; providers with a
+        multi-step pipeline override this to overlap them. The returned
+        response carries the grounded image prompts and fingerprint.
+
+        Raises:
+            ProviderError: If text generation fails (an image prompt
+                failure keeps the text result's own image prompts)
+        """
+        if self._supports_streaming:
+            text_result = await self.generate(request, model, system_prompt, max_tokens, on_event=on_event)
+        else:
+            text_result = await self.generate(request, model, system_prompt, max_tokens)
+
+        try:
+            image_result = await self.generate_image_prompts(
+                request=ImagePromptGenerationRequest(
+                    post_text=text_result.post_text,
+                    image_count=image_prompts.image_count,
+                    tone=request.tone,
+                    audience=request.audience,
+                ),
+                model=model,
+                system_prompt=image_prompts.system_prompt,
+                max_tokens=image_prompts.max_tokens,
+            )
+        except ProviderError as e:
+            logger.warning(f"Image prompt generation failed, keeping text result prompts: {e}")
+            return text_result
+
+        return merge_image_prompts(text_result, image_result)
+
+    async def generate_stream(
+        self,
+        request: TextGenerationRequest,
+        model: str,
+        system_prompt: str,
+        max_tokens: int = 4000,
+        image_prompts: Optional[ImagePromptOptions] = None,
+    ) -> AsyncIterator[TextStreamEvent]:
+        """
+        Generate LinkedIn post text, yielding events as output arrives.
+
+        Providers whose generate() accepts an on_event callback stream
+        tokens; others only yield the terminal "result" event. With
+        image_prompts, the result also carries grounded image prompts
+        (see generate_with_image_prompts).
+
+        Raises:
+            ProviderError: If generation fails
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def on_event(event: TextStreamEvent) -> None:
+            await queue.put(event)
+
+        if image_prompts is not None:
+            run = self.generate_with_image_prompts(
+                request, model, system_prompt, image_prompts, max_tokens, on_event=on_event
+            )
+        elif self._supports_streaming:
+            run = self.generate(request, model, system_prompt, max_tokens, on_event=on_event)
+        else:
+            run = self.generate(request, model, system_prompt, max_tokens)
+
+        task = asyncio.ensure_future(run)
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+
+            yield TextStreamEvent(event="result", response=task.result())
+        finally:
+            if not task.done():
+                task.cancel()
+
     @abstractmethod
     async def generate_image_prompts(
         self,
@@ -325,6 +478,98 @@ class ImageModelProvider(ABC):
         """Check if the specified model is available."""
         pass
 
+    async def _generate_concurrently(
+        self,
+        prompts: list[ImagePrompt],
+        generate_one: Callable[[ImagePrompt], Awaitable[tuple[Optional[GeneratedImage], Optional[str]]]],
+        max_concurrency: int,
+    ) -> tuple[list[GeneratedImage], list[str]]:
+        """
+        Fan out single-image generation with a bounded number of in-flight calls.
+
+        Args:
+            prompts: Prompts to render
+            generate_one: Coroutine returning (image, error) for one prompt;
+                (None, None) means the prompt was skipped
+            max_concurrency: Max prompts generated at the same time
+
+        Returns:
+            (images, errors) - images keep the order of prompts
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        report = image_progress.get()
+
+        async def _bounded(prompt_data: ImagePrompt):
+            async with semaphore:
+                # Calls past the semaphore: linkedin_image_generations_in_flight on /metrics
+                with metrics.in_flight("image_generations", provider=self.provider_name):
+                    if report is None:
+                        return await generate_one(prompt_data)
+
+                    report(prompt_data.id, "running", None)
+                    image, error = await generate_one(prompt_data)
+                    if image is not None:
+                        report(prompt_data.id, "done", None)
+                    else:
+                        report(prompt_data.id, "failed" if error else "skipped", error)
+                    return image, error
+
+        results = await asyncio.gather(*(_bounded(p) for p in prompts))
+
+        images = [image for image, _ in results if image is not None]
+        errors = [error for _, error in results if error]
+        return images, errors
+
+    def _resolve_seed(self, prompt_data: ImagePrompt, request: ImageGenerationRequest) -> Optional[int]:
+        """
+        Seed for a prompt in deterministic mode, or None for a random seed.
+
+        The seed is recorded on the prompt so callers can store and resend it.
+        """
+        if not request.deterministic:
+            return None
+        if prompt_data.seed is None:
+            prompt_data.seed = derive_seed(prompt_data.prompt)
+        return prompt_data.seed
+
+    async def _load_cached_image(
+        self,
+        cache_key: str,
+        prompt_data: ImagePrompt,
+        prompt_used: str,
+        width: int,
+        height: int,
+        seed: int,
+    ) -> Optional[GeneratedImage]:
+        """Return the cached image for cache_key, or None on a miss."""
+        try:
+            data = await image_cache.aget(cache_key)
+        except Exception as e:
+            logger.warning(f"Image cache read failed for image {prompt_data.id}: {e}")
+            return None
+
+        if data is None:
+            return None
+
+        logger.info(f"Image cache hit for image {prompt_data.id} (seed={seed})")
+        return GeneratedImage(
+            id=prompt_data.id,
+            data=data,
+            prompt_used=prompt_used,
+            format="png",
+            width=width,
+            height=height,
+            seed=seed,
+            cached=True,
+        )
+
+    async def _store_cached_image(self, cache_key: str, image: GeneratedImage):
+        """Store a freshly generated image (cache failures never fail generation)."""
+        try:
+            await image_cache.aput(cache_key, image.data)
+        except Exception as e:
+            logger.warning(f"Image cache write failed for image {image.id}: {e}")
+
 
 class ProviderError(Exception):
     """Base exception for provider-related errors."""
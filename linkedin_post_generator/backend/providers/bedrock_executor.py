@@ -0,0 +1,65 @@
+"""
+Bedrock Executor
+=================
+Runs blocking boto3 Bedrock calls off the event loop.
+
+boto3 clients are synchronous, so calling converse()/invoke_model()
+directly inside an async handler freezes the whole uvicorn loop for the
+duration of the model call. All Bedrock providers dispatch through one
+bounded thread pool instead, so concurrent requests overlap.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
+
+
+def get_bedrock_executor() -> ThreadPoolExecutor:
+    """Get (or lazily create) the shared Bedrock thread pool."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.bedrock_max_workers,
+                    thread_name_prefix="bedrock",
+                )
+                logger.info(f"Bedrock executor started ({settings.bedrock_max_workers} workers)")
+    return _executor
+
+
+async def run_bedrock_call(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking Bedrock call in the shared thread pool.
+
+    Args:
+        func: Blocking callable (e.g. client.converse)
+        *args, **kwargs: Passed through to func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_bedrock_executor(),
+        functools.partial(func, *args, **kwargs),
+    )
+
+
+def shutdown_bedrock_executor(wait: bool = True) -> None:
+    """Shut down the shared thread pool (called from app lifespan)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+            _executor = None
@@ -13,6 +13,7 @@ Single-Phase Generation:
 - generate() returns Text + Hashtags + Image Strategy + Image Prompts (all in one call)
 """
 
+import asyncio
 import json
 import time
 from typing import Optional
@@ -21,10 +22,13 @@ import boto3
 from botocore.config import Config
 
 from ..config import settings
+from .bedrock_executor import run_bedrock_call
 from .base import (
     TextModelProvider,
     TextGenerationRequest,
     TextGenerationResponse,
+    TextStreamEvent,
+    StreamCallback,
     ImagePromptGenerationRequest,
     ImagePromptGenerationResponse,
     ImagePrompt,
@@ -47,17 +51,28 @@ class BedrockTextProvider(TextModelProvider):
         "claude-haiku-4.5": "us.anthropic.claude-haiku-4-5-20251001-v1:0",  # Fast, cheap
     }
 
-    def __init__(self, region: Optional[str] = None):
-        """Initialize Bedrock client."""
+    _supports_streaming = True  # Tokens stream via generate(on_event=...) / converse_stream
+
+    def __init__(self, region: Optional[str] = None, client=None):
+        """
+        Initialize Bedrock client.
+
+        Args:
+            region: AWS region (default: settings.aws_region)
+            client: Shared bedrock-runtime client from the provider registry (optional)
+        """
         self.region = region or settings.aws_region
 
-        # Configure with retry logic
-        config = Config(
-            region_name=self.region,
-            retries={"max_attempts": 3, "mode": "adaptive"},
-        )
+        if client is None:
+            # Configure with retry logic
+            config = Config(
+                region_name=self.region,
+                retries={"max_attempts": 3, "mode": "adaptive"},
+            )
 
-        self.client = boto3.client("bedrock-runtime", config=config)
+            client = boto3.client("bedrock-runtime", config=config)
+
+        self.client = client
 
     @property
     def provider_name(self) -> str:
@@ -87,12 +102,16 @@ class BedrockTextProvider(TextModelProvider):
         model: str,
         system_prompt: str,
         max_tokens: int = 4000,
+        on_event: Optional[StreamCallback] = None,
     ) -> TextGenerationResponse:
         """
         Generate LinkedIn post text (Phase 1).
 
         Returns text + hashtags + image strategy.
         Does NOT generate image prompts.
+
+        If on_event is given, uses converse_stream and pushes output
+        chunks as "token" events as they arrive.
         """
         if not await self.validate_model(model):
             raise ProviderError(
@@ -104,37 +123,42 @@ class BedrockTextProvider(TextModelProvider):
         model_id = self._get_model_id(model)
         user_message = self._build_text_user_message(request)
 
+        converse_kwargs = dict(
+            modelId=model_id,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [{"text": user_message}],
+                }
+            ],
+            system=[{"text": system_prompt}],
+            inferenceConfig={
+                "maxTokens": max_tokens,
+                "temperature": 0.7,
+            },
+        )
+
         try:
             start_time = time.time()
 
-            # Use Converse API
-            response = self.client.converse(
-                modelId=model_id,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [{"text": user_message}],
-                    }
-                ],
-                system=[{"text": system_prompt}],
-                inferenceConfig={
-                    "maxTokens": max_tokens,
-                    "temperature": 0.7,
-                },
-            )
+            if on_event is not None:
+                raw_content, tokens_used = await self._converse_stream(converse_kwargs, on_event)
+            else:
+                # Use Converse API (runs in the Bedrock thread pool, off the event loop)
+                response = await run_bedrock_call(self.client.converse, **converse_kwargs)
+
+                # Extract response content
+                raw_content = ""
+                for block in response.get("output", {}).get("message", {}).get("content", []):
+                    if "text" in block:
+                        raw_content = block["text"]
+                        break
 
-            elapsed_ms = int((time.time() - start_time) * 1000)
+                # Get token usage
+                usage = response.get("usage", {})
+                tokens_used = usage.get("inputTokens", 0) + usage.get("outputTokens", 0)
 
-            # Extract response content
-            raw_content = ""
-            for block in response.get("output", {}).get("message", {}).get("content", []):
-                if "text" in block:
-                    raw_content = block["text"]
-                    break
-
-            # Get token usage
-            usage = response.get("usage", {})
-            tokens_used = usage.get("inputTokens", 0) + usage.get("outputTokens", 0)
+            elapsed_ms = int((time.time() - start_time) * 1000)
 
             return self._parse_text_response(
                 raw_content=raw_content,
@@ -157,6 +181,53 @@ class BedrockTextProvider(TextModelProvider):
                 original_error=e,
             )
 
+    async def _converse_stream(
+        self,
+        converse_kwargs: dict,
+        on_event: StreamCallback,
+    ) -> tuple[str, int]:
+        """
+        Call converse_stream and forward text deltas as "token" events.
+
+        boto3's event stream is a blocking iterator, so it is consumed in
+        the Bedrock thread pool and handed back to the loop chunk by chunk.
+
+        Returns (full_text, tokens_used).
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        usage: dict = {}
+
+        def _consume() -> None:
+            response = self.client.converse_stream(**converse_kwargs)
+            for event in response.get("stream", []):
+                if "contentBlockDelta" in event:
+                    text = event["contentBlockDelta"].get("delta", {}).get("text")
+                    if text:
+                        loop.call_soon_threadsafe(queue.put_nowait, text)
+                elif "metadata" in event:
+                    usage.update(event["metadata"].get("usage", {}))
+
+        consumer = asyncio.ensure_future(run_bedrock_call(_consume))
+        consumer.add_done_callback(lambda _: queue.put_nowait(None))
+
+        chunks = []
+        try:
+            while True:
+                text = await queue.get()
+                if text is None:
+                    break
+                chunks.append(text)
+                await on_event(TextStreamEvent(event="token", text=text))
+        finally:
+            if not consumer.done():
+                consumer.cancel()
+
+        await consumer  # Re-raise any Bedrock error from the worker thread
+
+        tokens_used = usage.get("inputTokens", 0) + usage.get("outputTokens", 0)
+        return "".join(chunks), tokens_used
+
     async def generate_image_prompts(
         self,
         request: ImagePromptGenerationRequest,
@@ -182,7 +253,8 @@ class BedrockTextProvider(TextModelProvider):
         try:
             start_time = time.time()
 
-            response = self.client.converse(
+            response = await run_bedrock_call(
+                self.client.converse,
                 modelId=model_id,
                 messages=[
                     {
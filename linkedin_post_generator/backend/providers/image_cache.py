@@ -0,0 +1,169 @@
+"""
+Image Cache
+============
+Content-addressed on-disk cache for generated images.
+
+Only used in deterministic mode: every prompt gets a fixed seed, so the
+same provider/model/prompt/negative prompt/size/seed/steps/cfg always
+produces the same image and a repeated /generate-images call can skip
+the model entirely. PNGs are stored as <key>.png under
+settings.image_cache_dir; the directory is capped at
+settings.image_cache_max_mb with least-recently-used eviction
+(file mtime is bumped on every hit).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock, get_ident
+from typing import Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Largest seed accepted by every provider (Nova Canvas: 0-858993459)
+MAX_SEED = 858993459
+
+
+def derive_seed(prompt: str) -> int:
+    """Stable seed for a prompt, so a reload without the recorded seed still hits the cache."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % (MAX_SEED + 1)
+
+
+def make_image_key(
+    provider: str,
+    model: str,
+    prompt: str,
+    negative_prompt: Optional[str],
+    width: int,
+    height: int,
+    seed: int,
+    steps: Optional[int] = None,
+    cfg_scale: Optional[float] = None,
+) -> str:
+    """Build the content-addressed key for one image generation call."""
+    payload = {
+        "provider": provider,
+        "model": model,
+        "prompt": prompt,
+        "negative_prompt": negative_prompt,
+        "width": width,
+        "height": height,
+        "seed": seed,
+        "steps": steps,
+        "cfg_scale": cfg_scale,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    """Size-capped LRU directory of PNG files keyed by make_image_key()."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._total_bytes: Optional[int] = None  # Computed on first use
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def _scan_size(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+        return sum(p.stat().st_size for p in self.cache_dir.glob("*.png"))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read a cached image, or None on a miss."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+        except FileNotFoundError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self._stats["hits"] += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store an image (atomic write), then evict LRU files over the size cap."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{get_ident()}.tmp")
+
+        tmp_path.write_bytes(data)
+        try:
+            old_size = path.stat().st_size  # Overwriting an entry replaces its bytes
+        except FileNotFoundError:
+            old_size = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            self._stats["stores"] += 1
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until under the cap (lock held)."""
+        files = []
+        for p in self.cache_dir.glob("*.png"):
+            try:
+                st = p.stat()
+                files.append((st.st_mtime, st.st_size, p))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+                total -= size
+                self._stats["evictions"] += 1
+            except FileNotFoundError:
+                continue
+
+        self._total_bytes = total
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """get() off the event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, data: bytes):
+        """put() off the event loop."""
+        await asyncio.to_thread(self.put, key, data)
+
+    def get_stats(self) -> dict:
+        """Get hit/miss counters and disk usage."""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            stats = dict(self._stats)
+            stats["total_bytes"] = self._total_bytes
+        stats["max_bytes"] = self.max_bytes
+        stats["enabled"] = settings.image_cache_enabled
+        return stats
+
+
+# Global instance
+image_cache = ImageCache(
+    cache_dir=Path(settings.image_cache_dir),
+    max_bytes=settings.image_cache_max_mb * 1024 * 1024,
+)
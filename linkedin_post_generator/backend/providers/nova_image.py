@@ -16,7 +16,6 @@ Optimized for:
 - Minimal, abstract, symbolic visuals
 """
 
-import base64
 import json
 import time
 import logging
@@ -27,6 +26,9 @@ from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from ..config import settings
+from ..utils.image_data import decode_base64
+from .bedrock_executor import run_bedrock_call
+from .image_cache import make_image_key
 from .base import (
     ImageModelProvider,
     ImageGenerationRequest,
@@ -66,16 +68,25 @@ class NovaCanvasProvider(ImageModelProvider):
         "nova-canvas": "amazon.nova-canvas-v1:0",
     }
 
-    def __init__(self, region: Optional[str] = None):
-        """Initialize Bedrock client for Nova Canvas."""
+    def __init__(self, region: Optional[str] = None, client=None):
+        """
+        Initialize Bedrock client for Nova Canvas.
+
+        Args:
+            region: AWS region (default: settings.aws_region)
+            client: Shared bedrock-runtime client from the provider registry (optional)
+        """
         self.region = region or settings.aws_region
 
-        config = Config(
-            region_name=self.region,
-            retries={"max_attempts": 3, "mode": "adaptive"},
-        )
+        if client is None:
+            config = Config(
+                region_name=self.region,
+                retries={"max_attempts": 3, "mode": "adaptive"},
+            )
 
-        self.client = boto3.client("bedrock-runtime", config=config)
+            client = boto3.client("bedrock-runtime", config=config)
+
+        self.client = client
 
     @property
     def provider_name(self) -> str:
@@ -116,83 +127,17 @@ class NovaCanvasProvider(ImageModelProvider):
 
         model_id = self._get_model_id(model)
         start_time = time.time()
-        images = []
-        errors = []
-
-        logger.info(f"Generating {len(request.prompts)} infographic images with Nova Canvas")
-
-        for prompt_data in request.prompts:
-            try:
-                # Get prompt - could be 'prompt' or 'description' attribute
-                prompt_text = getattr(prompt_data, 'prompt', '') or getattr(prompt_data, 'description', '')
-                style_notes = getattr(prompt_data, 'style_notes', '')
-                concept = getattr(prompt_data, 'concept', '')
-
-                if not prompt_text:
-                    logger.warning(f"Empty prompt for image {prompt_data.id}")
-                    continue
-
-                enhanced_prompt = self._build_infographic_prompt(
-                    prompt_text,
-                    style_notes,
-                    request.fingerprint,
-                )
 
-                logger.info(f"Nova image {prompt_data.id}: {enhanced_prompt[:300]}...")
-
-                # Use requested dimensions if provided (e.g., 512x512 for carousel), otherwise default to 1024x1024
-                img_width = request.width if request.width else 1024
-                img_height = request.height if request.height else 1024
-
-                body = json.dumps({
-                    "taskType": "TEXT_IMAGE",
-                    "textToImageParams": {
-                        "text": enhanced_prompt[:1024],
-                        "negativeText": NOVA_NEGATIVE_PROMPT,
-                    },
-                    "imageGenerationConfig": {
-                        "numberOfImages": 1,
-                        "height": img_height,
-                        "width": img_width,
-                        "quality": "premium",
-                    },
-                })
-
-                response = self.client.invoke_model(
-                    body=body,
-                    modelId=model_id,
-                    accept="application/json",
-                    contentType="application/json",
-                )
+        logger.info(
+            f"Generating {len(request.prompts)} infographic images with Nova Canvas "
+            f"(concurrency={settings.nova_max_concurrency})"
+        )
 
-                response_body = json.loads(response.get("body").read())
-
-                if "images" in response_body and len(response_body["images"]) > 0:
-                    image_data = response_body["images"][0]
-                    images.append(GeneratedImage(
-                        id=prompt_data.id,
-                        base64_data=image_data,
-                        prompt_used=enhanced_prompt,
-                        format="png",
-                        width=img_width,
-                        height=img_height,
-                    ))
-                    logger.info(f"Successfully generated infographic {prompt_data.id}")
-                else:
-                    error_msg = f"No images in response for prompt {prompt_data.id}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-
-            except ClientError as e:
-                error_msg = f"AWS error for image {prompt_data.id}: {e.response['Error']['Message']}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-                continue
-            except Exception as e:
-                error_msg = f"Failed to generate image {prompt_data.id}: {str(e)}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-                continue
+        images, errors = await self._generate_concurrently(
+            request.prompts,
+            lambda prompt_data: self._generate_one(prompt_data, request, model_id),
+            max_concurrency=settings.nova_max_concurrency,
+        )
 
         if not images:
             error_detail = "; ".join(errors) if errors else "Unknown error"
@@ -210,6 +155,114 @@ class NovaCanvasProvider(ImageModelProvider):
             generation_time_ms=elapsed_ms,
         )
 
+    async def _generate_one(
+        self,
+        prompt_data,
+        request: ImageGenerationRequest,
+        model_id: str,
+    ) -> tuple[Optional[GeneratedImage], Optional[str]]:
+        """Generate a single image. Returns (image, None), (None, error) or (None, None) if skipped."""
+        try:
+            # Get prompt - could be 'prompt' or 'description' attribute
+            prompt_text = getattr(prompt_data, 'prompt', '') or getattr(prompt_data, 'description', '')
+            style_notes = getattr(prompt_data, 'style_notes', '')
+            concept = getattr(prompt_data, 'concept', '')
+
+            if not prompt_text:
+                logger.warning(f"Empty prompt for image {prompt_data.id}")
+                return None, None
+
+            enhanced_prompt = self._build_infographic_prompt(
+                prompt_text,
+                style_notes,
+                request.fingerprint,
+            )
+
+            logger.info(f"Nova image {prompt_data.id}: {enhanced_prompt[:300]}...")
+
+            # Use requested dimensions if provided (e.g., 512x512 for carousel), otherwise default to 1024x1024
+            img_width = request.width if request.width else 1024
+            img_height = request.height if request.height else 1024
+
+            # Deterministic mode: fixed seed, and identical calls are served from the image cache
+            seed = self._resolve_seed(prompt_data, request)
+            cache_key = None
+            if seed is not None:
+                cache_key = make_image_key(
+                    provider="nova",
+                    model=model_id,
+                    prompt=enhanced_prompt[:1024],
+                    negative_prompt=NOVA_NEGATIVE_PROMPT,
+                    width=img_width,
+                    height=img_height,
+                    seed=seed,
+                )
+                cached_image = await self._load_cached_image(
+                    cache_key, prompt_data, enhanced_prompt, img_width, img_height, seed
+                )
+                if cached_image:
+                    return cached_image, None
+
+            generation_config = {
+                "numberOfImages": 1,
+                "height": img_height,
+                "width": img_width,
+                "quality": "premium",
+            }
+            if seed is not None:
+                generation_config["seed"] = seed
+
+            body = json.dumps({
+                "taskType": "TEXT_IMAGE",
+                "textToImageParams": {
+                    "text": enhanced_prompt[:1024],
+                    "negativeText": NOVA_NEGATIVE_PROMPT,
+                },
+                "imageGenerationConfig": generation_config,
+            })
+
+            # Blocking boto3 call runs in the Bedrock thread pool
+            response_body = await run_bedrock_call(self._invoke_model, body, model_id)
+
+            if "images" in response_body and len(response_body["images"]) > 0:
+                image_data = response_body["images"][0]
+                logger.info(f"Successfully generated infographic {prompt_data.id}")
+                image = GeneratedImage(
+                    id=prompt_data.id,
+                    data=decode_base64(image_data),
+                    prompt_used=enhanced_prompt,
+                    format="png",
+                    width=img_width,
+                    height=img_height,
+                    seed=seed,
+                )
+                if cache_key:
+                    await self._store_cached_image(cache_key, image)
+                return image, None
+
+            error_msg = f"No images in response for prompt {prompt_data.id}"
+            logger.error(error_msg)
+            return None, error_msg
+
+        except ClientError as e:
+            error_msg = f"AWS error for image {prompt_data.id}: {e.response['Error']['Message']}"
+            logger.error(error_msg)
+            return None, error_msg
+        except Exception as e:
+            error_msg = f"Failed to generate image {prompt_data.id}: {str(e)}"
+            logger.error(error_msg)
+            return None, error_msg
+
+    def _invoke_model(self, body: str, model_id: str) -> dict:
+        """Invoke Nova Canvas and read the JSON response body (blocking)."""
+        response = self.client.invoke_model(
+            body=body,
+            modelId=model_id,
+            accept="application/json",
+            contentType="application/json",
+        )
+        return json.loads(response.get("body").read())
+
     def _build_infographic_prompt(
         self,
         base_prompt: str,
@@ -16,11 +16,12 @@ Supported Models:
 Uses Ollama's direct HTTP API at http://localhost:11434
 """
 
+import asyncio
 import json
 import logging
 import re
 import time
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 import httpx
 
@@ -37,18 +38,23 @@ from ..prompts.pipeline_prompts import (
     validate_step3_output,
     PipelineConfig,
 )
+from ..utils.metrics import metrics
 # NOTE: prompt_logger is imported lazily in __init__ to avoid circular import
 from .base import (
     TextModelProvider,
     TextGenerationRequest,
     TextGenerationResponse,
+    TextStreamEvent,
+    StreamCallback,
     ImagePromptGenerationRequest,
     ImagePromptGenerationResponse,
+    ImagePromptOptions,
     ImagePrompt,
     ImageFingerprint,
     InfographicTextStructure,
     InfographicSection,
     ProviderError,
+    merge_image_prompts,
 )
 
 
@@ -74,15 +80,26 @@ class OllamaTextProvider(TextModelProvider):
         "llama3:8b": "llama3:8b",     # Creative content
     }
 
-    def __init__(self, base_url: Optional[str] = None):
-        """Initialize Ollama client with pipeline configuration."""
+    _supports_streaming = True  # Step 1 tokens stream via generate(on_event=...)
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Initialize Ollama client with pipeline configuration.
+
+        Args:
+            base_url: Ollama URL (default: settings.ollama_base_url)
+            client: Shared pooled client from the provider registry (optional)
+        """
         self.base_url = base_url or getattr(settings, 'ollama_base_url', 'http://localhost:11434')
-        self.client = httpx.AsyncClient(
+        self.client = client or httpx.AsyncClient(
             base_url=self.base_url,
             timeout=180.0,  # Pipeline takes longer (3 steps)
         )
         self.config = PipelineConfig()
-        self._current_session_id: Optional[str] = None  # Set during generate()
 
         # Lazy import to avoid circular dependency
         # (providers → services → api → providers)
@@ -116,29 +133,34 @@ class OllamaTextProvider(TextModelProvider):
         user_prompt: str,
         temperature: float,
         max_tokens: int,
+        on_event: Optional[StreamCallback] = None,
     ) -> tuple[str, int]:
         """
         Make a single call to Ollama API.
 
+        If on_event is given, the call uses Ollama's streaming mode and
+        pushes each chunk as a "token" event as it arrives.
+
         Returns (raw_response_text, tokens_used).
         """
         full_prompt = f"{system_prompt}\n\n{user_prompt}"
-
-        response = await self.client.post(
-            "/api/generate",
-            json={
-                "model": model,
-                "prompt": full_prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "top_p": self.config.STEP1_TOP_P,
-                    "num_predict": max_tokens,
-                    "repeat_penalty": self.config.REPEAT_PENALTY,
-                    "num_ctx": self.config.NUM_CTX,
-                },
+        payload = {
+            "model": model,
+            "prompt": full_prompt,
+            "stream": on_event is not None,
+            "options": {
+                "temperature": temperature,
+                "top_p": self.config.STEP1_TOP_P,
+                "num_predict": max_tokens,
+                "repeat_penalty": self.config.REPEAT_PENALTY,
+                "num_ctx": self.config.NUM_CTX,
             },
-        )
+        }
+
+        if on_event is not None:
+            return await self._stream_ollama(payload, on_event)
+
+        response = await self.client.post("/api/generate", json=payload)
 
         response.raise_for_status()
         data = response.json()
@@ -146,14 +168,43 @@ class OllamaTextProvider(TextModelProvider):
         tokens_used = data.get("eval_count", 0) + data.get("prompt_eval_count", 0)
         return data.get("response", ""), tokens_used
 
+    async def _stream_ollama(
+        self,
+        payload: dict,
+        on_event: StreamCallback,
+    ) -> tuple[str, int]:
+        """Stream /api/generate (NDJSON, one chunk per line) and collect the full output."""
+        chunks = []
+        tokens_used = 0
+
+        async with self.client.stream("POST", "/api/generate", json=payload) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+
+                chunk = data.get("response", "")
+                if chunk:
+                    chunks.append(chunk)
+                    await on_event(TextStreamEvent(event="token", text=chunk))
+
+                if data.get("done"):
+                    tokens_used = data.get("eval_count", 0) + data.get("prompt_eval_count", 0)
+
+        return "".join(chunks), tokens_used
+
     # =========================================================================
     # 3-STEP PIPELINE
     # =========================================================================
 
+    @metrics.timed("ollama.step1")
     async def _run_step1(
         self,
         request: TextGenerationRequest,
         model: str,
+        on_event: Optional[StreamCallback] = None,
     ) -> tuple[str, int]:
         """
         STEP 1: Content Generation
@@ -165,6 +216,9 @@ class OllamaTextProvider(TextModelProvider):
         - IGNORES formatting, emojis, JSON, hashtags
 
         Temperature: 0.6 | Max tokens: 900 | Retries: 1
+
+        If on_event is given, content tokens are streamed as they arrive
+        (a retry re-emits a "step" event so clients can reset the preview).
         """
         system_prompt = get_step1_system_prompt()
         user_prompt = get_step1_user_prompt(
@@ -180,6 +234,8 @@ class OllamaTextProvider(TextModelProvider):
         last_error = None
 
         for attempt in range(self.config.STEP1_RETRIES + 1):
+            if on_event is not None and attempt > 0:
+                await on_event(TextStreamEvent(event="step", step=1, text="Content Generation (retry)"))
             try:
                 output, tokens = await self._call_ollama(
                     model=model,
@@ -187,6 +243,7 @@ class OllamaTextProvider(TextModelProvider):
                     user_prompt=user_prompt,
                     temperature=self.config.STEP1_TEMPERATURE,
                     max_tokens=self.config.STEP1_MAX_TOKENS,
+                    on_event=on_event,
                 )
                 total_tokens += tokens
 
@@ -200,9 +257,9 @@ class OllamaTextProvider(TextModelProvider):
                     logger.info(f"[PIPELINE] Step 1 complete ({tokens} tokens)")
 
                     # Log the pipeline step with ACTUAL prompts
-                    if self._current_session_id:
+                    if request.session_id:
                         self.prompt_logger.log_pipeline_step(
-                            session_id=self._current_session_id,
+                            session_id=request.session_id,
                             provider="ollama",
                             model=model,
                             step_number=1,
@@ -222,9 +279,9 @@ class OllamaTextProvider(TextModelProvider):
                 logger.warning(f"[PIPELINE] Step 1 attempt {attempt + 1} error: {last_error}")
 
         # Log error
-        if self._current_session_id:
+        if request.session_id:
             self.prompt_logger.log_pipeline_step(
-                session_id=self._current_session_id,
+                session_id=request.session_id,
                 provider="ollama",
                 model=model,
                 step_number=1,
@@ -240,10 +297,12 @@ class OllamaTextProvider(TextModelProvider):
             model=model,
         )
 
+    @metrics.timed("ollama.step2")
     async def _run_step2(
         self,
         step1_output: str,
         model: str,
+        session_id: Optional[str] = None,
     ) -> tuple[str, int]:
         """
         STEP 2: Style + Constraint Normalization
@@ -284,9 +343,9 @@ class OllamaTextProvider(TextModelProvider):
                     logger.info(f"[PIPELINE] Step 2 complete ({tokens} tokens)")
 
                     # Log the pipeline step with ACTUAL prompts
-                    if self._current_session_id:
+                    if session_id:
                         self.prompt_logger.log_pipeline_step(
-                            session_id=self._current_session_id,
+                            session_id=session_id,
                             provider="ollama",
                             model=model,
                             step_number=2,
@@ -306,9 +365,9 @@ class OllamaTextProvider(TextModelProvider):
                 logger.warning(f"[PIPELINE] Step 2 attempt {attempt + 1} error: {last_error}")
 
         # Log error
-        if self._current_session_id:
+        if session_id:
             self.prompt_logger.log_pipeline_step(
-                session_id=self._current_session_id,
+                session_id=session_id,
                 provider="ollama",
                 model=model,
                 step_number=2,
@@ -324,11 +383,13 @@ class OllamaTextProvider(TextModelProvider):
             model=model,
         )
 
+    @metrics.timed("ollama.step3")
     async def _run_step3(
         self,
         step2_output: str,
         model: str,
         author_hashtags: list[str] = None,
+        session_id: Optional[str] = None,
     ) -> tuple[dict, int]:
         """
         STEP 3: Packaging + Metadata (Mechanical Output)
@@ -376,9 +437,9 @@ class OllamaTextProvider(TextModelProvider):
                 logger.info(f"[PIPELINE] Step 3 complete ({tokens} tokens)")
 
                 # Log the pipeline step with ACTUAL prompts
-                if self._current_session_id:
+                if session_id:
                     self.prompt_logger.log_pipeline_step(
-                        session_id=self._current_session_id,
+                        session_id=session_id,
                         provider="ollama",
                         model=model,
                         step_number=3,
@@ -399,9 +460,9 @@ class OllamaTextProvider(TextModelProvider):
                 logger.warning(f"[PIPELINE] Step 3 attempt {attempt + 1} error: {last_error}")
 
         # Log error
-        if self._current_session_id:
+        if session_id:
             self.prompt_logger.log_pipeline_step(
-                session_id=self._current_session_id,
+                session_id=session_id,
                 provider="ollama",
                 model=model,
                 step_number=3,
@@ -418,6 +479,7 @@ class OllamaTextProvider(TextModelProvider):
             model=model,
         )
 
+    @metrics.timed("json_repair")
     def _parse_step3_json(self, raw_output: str) -> dict:
         """Parse and clean JSON from Step 3 output."""
         content = raw_output.strip()
@@ -674,6 +736,7 @@ class OllamaTextProvider(TextModelProvider):
         model: str,
         system_prompt: str,  # Ignored - pipeline uses its own prompts
         max_tokens: int = 4000,  # Ignored - pipeline uses step-specific tokens
+        on_event: Optional[StreamCallback] = None,
     ) -> TextGenerationResponse:
         """
         Generate LinkedIn post using 3-step pipeline.
@@ -685,6 +748,60 @@ class OllamaTextProvider(TextModelProvider):
         1. Content Generation (creative, temp=0.6)
         2. Style Normalization (editing, temp=0.2)
         3. JSON Packaging (mechanical, temp=0.1)
+
+        If on_event is given, "step" events mark each step and Step 1
+        content tokens are streamed as they arrive.
+        """
+        return await self._run_pipeline(request, model, on_event=on_event)
+
+    async def generate_with_image_prompts(
+        self,
+        request: TextGenerationRequest,
+        model: str,
+        system_prompt: str,  # Ignored - pipeline uses its own prompts
+        image_prompts: ImagePromptOptions,
+        max_tokens: int = 4000,  # Ignored - pipeline uses step-specific tokens
+        on_event: Optional[StreamCallback] = None,
+    ) -> TextGenerationResponse:
+        """
+        Generate the post and grounded image prompts with overlapping steps.
+
+        Image prompt generation only needs the finished prose, so it starts
+        on the Step 2 output and runs concurrently with Step 3 JSON
+        packaging (which only adds emojis/paragraph breaks), saving a full
+        round trip versus calling /generate-image-prompts afterwards.
+        Ollama must allow parallel requests (OLLAMA_NUM_PARALLEL > 1) for
+        the two calls to actually overlap.
+        """
+        async def image_prompt_step(step2_output: str) -> ImagePromptGenerationResponse:
+            return await self.generate_image_prompts(
+                request=ImagePromptGenerationRequest(
+                    post_text=step2_output,
+                    image_count=image_prompts.image_count,
+                    tone=request.tone,
+                    audience=request.audience,
+                ),
+                model=model,
+                system_prompt=image_prompts.system_prompt,
+                max_tokens=image_prompts.max_tokens,
+            )
+
+        return await self._run_pipeline(
+            request, model, on_event=on_event, image_prompt_step=image_prompt_step
+        )
+
+    async def _run_pipeline(
+        self,
+        request: TextGenerationRequest,
+        model: str,
+        on_event: Optional[StreamCallback] = None,
+        image_prompt_step: Optional[Callable[[str], Awaitable[ImagePromptGenerationResponse]]] = None,
+    ) -> TextGenerationResponse:
+        """
+        Run the 3-step pipeline.
+
+        If image_prompt_step is given, it is started on the Step 2 output
+        alongside Step 3 and its prompts replace the packaged ones.
         """
         if not await self.validate_model(model):
             raise ProviderError(
@@ -705,32 +822,61 @@ class OllamaTextProvider(TextModelProvider):
         start_time = time.time()
         total_tokens = 0
 
-        # Set session_id for pipeline step logging
-        self._current_session_id = request.session_id
-        logger.info(f"[PIPELINE] Session ID for logging: {self._current_session_id}")
+        # Session ID is passed to each step for pipeline logging
+        # (no per-instance state - the provider instance is shared across requests)
+        session_id = request.session_id
+        logger.info(f"[PIPELINE] Session ID for logging: {session_id}")
 
         try:
             # STEP 1: Content Generation
             logger.info(f"[PIPELINE] Starting Step 1 (model={model_id})")
-            step1_output, tokens1 = await self._run_step1(request, model_id)
+            if on_event is not None:
+                await on_event(TextStreamEvent(event="step", step=1, text="Content Generation"))
+            step1_output, tokens1 = await self._run_step1(request, model_id, on_event=on_event)
             total_tokens += tokens1
 
             # STEP 2: Style Normalization
             logger.info("[PIPELINE] Starting Step 2")
-            step2_output, tokens2 = await self._run_step2(step1_output, model_id)
+            if on_event is not None:
+                await on_event(TextStreamEvent(event="step", step=2, text="Style Normalization"))
+            step2_output, tokens2 = await self._run_step2(step1_output, model_id, session_id=session_id)
             total_tokens += tokens2
 
-            # STEP 3: JSON Packaging
-            logger.info("[PIPELINE] Starting Step 3")
-            data, tokens3 = await self._run_step3(step2_output, model_id)
+            # STEP 3: JSON Packaging (+ image prompts from the Step 2 text, concurrently)
+            image_task = None
+            if image_prompt_step is not None:
+                logger.info("[PIPELINE] Starting Step 3 + image prompt generation")
+                image_task = asyncio.create_task(image_prompt_step(step2_output))
+            else:
+                logger.info("[PIPELINE] Starting Step 3")
+            if on_event is not None:
+                step_name = "JSON Packaging + Image Prompts" if image_task else "JSON Packaging"
+                await on_event(TextStreamEvent(event="step", step=3, text=step_name))
+
+            try:
+                data, tokens3 = await self._run_step3(step2_output, model_id, session_id=session_id)
+            except BaseException:
+                if image_task is not None:
+                    image_task.cancel()
+                raise
             total_tokens += tokens3
 
+            image_result = None
+            if image_task is not None:
+                try:
+                    image_result = await image_task
+                except ProviderError as e:
+                    logger.warning(f"[PIPELINE] Image prompt generation failed, keeping Step 3 prompts: {e}")
+
             elapsed_ms = int((time.time() - start_time) * 1000)
             logger.info(f"[PIPELINE] Complete ({total_tokens} tokens, {elapsed_ms}ms)")
 
             # Post-process and build response
             data = self._post_process_output(data)
-            return self._build_response(data, model, total_tokens, step1_output, step2_output)
+            response = self._build_response(data, model, total_tokens, step1_output, step2_output)
+            if image_result is not None:
+                response = merge_image_prompts(response, image_result)
+            return response
 
         except ProviderError:
             raise
@@ -741,9 +887,6 @@ class OllamaTextProvider(TextModelProvider):
                 model=model,
                 original_error=e,
             )
-        finally:
-            # Clear session_id after generation
-            self._current_session_id = None
 
     def _build_response(
         self,
@@ -22,6 +22,8 @@ from typing import Optional
 import httpx
 
 from ..config import settings
+from ..utils.image_data import decode_base64
+from .image_cache import make_image_key
 from .base import (
     ImageModelProvider,
     ImageGenerationRequest,
@@ -75,16 +77,21 @@ class SDXLWebUIProvider(ImageModelProvider):
         "colleagues", "thumbs-up", "recognition", "acknowledgment",
     ]
 
-    def __init__(self, webui_url: Optional[str] = None):
+    def __init__(
+        self,
+        webui_url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
         """
         Initialize SDXL WebUI provider.
 
         Args:
             webui_url: Base URL for WebUI (default: http://localhost:7860)
+            client: Shared pooled client from the provider registry (optional)
         """
         self.webui_url = webui_url or settings.sdxl_webui_url
         self.api_url = f"{self.webui_url.rstrip('/')}/sdapi/v1/txt2img"
-        self.client = httpx.AsyncClient(timeout=300.0)  # 5 min timeout for generation
+        self.client = client or httpx.AsyncClient(timeout=300.0)  # 5 min timeout for generation
 
     @property
     def provider_name(self) -> str:
@@ -133,8 +140,8 @@ class SDXLWebUIProvider(ImageModelProvider):
                 model=model,
             )
 
-        # Check WebUI health
-        if not await self._check_webui_health():
+        # Check WebUI health (skipped in deterministic mode, where cached images need no WebUI)
+        if not request.deterministic and not await self._check_webui_health():
             raise ProviderError(
                 f"SDXL WebUI is not accessible at {self.webui_url}. "
                 "Make sure WebUI is running and accessible.",
@@ -143,100 +150,17 @@ class SDXLWebUIProvider(ImageModelProvider):
             )
 
         start_time = time.time()
-        images = []
-        errors = []
-
-        logger.info(f"Generating {len(request.prompts)} images with SDXL WebUI")
-
-        for prompt_data in request.prompts:
-            try:
-                # Get prompt text
-                prompt_text = getattr(prompt_data, 'prompt', '') or getattr(prompt_data, 'description', '')
-                style_notes = getattr(prompt_data, 'style_notes', '')
-                concept = getattr(prompt_data, 'concept', '')
-                negative_prompt = getattr(prompt_data, 'negative_prompt', None)
-
-                if not prompt_text:
-                    logger.warning(f"Empty prompt for image {prompt_data.id}")
-                    continue
-
-                # Build enhanced prompt
-                enhanced_prompt = self._build_sdxl_prompt(
-                    prompt_text,
-                    style_notes,
-                    request.fingerprint,
-                )
 
-                # Use AI-generated negative prompt if available, otherwise fallback to default
-                final_negative_prompt = negative_prompt if negative_prompt else SDXL_NEGATIVE_PROMPT
-
-                logger.info(f"SDXL image {prompt_data.id}: {enhanced_prompt[:200]}...")
-                logger.info(f"SDXL negative prompt {prompt_data.id}: {final_negative_prompt[:100]}...")
-
-                # Use requested dimensions if provided (e.g., 512x512 for carousel), otherwise use settings
-                img_width = request.width if request.width else settings.sdxl_width
-                img_height = request.height if request.height else settings.sdxl_height
-
-                # Prepare request payload
-                payload = {
-                    "prompt": enhanced_prompt,
-                    "negative_prompt": final_negative_prompt,
-                    "width": img_width,
-                    "height": img_height,
-                    "steps": settings.sdxl_steps,
-                    "sampler_name": settings.sdxl_sampler,
-                    "cfg_scale": settings.sdxl_cfg_scale,
-                    "seed": -1,  # Random seed
-                }
-
-                # Make API request
-                response = await self.client.post(
-                    self.api_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                )
+        logger.info(
+            f"Generating {len(request.prompts)} images with SDXL WebUI "
+            f"(concurrency={settings.sdxl_max_concurrency})"
+        )
 
-                response.raise_for_status()
-                response_data = response.json()
-
-                # Extract image from response
-                if "images" in response_data and len(response_data["images"]) > 0:
-                    # WebUI returns base64-encoded images (with data URI prefix)
-                    image_base64 = response_data["images"][0]
-
-                    # Remove data URI prefix if present (e.g., "data:image/png;base64,")
-                    if "," in image_base64:
-                        image_base64 = image_base64.split(",", 1)[1]
-
-                    images.append(GeneratedImage(
-                        id=prompt_data.id,
-                        base64_data=image_base64,
-                        prompt_used=enhanced_prompt,
-                        format="png",
-                        width=img_width,
-                        height=img_height,
-                    ))
-                    logger.info(f"Successfully generated SDXL image {prompt_data.id}")
-                else:
-                    error_msg = f"No images in response for prompt {prompt_data.id}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-
-            except httpx.HTTPStatusError as e:
-                error_msg = f"HTTP error for image {prompt_data.id}: {e.response.status_code} - {e.response.text[:200]}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-                continue
-            except httpx.RequestError as e:
-                error_msg = f"Request error for image {prompt_data.id}: {str(e)}"
-                logger.error(error_msg)
-                errors.append(error_msg)
-                continue
-            except Exception as e:
-                error_msg = f"Failed to generate image {prompt_data.id}: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                errors.append(error_msg)
-                continue
+        images, errors = await self._generate_concurrently(
+            request.prompts,
+            lambda prompt_data: self._generate_one(prompt_data, request),
+            max_concurrency=settings.sdxl_max_concurrency,
+        )
 
         if not images:
             error_detail = "; ".join(errors) if errors else "Unknown error"
@@ -254,6 +178,123 @@ class SDXLWebUIProvider(ImageModelProvider):
             generation_time_ms=elapsed_ms,
         )
 
+    async def _generate_one(
+        self,
+        prompt_data,
+        request: ImageGenerationRequest,
+    ) -> tuple[Optional[GeneratedImage], Optional[str]]:
+        """Generate a single image. Returns (image, None), (None, error) or (None, None) if skipped."""
+        try:
+            # Get prompt text
+            prompt_text = getattr(prompt_data, 'prompt', '') or getattr(prompt_data, 'description', '')
+            style_notes = getattr(prompt_data, 'style_notes', '')
+            concept = getattr(prompt_data, 'concept', '')
+            negative_prompt = getattr(prompt_data, 'negative_prompt', None)
+
+            if not prompt_text:
+                logger.warning(f"Empty prompt for image {prompt_data.id}")
+                return None, None
+
+            # Build enhanced prompt
+            enhanced_prompt = self._build_sdxl_prompt(
+                prompt_text,
+                style_notes,
+                request.fingerprint,
+            )
+
+            # Use AI-generated negative prompt if available, otherwise fallback to default
+            final_negative_prompt = negative_prompt if negative_prompt else SDXL_NEGATIVE_PROMPT
+
+            logger.info(f"SDXL image {prompt_data.id}: {enhanced_prompt[:200]}...")
+            logger.info(f"SDXL negative prompt {prompt_data.id}: {final_negative_prompt[:100]}...")
+
+            # Use requested dimensions if provided (e.g., 512x512 for carousel), otherwise use settings
+            img_width = request.width if request.width else settings.sdxl_width
+            img_height = request.height if request.height else settings.sdxl_height
+
+            # Deterministic mode: fixed seed, and identical calls are served from the image cache
+            seed = self._resolve_seed(prompt_data, request)
+            cache_key = None
+            if seed is not None:
+                cache_key = make_image_key(
+                    provider="sdxl",
+                    model=f"sdxl:{settings.sdxl_sampler}",
+                    prompt=enhanced_prompt,
+                    negative_prompt=final_negative_prompt,
+                    width=img_width,
+                    height=img_height,
+                    seed=seed,
+                    steps=settings.sdxl_steps,
+                    cfg_scale=settings.sdxl_cfg_scale,
+                )
+                cached_image = await self._load_cached_image(
+                    cache_key, prompt_data, enhanced_prompt, img_width, img_height, seed
+                )
+                if cached_image:
+                    return cached_image, None
+
+            # Prepare request payload
+            payload = {
+                "prompt": enhanced_prompt,
+                "negative_prompt": final_negative_prompt,
+                "width": img_width,
+                "height": img_height,
+                "steps": settings.sdxl_steps,
+                "sampler_name": settings.sdxl_sampler,
+                "cfg_scale": settings.sdxl_cfg_scale,
+                "seed": seed if seed is not None else -1,  # -1 = random seed
+            }
+
+            # Make API request
+            response = await self.client.post(
+                self.api_url,
+                json=payload,
+                headers={"Content-Type": "application/json"},
+            )
+
+            response.raise_for_status()
+            response_data = response.json()
+
+            # Extract image from response
+            if "images" in response_data and len(response_data["images"]) > 0:
+                # WebUI returns base64-encoded images (with data URI prefix)
+                image_base64 = response_data["images"][0]
+
+                # Remove data URI prefix if present (e.g., "data:image/png;base64,")
+                if "," in image_base64:
+                    image_base64 = image_base64.split(",", 1)[1]
+
+                logger.info(f"Successfully generated SDXL image {prompt_data.id}")
+                image = GeneratedImage(
+                    id=prompt_data.id,
+                    data=decode_base64(image_base64),
+                    prompt_used=enhanced_prompt,
+                    format="png",
+                    width=img_width,
+                    height=img_height,
+                    seed=seed,
+                )
+                if cache_key:
+                    await self._store_cached_image(cache_key, image)
+                return image, None
+
+            error_msg = f"No images in response for prompt {prompt_data.id}"
+            logger.error(error_msg)
+            return None, error_msg
+
+        except httpx.HTTPStatusError as e:
+            error_msg = f"HTTP error for image {prompt_data.id}: {e.response.status_code} - {e.response.text[:200]}"
+            logger.error(error_msg)
+            return None, error_msg
+        except httpx.RequestError as e:
+            error_msg = f"Request error for image {prompt_data.id}: {str(e)}"
+            logger.error(error_msg)
+            return None, error_msg
+        except Exception as e:
+            error_msg = f"Failed to generate image {prompt_data.id}: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return None, error_msg
+
     def _is_illustration_prompt(self, prompt: str) -> bool:
         """Check if the prompt requests an illustrated/cartoon scene."""
         prompt_lower = prompt.lower()
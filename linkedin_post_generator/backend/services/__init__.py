@@ -1,24 +1,38 @@
-"""Services package."""
-
-from .session_manager import SessionManager, session_manager
-from .image_processor import ImageProcessor
-from .usage_logger import UsageLogger, usage_logger
-from .post_card_builder import PostCardBuilder, PostCardStyle, create_post_card
-from .infographic_renderer import InfographicRenderer
-from .text_extractor import extract_text_structure_llm
-from .carousel_builder import CarouselBuilder
-
-__all__ = [
-    "SessionManager",
-    "session_manager",
-    "ImageProcessor",
-    "UsageLogger",
-    "usage_logger",
-    "PostCardBuilder",
-    "PostCardStyle",
-    "create_post_card",
-    "InfographicRenderer",
-    "extract_text_structure_llm",
-    "CarouselBuilder",
-]
+"""
+Services package.
+
+Exports are resolved lazily (PEP 562): importing one service module,
+e.g. backend.services.image_processor in a render worker, does not
+construct the app singletons (session manager, usage logger, text cache
+and their SQLite connections) or import the API layer.
+
+The singletons themselves are imported from their submodules, e.g.
+`from backend.services.text_cache import text_cache`.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "SessionManager": ".session_manager",
+    "ImageProcessor": ".image_processor",
+    "UsageLogger": ".usage_logger",
+    "PostCardBuilder": ".post_card_builder",
+    "PostCardStyle": ".post_card_builder",
+    "create_post_card": ".post_card_builder",
+    "InfographicRenderer": ".infographic_renderer",
+    "extract_text_structure_llm": ".text_extractor",
+    "CarouselBuilder": ".carousel_builder",
+    "TextResponseCache": ".text_cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
@@ -10,15 +10,19 @@ Hybrid approach:
 - Arrow indicators added to show next page with soft edges
 """
 
-import base64
-import io
 import os
 import logging
+from functools import lru_cache
 from typing import Optional, List, Dict
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
 from .post_card_builder import PostCardBuilder, PostCardStyle
 from ..utils.constants import get_social_branding
+from ..utils.fonts import fonts
+from ..utils.gradients import vertical_alpha_overlay
+from ..utils.image_data import ImageInput, open_image, png_bytes
+from ..utils.metrics import metrics
+from ..utils.text_layout import wrap_text
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +30,31 @@ logger = logging.getLogger(__name__)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_FONTS_DIR = os.path.join(BASE_DIR, "assets", "fonts")
 
+_CAROUSEL_BOLD_FONTS = [
+    os.path.join(ASSETS_FONTS_DIR, "SourceSansPro-Bold.ttf"),
+    os.path.join(ASSETS_FONTS_DIR, "Raleway-Bold.ttf"),
+    os.path.join(ASSETS_FONTS_DIR, "OpenSans-Bold.ttf"),
+    # System fonts
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+]
+fonts.register_family(
+    "carousel",
+    {
+        "bold": _CAROUSEL_BOLD_FONTS,
+        "regular": [
+            os.path.join(ASSETS_FONTS_DIR, "SourceSansPro-Semibold.ttf"),
+            os.path.join(ASSETS_FONTS_DIR, "Raleway-Medium.ttf"),
+            os.path.join(ASSETS_FONTS_DIR, "OpenSans-Semibold.ttf"),
+            # System fonts
+            "/System/Library/Fonts/Supplemental/Arial.ttf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        ],
+        "awesome": [os.path.join(ASSETS_FONTS_DIR, "Awesome.ttf")] + _CAROUSEL_BOLD_FONTS,
+    },
+    preload_sizes=(16, 18, 22, 24, 30),
+)
+
 # Carousel dimensions - 768 height x 512 width for better content layout
 # AI generates image with bottom 30% free for title/footer overlay
 CAROUSEL_WIDTH = 512
@@ -47,6 +76,35 @@ OVERLAY_OPACITY = 0.80  # Strong opacity for readability
 CAROUSEL_FOOTER_HEIGHT = 50  # Fixed footer height for carousel
 
 
+@lru_cache(maxsize=8)
+def _cover_gradient(width: int, height: int, opacity: float) -> Image.Image:
+    """Cover overlay gradient for a canvas size (shared: callers must copy before drawing)."""
+    # Overlay area (bottom 30%)
+    overlay_start_y = int(height * AI_IMAGE_CONTENT_PERCENT)
+    overlay_height = height - overlay_start_y
+
+    max_alpha = int(255 * opacity)
+
+    # Gradient zone above overlay (smooth fade from transparent to overlay)
+    gradient_zone = int(height * 0.08)  # 8% gradient fade zone
+
+    alphas = [0] * height
+
+    # Top gradient fade
+    for i in range(gradient_zone):
+        y_pos = overlay_start_y - gradient_zone + i
+        if y_pos >= 0:
+            progress = i / gradient_zone
+            alphas[y_pos] = int(max_alpha * (progress ** 2))  # Ease-in curve
+
+    # Main overlay area, solid
+    for i in range(overlay_height):
+        progress = i / overlay_height
+        alphas[overlay_start_y + i] = int(max_alpha * (0.90 + 0.10 * progress))  # 90% to 100%
+
+    return vertical_alpha_overlay(width, alphas)
+
+
 class CarouselBuilder:
     """Builds carousel from AI cover + post card sections."""
 
@@ -66,22 +124,20 @@ class CarouselBuilder:
             handle=handle
         ))
 
-    def _extract_dominant_colors(self, image_base64: str, num_colors: int = 5) -> tuple:
+    def _extract_dominant_colors(self, image: ImageInput, num_colors: int = 5) -> tuple:
         """
         Extract dominant colors from the cover image.
         Returns a tuple (R, G, B) representing the best background color.
 
         Args:
-            image_base64: Base64 encoded image
+            image: Cover image (raw PNG bytes or PIL image)
             num_colors: Number of dominant colors to extract
 
         Returns:
             Tuple (R, G, B) suitable for background
         """
         try:
-            img_data = base64.b64decode(image_base64)
-            img_buffer = io.BytesIO(img_data)
-            img = Image.open(img_buffer).convert('RGB')
+            img = open_image(image, 'RGB')
 
             # Resize for faster processing (keep aspect ratio)
             max_size = 200
@@ -147,27 +203,10 @@ class CarouselBuilder:
             return (0, 0, 0)  # Fallback to black
 
     def _load_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-        """Load font with fallbacks."""
-        font_paths = [
-            # Bold fonts
-            os.path.join(ASSETS_FONTS_DIR, "SourceSansPro-Bold.ttf") if bold else os.path.join(ASSETS_FONTS_DIR, "SourceSansPro-Semibold.ttf"),
-            os.path.join(ASSETS_FONTS_DIR, "Raleway-Bold.ttf") if bold else os.path.join(ASSETS_FONTS_DIR, "Raleway-Medium.ttf"),
-            os.path.join(ASSETS_FONTS_DIR, "OpenSans-Bold.ttf") if bold else os.path.join(ASSETS_FONTS_DIR, "OpenSans-Semibold.ttf"),
-            # System fonts
-            "/System/Library/Fonts/Supplemental/Arial Bold.ttf" if bold else "/System/Library/Fonts/Supplemental/Arial.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        ]
+        """Load font with fallbacks (shared font registry)."""
+        return fonts.get("carousel", "bold" if bold else "regular", size)
 
-        for path in font_paths:
-            try:
-                if os.path.exists(path):
-                    return ImageFont.truetype(path, size)
-            except (OSError, IOError):
-                continue
-
-        return ImageFont.load_default()
-
-    def _render_carousel_cover(self, ai_image_base64: str, title: str, subtitle: Optional[str] = None) -> str:
+    def _render_carousel_cover(self, ai_image: ImageInput, title: str, subtitle: Optional[str] = None) -> bytes:
         """
         Render carousel cover with title/subtitle in the bottom 30% overlay area.
         AI image should have interactive cartoon character in top 70%.
@@ -178,17 +217,14 @@ class CarouselBuilder:
         - Smooth gradient fade at top edge of overlay
 
         Args:
-            ai_image_base64: AI-generated image with cartoon character (512x768, content in top 70%)
+            ai_image: AI-generated image with cartoon character (512x768, content in top 70%)
             title: Main title
             subtitle: Optional subtitle
 
         Returns:
-            Base64 encoded image with title/subtitle overlay and footer
+            PNG bytes with title/subtitle overlay and footer
         """
-        # Decode AI image
-        img_data = base64.b64decode(ai_image_base64)
-        img_buffer = io.BytesIO(img_data)
-        img = Image.open(img_buffer).convert('RGBA')
+        img = open_image(ai_image, 'RGBA')
 
         # Resize/fit AI image to carousel dimensions
         if img.size != (CAROUSEL_WIDTH, CAROUSEL_HEIGHT):
@@ -219,42 +255,12 @@ class CarouselBuilder:
         else:
             logger.debug(f"AI correctly generated {CAROUSEL_WIDTH}x{CAROUSEL_HEIGHT} image")
 
-        # Create overlay for gradient and text - FULL WIDTH, no side gaps
-        overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
+        # Overlay for gradient and text - FULL WIDTH, no side gaps (cached; draw on a copy)
+        overlay = _cover_gradient(CAROUSEL_WIDTH, CAROUSEL_HEIGHT, OVERLAY_OPACITY).copy()
         draw = ImageDraw.Draw(overlay)
 
-        # Calculate overlay area (bottom 30%)
+        # Overlay area (bottom 30%)
         overlay_start_y = int(CAROUSEL_HEIGHT * AI_IMAGE_CONTENT_PERCENT)
-        overlay_height = CAROUSEL_HEIGHT - overlay_start_y
-
-        # Create full-width gradient overlay
-        max_alpha = int(255 * OVERLAY_OPACITY)
-
-        # Gradient zone above overlay (smooth fade from transparent to overlay)
-        gradient_zone = int(CAROUSEL_HEIGHT * 0.08)  # 8% gradient fade zone
-
-        # Draw top gradient fade - FULL WIDTH from edge to edge
-        for i in range(gradient_zone):
-            y_pos = overlay_start_y - gradient_zone + i
-            if y_pos >= 0:
-                progress = i / gradient_zone
-                alpha = int(max_alpha * (progress ** 2))  # Ease-in curve
-                # Full width - 0 to CAROUSEL_WIDTH
-                draw.rectangle(
-                    [(0, y_pos), (CAROUSEL_WIDTH, y_pos + 1)],
-                    fill=(0, 0, 0, alpha),
-                )
-
-        # Draw main overlay area - FULL WIDTH, solid
-        for i in range(overlay_height):
-            y_pos = overlay_start_y + i
-            progress = i / overlay_height
-            alpha = int(max_alpha * (0.90 + 0.10 * progress))  # 90% to 100%
-            # Full width overlay
-            draw.rectangle(
-                [(0, y_pos), (CAROUSEL_WIDTH, y_pos + 1)],
-                fill=(0, 0, 0, alpha),
-            )
 
         # Load fonts - larger for better readability
         title_font = self._load_font(30, bold=True)  # Title font
@@ -324,11 +330,7 @@ class CarouselBuilder:
         result = Image.alpha_composite(img, overlay)
         result = result.convert('RGB')
 
-        # Convert to base64
-        output_buffer = io.BytesIO()
-        result.save(output_buffer, format='PNG')
-        output_buffer.seek(0)
-        return base64.b64encode(output_buffer.read()).decode('utf-8')
+        return png_bytes(result)
 
     def _draw_compact_footer(self, draw: ImageDraw.Draw, y_start: int, height: int):
         """Draw a compact footer with icons for carousel images (optimized for 512 width)."""
@@ -483,28 +485,12 @@ class CarouselBuilder:
         )
 
     def _wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int, draw: ImageDraw.Draw) -> List[str]:
-        """Wrap text to fit within max_width."""
-        lines = []
-        words = text.split()
-        line = ""
-        for word in words:
-            test_line = f"{line} {word}".strip()
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] <= max_width:
-                line = test_line
-            else:
-                if line:
-                    lines.append(line)
-                line = word
-        if line:
-            lines.append(line)
-        return lines
-
-    def _resize_image(self, image_base64: str, target_width: int, target_height: int) -> str:
+        """Wrap text to fit within max_width (memoized, see utils.text_layout)."""
+        return list(wrap_text(text, font, max_width))
+
+    def _resize_image(self, image: ImageInput, target_width: int, target_height: int) -> bytes:
         """Resize image to target dimensions while maintaining aspect ratio."""
-        img_data = base64.b64decode(image_base64)
-        img_buffer = io.BytesIO(img_data)
-        img = Image.open(img_buffer)
+        img = open_image(image)
 
         # Calculate scaling to fit within target dimensions
         aspect = img.width / img.height
@@ -528,17 +514,11 @@ class CarouselBuilder:
         paste_y = (target_height - new_height) // 2
         canvas.paste(img_resized, (paste_x, paste_y))
 
-        # Convert back to base64
-        output_buffer = io.BytesIO()
-        canvas.save(output_buffer, format='PNG')
-        output_buffer.seek(0)
-        return base64.b64encode(output_buffer.read()).decode('utf-8')
+        return png_bytes(canvas)
 
-    def _add_arrow_indicator(self, image_base64: str, is_last: bool = False) -> str:
+    def _add_arrow_indicator(self, image: ImageInput, is_last: bool = False) -> bytes:
         """Add elegant single > arrow indicator with soft/blurred edges to right-middle of image."""
-        img_data = base64.b64decode(image_base64)
-        img_buffer = io.BytesIO(img_data)
-        img = Image.open(img_buffer).convert('RGBA')
+        img = open_image(image, 'RGBA')
 
         if not is_last:
             # Create a larger overlay for the chevron (for blur effect)
@@ -601,39 +581,39 @@ class CarouselBuilder:
             img = Image.alpha_composite(img, shadow_layer)
             img = Image.alpha_composite(img, chevron_overlay)
 
-        # Convert back to RGB for base64 encoding
+        # Convert back to RGB for PNG encoding
         img_rgb = Image.new('RGB', img.size, (0, 0, 0))
         img_rgb.paste(img, mask=img.split()[3] if img.mode == 'RGBA' else None)
 
-        # Convert back to base64
-        output_buffer = io.BytesIO()
-        img_rgb.save(output_buffer, format='PNG')
-        output_buffer.seek(0)
-        return base64.b64encode(output_buffer.read()).decode('utf-8')
+        return png_bytes(img_rgb)
 
+    @metrics.timed("render.carousel")
     def build_carousel(
         self,
-        ai_cover_image_base64: str,
+        ai_cover_image: ImageInput,
         infographic_text: Dict,
         post_text: str,
         short_post: Optional[str] = None,
-    ) -> List[str]:
+    ) -> List[bytes]:
         """
         Build carousel from AI cover + post card sections.
 
         Args:
-            ai_cover_image_base64: AI-generated cover image (first slide)
+            ai_cover_image: AI-generated cover image (first slide), raw PNG bytes or PIL image
             infographic_text: Dict with title, subtitle, sections, takeaway
             post_text: Full post text
             short_post: Short post text for title card
 
         Returns:
-            List of base64 encoded images (cover + post cards)
+            List of PNG images as bytes (cover + post cards)
         """
         carousel_images = []
 
+        # Decode the cover once for color extraction and the cover render
+        cover_image = open_image(ai_cover_image)
+
         # 1. Extract dominant color from cover image for post card backgrounds
-        extracted_bg_color = self._extract_dominant_colors(ai_cover_image_base64)
+        extracted_bg_color = self._extract_dominant_colors(cover_image)
         logger.info(f"Extracted background color from cover: RGB{extracted_bg_color}")
 
         # Update post card builder style with extracted color
@@ -652,7 +632,7 @@ class CarouselBuilder:
         title = infographic_text.get('title', '')
         subtitle = infographic_text.get('subtitle', '')
         cover_with_overlay = self._render_carousel_cover(
-            ai_image_base64=ai_cover_image_base64,
+            ai_image=cover_image,
             title=title or 'Key Insight',
             subtitle=subtitle
         )
@@ -674,14 +654,14 @@ class CarouselBuilder:
                     else:
                         section_text = bullet_text
 
-                section_card_base64, _ = self.post_card_builder.build(
+                section_card, _ = self.post_card_builder.build(
                     post_text=section_text,
                     avatar_base64=None,
                     short_post=None,
                     is_carousel=True,  # Flag for carousel-specific styling
                     is_section=True,  # Flag to indicate this is a section (larger title)
                 )
-                carousel_images.append(section_card_base64)
+                carousel_images.append(section_card)
 
         # 4. Create takeaway/conclusion card (if exists) - with title prefix and follow CTA
         takeaway = infographic_text.get('takeaway', '')
@@ -690,7 +670,7 @@ class CarouselBuilder:
             takeaway_title = "Takeaway"
             takeaway_text = f"{takeaway_title}\n\n{takeaway}"
 
-            takeaway_card_base64, _ = self.post_card_builder.build(
+            takeaway_card, _ = self.post_card_builder.render(
                 post_text=takeaway_text,
                 avatar_base64=None,
                 short_post=None,
@@ -699,20 +679,17 @@ class CarouselBuilder:
             )
 
             # Add "Follow for more" CTA to the last slide
-            takeaway_with_cta = self._add_follow_cta(takeaway_card_base64)
+            takeaway_with_cta = self._add_follow_cta(takeaway_card)
             carousel_images.append(takeaway_with_cta)
 
         return carousel_images
 
-    def _add_follow_cta(self, image_base64: str) -> str:
+    def _add_follow_cta(self, image: ImageInput) -> bytes:
         """
         Add [Follow button] + "for more" CTA to the bottom-right of the image.
         Tilted diagonally between takeaway content and footer.
         """
-        # Decode image
-        img_data = base64.b64decode(image_base64)
-        img_buffer = io.BytesIO(img_data)
-        img = Image.open(img_buffer).convert('RGBA')
+        img = open_image(image, 'RGBA')
 
         # Create a separate layer for the CTA that we'll rotate
         cta_layer = Image.new('RGBA', (300, 80), (0, 0, 0, 0))  # Larger canvas for rotation
@@ -785,21 +762,9 @@ class CarouselBuilder:
         # Convert to RGB
         result = img.convert('RGB')
 
-        # Convert to base64
-        output_buffer = io.BytesIO()
-        result.save(output_buffer, format='PNG')
-        output_buffer.seek(0)
-        return base64.b64encode(output_buffer.read()).decode('utf-8')
+        return png_bytes(result)
 
     def _load_awesome_font(self, size: int) -> ImageFont.FreeTypeFont:
-        """Load the Awesome font specifically."""
-        awesome_path = os.path.join(ASSETS_FONTS_DIR, "Awesome.ttf")
-        try:
-            if os.path.exists(awesome_path):
-                return ImageFont.truetype(awesome_path, size)
-        except (OSError, IOError):
-            pass
-
-        # Fallback to regular font loading
-        return self._load_font(size, bold=True)
+        """Load the Awesome font specifically (falls back to the bold font)."""
+        return fonts.get("carousel", "awesome", size)
 
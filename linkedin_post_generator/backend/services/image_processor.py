@@ -9,19 +9,84 @@ Post-processing for generated images:
 Supports consistent text overlays across ALL image providers!
 """
 
-import base64
 import io
+from functools import lru_cache
 from typing import Optional
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
 from ..utils.constants import get_social_branding
+from ..utils.fonts import fonts
+from ..utils.gradients import vertical_alpha_overlay
+from ..utils.image_data import ImageInput, open_image, png_bytes
+from ..utils.metrics import metrics
 
 # More subtle footer - lower opacity for better blend
 DEFAULT_FOOTER_OPACITY = 0.55
 
 
+# Footer fonts (macOS/Linux fallbacks)
+fonts.register_family(
+    "footer",
+    {
+        "bold": [
+            # macOS fonts
+            "/System/Library/Fonts/SFNSText.ttf",
+            "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+            "/System/Library/Fonts/Helvetica.ttc",
+            # Linux fonts
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+        ],
+        "regular": [
+            # macOS fonts
+            "/System/Library/Fonts/SFNSText.ttf",
+            "/System/Library/Fonts/Supplemental/Arial.ttf",
+            "/System/Library/Fonts/Helvetica.ttc",
+            # Linux fonts
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        ],
+    },
+    preload_sizes=(18, 22, 28),
+)
+
+
+@lru_cache(maxsize=32)
+def _footer_gradient(width: int, height: int, opacity: float) -> Image.Image:
+    """Footer gradient overlay for a canvas size (shared: callers must copy before drawing)."""
+    # Footer dimensions - 8% of image height
+    footer_height = int(height * 0.08)
+    footer_y = height - footer_height
+
+    # Calculate max alpha (more subtle)
+    max_alpha = int(255 * opacity)
+
+    # Create smooth gradient from transparent to semi-transparent
+    # Gradient zone starts above the footer area for seamless blend
+    gradient_zone = int(height * 0.06)  # 6% gradient above footer
+
+    alphas = [0] * height
+
+    # Gradient zone (transparent to semi-transparent)
+    for i in range(gradient_zone):
+        y_pos = footer_y - gradient_zone + i
+        if y_pos >= 0:
+            # Ease-in curve for smoother transition
+            progress = i / gradient_zone
+            alphas[y_pos] = int(max_alpha * 0.4 * (progress ** 2))
+
+    # Footer area with gradient (semi-transparent, not solid)
+    for i in range(footer_height):
+        # Start at 30% opacity and go to 70% at bottom
+        progress = i / footer_height
+        alphas[footer_y + i] = int(max_alpha * (0.3 + 0.3 * progress))
+
+    return vertical_alpha_overlay(width, alphas)
+
+
 class ImageProcessor:
     """Process generated images with branded footer and PDF merge."""
 
@@ -34,25 +99,8 @@ class ImageProcessor:
         self.branding = get_social_branding()
 
     def _get_font(self, size: int, bold: bool = False):
-        """Get appropriate font, with macOS/Linux fallbacks."""
-        font_paths = [
-            # macOS fonts
-            "/System/Library/Fonts/SFNSText.ttf",
-            "/System/Library/Fonts/Supplemental/Arial Bold.ttf" if bold else "/System/Library/Fonts/Supplemental/Arial.ttf",
-            "/System/Library/Fonts/Helvetica.ttc",
-            # Linux fonts
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-        ]
-
-        for path in font_paths:
-            try:
-                return ImageFont.truetype(path, size)
-            except (OSError, IOError):
-                continue
-
-        # Fallback to default
-        return ImageFont.load_default()
+        """Get appropriate font, with macOS/Linux fallbacks (shared font registry)."""
+        return fonts.get("footer", "bold" if bold else "regular", size)
 
     def _draw_linkedin_icon(self, draw: ImageDraw, x: int, y: int, size: int, color: tuple):
         """Draw LinkedIn icon - outline style rounded rectangle with 'in' text."""
@@ -141,11 +189,12 @@ class ImageProcessor:
         )
 
 
+    @metrics.timed("render.footer")
     def add_footer(
         self,
-        image_base64: str,
+        image: ImageInput,
         custom_branding: Optional[dict] = None,
-    ) -> str:
+    ) -> bytes:
         """
         Add branded footer overlay to image.
 
@@ -154,21 +203,23 @@ class ImageProcessor:
         [Globe] yourwebsite.com
 
         Args:
-            image_base64: Base64 encoded image
+            image: Raw PNG bytes or PIL image
             custom_branding: Optional custom branding dict
 
         Returns:
-            Base64 encoded image with branded footer
+            PNG bytes with branded footer
         """
-        branding = custom_branding or self.branding
+        return png_bytes(self._render_footer(image, custom_branding), optimize=True)
 
-        # Decode image
-        image_data = base64.b64decode(image_base64)
-        image = Image.open(io.BytesIO(image_data))
+    def _render_footer(
+        self,
+        image: ImageInput,
+        custom_branding: Optional[dict] = None,
+    ) -> Image.Image:
+        """Composite the branded footer; returns the RGB result as a PIL image."""
+        branding = custom_branding or self.branding
 
-        # Convert to RGBA if needed
-        if image.mode != "RGBA":
-            image = image.convert("RGBA")
+        image = open_image(image, "RGBA")
 
         width, height = image.size
 
@@ -176,40 +227,10 @@ class ImageProcessor:
         footer_height = int(height * 0.08)
         footer_y = height - footer_height
 
-        # Create overlay
-        overlay = Image.new("RGBA", image.size, (0, 0, 0, 0))
+        # Gradient overlay (cached per canvas size and opacity; draw on a copy)
+        overlay = _footer_gradient(width, height, self.footer_opacity).copy()
         draw = ImageDraw.Draw(overlay)
 
-        # Calculate max alpha (more subtle)
-        max_alpha = int(255 * self.footer_opacity)
-
-        # Create smooth gradient from transparent to semi-transparent
-        # Gradient zone starts above the footer area for seamless blend
-        gradient_zone = int(height * 0.06)  # 6% gradient above footer
-
-        # Draw gradient zone (transparent to semi-transparent)
-        for i in range(gradient_zone):
-            y_pos = footer_y - gradient_zone + i
-            if y_pos >= 0:
-                # Ease-in curve for smoother transition
-                progress = i / gradient_zone
-                alpha = int(max_alpha * 0.4 * (progress ** 2))
-                draw.rectangle(
-                    [(0, y_pos), (width, y_pos + 1)],
-                    fill=(0, 0, 0, alpha),
-                )
-
-        # Footer area with gradient (semi-transparent, not solid)
-        for i in range(footer_height):
-            y_pos = footer_y + i
-            # Start at 30% opacity and go to 70% at bottom
-            progress = i / footer_height
-            alpha = int(max_alpha * (0.3 + 0.3 * progress))
-            draw.rectangle(
-                [(0, y_pos), (width, y_pos + 1)],
-                fill=(0, 0, 0, alpha),
-            )
-
         # Icon and text configuration - increased font sizes for better readability
         icon_size = int(footer_height * 0.50)
         font_size = int(footer_height * 0.44)
@@ -304,77 +325,55 @@ class ImageProcessor:
         result = Image.alpha_composite(image, overlay)
 
         # Convert back to RGB for PNG
-        result = result.convert("RGB")
-
-        # Encode back to base64
-        buffer = io.BytesIO()
-        result.save(buffer, format="PNG", optimize=True)
-        buffer.seek(0)
-
-        return base64.b64encode(buffer.read()).decode("utf-8")
+        return result.convert("RGB")
 
+    @metrics.timed("render.pdf")
     def merge_to_pdf(
         self,
-        images_base64: list[str],
+        images: list[ImageInput],
         title: Optional[str] = None,
-    ) -> str:
+    ) -> bytes:
         """
         Merge multiple images into a single PDF without margins.
         Images fill entire pages edge-to-edge using Canvas for precise control.
         Each page size matches its image dimensions exactly.
 
         Args:
-            images_base64: List of base64 encoded images
+            images: List of raw PNG bytes or PIL images
             title: Optional title for the PDF
 
         Returns:
-            Base64 encoded PDF
+            PDF bytes
         """
-        if not images_base64:
+        if not images:
             raise ValueError("No images provided for PDF generation")
 
         buffer = io.BytesIO()
-
-        # Get first image dimensions for initial page size
-        first_img_data = base64.b64decode(images_base64[0])
-        first_img_buffer = io.BytesIO(first_img_data)
-        first_pil_img = Image.open(first_img_buffer)
-        first_width, first_height = first_pil_img.size
+        pil_images = [open_image(img) for img in images]
 
         # Create PDF canvas with first image dimensions
-        pdf = canvas.Canvas(buffer, pagesize=(first_width, first_height))
+        pdf = canvas.Canvas(buffer, pagesize=pil_images[0].size)
 
-        for idx, img_b64 in enumerate(images_base64):
-            # Decode image
-            img_data = base64.b64decode(img_b64)
-            img_buffer = io.BytesIO(img_data)
-
-            # Get image dimensions
-            pil_img = Image.open(img_buffer)
+        for idx, pil_img in enumerate(pil_images):
             img_width, img_height = pil_img.size
 
             # Set page size to match this image exactly
             pdf.setPageSize((img_width, img_height))
 
-            # Reset buffer for reading
-            img_buffer.seek(0)
-
             # Draw image at (0, 0) covering the entire page
             # ReportLab uses bottom-left origin, so y=0 is bottom
-            from reportlab.lib.utils import ImageReader
-            img_reader = ImageReader(img_buffer)
-            pdf.drawImage(img_reader, 0, 0, width=img_width, height=img_height)
+            pdf.drawImage(ImageReader(pil_img), 0, 0, width=img_width, height=img_height)
 
             # Create new page for next image (except last)
-            if idx < len(images_base64) - 1:
+            if idx < len(pil_images) - 1:
                 pdf.showPage()
 
         # Save PDF
         pdf.save()
-        buffer.seek(0)
 
-        return base64.b64encode(buffer.read()).decode("utf-8")
+        return buffer.getvalue()
 
+    @metrics.timed("render.process_images")
     def process_images(
         self,
         images: list[dict],
@@ -385,33 +384,36 @@ class ImageProcessor:
         Process a batch of generated images.
 
         Args:
-            images: List of image dicts with 'base64_data' key
+            images: List of image dicts with a 'data' key (raw PNG bytes)
             add_footer: Whether to add branded footer to images
             create_pdf: Whether to create PDF if multiple images
 
         Returns:
-            Dict with processed images and optional PDF
+            Dict with processed images and optional PDF bytes ('pdf')
         """
         processed_images = []
+        pdf_images = []  # Rendered PIL images, handed to the PDF without re-decoding
 
         for img in images:
-            img_data = img.get("base64_data", "")
+            img_data = img.get("data")
 
             if add_footer and img_data:
-                img_data = self.add_footer(img_data)
+                rendered = self._render_footer(img_data)
+                pdf_images.append(rendered)
+                img_data = png_bytes(rendered, optimize=True)
+            elif img_data:
+                pdf_images.append(img_data)
 
             processed_images.append({
                 **img,
-                "base64_data": img_data,
+                "data": img_data,
             })
 
         result = {"images": processed_images}
 
         # Create PDF if multiple images
-        if create_pdf and len(processed_images) > 1:
-            pdf_images = [img["base64_data"] for img in processed_images if img["base64_data"]]
-            if pdf_images:
-                result["pdf_base64"] = self.merge_to_pdf(pdf_images)
+        if create_pdf and len(processed_images) > 1 and pdf_images:
+            result["pdf"] = self.merge_to_pdf(pdf_images)
 
         return result
 
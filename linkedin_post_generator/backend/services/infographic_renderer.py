@@ -10,15 +10,17 @@ This service handles:
 - Consistent typography system
 """
 
-import base64
-import io
 import logging
 import os
+from dataclasses import dataclass, field
 from typing import Optional, List, Literal
 from PIL import Image, ImageDraw, ImageFont
 
 from ..utils.constants import get_social_branding
-from .text_extractor import _simple_extract as _text_extractor_simple_extract
+from ..utils.fonts import fonts
+from ..utils.image_data import ImageInput, open_image, png_bytes
+from ..utils.metrics import metrics
+from ..utils.text_layout import fit_scale, wrap_text
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,7 @@ SECTION_GAP = 32
 # Layout constants
 FOOTER_HEIGHT = 100  # Reserve bottom 100px for footer
 MAX_CONTENT_Y = CANVAS_HEIGHT - FOOTER_HEIGHT - 20  # Stop content before footer
+MIN_FONT_SCALE = 0.53  # Adaptive font sizing never shrinks text below ~53%
 
 # Font paths (with fallbacks)
 # Priority: assets/fonts > system fonts
@@ -89,6 +92,34 @@ def _get_font_paths():
     }
 
 FONT_PATHS = _get_font_paths()
+fonts.register_family(
+    "infographic",
+    FONT_PATHS,
+    preload_sizes=(14, 16, 18, 20, 24, 28, 32, 36, 42, 48, 56),
+)
+
+
+@dataclass
+class _InfographicPlan:
+    """Fonts, wrapped lines and heights of the infographic layout at one font scale."""
+    font_scale: float
+    title_font: ImageFont.FreeTypeFont
+    subtitle_font: ImageFont.FreeTypeFont
+    section_font: ImageFont.FreeTypeFont
+    body_font: ImageFont.FreeTypeFont
+    title_lines: List[str]
+    subtitle_lines: List[str]
+    takeaway_lines: List[str]
+    title_line_height: int
+    subtitle_line_height: int
+    section_title_height: int
+    bullet_line_height: int
+    bullet_spacing: int
+    takeaway_line_height: int
+    header_height: int
+    takeaway_height: int
+    section_heights: List[int] = field(default_factory=list)
+    total_needed: int = 0
 
 
 class InfographicRenderer:
@@ -97,58 +128,16 @@ class InfographicRenderer:
     def __init__(self, branding: Optional[dict] = None):
         """Initialize renderer with branding."""
         self.branding = branding or get_social_branding()
-        self._fonts = {}
 
     def _load_font(self, style: str, size: int) -> ImageFont.FreeTypeFont:
-        """Load font with fallbacks - checks assets/fonts first."""
-        cache_key = f"{style}_{size}"
-        if cache_key in self._fonts:
-            return self._fonts[cache_key]
-
-        font_paths = FONT_PATHS.get(style, FONT_PATHS["regular"])
-
-        for path in font_paths:
-            try:
-                # Check if path exists
-                if os.path.exists(path):
-                    font = ImageFont.truetype(path, size)
-                    self._fonts[cache_key] = font
-                    logger.debug(f"Loaded font: {path}")
-                    return font
-            except (OSError, IOError) as e:
-                logger.debug(f"Failed to load font {path}: {e}")
-                continue
-
-        # Fallback to default
-        logger.warning(f"Using default font for {style} {size}pt - no custom fonts found")
-        font = ImageFont.load_default()
-        self._fonts[cache_key] = font
-        return font
+        """Load font with fallbacks - checks assets/fonts first (shared font registry)."""
+        return fonts.get("infographic", style if style in FONT_PATHS else "regular", size)
 
     def _wrap_text(
         self, draw: ImageDraw, text: str, font: ImageFont.FreeTypeFont, max_width: int
     ) -> List[str]:
-        """Wrap text to fit within max_width."""
-        words = text.split()
-        lines = []
-        line = ""
-
-        for word in words:
-            test_line = f"{line} {word}".strip()
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            text_width = bbox[2] - bbox[0]
-
-            if text_width <= max_width:
-                line = test_line
-            else:
-                if line:
-                    lines.append(line)
-                line = word
-
-        if line:
-            lines.append(line)
-
-        return lines
+        """Wrap text to fit within max_width (memoized, see utils.text_layout)."""
+        return list(wrap_text(text, font, max_width))
 
     def _draw_linkedin_icon(self, draw: ImageDraw, x: int, y: int, size: int, color: tuple):
         """Draw LinkedIn icon - outline style rounded rectangle with 'in' text."""
@@ -386,21 +375,22 @@ class InfographicRenderer:
             fill=bg_color,
         )
 
+    @metrics.timed("render.infographic")
     def render_infographic(
         self,
-        base_image_base64: str,
+        base_image: ImageInput,
         title: str,
         subtitle: Optional[str] = None,
         sections: Optional[List[dict]] = None,
         takeaway: Optional[str] = None,
         add_footer: bool = True,
         layout: Literal["infographic", "checklist", "quote", "comparison"] = "infographic",
-    ) -> str:
+    ) -> bytes:
         """
         Render infographic with text overlay (Step 3 - Multiple Layouts).
 
         Args:
-            base_image_base64: Base64 encoded SDXL-generated image
+            base_image: SDXL-generated image (raw PNG bytes or PIL image)
             title: Main headline
             subtitle: Optional subtitle/context
             sections: List of section dicts with 'title' and 'bullets' keys
@@ -409,40 +399,98 @@ class InfographicRenderer:
             layout: Layout template to use
 
         Returns:
-            Base64 encoded final image
+            Final image as PNG bytes
         """
         # Route to appropriate layout renderer
         if layout == "checklist":
             return self._render_checklist_layout(
-                base_image_base64, title, subtitle, sections, takeaway, add_footer
+                base_image, title, subtitle, sections, takeaway, add_footer
             )
         elif layout == "quote":
             return self._render_quote_layout(
-                base_image_base64, title, subtitle, takeaway, add_footer
+                base_image, title, subtitle, takeaway, add_footer
             )
         elif layout == "comparison":
             return self._render_comparison_layout(
-                base_image_base64, title, subtitle, sections, takeaway, add_footer
+                base_image, title, subtitle, sections, takeaway, add_footer
             )
         else:
             # Default infographic layout
             return self._render_infographic_layout(
-                base_image_base64, title, subtitle, sections, takeaway, add_footer
+                base_image, title, subtitle, sections, takeaway, add_footer
             )
 
+    def _plan_infographic_layout(
+        self,
+        title: str,
+        subtitle: Optional[str],
+        sections: Optional[List[dict]],
+        takeaway: Optional[str],
+        font_scale: float,
+    ) -> _InfographicPlan:
+        """Wrap and measure the infographic layout at a font scale (no drawing)."""
+        title_font = self._load_font("bold", int(52 * font_scale))
+        subtitle_font = self._load_font("regular", int(32 * font_scale))
+        section_font = self._load_font("bold", int(36 * font_scale))
+        body_font = self._load_font("regular", int(28 * font_scale))
+
+        # Line heights are proportional to the font size
+        plan = _InfographicPlan(
+            font_scale=font_scale,
+            title_font=title_font,
+            subtitle_font=subtitle_font,
+            section_font=section_font,
+            body_font=body_font,
+            title_lines=list(wrap_text(title, title_font, CONTENT_WIDTH - 40)),
+            subtitle_lines=list(wrap_text(subtitle, subtitle_font, CONTENT_WIDTH - 40)) if subtitle else [],
+            takeaway_lines=list(wrap_text(takeaway, section_font, CONTENT_WIDTH - 60)) if takeaway else [],
+            title_line_height=int(60 * font_scale),
+            subtitle_line_height=int(40 * font_scale),
+            section_title_height=int(50 * font_scale),
+            bullet_line_height=int(34 * font_scale),
+            bullet_spacing=int(8 * font_scale),
+            takeaway_line_height=int(44 * font_scale),
+            header_height=0,
+            takeaway_height=0,
+        )
+
+        plan.header_height = (
+            len(plan.title_lines) * plan.title_line_height
+            + len(plan.subtitle_lines) * plan.subtitle_line_height
+            + int(40 * font_scale)
+        )
+
+        for section in sections or []:
+            section_height = plan.section_title_height if section.get("title", "") else int(10 * font_scale)
+            for bullet in section.get("bullets", []):
+                bullet_lines = wrap_text(bullet, body_font, CONTENT_WIDTH - 80)
+                section_height += len(bullet_lines) * plan.bullet_line_height + plan.bullet_spacing
+            section_height += int(20 * font_scale)  # Bottom padding
+            plan.section_heights.append(section_height)
+
+        if takeaway:
+            plan.takeaway_height = len(plan.takeaway_lines) * plan.takeaway_line_height + int(40 * font_scale)
+
+        # Total space needed with minimum gaps between the overlays (header, sections, takeaway)
+        num_overlays = 1 + len(plan.section_heights) + (1 if takeaway else 0)
+        min_gap = max(12, int(SECTION_GAP * font_scale * 0.4))  # Minimum 12px, scaled
+        plan.total_needed = (
+            plan.header_height + sum(plan.section_heights) + plan.takeaway_height + (num_overlays - 1) * min_gap
+        )
+        return plan
+
     def _render_infographic_layout(
         self,
-        base_image_base64: str,
+        base_image: ImageInput,
         title: str,
         subtitle: Optional[str] = None,
         sections: Optional[List[dict]] = None,
         takeaway: Optional[str] = None,
         add_footer: bool = True,
-    ) -> str:
+    ) -> bytes:
         """Render standard infographic layout (multi-panel with sections)."""
-        # Decode base image
-        image_data = base64.b64decode(base_image_base64)
-        img = Image.open(io.BytesIO(image_data)).convert("RGBA")
+        # Open base image
+        img = open_image(base_image, "RGBA")
 
         # Resize if needed (SDXL should generate 768x1344, but handle variations)
         if img.size != (CANVAS_WIDTH, CANVAS_HEIGHT):
@@ -452,104 +500,35 @@ class InfographicRenderer:
         overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
         draw = ImageDraw.Draw(overlay)
 
-        # Adaptive font sizing to ensure ALL sections always render
-        # Start with base sizes and reduce if needed
-        font_scale = 1.0
-        title_size = 52
-        subtitle_size = 32
-        section_size = 36
-        body_size = 28
-
-        # Try to fit everything with adaptive sizing (max 5 attempts)
-        for attempt in range(5):
-            # Load fonts with current scale
-            title_font = self._load_font("bold", int(title_size * font_scale))
-            subtitle_font = self._load_font("regular", int(subtitle_size * font_scale))
-            section_font = self._load_font("bold", int(section_size * font_scale))
-            body_font = self._load_font("regular", int(body_size * font_scale))
-            footer_font = self._load_font("regular", 24)  # Footer size stays constant
-
-            # Calculate heights with current font sizes
-            title_lines = self._wrap_text(draw, title, title_font, CONTENT_WIDTH - 40)
-            subtitle_lines = []
-            if subtitle:
-                subtitle_lines = self._wrap_text(draw, subtitle, subtitle_font, CONTENT_WIDTH - 40)
+        # Adaptive font sizing to ensure ALL sections always render:
+        # largest font scale (binary search) at which everything fits
+        plans = {}
 
-            # Calculate line heights based on font size (proportional)
-            title_line_height = int(60 * font_scale)
-            subtitle_line_height = int(40 * font_scale)
-            section_title_height = int(50 * font_scale)
-            bullet_line_height = int(34 * font_scale)
-            bullet_spacing = int(8 * font_scale)
-            takeaway_line_height = int(44 * font_scale)
+        def measure(font_scale: float) -> int:
+            plans[font_scale] = self._plan_infographic_layout(title, subtitle, sections, takeaway, font_scale)
+            return plans[font_scale].total_needed
 
-            header_height = len(title_lines) * title_line_height + len(subtitle_lines) * subtitle_line_height + int(40 * font_scale)
-            header_card_bottom = MARGIN_Y + header_height
+        font_scale = fit_scale(measure, MAX_CONTENT_Y - MARGIN_Y - 20, MIN_FONT_SCALE)
+        plan = plans.get(font_scale) or self._plan_infographic_layout(title, subtitle, sections, takeaway, font_scale)
+        logger.debug(f"Content fits with font_scale={font_scale:.2f}, total_needed={plan.total_needed}px")
 
-            # Pre-calculate section heights
-            section_heights = []
-            if sections:
-                for section in sections:
-                    section_title = section.get("title", "")
-                    bullets = section.get("bullets", [])
-                    section_height = section_title_height if section_title else int(10 * font_scale)
-                    for bullet in bullets:
-                        bullet_lines = self._wrap_text(draw, bullet, body_font, CONTENT_WIDTH - 80)
-                        section_height += len(bullet_lines) * bullet_line_height + bullet_spacing
-                    section_height += int(20 * font_scale)  # Bottom padding
-                    section_heights.append(section_height)
-
-            # Calculate takeaway height
-            takeaway_height_est = 0
-            if takeaway:
-                takeaway_lines_est = self._wrap_text(draw, takeaway, section_font, CONTENT_WIDTH - 60)
-                takeaway_height_est = len(takeaway_lines_est) * takeaway_line_height + int(40 * font_scale)
-
-            # Calculate total space needed
-            total_content_height = header_height + sum(section_heights) + takeaway_height_est
-
-            # Calculate gaps needed (use minimum gaps to fit everything)
-            num_overlays = 1 + len(sections) + (1 if takeaway else 0)
-            num_gaps = num_overlays - 1 if num_overlays > 1 else 0
-
-            # Use minimum gaps (scaled down) to ensure everything fits
-            min_gap = max(12, int(SECTION_GAP * font_scale * 0.4))  # Minimum 12px, scaled
-            total_gaps_height = num_gaps * min_gap
-
-            # Check if everything fits
-            total_needed = header_card_bottom - MARGIN_Y + sum(section_heights) + takeaway_height_est + total_gaps_height
-
-            if total_needed <= MAX_CONTENT_Y - MARGIN_Y - 20:
-                # Everything fits! Break and use these font sizes
-                logger.debug(f"Content fits with font_scale={font_scale:.2f}, total_needed={total_needed}px")
-                break
-            else:
-                # Reduce font scale for next attempt
-                font_scale *= 0.88  # Reduce by 12% each time
-                logger.debug(f"Attempt {attempt + 1}: Content doesn't fit ({total_needed}px > {MAX_CONTENT_Y - MARGIN_Y}px), reducing font scale to {font_scale:.2f}")
-
-        # Final font sizes (may be reduced)
-        title_font = self._load_font("bold", int(title_size * font_scale))
-        subtitle_font = self._load_font("regular", int(subtitle_size * font_scale))
-        section_font = self._load_font("bold", int(section_size * font_scale))
-        body_font = self._load_font("regular", int(body_size * font_scale))
-        footer_font = self._load_font("regular", 24)
+        title_font = plan.title_font
+        subtitle_font = plan.subtitle_font
+        section_font = plan.section_font
+        body_font = plan.body_font
+        footer_font = self._load_font("regular", 24)  # Footer size stays constant
 
-        # Recalculate with final font sizes
-        title_lines = self._wrap_text(draw, title, title_font, CONTENT_WIDTH - 40)
-        subtitle_lines = []
-        if subtitle:
-            subtitle_lines = self._wrap_text(draw, subtitle, subtitle_font, CONTENT_WIDTH - 40)
+        title_lines = plan.title_lines
+        subtitle_lines = plan.subtitle_lines
 
-        # Calculate line heights with final scale
-        title_line_height = int(60 * font_scale)
-        subtitle_line_height = int(40 * font_scale)
-        section_title_height = int(50 * font_scale)
-        bullet_line_height = int(34 * font_scale)
-        bullet_spacing = int(8 * font_scale)
-        takeaway_line_height = int(44 * font_scale)
+        title_line_height = plan.title_line_height
+        subtitle_line_height = plan.subtitle_line_height
+        section_title_height = plan.section_title_height
+        bullet_line_height = plan.bullet_line_height
+        bullet_spacing = plan.bullet_spacing
+        takeaway_line_height = plan.takeaway_line_height
 
-        header_height = len(title_lines) * title_line_height + len(subtitle_lines) * subtitle_line_height + int(40 * font_scale)
+        header_height = plan.header_height
 
         y = MARGIN_Y
 
@@ -588,26 +567,9 @@ class InfographicRenderer:
         # Actual header content height (from start to end of text)
         header_content_height = y - MARGIN_Y
 
-        # Pre-calculate all section heights for dynamic gap distribution (using final font sizes)
-        section_heights = []
-        if sections:
-            for section in sections:
-                section_title = section.get("title", "")
-                bullets = section.get("bullets", [])
-                section_height = section_title_height if section_title else int(10 * font_scale)
-                for bullet in bullets:
-                    bullet_lines = self._wrap_text(
-                        draw, bullet, body_font, CONTENT_WIDTH - 80
-                    )
-                    section_height += len(bullet_lines) * bullet_line_height + bullet_spacing
-                section_height += int(20 * font_scale)  # Bottom padding
-                section_heights.append(section_height)
-
-        # Calculate takeaway height if present
-        takeaway_height_est = 0
-        if takeaway:
-            takeaway_lines_est = self._wrap_text(draw, takeaway, section_font, CONTENT_WIDTH - 60)
-            takeaway_height_est = len(takeaway_lines_est) * takeaway_line_height + int(40 * font_scale)
+        # Section and takeaway heights for dynamic gap distribution (final font sizes)
+        section_heights = plan.section_heights
+        takeaway_height_est = plan.takeaway_height
 
         # Count total overlays: header (1) + sections (N) + takeaway (0 or 1)
         num_overlays = 1  # Header overlay (title + subtitle)
@@ -719,9 +681,8 @@ class InfographicRenderer:
 
         # TAKEAWAY SECTION - ALWAYS render if present (we've already adjusted fonts/gaps to fit)
         if takeaway:
-            # Pre-calculate takeaway height
-            takeaway_lines = self._wrap_text(draw, takeaway, section_font, CONTENT_WIDTH - 60)
-            takeaway_height = len(takeaway_lines) * takeaway_line_height + int(40 * font_scale)
+            takeaway_lines = plan.takeaway_lines
+            takeaway_height = plan.takeaway_height
 
             # Add gap before takeaway (reduce if needed to fit)
             takeaway_start_y = y
@@ -760,12 +721,7 @@ class InfographicRenderer:
         # Convert to RGB for PNG
         result = result.convert("RGB")
 
-        # Encode to base64
-        buffer = io.BytesIO()
-        result.save(buffer, format="PNG", optimize=True)
-        buffer.seek(0)
-
-        return base64.b64encode(buffer.read()).decode("utf-8")
+        return png_bytes(result, optimize=True)
 
     async def extract_text_from_post_llm(
         self,
@@ -798,7 +754,10 @@ class InfographicRenderer:
         self, post_text: str, short_post: Optional[str] = None
     ) -> dict:
         """Simple text extraction fallback. Delegates to text_extractor module."""
-        return _text_extractor_simple_extract(post_text, short_post)
+        # Imported here so render workers don't load the provider stack
+        from .text_extractor import _simple_extract
+
+        return _simple_extract(post_text, short_post)
 
     # Legacy method for backward compatibility
     def extract_text_from_post(
@@ -809,163 +768,196 @@ class InfographicRenderer:
 
     def _render_checklist_layout(
         self,
-        base_image_base64: str,
+        base_image: ImageInput,
         title: str,
         subtitle: Optional[str] = None,
         sections: Optional[List[dict]] = None,
         takeaway: Optional[str] = None,
         add_footer: bool = True,
-    ) -> str:
+    ) -> bytes:
         """Render checklist-style layout."""
-        image_data = base64.b64decode(base_image_base64)
-        img = Image.open(io.BytesIO(image_data)).convert("RGBA")
+        img = open_image(base_image, "RGBA")
         if img.size != (CANVAS_WIDTH, CANVAS_HEIGHT):
             img = img.resize((CANVAS_WIDTH, CANVAS_HEIGHT), Image.Resampling.LANCZOS)
 
         overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
         draw = ImageDraw.Draw(overlay)
 
-        title_font = self._load_font("bold", 52)
-        subtitle_font = self._load_font("regular", 32)
-        body_font = self._load_font("regular", 28)
+        # Checklist items - each item gets its own subtle background
+        all_items = []
+        if sections:
+            for section in sections:
+                all_items.extend(section.get("bullets", []))
+        items = all_items[:8]
+
+        # Largest font scale at which header and items fit above the footer
+        def measure(scale: float) -> int:
+            body_font = self._load_font("regular", int(28 * scale))
+            height = len(wrap_text(title, self._load_font("bold", int(52 * scale)), CONTENT_WIDTH - 40)) * int(60 * scale)
+            if subtitle:
+                subtitle_lines = wrap_text(subtitle, self._load_font("regular", int(32 * scale)), CONTENT_WIDTH - 40)
+                height += int(10 * scale) + len(subtitle_lines) * int(40 * scale)
+            height += int(30 * scale)
+            for item in items:
+                height += len(wrap_text(f"✓ {item}", body_font, CONTENT_WIDTH - 60)) * int(36 * scale) + int(10 * scale)
+            return height
+
+        scale = fit_scale(measure, MAX_CONTENT_Y - MARGIN_Y, MIN_FONT_SCALE)
+
+        title_font = self._load_font("bold", int(52 * scale))
+        subtitle_font = self._load_font("regular", int(32 * scale))
+        body_font = self._load_font("regular", int(28 * scale))
         footer_font = self._load_font("regular", 24)
 
         y = MARGIN_Y
 
         # Header
         title_lines = self._wrap_text(draw, title, title_font, CONTENT_WIDTH - 40)
-        header_height = len(title_lines) * 60 + 40
-        self._draw_card(draw, y, header_height, padding=24, is_header=True)
+        header_height = len(title_lines) * int(60 * scale) + int(40 * scale)
+        self._draw_card(draw, y, header_height, padding=int(24 * scale), is_header=True)
 
         for line in title_lines:
             draw.text((MARGIN_X, y), line, fill=COLORS["title"], font=title_font)
-            y += 60
+            y += int(60 * scale)
 
         if subtitle:
-            y += 10
+            y += int(10 * scale)
             subtitle_lines = self._wrap_text(draw, subtitle, subtitle_font, CONTENT_WIDTH - 40)
             for line in subtitle_lines:
                 draw.text((MARGIN_X, y), line, fill=COLORS["subtitle"], font=subtitle_font)
-                y += 40
+                y += int(40 * scale)
 
-        y += 30
+        y += int(30 * scale)
 
-        # Checklist items - each item gets its own subtle background
-        all_items = []
-        if sections:
-            for section in sections:
-                all_items.extend(section.get("bullets", []))
-
-        for item in all_items[:8]:
+        for item in items:
             if y + 50 > MAX_CONTENT_Y:
                 break
             item_lines = self._wrap_text(draw, f"✓ {item}", body_font, CONTENT_WIDTH - 60)
             for line in item_lines:
-                draw.text((MARGIN_X + 24, y), line, fill=COLORS["body"], font=body_font)
-                y += 36
-            y += 10
+                draw.text((MARGIN_X + int(24 * scale), y), line, fill=COLORS["body"], font=body_font)
+                y += int(36 * scale)
+            y += int(10 * scale)
 
         # Footer
         if add_footer:
             self._draw_footer(draw, footer_font)
 
         result = Image.alpha_composite(img, overlay).convert("RGB")
-        buffer = io.BytesIO()
-        result.save(buffer, format="PNG", optimize=True)
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return png_bytes(result, optimize=True)
 
     def _render_quote_layout(
         self,
-        base_image_base64: str,
+        base_image: ImageInput,
         title: str,
         subtitle: Optional[str] = None,
         takeaway: Optional[str] = None,
         add_footer: bool = True,
-    ) -> str:
+    ) -> bytes:
         """Render quote-style layout."""
-        image_data = base64.b64decode(base_image_base64)
-        img = Image.open(io.BytesIO(image_data)).convert("RGBA")
+        img = open_image(base_image, "RGBA")
         if img.size != (CANVAS_WIDTH, CANVAS_HEIGHT):
             img = img.resize((CANVAS_WIDTH, CANVAS_HEIGHT), Image.Resampling.LANCZOS)
 
         overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
         draw = ImageDraw.Draw(overlay)
 
-        quote_font = self._load_font("bold", 48)
-        author_font = self._load_font("regular", 32)
+        quote_text = f'"{takeaway or title}"'
+
+        # Largest font scale at which the quote card fits between the margins
+        def measure(scale: float) -> int:
+            quote_lines = wrap_text(quote_text, self._load_font("bold", int(48 * scale)), CONTENT_WIDTH - 80)
+            return len(quote_lines) * int(60 * scale) + int(80 * scale)
+
+        scale = fit_scale(measure, MAX_CONTENT_Y - MARGIN_Y, MIN_FONT_SCALE)
+
+        quote_font = self._load_font("bold", int(48 * scale))
+        author_font = self._load_font("regular", int(32 * scale))
         footer_font = self._load_font("regular", 24)
 
-        quote_text = takeaway or title
-        quote_lines = self._wrap_text(draw, f'"{quote_text}"', quote_font, CONTENT_WIDTH - 80)
+        quote_lines = self._wrap_text(draw, quote_text, quote_font, CONTENT_WIDTH - 80)
 
         # Center vertically
-        total_height = len(quote_lines) * 60
+        line_height = int(60 * scale)
+        total_height = len(quote_lines) * line_height
         y = (CANVAS_HEIGHT - FOOTER_HEIGHT - total_height) // 2
 
         # Draw quote card (header-like for emphasis)
-        self._draw_card(draw, y - 20, total_height + 80, padding=30, is_header=True)
+        self._draw_card(draw, y - int(20 * scale), total_height + int(80 * scale), padding=int(30 * scale), is_header=True)
 
         for line in quote_lines:
             draw.text((MARGIN_X + 20, y), line, fill=COLORS["title"], font=quote_font)
-            y += 60
+            y += line_height
 
         if subtitle:
-            draw.text((MARGIN_X + 20, y + 10), f"— {subtitle}", fill=COLORS["subtitle"], font=author_font)
+            draw.text((MARGIN_X + 20, y + int(10 * scale)), f"— {subtitle}", fill=COLORS["subtitle"], font=author_font)
 
         # Footer
         if add_footer:
             self._draw_footer(draw, footer_font)
 
         result = Image.alpha_composite(img, overlay).convert("RGB")
-        buffer = io.BytesIO()
-        result.save(buffer, format="PNG", optimize=True)
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return png_bytes(result, optimize=True)
 
     def _render_comparison_layout(
         self,
-        base_image_base64: str,
+        base_image: ImageInput,
         title: str,
         subtitle: Optional[str] = None,
         sections: Optional[List[dict]] = None,
         takeaway: Optional[str] = None,
         add_footer: bool = True,
-    ) -> str:
+    ) -> bytes:
         """Render comparison-style layout - side-by-side comparison."""
-        image_data = base64.b64decode(base_image_base64)
-        img = Image.open(io.BytesIO(image_data)).convert("RGBA")
+        img = open_image(base_image, "RGBA")
         if img.size != (CANVAS_WIDTH, CANVAS_HEIGHT):
             img = img.resize((CANVAS_WIDTH, CANVAS_HEIGHT), Image.Resampling.LANCZOS)
 
         overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
         draw = ImageDraw.Draw(overlay)
 
-        title_font = self._load_font("bold", 48)
-        section_font = self._load_font("bold", 32)
-        body_font = self._load_font("regular", 26)
+        col_width = (CONTENT_WIDTH - 40) // 2
+        columns = sections[:2] if sections and len(sections) >= 2 else []
+        max_items = min(4, max((len(column.get("bullets", [])) for column in columns), default=0))
+
+        # Largest font scale at which the title and both columns fit above the footer
+        def measure(scale: float) -> int:
+            body_font = self._load_font("regular", int(26 * scale))
+            title_lines = wrap_text(title, self._load_font("bold", int(48 * scale)), CONTENT_WIDTH - 40)
+            columns_height = int((50 + max_items * 80) * scale)
+            for column in columns:
+                column_height = int(40 * scale)
+                for bullet in column.get("bullets", [])[:4]:
+                    column_height += len(wrap_text(bullet, body_font, col_width - 20)) * int(32 * scale)
+                columns_height = max(columns_height, column_height)
+            return len(title_lines) * int(56 * scale) + int(40 * scale) + (columns_height + 1 if columns else 0)
+
+        scale = fit_scale(measure, MAX_CONTENT_Y - MARGIN_Y, MIN_FONT_SCALE)
+
+        title_font = self._load_font("bold", int(48 * scale))
+        section_font = self._load_font("bold", int(32 * scale))
+        body_font = self._load_font("regular", int(26 * scale))
         footer_font = self._load_font("regular", 24)
 
         y = MARGIN_Y
 
         # Title
         title_lines = self._wrap_text(draw, title, title_font, CONTENT_WIDTH - 40)
-        header_height = len(title_lines) * 56 + 30
-        self._draw_card(draw, y, header_height, padding=24, is_header=True)
+        header_height = len(title_lines) * int(56 * scale) + int(30 * scale)
+        self._draw_card(draw, y, header_height, padding=int(24 * scale), is_header=True)
 
         for line in title_lines:
             draw.text((MARGIN_X, y), line, fill=COLORS["title"], font=title_font)
-            y += 56
+            y += int(56 * scale)
 
-        y += 40
+        y += int(40 * scale)
 
         # Two-column comparison
-        if sections and len(sections) >= 2:
-            left_section = sections[0]
-            right_section = sections[1]
-            col_width = (CONTENT_WIDTH - 40) // 2
+        if columns:
+            left_section, right_section = columns
+            line_height = int(32 * scale)
 
             # Estimate max height needed
-            max_items = min(4, max(len(left_section.get("bullets", [])), len(right_section.get("bullets", []))))
-            comparison_height = 50 + max_items * 80
+            comparison_height = int((50 + max_items * 80) * scale)
 
             if y + comparison_height < MAX_CONTENT_Y:
                 self._draw_card(draw, y, comparison_height, padding=20, is_header=False)
@@ -973,33 +965,31 @@ class InfographicRenderer:
                 # Left column
                 left_y = y
                 draw.text((MARGIN_X, left_y), left_section.get("title", ""), fill=COLORS["accent"], font=section_font)
-                left_y += 40
+                left_y += int(40 * scale)
                 for bullet in left_section.get("bullets", [])[:4]:
                     bullet_lines = self._wrap_text(draw, bullet, body_font, col_width - 20)
                     for line in bullet_lines:
-                        if left_y + 32 > MAX_CONTENT_Y:
+                        if left_y + line_height > MAX_CONTENT_Y:
                             break
                         draw.text((MARGIN_X, left_y), line, fill=COLORS["body"], font=body_font)
-                        left_y += 32
+                        left_y += line_height
 
                 # Right column
                 right_y = y
                 draw.text((MARGIN_X + col_width + 30, right_y), right_section.get("title", ""), fill=COLORS["accent"], font=section_font)
-                right_y += 40
+                right_y += int(40 * scale)
                 for bullet in right_section.get("bullets", [])[:4]:
                     bullet_lines = self._wrap_text(draw, bullet, body_font, col_width - 20)
                     for line in bullet_lines:
-                        if right_y + 32 > MAX_CONTENT_Y:
+                        if right_y + line_height > MAX_CONTENT_Y:
                             break
                         draw.text((MARGIN_X + col_width + 30, right_y), line, fill=COLORS["body"], font=body_font)
-                        right_y += 32
+                        right_y += line_height
 
         # Footer
         if add_footer:
             self._draw_footer(draw, footer_font)
 
         result = Image.alpha_composite(img, overlay).convert("RGB")
-        buffer = io.BytesIO()
-        result.save(buffer, format="PNG", optimize=True)
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return png_bytes(result, optimize=True)
 
@@ -0,0 +1,526 @@
+"""
+Job Manager
+============
+Background jobs for long-running image generation.
+
+/generate-images holds the HTTP connection open for the whole render,
+which for SDXL (and carousels/PDFs) can outlive proxy and client
+timeouts. Jobs decouple the work from the request: POST /jobs/images
+enqueues a job, an in-process asyncio worker pool runs it, and clients
+poll GET /jobs/{id} for per-image progress and fetch the result from
+GET /jobs/{id}/result.
+
+Job state is persisted as JSON under settings.job_dir (one file per job,
+result in a separate file), so finished results survive a restart and
+jobs that were queued or running when their worker exited are re-queued.
+Writes run in a thread. Status changes are written at once; per-image
+progress and stage updates are coalesced and written at most every
+settings.job_progress_save_interval_ms.
+
+With several uvicorn workers, each runs the jobs submitted to it, and a
+status poll that lands on another worker reads the job from disk (in a
+thread: aget/aget_result). Every job records its owner, a worker that
+holds a lock file under job_dir/owners while it runs. One worker at a
+time holds the job directory's recovery lock. At startup and every
+settings.job_recovery_interval_seconds it re-queues unfinished jobs
+whose owner's lock is free, i.e. whose worker exited. The other workers
+retry the recovery lock on the same interval, so recovery continues when
+its holder exits. Locks are flock()s: the job directory must be local to
+the host.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: single worker only
+    fcntl = None
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from ..config import settings
+from ..providers.base import image_progress
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Job lifecycle states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """Persisted job state."""
+    job_id: str
+    kind: str  # "images"
+    session_id: str
+    request: dict  # Serialized request payload (re-run on restart)
+    status: JobStatus = JobStatus.QUEUED
+    stage: Optional[str] = None  # Runner-reported stage, e.g. "generating"
+    images: list[dict] = field(default_factory=list)  # [{"id", "status", "error"}]
+    error: Optional[str] = None
+    has_result: bool = False
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    owner: Optional[str] = None  # Worker running or queueing the job (see JobManager._owner)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["status"] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        data = dict(data)
+        data["status"] = JobStatus(data.get("status", JobStatus.QUEUED.value))
+        return cls(**data)
+
+
+# Runner: (job, on_stage) -> JSON-serializable result
+JobRunner = Callable[[Job, Callable[[str], None]], Awaitable[dict]]
+
+
+class JobManager:
+    """
+    In-process job queue with a fixed pool of asyncio workers.
+
+    Started and stopped from main.lifespan. Workers share the event loop
+    with request handlers, so a job is just a detached coroutine - the
+    providers' own concurrency limits still apply.
+    """
+
+    def __init__(
+        self,
+        job_dir: Optional[Path] = None,
+        num_workers: Optional[int] = None,
+        retention_seconds: Optional[int] = None,
+        save_interval_ms: Optional[int] = None,
+        recovery_interval_seconds: Optional[int] = None,
+    ):
+        self.job_dir = Path(job_dir or settings.job_dir)
+        self.num_workers = num_workers or settings.job_workers
+        self.retention_seconds = retention_seconds or settings.job_retention_seconds
+        self.save_interval = (save_interval_ms or settings.job_progress_save_interval_ms) / 1000
+        self.recovery_interval = recovery_interval_seconds or settings.job_recovery_interval_seconds
+        self._jobs: dict[str, Job] = {}
+        self._runners: dict[str, JobRunner] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._recovery_task: Optional[asyncio.Task] = None
+        self._recovery_lock: Optional[int] = None  # fd of the held job_dir lock
+        self._owner: Optional[str] = None  # This worker's owner id while started
+        self._owner_lock: Optional[int] = None  # fd of the held owners/{owner}.lock
+        self._save_lock: Optional[asyncio.Lock] = None  # Serializes state writes (newest snapshot lands last)
+        self._pending_saves: dict[str, asyncio.Task] = {}  # job_id -> coalesced progress save
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def _state_path(self, job_id: str) -> Path:
+        return self.job_dir / f"{job_id}.json"
+
+    def _result_path(self, job_id: str) -> Path:
+        return self.job_dir / f"{job_id}.result.json"
+
+    def _write_json(self, path: Path, data: Any):
+        """Atomic JSON write (temp file + rename)."""
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _save(self, job_id: str, data: dict):
+        try:
+            self._write_json(self._state_path(job_id), data)
+        except OSError as e:
+            logger.warning(f"Failed to persist job {job_id}: {e}")
+
+    async def _persist(self, job: Job):
+        """Write the job's current state now (in a thread); supersedes a coalesced save."""
+        pending = self._pending_saves.pop(job.job_id, None)
+        if pending is not None:
+            pending.cancel()  # Still sleeping: it leaves _pending_saves before writing
+        await self._write_state(job)
+
+    async def _write_state(self, job: Job):
+        async with self._save_lock:
+            # Snapshot taken under the lock, so a later write never carries older state
+            await asyncio.to_thread(self._save, job.job_id, job.to_dict())
+
+    def _persist_soon(self, job: Job):
+        """Coalesce progress updates into one write per save interval."""
+        if job.job_id not in self._pending_saves:
+            self._pending_saves[job.job_id] = asyncio.get_running_loop().create_task(self._persist_later(job))
+
+    async def _persist_later(self, job: Job):
+        await asyncio.sleep(self.save_interval)
+        del self._pending_saves[job.job_id]  # Updates from here on schedule another save
+        await self._write_state(job)
+
+    def _live_owners(self) -> set[str]:
+        """Owners whose worker still runs (blocking); lock files of exited workers are removed."""
+        if fcntl is None:
+            return {self._owner}
+
+        live = set()
+        for path in (self.job_dir / "owners").glob("*.lock"):
+            if path.stem == self._owner:
+                live.add(path.stem)
+                continue
+            try:
+                fd = os.open(path, os.O_RDWR)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                live.add(path.stem)  # Held: its worker is running
+            else:
+                path.unlink(missing_ok=True)
+            finally:
+                os.close(fd)
+        return live
+
+    def _load(self) -> tuple[list[Job], set[str]]:
+        """Read persisted jobs (blocking), dropping finished ones past retention; returns (jobs, live owners)."""
+        if not self.job_dir.exists():
+            return [], set()
+
+        live_owners = self._live_owners()
+        now = time.time()
+        jobs = []
+        for path in self.job_dir.glob("*.json"):
+            if path.name.endswith(".result.json"):
+                continue
+            try:
+                with open(path) as f:
+                    job = Job.from_dict(json.load(f))
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Skipping unreadable job file {path.name}: {e}")
+                continue
+
+            if job.is_finished and job.finished_at and now - job.finished_at > self.retention_seconds:
+                self._delete_files(job.job_id)
+                continue
+            jobs.append(job)
+
+        return jobs, live_owners
+
+    async def _recover(self) -> int:
+        """Adopt and re-queue unfinished jobs whose worker exited (recovery lock held). Returns count."""
+        jobs, live_owners = await asyncio.to_thread(self._load)
+
+        pending = []
+        for job in jobs:
+            if job.job_id in self._jobs:
+                continue
+            if not job.is_finished:
+                if job.owner in live_owners:
+                    continue  # Queued or running on another worker
+                # Interrupted by a restart or crash - run again from the persisted request
+                job.status = JobStatus.QUEUED
+                job.stage = None
+                job.started_at = None
+                job.owner = self._owner
+                job.images = [{**img, "status": "pending", "error": None} for img in job.images]
+                pending.append(job)
+            self._jobs[job.job_id] = job
+
+        for job in sorted(pending, key=lambda j: j.created_at):
+            await self._persist(job)
+            self._queue.put_nowait(job.job_id)
+        return len(pending)
+
+    def _read(self, job_id: str) -> Optional[Job]:
+        """Load one job's state from disk (jobs submitted to other workers)."""
+        if not job_id.isalnum():
+            return None
+        try:
+            with open(self._state_path(job_id)) as f:
+                return Job.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to read job {job_id}: {e}")
+            return None
+
+    def _acquire_owner_lock(self):
+        """Register this worker as a job owner (lock held until stop)."""
+        self._owner = uuid.uuid4().hex
+        if fcntl is None:
+            return
+        owners_dir = self.job_dir / "owners"
+        owners_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(owners_dir / f"{self._owner}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        self._owner_lock = fd
+
+    def _release_owner_lock(self):
+        if self._owner_lock is not None:
+            (self.job_dir / "owners" / f"{self._owner}.lock").unlink(missing_ok=True)
+            os.close(self._owner_lock)
+            self._owner_lock = None
+
+    def _acquire_recovery_lock(self) -> bool:
+        """Try to become the worker that re-queues interrupted jobs (held until stop)."""
+        if fcntl is None:
+            return True
+        fd = os.open(self.job_dir / "recovery.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._recovery_lock = fd
+        return True
+
+    def _release_recovery_lock(self):
+        if self._recovery_lock is not None:
+            os.close(self._recovery_lock)  # Releases the flock
+            self._recovery_lock = None
+
+    def _delete_files(self, job_id: str):
+        for path in (self._state_path(job_id), self._result_path(job_id)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    def register_runner(self, kind: str, runner: JobRunner):
+        """Register the coroutine that executes jobs of a given kind."""
+        self._runners[kind] = runner
+
+    async def start(self):
+        """Recover persisted jobs and start the worker pool."""
+        if self._workers:
+            return
+
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self._queue = asyncio.Queue()
+        self._save_lock = asyncio.Lock()
+        self._acquire_owner_lock()
+
+        if self._acquire_recovery_lock():
+            recovered = await self._recover()
+            if recovered:
+                logger.info(f"Re-queued {recovered} unfinished job(s)")
+        else:
+            logger.info("Another worker recovers persisted jobs; serving only new ones")
+
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+        self._recovery_task = asyncio.create_task(self._recovery_loop(), name="job-recovery")
+        logger.info(f"Job manager started ({self.num_workers} workers)")
+
+    async def stop(self):
+        """Cancel workers. Running jobs stay persisted as running and are re-queued by the next recovery."""
+        tasks = [*self._workers, *self._pending_saves.values()]
+        if self._recovery_task is not None:
+            tasks.append(self._recovery_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._pending_saves.clear()
+        self._recovery_task = None
+        self._queue = None
+        self._release_recovery_lock()
+        self._release_owner_lock()
+        logger.info("Job manager stopped")
+
+    async def _recovery_loop(self):
+        while True:
+            await asyncio.sleep(self.recovery_interval)
+            try:
+                if self._recovery_lock is None:
+                    if not self._acquire_recovery_lock():
+                        continue
+                    if fcntl is not None:
+                        logger.info("Took over job recovery")
+                recovered = await self._recover()
+                if recovered:
+                    logger.info(f"Re-queued {recovered} job(s) left unfinished by an exited worker")
+            except Exception as e:
+                logger.error(f"Job recovery failed: {e}", exc_info=True)
+
+    # =========================================================================
+    # JOBS
+    # =========================================================================
+
+    async def submit(self, kind: str, session_id: str, request: dict, image_ids: Optional[list[int]] = None) -> Job:
+        """Create, persist and enqueue a job."""
+        if kind not in self._runners:
+            raise ValueError(f"No runner registered for job kind '{kind}'")
+        if self._queue is None:
+            raise RuntimeError("Job manager is not started")
+
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            kind=kind,
+            session_id=session_id,
+            request=request,
+            images=[{"id": i, "status": "pending", "error": None} for i in (image_ids or [])],
+            owner=self._owner,
+        )
+        self._jobs[job.job_id] = job
+        await self._persist(job)
+        self._queue.put_nowait(job.job_id)
+
+        logger.info(f"Queued {kind} job {job.job_id} (session={session_id})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id (from disk if another worker owns it)."""
+        return self._jobs.get(job_id) or self._read(job_id)
+
+    def get_result(self, job_id: str) -> Optional[dict]:
+        """Load a finished job's result from disk."""
+        job = self.get(job_id)
+        if job is None or not job.has_result:
+            return None
+        try:
+            with open(self._result_path(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read result for job {job_id}: {e}")
+            return None
+
+    async def aget(self, job_id: str) -> Optional[Job]:
+        """get() for async handlers (the disk read runs in a thread)."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        return await asyncio.to_thread(self._read, job_id)
+
+    async def aget_result(self, job_id: str) -> Optional[dict]:
+        """get_result() for async handlers (runs in a thread)."""
+        return await asyncio.to_thread(self.get_result, job_id)
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position among queued jobs (None if not queued)."""
+        queued = sorted(
+            (j for j in self._jobs.values() if j.status == JobStatus.QUEUED),
+            key=lambda j: j.created_at,
+        )
+        for position, job in enumerate(queued, start=1):
+            if job.job_id == job_id:
+                return position
+        return None
+
+    def cleanup_finished(self) -> int:
+        """Forget finished jobs past retention. Returns count removed."""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at and now - job.finished_at > self.retention_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._delete_files(job_id)
+        return len(expired)
+
+    def get_stats(self) -> dict:
+        """Get job counts by status."""
+        counts = {status.value: 0 for status in JobStatus}
+        for job in self._jobs.values():
+            counts[job.status.value] += 1
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "jobs": counts,
+        }
+
+    # =========================================================================
+    # WORKERS
+    # =========================================================================
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None and job.status == JobStatus.QUEUED:
+                    await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker error for {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+            self.cleanup_finished()
+
+    def _on_image_progress(self, job: Job, image_id: int, status: str, error: Optional[str]):
+        for img in job.images:
+            if img["id"] == image_id:
+                img["status"] = status
+                img["error"] = error
+                break
+        else:
+            job.images.append({"id": image_id, "status": status, "error": error})
+        self._persist_soon(job)
+
+    def _on_stage(self, job: Job, stage: str):
+        job.stage = stage
+        self._persist_soon(job)
+
+    async def _run(self, job: Job):
+        runner = self._runners[job.kind]
+
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        await self._persist(job)
+
+        # Providers report per-image progress through this context variable
+        token = image_progress.set(
+            lambda image_id, status, error: self._on_image_progress(job, image_id, status, error)
+        )
+        try:
+            result = await runner(job, lambda stage: self._on_stage(job, stage))
+            await asyncio.to_thread(self._write_json, self._result_path(job.job_id), result)
+            job.has_result = True
+            job.status = JobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            # Shutdown - leave the job persisted as running so it is re-queued
+            raise
+        except Exception as e:
+            job.error = str(getattr(e, "detail", None) or e)
+            job.status = JobStatus.FAILED
+            logger.error(f"Job {job.job_id} failed: {job.error}")
+        finally:
+            image_progress.reset(token)
+
+        job.finished_at = time.time()
+        await self._persist(job)
+
+        elapsed_ms = int((job.finished_at - job.started_at) * 1000)
+        logger.info(f"Job {job.job_id} {job.status.value} in {elapsed_ms}ms")
+
+
+# Global instance
+job_manager = JobManager()
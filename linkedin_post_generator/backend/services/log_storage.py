@@ -0,0 +1,222 @@
+"""
+Log Storage
+============
+Compression and size cap for the dated JSONL logs
+(logs/usage_YYYY-MM-DD.jsonl, logs/prompts/*_YYYY-MM-DD.jsonl).
+
+A background task (started in main.lifespan) runs every
+settings.log_maintenance_interval_seconds, in a thread:
+
+1. gzip every closed day file: a day before today, not written to for
+   settings.log_compress_grace_seconds (other workers may still flush
+   yesterday's last batch). Written as name.jsonl.gz next to the
+   original, then the original is removed.
+2. delete the oldest day files until all dated logs fit in
+   settings.log_max_mb. Today's files are never deleted, and neither is
+   the prompt dictionary, which is not a dated file.
+
+Readers use utils.jsonl (read_jsonl / dated_logs), which handles
+plain and compressed files alike. With several workers, only the one
+holding the logs directory's lock does maintenance.
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import time
+from datetime import date
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single worker only
+    fcntl = None
+
+from ..config import settings
+from ..utils.jsonl import COMPRESSED_SUFFIX, dated_logs, log_date
+
+
+logger = logging.getLogger(__name__)
+
+
+class LogStorage:
+    """Compresses closed day logs and caps their total size."""
+
+    def __init__(
+        self,
+        log_dirs: list[Path],
+        max_bytes: Optional[int] = None,
+        interval_seconds: Optional[int] = None,
+        grace_seconds: Optional[int] = None,
+        compress: Optional[bool] = None,
+    ):
+        self.log_dirs = [Path(d) for d in log_dirs]
+        self.max_bytes = max_bytes or settings.log_max_mb * 1024 * 1024
+        self.interval = interval_seconds or settings.log_maintenance_interval_seconds
+        self.grace_seconds = settings.log_compress_grace_seconds if grace_seconds is None else grace_seconds
+        self.compress = settings.log_compression_enabled if compress is None else compress
+
+        self._lock = Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"runs": 0, "compressed": 0, "bytes_saved": 0, "deleted": 0, "bytes_deleted": 0}
+
+    def _files(self) -> list[Path]:
+        """All dated logs, oldest day first."""
+        files = [path for directory in self.log_dirs for path in dated_logs(directory)]
+        return sorted(files, key=lambda p: (log_date(p), p.name))
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    def _compress(self, path: Path) -> int:
+        """gzip one file (atomic); returns bytes saved."""
+        target = path.with_name(path.name + COMPRESSED_SUFFIX)
+        tmp_path = path.with_name(f"{target.name}.{os.getpid()}.tmp")
+        with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp_path, target)
+
+        saved = path.stat().st_size - target.stat().st_size
+        path.unlink()
+        return saved
+
+    def compress_closed(self) -> int:
+        """Compress closed day files. Returns count compressed."""
+        today = date.today()
+        cutoff = time.time() - self.grace_seconds
+        compressed = 0
+        for path in self._files():
+            if path.name.endswith(COMPRESSED_SUFFIX) or log_date(path) >= today:
+                continue
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                saved = self._compress(path)
+            except OSError as e:
+                logger.warning(f"Failed to compress {path}: {e}")
+                continue
+            compressed += 1
+            with self._lock:
+                self._stats["compressed"] += 1
+                self._stats["bytes_saved"] += saved
+        return compressed
+
+    def enforce_cap(self) -> int:
+        """Delete oldest day files beyond max_bytes. Returns count deleted."""
+        today = date.today()
+        files = []
+        for path in self._files():
+            try:
+                files.append((path, path.stat().st_size))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, size in files)
+        deleted = 0
+        for path, size in files:
+            if total <= self.max_bytes:
+                break
+            if log_date(path) >= today:
+                break  # Only today's files are left
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            deleted += 1
+            with self._lock:
+                self._stats["deleted"] += 1
+                self._stats["bytes_deleted"] += size
+            logger.info(f"Deleted {path} ({size} bytes) to keep logs under {self.max_bytes} bytes")
+        return deleted
+
+    def run_once(self) -> dict:
+        """One maintenance pass (compress, then cap). Blocking."""
+        compressed = self.compress_closed() if self.compress else 0
+        deleted = self.enforce_cap()
+        with self._lock:
+            self._stats["runs"] += 1
+        return {"compressed": compressed, "deleted": deleted}
+
+    # =========================================================================
+    # BACKGROUND TASK
+    # =========================================================================
+
+    def _acquire_lock(self) -> Optional[int]:
+        """Non-blocking lock so only one worker maintains the logs (fd or None)."""
+        lock_dir = self.log_dirs[0]
+        lock_dir.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            return -1
+        fd = os.open(lock_dir / ".maintenance.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    def _run_locked(self) -> Optional[dict]:
+        fd = self._acquire_lock()
+        if fd is None:
+            return None
+        try:
+            return self.run_once()
+        finally:
+            if fd >= 0:
+                os.close(fd)
+
+    async def _loop(self):
+        while True:
+            try:
+                result = await asyncio.to_thread(self._run_locked)
+                if result and (result["compressed"] or result["deleted"]):
+                    logger.info(
+                        f"Log maintenance: compressed {result['compressed']}, deleted {result['deleted']} file(s)"
+                    )
+            except Exception as e:
+                logger.error(f"Log maintenance failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start periodic maintenance (first pass right away; called from main.lifespan)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="log-storage")
+
+    async def stop(self):
+        """Stop periodic maintenance."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def get_stats(self) -> dict:
+        """Get log storage statistics."""
+        files = self._files()
+        sizes = []
+        for path in files:
+            try:
+                sizes.append(path.stat().st_size)
+            except FileNotFoundError:
+                sizes.append(0)
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            "files": len(files),
+            "compressed_files": sum(1 for p in files if p.name.endswith(COMPRESSED_SUFFIX)),
+            "total_bytes": sum(sizes),
+            "max_bytes": self.max_bytes,
+            "compression_enabled": self.compress,
+            "running": self._task is not None,
+            **stats,
+        }
+
+
+# Global instance
+log_storage = LogStorage(log_dirs=[Path("logs"), Path("logs/prompts")])
@@ -0,0 +1,217 @@
+"""
+Log Writer
+===========
+Background, batched writer for the JSONL usage and prompt logs.
+
+Loggers used to open the day's file, append one line and close it
+inside the request handler. Now they hand the encoded line to
+log_writer.write(), which only appends it to an in-memory buffer. A flusher
+task (started in main.lifespan) writes the buffer every
+settings.log_flush_interval_ms, or sooner once
+settings.log_flush_batch_size records are waiting. The write runs in a
+thread and does one write() per file per batch, on file handles that
+stay open until the day rolls over.
+
+Backpressure when settings.log_queue_max_records are buffered
+(settings.log_queue_overflow):
+
+- block: the caller flushes the buffer itself (it waits for the disk, nothing is lost)
+- drop:  the record is discarded and counted (unless written with
+         never_drop=True, e.g. prompt dictionary entries other records refer to)
+
+Before start() and after stop() writes go straight to disk, so scripts
+and shutdown paths never lose records. stop() flushes everything.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional
+
+from ..config import settings
+from ..utils.jsonl import jsonl_line
+
+
+logger = logging.getLogger(__name__)
+
+
+class LogWriter:
+    """Buffered append-only writer for JSONL log files."""
+
+    def __init__(
+        self,
+        flush_interval_ms: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_records: Optional[int] = None,
+        overflow: Optional[str] = None,
+    ):
+        self.flush_interval = (flush_interval_ms or settings.log_flush_interval_ms) / 1000
+        self.batch_size = batch_size or settings.log_flush_batch_size
+        self.max_records = max_records or settings.log_queue_max_records
+        self.overflow = overflow or settings.log_queue_overflow
+        if self.overflow not in ("block", "drop"):
+            raise ValueError(f"Unknown log queue overflow mode: {self.overflow} (expected block or drop)")
+
+        self._buffer: list[tuple[Path, bytes]] = []
+        self._buffer_lock = Lock()
+        self._write_lock = Lock()  # Serializes flushes and guards _handles
+        self._handles: dict[Path, int] = {}  # path -> O_APPEND fd
+        self._day: Optional[date] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._stats = {"records": 0, "batches": 0, "dropped": 0, "blocked": 0, "errors": 0}
+
+    # =========================================================================
+    # PRODUCERS
+    # =========================================================================
+
+    def write(
+        self,
+        path: Path,
+        record: dict[str, Any],
+        ensure_ascii: bool = True,
+        never_drop: bool = False,
+    ):
+        """Queue one JSON record for appending to path (never touches the disk unless blocked)."""
+        line = jsonl_line(record, ensure_ascii=ensure_ascii)
+
+        if self._flusher is None:
+            self._flush([(Path(path), line)])
+            return
+
+        with self._buffer_lock:
+            if len(self._buffer) >= self.max_records:
+                if self.overflow == "drop" and not never_drop:
+                    self._stats["dropped"] += 1
+                    if self._stats["dropped"] % 1000 == 1:
+                        logger.warning(f"Log buffer full, dropped {self._stats['dropped']} record(s) so far")
+                    return
+                self._stats["blocked"] += 1
+                batch, self._buffer = self._buffer, []
+            else:
+                batch = None
+            self._buffer.append((Path(path), line))
+            pending = len(self._buffer)
+
+        if batch:
+            # Backpressure: the caller pays for the write it could not queue
+            self._flush(batch)
+        elif pending >= self.batch_size:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    # =========================================================================
+    # FLUSHING
+    # =========================================================================
+
+    def _handle(self, path: Path) -> int:
+        fd = self._handles.get(path)
+        if fd is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._handles[path] = fd
+        return fd
+
+    def _close_handles(self):
+        for fd in self._handles.values():
+            os.close(fd)
+        self._handles.clear()
+
+    def _flush(self, batch: list[tuple[Path, bytes]]):
+        """Append a batch: one write() per file, records in order."""
+        by_path: dict[Path, list[bytes]] = {}
+        for path, line in batch:
+            by_path.setdefault(path, []).append(line)
+
+        with self._write_lock:
+            today = date.today()
+            if today != self._day:
+                # Day rollover: files are named by date, release yesterday's handles
+                self._close_handles()
+                self._day = today
+
+            for path, lines in by_path.items():
+                try:
+                    os.write(self._handle(path), b"".join(lines))
+                except OSError as e:
+                    self._stats["errors"] += 1
+                    logger.error(f"Failed to write {len(lines)} log record(s) to {path}: {e}")
+                    fd = self._handles.pop(path, None)
+                    if fd is not None:
+                        os.close(fd)
+
+            self._stats["records"] += len(batch)
+            self._stats["batches"] += 1
+
+    def _take(self) -> list[tuple[Path, bytes]]:
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+        return batch
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            batch = self._take()
+            if batch:
+                try:
+                    await asyncio.to_thread(self._flush, batch)
+                except Exception as e:
+                    logger.error(f"Log flush failed: {e}", exc_info=True)
+
+    # =========================================================================
+    # LIFECYCLE
+    # =========================================================================
+
+    def start(self):
+        """Start the flusher task (called from main.lifespan)."""
+        if self._flusher is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop(), name="log-writer")
+        logger.info(
+            f"Log writer started (every {int(self.flush_interval * 1000)} ms or "
+            f"{self.batch_size} records, overflow={self.overflow})"
+        )
+
+    async def stop(self):
+        """Stop the flusher and write everything still buffered."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+
+        batch = self._take()
+        if batch:
+            await asyncio.to_thread(self._flush, batch)
+        with self._write_lock:
+            self._close_handles()
+
+    def get_stats(self) -> dict:
+        """Get writer statistics."""
+        with self._buffer_lock:
+            buffered = len(self._buffer)
+            stats = dict(self._stats)
+        return {
+            "running": self._flusher is not None,
+            "buffered": buffered,
+            "max_records": self.max_records,
+            "overflow": self.overflow,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "batch_size": self.batch_size,
+            "open_files": len(self._handles),
+            **stats,
+        }
+
+
+# Global instance
+log_writer = LogWriter()
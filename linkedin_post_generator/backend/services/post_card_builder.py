@@ -20,6 +20,63 @@ from dataclasses import dataclass
 
 from PIL import Image, ImageDraw, ImageFont
 
+from ..utils.fonts import fonts
+from ..utils.image_data import png_bytes
+from ..utils.metrics import metrics
+from ..utils.text_layout import wrap_paragraphs, wrap_text
+
+
+# Base paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_FONTS_DIR = os.path.join(BASE_DIR, "assets", "fonts")
+
+# Post card text fonts
+fonts.register_family(
+    "post_card",
+    {
+        "bold": [
+            "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+            "/System/Library/Fonts/SFNSTextCondensed-Bold.otf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+        ],
+        "regular": [
+            "/System/Library/Fonts/Supplemental/Arial.ttf",
+            "/System/Library/Fonts/SFNS.ttf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        ],
+    },
+    preload_sizes=(28, 32, 44, 48),
+)
+
+# Carousel post card fonts - prioritize Lato (modern, clean, highly readable)
+fonts.register_family(
+    "post_card_carousel",
+    {
+        # Bold fonts - prefer Lato Bold, then Lato Black, then fallbacks
+        "bold": [
+            os.path.join(ASSETS_FONTS_DIR, "Lato-Bold.ttf"),
+            os.path.join(ASSETS_FONTS_DIR, "Lato-Black.ttf"),
+            os.path.join(ASSETS_FONTS_DIR, "Raleway-Bold.ttf"),
+            os.path.join(ASSETS_FONTS_DIR, "SourceSansPro-Bold.ttf"),
+            "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+            "/System/Library/Fonts/SFNSTextCondensed-Bold.otf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        ],
+        # Regular fonts - prefer Lato Medium, then fallbacks
+        "regular": [
+            os.path.join(ASSETS_FONTS_DIR, "Lato-Medium.ttf"),
+            os.path.join(ASSETS_FONTS_DIR, "Raleway-Medium.ttf"),
+            os.path.join(ASSETS_FONTS_DIR, "SourceSansPro-Semibold.ttf"),
+            "/System/Library/Fonts/Supplemental/Arial.ttf",
+            "/System/Library/Fonts/SFNS.ttf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        ],
+    },
+    preload_sizes=(16, 28, 36),
+)
+
 
 @dataclass
 class PostCardStyle:
@@ -107,88 +164,20 @@ class PostCardBuilder:
         self._load_fonts()
 
     def _load_fonts(self):
-        """Load fonts with fallbacks."""
-        bold_paths = [
-            "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
-            "/System/Library/Fonts/SFNSTextCondensed-Bold.otf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-        ]
-
-        regular_paths = [
-            "/System/Library/Fonts/Supplemental/Arial.ttf",
-            "/System/Library/Fonts/SFNS.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-        ]
-
+        """Load fonts with fallbacks (shared font registry)."""
         self.fonts = {}
 
-        # Load bold fonts - name, text, and button sizes
+        # Bold fonts - name, text, and button sizes
         for size_name, size in [('name', self.style.name_size), ('text', self.style.text_size), ('button', 28)]:
-            loaded = False
-            for path in bold_paths:
-                try:
-                    self.fonts[f'bold_{size_name}'] = ImageFont.truetype(path, size)
-                    loaded = True
-                    break
-                except (OSError, IOError):
-                    continue
-            if not loaded:
-                self.fonts[f'bold_{size_name}'] = ImageFont.load_default()
+            self.fonts[f'bold_{size_name}'] = fonts.get("post_card", "bold", size)
 
-        # Load regular fonts
+        # Regular fonts
         for size_name, size in [('handle', self.style.handle_size), ('text', self.style.text_size)]:
-            loaded = False
-            for path in regular_paths:
-                try:
-                    self.fonts[f'regular_{size_name}'] = ImageFont.truetype(path, size)
-                    loaded = True
-                    break
-                except (OSError, IOError):
-                    continue
-            if not loaded:
-                self.fonts[f'regular_{size_name}'] = ImageFont.load_default()
+            self.fonts[f'regular_{size_name}'] = fonts.get("post_card", "regular", size)
 
     def _load_font_for_size(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         """Load font for a specific size (used for carousel). Prefers Lato from assets."""
-        # Get assets fonts directory
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        assets_fonts_dir = os.path.join(base_dir, "assets", "fonts")
-
-        # Prioritize Lato fonts (modern, clean, highly readable)
-        font_paths = []
-
-        if bold:
-            # Bold fonts - prefer Lato Bold, then Lato Black, then fallbacks
-            font_paths = [
-                os.path.join(assets_fonts_dir, "Lato-Bold.ttf"),
-                os.path.join(assets_fonts_dir, "Lato-Black.ttf"),
-                os.path.join(assets_fonts_dir, "Raleway-Bold.ttf"),
-                os.path.join(assets_fonts_dir, "SourceSansPro-Bold.ttf"),
-                "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
-                "/System/Library/Fonts/SFNSTextCondensed-Bold.otf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            ]
-        else:
-            # Regular fonts - prefer Lato Medium, then fallbacks
-            font_paths = [
-                os.path.join(assets_fonts_dir, "Lato-Medium.ttf"),
-                os.path.join(assets_fonts_dir, "Raleway-Medium.ttf"),
-                os.path.join(assets_fonts_dir, "SourceSansPro-Semibold.ttf"),
-                "/System/Library/Fonts/Supplemental/Arial.ttf",
-                "/System/Library/Fonts/SFNS.ttf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            ]
-
-        for path in font_paths:
-            try:
-                if os.path.exists(path):
-                    return ImageFont.truetype(path, size)
-            except (OSError, IOError):
-                continue
-
-        return ImageFont.load_default()
+        return fonts.get("post_card_carousel", "bold" if bold else "regular", size)
 
     def _draw_carousel_footer(self, draw: ImageDraw.Draw, y_start: int, height: int, style: PostCardStyle):
         """Draw a compact footer with icons for carousel postcards (consistent with cover)."""
@@ -359,25 +348,8 @@ class PostCardBuilder:
         )
 
     def _wrap_text(self, text: str, font: ImageFont, max_width: int) -> list[str]:
-        """Wrap text to fit within max_width."""
-        words = text.split()
-        lines = []
-        current_line = []
-
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = font.getbbox(test_line)
-            if bbox[2] <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-
-        if current_line:
-            lines.append(' '.join(current_line))
-
-        return lines
+        """Wrap text to fit within max_width (memoized, see utils.text_layout)."""
+        return list(wrap_text(text, font, max_width, mode="extent"))
 
     def _draw_avatar(
         self,
@@ -422,7 +394,7 @@ class PostCardBuilder:
 
         # Add initials
         initials = ''.join([n[0].upper() for n in s.name.split()[:2]])
-        font = self.fonts.get('bold_name', ImageFont.load_default())
+        font = self.fonts['bold_name']
 
         draw.text(
             (size // 2, size // 2),
@@ -450,6 +422,7 @@ class PostCardBuilder:
         ]
         draw.line(check_points, fill=(255, 255, 255), width=max(2, size // 8))
 
+    @metrics.timed("render.post_card")
     def build(
         self,
         post_text: str,
@@ -458,7 +431,7 @@ class PostCardBuilder:
         is_carousel: bool = False,  # Flag for carousel-specific styling
         is_section: bool = False,  # Flag to indicate section card (larger title)
         is_takeaway: bool = False,  # Flag to indicate takeaway/conclusion card
-    ) -> tuple[str, int]:
+    ) -> tuple[bytes, int]:
         """
         Build a post card image with dynamic height based on content.
 
@@ -468,8 +441,28 @@ class PostCardBuilder:
             short_post: Optional shortened version of the post (PLAIN TEXT ONLY)
 
         Returns:
-            Base64 encoded PNG image
+            Tuple of (PNG bytes, height)
         """
+        image, calculated_height = self.render(
+            post_text=post_text,
+            avatar_base64=avatar_base64,
+            short_post=short_post,
+            is_carousel=is_carousel,
+            is_section=is_section,
+            is_takeaway=is_takeaway,
+        )
+        return png_bytes(image, optimize=True), calculated_height
+
+    def render(
+        self,
+        post_text: str,
+        avatar_base64: Optional[str] = None,
+        short_post: Optional[str] = None,
+        is_carousel: bool = False,
+        is_section: bool = False,
+        is_takeaway: bool = False,
+    ) -> tuple[Image.Image, int]:
+        """Same as build(), but returns the PIL image (for further compositing)."""
         s = self.style
 
         # For postcards, prefer short_post (punchy summary) over full post_text
@@ -487,7 +480,7 @@ class PostCardBuilder:
             calculated_height = s.height  # Fixed 512x512 for carousel
         else:
             # Calculate dynamic height based on actual content (no truncation - show all text)
-            text_font = self.fonts.get('regular_text', ImageFont.load_default())
+            text_font = self.fonts['regular_text']
             content_width = s.width - (s.padding * 2)
 
             # Get actual line height from font
@@ -495,21 +488,20 @@ class PostCardBuilder:
             actual_line_height = sample_bbox[3] - sample_bbox[1]
             line_height = int(actual_line_height * 1.5)  # 1.5x line spacing
 
-            # Process paragraphs and count actual rendered lines
-            paragraphs = display_text.split('\n')
+            # Wrap once: the same lines are drawn below
+            paragraph_lines = wrap_paragraphs(display_text, text_font, content_width, mode="extent")
             total_content_height = 0
             paragraph_gap = 25  # Gap between paragraphs (MUST match rendering)
 
-            for i, para in enumerate(paragraphs):
-                if para.strip():
-                    wrapped = self._wrap_text(para.strip(), text_font, content_width)
-                    total_content_height += len(wrapped) * line_height
+            for i, lines in enumerate(paragraph_lines):
+                if lines:
+                    total_content_height += len(lines) * line_height
                 else:
                     # Empty line = half paragraph gap
                     total_content_height += paragraph_gap // 2
 
                 # Add paragraph gap after each paragraph (except last)
-                if i < len(paragraphs) - 1 and para.strip():
+                if i < len(paragraph_lines) - 1 and lines:
                     total_content_height += paragraph_gap
 
             # Calculate height: header + text content + bottom padding
@@ -546,12 +538,12 @@ class PostCardBuilder:
             text_x = avatar_x + s.avatar_size + 20
 
             # Get name dimensions for proper vertical alignment
-            name_font = self.fonts.get('bold_name', ImageFont.load_default())
+            name_font = self.fonts['bold_name']
             name_bbox = name_font.getbbox(s.name)
             name_height = name_bbox[3] - name_bbox[1]
 
             # Handle dimensions
-            handle_font = self.fonts.get('regular_handle', ImageFont.load_default())
+            handle_font = self.fonts['regular_handle']
             handle_bbox = handle_font.getbbox(s.handle)
             handle_height = handle_bbox[3] - handle_bbox[1]
 
@@ -579,7 +571,7 @@ class PostCardBuilder:
             draw.text((text_x, handle_y), s.handle, font=handle_font, fill=s.secondary_color)
 
             # Follow button (right side of header) - elegant pill shape
-            follow_font = self.fonts.get('bold_button', ImageFont.load_default())
+            follow_font = self.fonts['bold_button']
             follow_text = "+ Follow"
 
             # Calculate text dimensions first
@@ -826,36 +818,21 @@ class PostCardBuilder:
             # Draw compact footer for carousel postcards
             self._draw_carousel_footer(draw, s.height - footer_height, footer_height, s)
         else:
-            # Non-carousel: use existing logic
-            text_font = self.fonts.get('regular_text', ImageFont.load_default())
-            text_bbox = text_font.getbbox("Ayg")
-            line_height = int((text_bbox[3] - text_bbox[1]) * 1.5)
-            paragraphs = display_text.split('\n')
-
-            # Calculate content width for text wrapping
-            content_width = s.width - (s.padding * 2)
-
-            for i, para in enumerate(paragraphs):
-                if not para.strip():
+            # Non-carousel: draw the lines wrapped for the height calculation
+            for i, lines in enumerate(paragraph_lines):
+                if not lines:
                     y += paragraph_gap // 2  # Empty line = half paragraph gap
                     continue
 
-                lines = self._wrap_text(para.strip(), text_font, content_width)
-
                 for line in lines:
                     draw.text((s.padding, y), line, font=text_font, fill=s.text_color)
                     y += line_height
 
                 # Add paragraph gap after each paragraph (except last)
-                if i < len(paragraphs) - 1:
+                if i < len(paragraph_lines) - 1:
                     y += paragraph_gap
 
-        # Convert to bytes
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG', optimize=True)
-        buffer.seek(0)
-
-        return base64.b64encode(buffer.read()).decode('utf-8'), calculated_height
+        return image, calculated_height
 
 
 # Convenience function
@@ -866,11 +843,11 @@ def create_post_card(
     theme: Literal['dark', 'light'] = 'dark',
     name: str = "Your Name",
     handle: str = "@yourusername",
-) -> tuple[str, int]:
+) -> tuple[bytes, int]:
     """
     Quick function to create a post card.
 
-    Returns tuple of (base64 encoded PNG, height).
+    Returns tuple of (PNG bytes, height).
     """
     style = PostCardStyle(
         theme=theme,
@@ -4,13 +4,25 @@ Prompt Logger Service
 Logs all prompts sent to AI models for debugging and transparency.
 
 Simplified single-user architecture (no multi-tenancy).
+
+The logger holds no state besides its directory, so the per-process
+singleton is safe with several workers. Entries are handed to the
+background log writer (services.log_writer), which appends them in
+batches off the request path.
+
+System prompts are stored once per distinct text in a content-hashed
+side file (utils.prompt_dictionary) and records reference them by
+SHA-256; `python -m backend.utils.prompt_dictionary` prints full records.
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
+from threading import Lock
 from typing import Optional, Any
 
+from ..utils.prompt_dictionary import DICTIONARY_NAME, load_prompt_dictionary, prompt_hash
+from .log_writer import log_writer
+
 
 class PromptLogger:
     """Logs prompts sent to AI models."""
@@ -20,6 +32,27 @@ class PromptLogger:
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
+        # Hashes already in the prompt dictionary (another worker may append
+        # the same prompt again - the copies are identical)
+        self._known_prompts = set(load_prompt_dictionary(self.log_dir))
+        self._lock = Lock()
+
+    def _prompt_ref(self, prompt: str) -> str:
+        """Hash of a prompt, storing its text in the dictionary the first time."""
+        digest = prompt_hash(prompt)
+        with self._lock:
+            if digest in self._known_prompts:
+                return digest
+            self._known_prompts.add(digest)
+
+        log_writer.write(
+            self.log_dir / DICTIONARY_NAME,
+            {"sha256": digest, "prompt": prompt},
+            ensure_ascii=False,
+            never_drop=True,
+        )
+        return digest
+
     def log_text_generation(
         self,
         session_id: str,
@@ -41,15 +74,14 @@ class PromptLogger:
             "session_id": session_id,
             "provider": provider,
             "model": model,
-            "system_prompt": system_prompt,
+            "system_prompt_sha256": self._prompt_ref(system_prompt),
             "user_input": user_input,
             "response": response,
             "error": error,
         }
 
         log_file = self.log_dir / f"text_prompts_{date_str}.jsonl"
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        log_writer.write(log_file, log_entry, ensure_ascii=False)
 
     def log_pipeline_step(
         self,
@@ -82,7 +114,7 @@ class PromptLogger:
             "model": model,
             "step_number": step_number,
             "step_name": step_name,
-            "system_prompt": system_prompt,
+            "system_prompt_sha256": self._prompt_ref(system_prompt),
             "user_prompt": user_prompt,
             "output": output,
             "tokens_used": tokens_used,
@@ -90,8 +122,7 @@ class PromptLogger:
         }
 
         log_file = self.log_dir / f"text_prompts_{date_str}.jsonl"
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        log_writer.write(log_file, log_entry, ensure_ascii=False)
 
     def log_image_generation(
         self,
@@ -121,8 +152,7 @@ class PromptLogger:
         }
 
         log_file = self.log_dir / f"image_prompts_{date_str}.jsonl"
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        log_writer.write(log_file, log_entry, ensure_ascii=False)
 
 # Singleton instance
 _prompt_logger: Optional[PromptLogger] = None
@@ -18,17 +18,91 @@ import base64
 import io
 import os
 import random
+from functools import lru_cache
 from typing import Optional, Literal, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
+from ..utils.fonts import fonts
+from ..utils.metrics import metrics
+from ..utils.text_layout import wrap_text
+
 
 # Base paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ASSETS_FONTS_DIR = os.path.join(BASE_DIR, "assets", "fonts")
 
+# Font sizes by key
+FONT_SIZES = {
+    "title_large": 56,
+    "title": 44,
+    "body": 36,
+    "body_large": 42,
+    "subtitle": 28,
+    "footer": 18,
+    "handle": 24,
+}
+
+_SYSTEM_FALLBACKS = [
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+
+def _assets_fonts(*names: str) -> list[str]:
+    return [os.path.join(ASSETS_FONTS_DIR, name) for name in names]
+
+
+# One weight per font key (preferred assets fonts, then system fonts), plus
+# bold/regular for arbitrary sizes (assets fonts only)
+fonts.register_family(
+    "quote_card",
+    {
+        "title_large": _assets_fonts("Raleway-Heavy.ttf", "Lato-Black.ttf") + _SYSTEM_FALLBACKS,
+        "title": _assets_fonts("Raleway-Bold.ttf", "Lato-Bold.ttf") + _SYSTEM_FALLBACKS,
+        "body": _assets_fonts("Lato-Medium.ttf", "SourceSansPro-Semibold.ttf") + _SYSTEM_FALLBACKS,
+        "body_large": _assets_fonts("Lato-Medium.ttf", "SourceSansPro-Semibold.ttf") + _SYSTEM_FALLBACKS,
+        "subtitle": _assets_fonts("Lato-Medium.ttf", "SourceSansPro-Semibold.ttf") + _SYSTEM_FALLBACKS,
+        "footer": _assets_fonts("Lato-Bold.ttf", "SourceSansPro-Bold.ttf") + _SYSTEM_FALLBACKS,
+        "handle": _assets_fonts("Lato-Medium.ttf") + _SYSTEM_FALLBACKS,
+        "bold": _assets_fonts("Lato-Bold.ttf", "Raleway-Bold.ttf"),
+        "regular": _assets_fonts("Lato-Medium.ttf", "SourceSansPro-Semibold.ttf"),
+    },
+)
+
+
+def _speckle(
+    width: int,
+    height: int,
+    base_color: Tuple[int, int, int],
+    grey_range: Tuple[int, int],
+    every: int,
+    seed: int,
+) -> Image.Image:
+    """
+    Base color with grey dots on about one pixel in `every` (paper-like noise).
+
+    Built from seeded random bytes mapped through lookup tables, so the
+    whole texture is a handful of C-level Pillow operations instead of a
+    putpixel per dot.
+    """
+    rng = random.Random(seed)
+    size = (width, height)
+    threshold = max(1, round(256 / every))
+    low, high = grey_range
+    span = high - low + 1
+
+    mask = Image.frombytes("L", size, rng.randbytes(width * height))
+    mask = mask.point([255 if v < threshold else 0 for v in range(256)])
+    greys = Image.frombytes("L", size, rng.randbytes(width * height))
+    greys = greys.point([low + v % span for v in range(256)])
+
+    return Image.composite(Image.merge("RGB", (greys, greys, greys)), Image.new("RGB", size, base_color), mask)
+
 
 class QuoteStyle(str, Enum):
     """Visual styles for quote cards."""
@@ -46,6 +120,7 @@ class QuoteCardConfig:
     width: int = 900
     height: int = 1200
     style: QuoteStyle = QuoteStyle.PAPER_TEXTURE
+    texture_seed: int = 0  # Noise seed for textured styles (backgrounds are cached per seed)
 
     # Text settings
     main_text: str = ""
@@ -77,103 +152,38 @@ class QuoteCardBuilder:
         self._load_fonts()
 
     def _load_fonts(self):
-        """Load fonts with fallbacks, prioritizing assets fonts."""
-        self.fonts = {}
-
-        # Font configurations: (key, size, bold, preferred_fonts)
-        font_configs = [
-            ("title_large", 56, True, ["Raleway-Heavy.ttf", "Lato-Black.ttf"]),
-            ("title", 44, True, ["Raleway-Bold.ttf", "Lato-Bold.ttf"]),
-            ("body", 36, False, ["Lato-Medium.ttf", "SourceSansPro-Semibold.ttf"]),
-            ("body_large", 42, False, ["Lato-Medium.ttf", "SourceSansPro-Semibold.ttf"]),
-            ("subtitle", 28, False, ["Lato-Medium.ttf", "SourceSansPro-Semibold.ttf"]),
-            ("footer", 18, True, ["Lato-Bold.ttf", "SourceSansPro-Bold.ttf"]),
-            ("handle", 24, False, ["Lato-Medium.ttf"]),
-        ]
-
-        system_fallbacks = [
-            "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
-            "/System/Library/Fonts/Supplemental/Arial.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        ]
-
-        for key, size, bold, preferred in font_configs:
-            font = None
-
-            # Try preferred fonts from assets
-            for font_name in preferred:
-                path = os.path.join(ASSETS_FONTS_DIR, font_name)
-                if os.path.exists(path):
-                    try:
-                        font = ImageFont.truetype(path, size)
-                        break
-                    except (OSError, IOError):
-                        continue
-
-            # Fallback to system fonts
-            if font is None:
-                for path in system_fallbacks:
-                    try:
-                        font = ImageFont.truetype(path, size)
-                        break
-                    except (OSError, IOError):
-                        continue
-
-            # Final fallback
-            if font is None:
-                font = ImageFont.load_default()
-
-            self.fonts[key] = font
+        """Load fonts with fallbacks, prioritizing assets fonts (shared font registry)."""
+        self.fonts = {key: fonts.get("quote_card", key, size) for key, size in FONT_SIZES.items()}
 
     def _get_font(self, key: str) -> ImageFont.FreeTypeFont:
         """Get font by key."""
-        return self.fonts.get(key, ImageFont.load_default())
+        font = self.fonts.get(key)
+        return font if font is not None else ImageFont.load_default()
 
     def _load_font_for_size(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
         """Load font for a specific size."""
-        font_files = (
-            ["Lato-Bold.ttf", "Raleway-Bold.ttf"] if bold
-            else ["Lato-Medium.ttf", "SourceSansPro-Semibold.ttf"]
-        )
-
-        for font_name in font_files:
-            path = os.path.join(ASSETS_FONTS_DIR, font_name)
-            if os.path.exists(path):
-                try:
-                    return ImageFont.truetype(path, size)
-                except (OSError, IOError):
-                    continue
+        return fonts.get("quote_card", "bold" if bold else "regular", size)
 
-        return ImageFont.load_default()
-
-    def _create_paper_texture(self, width: int, height: int) -> Image.Image:
+    @staticmethod
+    def _create_paper_texture(width: int, height: int, seed: int = 0) -> Image.Image:
         """Create a subtle paper texture background."""
-        # Base cream/off-white color
-        base_color = (252, 250, 245)  # Warm off-white
-        img = Image.new('RGB', (width, height), base_color)
-        draw = ImageDraw.Draw(img)
-
-        # Add subtle noise for paper texture
-        for _ in range(width * height // 50):
-            x = random.randint(0, width - 1)
-            y = random.randint(0, height - 1)
-            # Subtle grey dots
-            grey = random.randint(240, 252)
-            img.putpixel((x, y), (grey, grey, grey))
+        # Warm off-white base with subtle grey dots on ~1 in 50 pixels
+        img = _speckle(width, height, (252, 250, 245), (240, 252), every=50, seed=seed)
 
         # Apply slight blur for smoothness
         img = img.filter(ImageFilter.GaussianBlur(radius=0.5))
 
         return img
 
-    def _create_dark_solid(self, width: int, height: int) -> Image.Image:
+    @staticmethod
+    def _create_dark_solid(width: int, height: int, seed: int = 0) -> Image.Image:
         """Create a dark solid background (Jean Lee style)."""
         # Deep dark blue-grey
         base_color = (30, 39, 46)  # #1e272e
         return Image.new('RGB', (width, height), base_color)
 
-    def _create_grid_paper(self, width: int, height: int) -> Image.Image:
+    @staticmethod
+    def _create_grid_paper(width: int, height: int, seed: int = 0) -> Image.Image:
         """Create a grid paper background."""
         # White base
         img = Image.new('RGB', (width, height), (255, 255, 255))
@@ -193,22 +203,16 @@ class QuoteCardBuilder:
 
         return img
 
-    def _create_highlight_bg(self, width: int, height: int) -> Image.Image:
+    @staticmethod
+    def _create_highlight_bg(width: int, height: int, seed: int = 0) -> Image.Image:
         """Create a grey textured background for highlight style."""
-        base_color = (235, 235, 235)  # Light grey
-        img = Image.new('RGB', (width, height), base_color)
-
-        # Add subtle texture
-        for _ in range(width * height // 30):
-            x = random.randint(0, width - 1)
-            y = random.randint(0, height - 1)
-            grey = random.randint(230, 240)
-            img.putpixel((x, y), (grey, grey, grey))
-
+        # Light grey base with subtle texture on ~1 in 30 pixels
+        img = _speckle(width, height, (235, 235, 235), (230, 240), every=30, seed=seed)
         img = img.filter(ImageFilter.GaussianBlur(radius=0.3))
         return img
 
-    def _create_whiteboard(self, width: int, height: int) -> Image.Image:
+    @staticmethod
+    def _create_whiteboard(width: int, height: int, seed: int = 0) -> Image.Image:
         """Create a whiteboard background."""
         # Slightly off-white with subtle gradient
         img = Image.new('RGB', (width, height), (250, 252, 255))
@@ -235,23 +239,30 @@ class QuoteCardBuilder:
 
         return img
 
-    def _create_minimal(self, width: int, height: int) -> Image.Image:
+    @staticmethod
+    def _create_minimal(width: int, height: int, seed: int = 0) -> Image.Image:
         """Create a minimal white background."""
         return Image.new('RGB', (width, height), (255, 255, 255))
 
-    def _create_background(self, config: QuoteCardConfig) -> Image.Image:
-        """Create background based on style."""
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _cached_background(style: QuoteStyle, width: int, height: int, seed: int) -> Image.Image:
+        """Background per (style, width, height, seed), shared: callers must copy before drawing."""
         creators = {
-            QuoteStyle.PAPER_TEXTURE: self._create_paper_texture,
-            QuoteStyle.DARK_SOLID: self._create_dark_solid,
-            QuoteStyle.GRID_PAPER: self._create_grid_paper,
-            QuoteStyle.HIGHLIGHT: self._create_highlight_bg,
-            QuoteStyle.WHITEBOARD: self._create_whiteboard,
-            QuoteStyle.MINIMAL: self._create_minimal,
+            QuoteStyle.PAPER_TEXTURE: QuoteCardBuilder._create_paper_texture,
+            QuoteStyle.DARK_SOLID: QuoteCardBuilder._create_dark_solid,
+            QuoteStyle.GRID_PAPER: QuoteCardBuilder._create_grid_paper,
+            QuoteStyle.HIGHLIGHT: QuoteCardBuilder._create_highlight_bg,
+            QuoteStyle.WHITEBOARD: QuoteCardBuilder._create_whiteboard,
+            QuoteStyle.MINIMAL: QuoteCardBuilder._create_minimal,
         }
 
-        creator = creators.get(config.style, self._create_paper_texture)
-        return creator(config.width, config.height)
+        creator = creators.get(style, QuoteCardBuilder._create_paper_texture)
+        return creator(width, height, seed)
+
+    def _create_background(self, config: QuoteCardConfig) -> Image.Image:
+        """Create background based on style (a copy of the cached background)."""
+        return self._cached_background(config.style, config.width, config.height, config.texture_seed).copy()
 
     def _get_text_color(self, style: QuoteStyle) -> Tuple[int, int, int]:
         """Get appropriate text color for background style."""
@@ -270,25 +281,8 @@ class QuoteCardBuilder:
             return (100, 100, 100)  # Dark grey on light
 
     def _wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list[str]:
-        """Wrap text to fit within max_width."""
-        words = text.split()
-        lines = []
-        current_line = []
-
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = font.getbbox(test_line)
-            if bbox[2] <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-
-        if current_line:
-            lines.append(' '.join(current_line))
-
-        return lines
+        """Wrap text to fit within max_width (memoized, see utils.text_layout)."""
+        return list(wrap_text(text, font, max_width, mode="extent"))
 
     def _draw_highlighted_text(
         self,
@@ -299,10 +293,12 @@ class QuoteCardBuilder:
         y: int,
         max_width: int,
         text_color: Tuple[int, int, int],
-        highlight_color: Tuple[int, int, int] = (255, 247, 140)  # Yellow highlight
+        highlight_color: Tuple[int, int, int] = (255, 247, 140),  # Yellow highlight
+        lines: Optional[list[str]] = None,
     ) -> int:
-        """Draw text with highlight effect (like Sibel Terhaar quote)."""
-        lines = self._wrap_text(text, font, max_width)
+        """Draw text with highlight effect (like Sibel Terhaar quote); pass lines if already wrapped."""
+        if lines is None:
+            lines = self._wrap_text(text, font, max_width)
 
         # Get line height
         sample_bbox = font.getbbox("Ayg")
@@ -443,6 +439,7 @@ class QuoteCardBuilder:
 
         return avatar_y + avatar_size + 40  # Return new y position
 
+    @metrics.timed("render.quote_card")
     def build(self, config: QuoteCardConfig) -> str:
         """
         Build a quote card image.
@@ -489,7 +486,7 @@ class QuoteCardBuilder:
         line_height = int((sample_bbox[3] - sample_bbox[1]) * 1.5)
         total_text_height = len(lines) * line_height
 
-        # Add subtitle height if present
+        # Add subtitle height if present (lines reused when drawing)
         if config.subtitle:
             subtitle_font = self._get_font("subtitle")
             subtitle_lines = self._wrap_text(config.subtitle, subtitle_font, content_width)
@@ -508,7 +505,7 @@ class QuoteCardBuilder:
             text_y = self._draw_highlighted_text(
                 draw, config.main_text, text_font,
                 padding, text_start_y, content_width,
-                text_color
+                text_color, lines=lines,
             )
         else:
             # Regular text drawing
@@ -520,11 +517,6 @@ class QuoteCardBuilder:
         # Draw subtitle/attribution
         if config.subtitle:
             text_y += 30  # Gap before subtitle
-            subtitle_font = self._get_font("subtitle")
-            subtitle_lines = self._wrap_text(config.subtitle, subtitle_font, content_width)
-            sub_bbox = subtitle_font.getbbox("Ayg")
-            sub_line_height = int((sub_bbox[3] - sub_bbox[1]) * 1.4)
-
             for line in subtitle_lines:
                 draw.text((padding, text_y), line, font=subtitle_font, fill=subtitle_color)
                 text_y += sub_line_height
@@ -541,6 +533,7 @@ class QuoteCardBuilder:
 
         return base64.b64encode(buffer.read()).decode('utf-8')
 
+    @metrics.timed("render.quote_card")
     def build_from_ai_background(
         self,
         ai_image_base64: str,
@@ -0,0 +1,158 @@
+"""
+Redis Protocol Client
+======================
+Minimal asyncio client for the Redis wire protocol (RESP2).
+
+Covers what the shared-state backends need (GET/SET/DEL/EXPIRE, hashes,
+sorted sets, pipelines) without adding a dependency. Works against
+Redis, Valkey, KeyDB or any local fake that speaks RESP.
+
+URL format: redis://[:password@]host[:port][/db]
+"""
+
+import asyncio
+import logging
+from typing import Any, Optional, Sequence
+from urllib.parse import unquote, urlparse
+
+
+logger = logging.getLogger(__name__)
+
+
+class RedisError(Exception):
+    """Error reply from the server, or a protocol/connection failure."""
+    pass
+
+
+def _encode_command(args: Sequence[Any]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode("utf-8")
+        else:
+            data = str(arg).encode("utf-8")
+        parts.append(f"${len(data)}\r\n".encode())
+        parts.append(data)
+        parts.append(b"\r\n")
+    return b"".join(parts)
+
+
+class RedisClient:
+    """
+    Single-connection RESP client.
+
+    Commands are serialized over one connection (a lock guards each
+    round trip); pipeline() sends a batch in one write. The connection
+    is opened lazily and re-opened if it drops (see pipeline() for when a
+    batch is retried).
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", ""):
+            raise ValueError(f"Unsupported Redis URL scheme: {parsed.scheme}")
+
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        if self.password:
+            await self._roundtrip([("AUTH", self.password)])
+        if self.db:
+            await self._roundtrip([("SELECT", self.db)])
+        logger.info(f"Connected to Redis at {self.host}:{self.port}/{self.db}")
+
+    async def _disconnect(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self._reader = self._writer = None
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by Redis server")
+
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count == -1:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected RESP reply type: {kind!r}")
+
+    async def _roundtrip(self, commands: list[Sequence[Any]]) -> list[Any]:
+        self._writer.write(b"".join(_encode_command(cmd) for cmd in commands))
+        await self._writer.drain()
+        return [
+            await asyncio.wait_for(self._read_reply(), self.timeout)
+            for _ in commands
+        ]
+
+    async def pipeline(self, commands: list[Sequence[Any]], idempotent: bool = True) -> list[Any]:
+        """
+        Send several commands in one write; returns replies in order (errors raise).
+
+        A batch that fails before it is sent (connect/auth, or a connection
+        the server already closed) is retried once on a new connection. Once
+        sent, the server may have applied it even if the reply never arrives,
+        so a failure after that point is only retried for idempotent batches
+        (pass idempotent=False for e.g. HINCRBY).
+        """
+        async with self._lock:
+            for attempt in (1, 2):
+                sent = False
+                try:
+                    if self._writer is None or self._reader.at_eof() or self._writer.is_closing():
+                        await self._disconnect()
+                        await self._connect()
+                    sent = True
+                    replies = await self._roundtrip(commands)
+                    break
+                except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                    await self._disconnect()
+                    if attempt == 2 or (sent and not idempotent):
+                        raise RedisError(f"Redis connection failed: {e}") from e
+                    logger.warning(f"Redis connection lost ({e}), reconnecting")
+
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def execute(self, *args: Any, idempotent: bool = True) -> Any:
+        """Run a single command."""
+        return (await self.pipeline([args], idempotent=idempotent))[0]
+
+    async def close(self):
+        """Close the connection."""
+        async with self._lock:
+            await self._disconnect()
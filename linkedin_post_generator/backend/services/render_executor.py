@@ -0,0 +1,262 @@
+"""
+Render Executor
+================
+Runs CPU-heavy Pillow/reportlab rendering off the event loop.
+
+Footers, infographic overlays, carousels, post cards and PDF merging are
+pure CPU work. Called directly from async handlers, one carousel build
+blocks every other request; a thread pool doesn't help much either,
+since Pillow's Python-level drawing holds the GIL. Rendering is
+dispatched to a ProcessPoolExecutor instead.
+
+Images cross the process boundary as raw PNG bytes (never base64).
+Stage timings observed in a worker travel back with the result and are
+recorded in the server's metrics (plus render_pool.wait, the time spent
+queueing and crossing the process boundary).
+
+Workers are warm: the pool is started in main.lifespan, every worker
+is spawned up front, and each one imports the renderers, keeps
+long-lived renderer instances and preloads every renderer's fonts into
+the process-wide font registry (utils.fonts) once.
+
+If a worker process dies (e.g. OOM-killed), the pool is broken for good:
+the executor replaces it with a fresh pool and retries the task once
+(rendering has no side effects).
+
+Set RENDER_POOL_ENABLED=false to render in a thread instead (still off
+the event loop; useful for debugging).
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from ..config import settings
+from ..utils.deployment import detect_worker_count
+from ..utils.fonts import fonts
+from ..utils.metrics import Timing, metrics
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# WORKER SIDE (runs inside pool processes)
+# =============================================================================
+
+# Per-process renderer instances, created by _init_worker
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker():
+    """Pool initializer: build renderers and preload fonts once per process."""
+    # Importing the renderers registers their font families
+    from . import carousel_builder, post_card_builder, quote_card_builder  # noqa: F401
+    from .image_processor import ImageProcessor
+    from .infographic_renderer import InfographicRenderer
+
+    _worker_state["processor"] = ImageProcessor()
+    _worker_state["renderer"] = InfographicRenderer()
+
+    loaded = fonts.preload()
+    logger.debug(f"Render worker {os.getpid()} preloaded {loaded} fonts")
+
+
+def _worker(name: str):
+    """Get a per-process renderer instance (initializes if the pool had no initializer)."""
+    if name not in _worker_state:
+        _init_worker()
+    return _worker_state[name]
+
+
+def _warmup(delay: float) -> int:
+    """No-op task used to force every worker process to start."""
+    time.sleep(delay)
+    return os.getpid()
+
+
+def _timed(func: Callable, *args: Any) -> tuple[Any, list[Timing], int, dict]:
+    """Run a task, returning its result, the stage timings observed in it and the worker's font stats."""
+    with metrics.capture() as timings:
+        result = func(*args)
+    return result, timings, os.getpid(), fonts.get_stats()
+
+
+def _process_images(images: list[dict], add_footer: bool, create_pdf: bool) -> dict:
+    return _worker("processor").process_images(images, add_footer=add_footer, create_pdf=create_pdf)
+
+
+def _merge_to_pdf(images: list[bytes], title: Optional[str]) -> bytes:
+    return _worker("processor").merge_to_pdf(images, title=title)
+
+
+def _render_infographic(kwargs: dict) -> bytes:
+    return _worker("renderer").render_infographic(**kwargs)
+
+
+def _build_carousel(kwargs: dict) -> list[bytes]:
+    from .carousel_builder import CarouselBuilder
+
+    # Per call: build_carousel mutates the builder's post card style (background color)
+    return CarouselBuilder().build_carousel(**kwargs)
+
+
+def _build_post_card(style, post_text: str, avatar_base64: Optional[str], short_post: Optional[str]):
+    from .post_card_builder import PostCardBuilder
+
+    return PostCardBuilder(style).build(
+        post_text=post_text,
+        avatar_base64=avatar_base64,
+        short_post=short_post,
+    )
+
+
+# =============================================================================
+# EVENT LOOP SIDE
+# =============================================================================
+
+class RenderExecutor:
+    """
+    Async facade over the rendering pool.
+
+    Started/stopped from main.lifespan; falls back to lazy start on first use.
+    """
+
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self._workers = 0
+        self._tasks = 0
+        self._restarts = 0
+        self._font_stats: dict[int, dict] = {}  # Latest font registry stats per worker pid
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def start(self):
+        """Create the pool and spawn every worker (fonts preloaded in each)."""
+        if self._executor is not None:
+            return
+
+        # Auto-sized pools share the cores between uvicorn workers
+        self._workers = settings.render_workers or max(
+            (os.cpu_count() or 1) // detect_worker_count(), 1
+        )
+
+        if not settings.render_pool_enabled:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers,
+                thread_name_prefix="render",
+            )
+            logger.info(f"Render executor started (threads, {self._workers} workers)")
+            return
+
+        self._executor = self._create_pool()
+
+        # Overlapping no-op tasks make the pool spawn (and initialize) all workers now
+        futures = [self._executor.submit(_warmup, 0.05) for _ in range(self._workers)]
+        pids = {f.result() for f in futures}
+        logger.info(f"Render executor started ({len(pids)} warm worker processes)")
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        # spawn (not fork): the server process already runs threads (boto3, executors)
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _replace_broken_pool(self, broken: Executor):
+        """Swap a broken process pool for a new one (once, however many tasks saw it break)."""
+        if self._executor is not broken:
+            return
+        logger.error("Render pool broken (a worker process died); starting a new pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_pool()
+        self._font_stats.clear()
+        self._restarts += 1
+
+    def shutdown(self, wait: bool = True):
+        """Shut the pool down (called from main.lifespan)."""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+        self._font_stats.clear()
+        logger.info("Render executor shut down")
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        if self._executor is None:
+            self.start()
+        self._tasks += 1
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        task = functools.partial(_timed, func, *args)
+        executor = self._executor
+        try:
+            result, timings, pid, font_stats = await loop.run_in_executor(executor, task)
+        except BrokenProcessPool:
+            self._replace_broken_pool(executor)
+            result, timings, pid, font_stats = await loop.run_in_executor(self._executor, task)
+        self._font_stats[pid] = font_stats
+
+        if timings:
+            # The outermost stage finishes last; the rest of the wall time is pool overhead
+            metrics.observe("render_pool.wait", max(time.perf_counter() - start - timings[-1][2], 0.0))
+            metrics.record(timings)
+        return result
+
+    async def process_images(self, images: list[dict], add_footer: bool = True, create_pdf: bool = True) -> dict:
+        """ImageProcessor.process_images in the pool."""
+        return await self._run(_process_images, images, add_footer, create_pdf)
+
+    async def merge_to_pdf(self, images: list[bytes], title: Optional[str] = None) -> bytes:
+        """ImageProcessor.merge_to_pdf in the pool."""
+        return await self._run(_merge_to_pdf, images, title)
+
+    async def render_infographic(self, **kwargs: Any) -> bytes:
+        """InfographicRenderer.render_infographic in the pool."""
+        return await self._run(_render_infographic, kwargs)
+
+    async def build_carousel(self, **kwargs: Any) -> list[bytes]:
+        """CarouselBuilder.build_carousel in the pool."""
+        return await self._run(_build_carousel, kwargs)
+
+    async def build_post_card(
+        self,
+        style,
+        post_text: str,
+        avatar_base64: Optional[str] = None,
+        short_post: Optional[str] = None,
+    ) -> tuple[bytes, int]:
+        """PostCardBuilder(style).build in the pool."""
+        return await self._run(_build_post_card, style, post_text, avatar_base64, short_post)
+
+    def get_stats(self) -> dict:
+        """Get pool configuration, task count and font cache counters (summed over workers)."""
+        worker_stats = list(self._font_stats.values())
+        hits = sum(s["hits"] for s in worker_stats)
+        misses = sum(s["misses"] for s in worker_stats)
+        return {
+            "started": self._executor is not None,
+            "mode": "process" if settings.render_pool_enabled else "thread",
+            "workers": self._workers,
+            "tasks_submitted": self._tasks,
+            "pool_restarts": self._restarts,
+            "font_cache": {
+                "workers_reporting": len(worker_stats),
+                "fonts": sum(s["fonts"] for s in worker_stats),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            },
+        }
+
+
+# Global instance
+render_executor = RenderExecutor()
@@ -0,0 +1,453 @@
+"""
+Session Backends
+=================
+Storage backends behind SessionManager.
+
+- memory: in-process LRU with a byte budget (single worker only)
+- sqlite: one row of JSON per session in a WAL-mode database file,
+  shared by all workers on the host
+- redis:  one JSON string per session (SET with EX = session TTL) plus a
+  sorted-set index by last access, shared across hosts
+
+Sessions only hold text results and references: generated images, the
+PDF and the post card are written to the session file store
+(services.session_files) and served from /session/{id}/..., so session
+reads stay small whatever the backend.
+
+Selected with settings.session_backend.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Any
+
+from .redis_client import RedisClient
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionData:
+    """Session data container for generation flow."""
+    session_id: str
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    # Text generation results
+    post_text: Optional[str] = None
+    short_post: Optional[str] = None  # For post cards
+    hashtags: Optional[list] = None
+    image_recommendation: Optional[dict] = None  # AI recommendation for image type
+    image_strategy: Optional[dict] = None
+    tone: Optional[str] = None
+    audience: Optional[list] = None
+    text_model_used: Optional[str] = None
+
+    # Infographic text structure (pre-extracted to avoid second LLM call)
+    infographic_text: Optional[dict] = None
+
+    # Image prompt results
+    image_prompts: Optional[list] = None
+    image_fingerprint: Optional[dict] = None
+
+    # Image generation results (files live in session_files; these are references)
+    generated_images: Optional[list] = None  # Image metadata dicts with "url" and "etag"
+    image_model_used: Optional[str] = None
+    pdf_url: Optional[str] = None
+    post_card_url: Optional[str] = None
+
+    def is_expired(self, ttl_seconds: int) -> bool:
+        """Check if session has expired."""
+        return (time.time() - self.updated_at) > ttl_seconds
+
+    def touch(self):
+        """Update the last access time."""
+        self.updated_at = time.time()
+
+
+_SESSION_FIELDS = {f.name for f in fields(SessionData)}
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):  # Pydantic models
+        return value.model_dump(mode="json")
+    if hasattr(value, "value"):  # Enums
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__} in session data")
+
+
+def serialize_session(session: SessionData) -> str:
+    """Session as a JSON string."""
+    return json.dumps(asdict(session), default=_json_default, separators=(",", ":"))
+
+
+def deserialize_session(data: str | bytes) -> SessionData:
+    """Session from serialize_session() output (unknown keys are ignored)."""
+    values = json.loads(data)
+    return SessionData(**{k: v for k, v in values.items() if k in _SESSION_FIELDS})
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate in-memory size of a session field value (containers walked recursively)."""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _estimate_size(k) + _estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(_estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def estimate_session_size(session: SessionData) -> int:
+    """Approximate in-memory size of a session in bytes."""
+    return sys.getsizeof(session) + sum(
+        _estimate_size(getattr(session, f.name)) for f in fields(session)
+    )
+
+
+class SessionBackend(ABC):
+    """
+    Session storage.
+
+    load() returns the stored session as-is (the caller checks expiry)
+    and records the access when it has not expired. Methods that remove
+    sessions return the removed ids so the caller can drop their files.
+    """
+
+    name: str = "base"
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl = ttl_seconds
+
+    @abstractmethod
+    async def load(self, session_id: str) -> Optional[SessionData]:
+        """Stored session, or None."""
+        pass
+
+    @abstractmethod
+    async def save(self, session: SessionData) -> list[str]:
+        """Store a session; returns ids evicted to make room."""
+        pass
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool:
+        """Remove a session; False if it did not exist."""
+        pass
+
+    @abstractmethod
+    async def cleanup_expired(self) -> list[str]:
+        """Remove expired sessions; returns their ids."""
+        pass
+
+    @abstractmethod
+    async def get_stats(self) -> dict:
+        """Backend-specific statistics."""
+        pass
+
+    async def close(self):
+        """Release connections/handles."""
+        pass
+
+
+# =============================================================================
+# MEMORY
+# =============================================================================
+
+class MemorySessionBackend(SessionBackend):
+    """
+    In-process sessions.
+
+    Sessions are kept in LRU order (OrderedDict, most recently used
+    last) with a per-session size estimate; writes that push the total
+    over max_bytes evict from the least recently used end.
+    """
+
+    name = "memory"
+
+    def __init__(self, ttl_seconds: int, max_bytes: int):
+        super().__init__(ttl_seconds)
+        self.max_bytes = max_bytes
+        self._store: OrderedDict[str, SessionData] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = Lock()
+
+    def _pop(self, session_id: str) -> bool:
+        self._total_bytes -= self._sizes.pop(session_id, 0)
+        return self._store.pop(session_id, None) is not None
+
+    def _evict_over_budget(self, keep: str) -> list[str]:
+        """Evict least recently used sessions until under max_bytes (never `keep`)."""
+        evicted = []
+        while self._total_bytes > self.max_bytes and len(self._store) > 1:
+            session_id = next(iter(self._store))
+            if session_id == keep:
+                self._store.move_to_end(keep)
+                continue
+            self._pop(session_id)
+            evicted.append(session_id)
+        return evicted
+
+    async def load(self, session_id: str) -> Optional[SessionData]:
+        with self._lock:
+            session = self._store.get(session_id)
+            if session is not None and not session.is_expired(self.ttl):
+                self._store.move_to_end(session_id)
+        return session
+
+    async def save(self, session: SessionData) -> list[str]:
+        size = estimate_session_size(session)
+        with self._lock:
+            self._store[session.session_id] = session
+            self._store.move_to_end(session.session_id)
+            self._total_bytes += size - self._sizes.get(session.session_id, 0)
+            self._sizes[session.session_id] = size
+            return self._evict_over_budget(keep=session.session_id)
+
+    async def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._pop(session_id)
+
+    async def cleanup_expired(self) -> list[str]:
+        with self._lock:
+            expired = [
+                key for key, session in self._store.items()
+                if session.is_expired(self.ttl)
+            ]
+            for key in expired:
+                self._pop(key)
+        return expired
+
+    async def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "total_sessions": len(self._store),
+                "active_sessions": sum(
+                    1 for s in self._store.values() if not s.is_expired(self.ttl)
+                ),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "largest_session_bytes": max(self._sizes.values(), default=0),
+            }
+
+
+# =============================================================================
+# SQLITE
+# =============================================================================
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Sessions in a SQLite database (WAL journal).
+
+    WAL lets every worker process read while one writes; each process
+    keeps a single connection guarded by a lock and runs queries in a
+    thread so the event loop never waits on disk.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, ttl_seconds: int, path: str):
+        super().__init__(ttl_seconds)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=10.0, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " size INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)"
+        )
+
+    def _run(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _load(self, session_id: str) -> Optional[SessionData]:
+        rows = self._run(
+            "SELECT data, updated_at FROM sessions WHERE session_id = ?", (session_id,)
+        )
+        if not rows:
+            return None
+        session = deserialize_session(rows[0][0])
+        session.updated_at = rows[0][1]  # Reads bump the column, not the document
+        if not session.is_expired(self.ttl):
+            # Record the access without rewriting the document
+            self._run(
+                "UPDATE sessions SET updated_at = ? WHERE session_id = ?",
+                (time.time(), session_id),
+            )
+        return session
+
+    def _save(self, session: SessionData):
+        data = serialize_session(session)
+        self._run(
+            "INSERT INTO sessions (session_id, data, updated_at, size) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT(session_id) DO UPDATE SET"
+            " data = excluded.data, updated_at = excluded.updated_at, size = excluded.size",
+            (session.session_id, data, session.updated_at, len(data)),
+        )
+
+    def _cleanup_expired(self) -> list[str]:
+        cutoff = time.time() - self.ttl
+        rows = self._run(
+            "DELETE FROM sessions WHERE updated_at < ? RETURNING session_id", (cutoff,)
+        )
+        return [row[0] for row in rows]
+
+    async def load(self, session_id: str) -> Optional[SessionData]:
+        return await asyncio.to_thread(self._load, session_id)
+
+    async def save(self, session: SessionData) -> list[str]:
+        await asyncio.to_thread(self._save, session)
+        return []
+
+    async def delete(self, session_id: str) -> bool:
+        rows = await asyncio.to_thread(
+            self._run, "DELETE FROM sessions WHERE session_id = ? RETURNING session_id", (session_id,)
+        )
+        return bool(rows)
+
+    async def cleanup_expired(self) -> list[str]:
+        return await asyncio.to_thread(self._cleanup_expired)
+
+    async def get_stats(self) -> dict:
+        cutoff = time.time() - self.ttl
+        rows = await asyncio.to_thread(
+            self._run,
+            "SELECT COUNT(*), COALESCE(SUM(updated_at >= ?), 0),"
+            " COALESCE(SUM(size), 0), COALESCE(MAX(size), 0) FROM sessions",
+            (cutoff,),
+        )
+        total, active, total_bytes, largest = rows[0]
+        return {
+            "total_sessions": total,
+            "active_sessions": active,
+            "total_bytes": total_bytes,
+            "largest_session_bytes": largest,
+            "path": str(self.path),
+            "file_bytes": self.path.stat().st_size if self.path.exists() else 0,
+        }
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# =============================================================================
+# REDIS
+# =============================================================================
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Sessions in Redis (or anything speaking its protocol).
+
+    Each session is a JSON string under {prefix}{id} with the session TTL
+    as key expiry, so abandoned sessions disappear on their own. A sorted
+    set ({prefix}index, scored by last access) lets the sweeper find
+    expired ids so their files can be removed too.
+    """
+
+    name = "redis"
+
+    def __init__(self, ttl_seconds: int, url: str, prefix: str = "session:"):
+        super().__init__(ttl_seconds)
+        self.client = RedisClient(url)
+        self.prefix = prefix
+        self.index_key = f"{prefix}index"
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    async def load(self, session_id: str) -> Optional[SessionData]:
+        # Key expiry already enforces the TTL: refresh it together with the read
+        data, _, _ = await self.client.pipeline([
+            ("GET", self._key(session_id)),
+            ("EXPIRE", self._key(session_id), self.ttl),
+            ("ZADD", self.index_key, "XX", time.time(), session_id),
+        ])
+        if data is None:
+            return None
+        session = deserialize_session(data)
+        session.touch()  # The key exists, so it has not expired
+        return session
+
+    async def save(self, session: SessionData) -> list[str]:
+        await self.client.pipeline([
+            ("SET", self._key(session.session_id), serialize_session(session), "EX", self.ttl),
+            ("ZADD", self.index_key, session.updated_at, session.session_id),
+        ])
+        return []
+
+    async def delete(self, session_id: str) -> bool:
+        deleted, _ = await self.client.pipeline([
+            ("DEL", self._key(session_id)),
+            ("ZREM", self.index_key, session_id),
+        ])
+        return bool(deleted)
+
+    async def cleanup_expired(self) -> list[str]:
+        cutoff = time.time() - self.ttl
+        expired = await self.client.execute("ZRANGEBYSCORE", self.index_key, "-inf", cutoff)
+        if not expired:
+            return []
+        session_ids = [m.decode("utf-8") for m in expired]
+        await self.client.pipeline([
+            ("ZREM", self.index_key, *session_ids),
+            ("DEL", *[self._key(s) for s in session_ids]),
+        ])
+        return session_ids
+
+    async def get_stats(self) -> dict:
+        cutoff = time.time() - self.ttl
+        total, active = await self.client.pipeline([
+            ("ZCARD", self.index_key),
+            ("ZCOUNT", self.index_key, cutoff, "+inf"),
+        ])
+        return {
+            "total_sessions": total,
+            "active_sessions": active,
+            "url": f"redis://{self.client.host}:{self.client.port}/{self.client.db}",
+        }
+
+    async def close(self):
+        await self.client.close()
+
+
+def create_session_backend(
+    name: str,
+    ttl_seconds: int,
+    max_bytes: int,
+    sqlite_path: str,
+    redis_url: str,
+) -> SessionBackend:
+    """Backend for a settings.session_backend value."""
+    if name == "memory":
+        return MemorySessionBackend(ttl_seconds, max_bytes)
+    if name == "sqlite":
+        return SQLiteSessionBackend(ttl_seconds, sqlite_path)
+    if name == "redis":
+        return RedisSessionBackend(ttl_seconds, redis_url)
+    raise ValueError(f"Unknown session backend: {name} (expected memory, sqlite or redis)")
@@ -0,0 +1,203 @@
+"""
+Session File Store
+===================
+Server-side storage for a session's generated images, PDF and post card.
+
+Responses used to inline every PNG and the merged PDF as base64 JSON
+(+33% payload, several MB per carousel). Files are now written under
+settings.session_files_dir and served as binary from stable URLs:
+
+    GET /session/{id}/images/{n}.png
+    GET /session/{id}/carousel.pdf
+    GET /session/{id}/post-card.png
+
+Each session gets its own directory (named by a hash of the session id,
+so client-supplied ids never touch the path). A new image generation
+replaces the session's previous images and PDF. ETags are content
+hashes, computed at write time and re-derived lazily after a restart.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock, get_ident
+from typing import Optional
+from urllib.parse import quote
+
+from ..config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+IMAGES_DIR = "images"
+PDF_NAME = "carousel.pdf"
+POST_CARD_NAME = "post-card.png"
+
+
+@dataclass
+class StoredFile:
+    """Reference to a stored session file."""
+    url: str
+    etag: str
+    size_bytes: int
+
+
+def _content_etag(data: bytes) -> str:
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+class SessionFileStore:
+    """Per-session directories of generated files."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = Lock()
+        self._etags: dict[Path, tuple[int, int, str]] = {}  # path -> (mtime_ns, size, etag)
+
+    def _session_dir(self, session_id: str) -> Path:
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        return self.root / digest
+
+    def _url(self, session_id: str, name: str) -> str:
+        return f"{settings.api_prefix}/session/{quote(session_id, safe='')}/{name}"
+
+    def _write(self, session_id: str, name: str, data: bytes) -> StoredFile:
+        """Atomic write (temp file + rename); records the content ETag."""
+        path = self._session_dir(session_id) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.{get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        etag = _content_etag(data)
+        st = path.stat()
+        with self._lock:
+            self._etags[path] = (st.st_mtime_ns, st.st_size, etag)
+
+        return StoredFile(url=self._url(session_id, name), etag=etag, size_bytes=len(data))
+
+    def _remove(self, path: Path):
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            for cached in [p for p in self._etags if p == path or path in p.parents]:
+                del self._etags[cached]
+
+    # =========================================================================
+    # WRITES
+    # =========================================================================
+
+    def save_generation(
+        self,
+        session_id: str,
+        images: list[bytes],
+        pdf: Optional[bytes] = None,
+    ) -> tuple[list[StoredFile], Optional[StoredFile]]:
+        """
+        Store a generation's images (1-based, in order) and optional PDF.
+
+        Replaces the session's previous images and PDF.
+        """
+        session_dir = self._session_dir(session_id)
+        self._remove(session_dir / IMAGES_DIR)
+        self._remove(session_dir / PDF_NAME)
+
+        stored_images = [
+            self._write(session_id, f"{IMAGES_DIR}/{n}.png", data)
+            for n, data in enumerate(images, start=1)
+        ]
+        stored_pdf = self._write(session_id, PDF_NAME, pdf) if pdf else None
+        return stored_images, stored_pdf
+
+    def save_post_card(self, session_id: str, data: bytes) -> StoredFile:
+        """Store the session's post card (replaces the previous one)."""
+        return self._write(session_id, POST_CARD_NAME, data)
+
+    async def asave_generation(
+        self,
+        session_id: str,
+        images: list[bytes],
+        pdf: Optional[bytes] = None,
+    ) -> tuple[list[StoredFile], Optional[StoredFile]]:
+        """save_generation() off the event loop."""
+        return await asyncio.to_thread(self.save_generation, session_id, images, pdf)
+
+    async def asave_post_card(self, session_id: str, data: bytes) -> StoredFile:
+        """save_post_card() off the event loop."""
+        return await asyncio.to_thread(self.save_post_card, session_id, data)
+
+    # =========================================================================
+    # READS
+    # =========================================================================
+
+    def image_path(self, session_id: str, n: int) -> Optional[Path]:
+        """Path of the session's n-th image (1-based), or None."""
+        return self._existing(self._session_dir(session_id) / IMAGES_DIR / f"{n}.png")
+
+    def pdf_path(self, session_id: str) -> Optional[Path]:
+        """Path of the session's merged PDF, or None."""
+        return self._existing(self._session_dir(session_id) / PDF_NAME)
+
+    def post_card_path(self, session_id: str) -> Optional[Path]:
+        """Path of the session's post card, or None."""
+        return self._existing(self._session_dir(session_id) / POST_CARD_NAME)
+
+    def _existing(self, path: Path) -> Optional[Path]:
+        return path if path.is_file() else None
+
+    def etag(self, path: Path) -> str:
+        """Content ETag for a stored file (cached by mtime/size)."""
+        st = path.stat()
+        with self._lock:
+            cached = self._etags.get(path)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+
+        etag = _content_etag(path.read_bytes())
+        with self._lock:
+            self._etags[path] = (st.st_mtime_ns, st.st_size, etag)
+        return etag
+
+    # =========================================================================
+    # CLEANUP
+    # =========================================================================
+
+    def delete(self, session_id: str):
+        """Remove all files of a session."""
+        self._remove(self._session_dir(session_id))
+
+    def cleanup_expired(self, ttl_seconds: int) -> int:
+        """Remove session directories not written to within ttl_seconds. Returns count removed."""
+        if not self.root.exists():
+            return 0
+
+        cutoff = time.time() - ttl_seconds
+        removed = 0
+        for session_dir in self.root.iterdir():
+            try:
+                newest = max(
+                    (p.stat().st_mtime for p in session_dir.rglob("*") if p.is_file()),
+                    default=session_dir.stat().st_mtime,
+                )
+            except FileNotFoundError:
+                continue
+            if newest < cutoff:
+                self._remove(session_dir)
+                removed += 1
+        return removed
+
+
+# Global instance
+session_files = SessionFileStore(root=Path(settings.session_files_dir))
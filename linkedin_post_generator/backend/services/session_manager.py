@@ -1,160 +1,216 @@
 """
 Session Manager
 ================
-In-memory session storage with Redis-ready interface.
+Session storage behind a Redis-ready async interface.
 Stores text generation results for subsequent image generation.
 
 Simplified single-user architecture (no multi-tenancy).
-Uses asyncio-compatible locks for thread safety in async context.
+
+The store itself is pluggable (services.session_backends, selected with
+settings.session_backend): in-process memory for a single worker, or
+SQLite / Redis so every worker sees the same sessions. Generated files
+live in services.session_files, so sessions only carry references.
+
+With the memory backend, memory is bounded: every session's size is
+estimated on write and the least recently used sessions are evicted
+beyond settings.session_max_mb. For every backend, a background sweeper
+(started in main.lifespan) removes expired sessions and their files
+every settings.session_sweep_interval_seconds.
 """
 
 import asyncio
-import time
+import logging
+from threading import Lock
 from typing import Optional, Any
-from dataclasses import dataclass, field
 
 from ..config import settings
+from .session_backends import (  # noqa: F401  (SessionData / estimate_session_size re-exported)
+    SessionBackend,
+    SessionData,
+    create_session_backend,
+    estimate_session_size,
+)
+from .session_files import session_files
 
 
-@dataclass
-class SessionData:
-    """Session data container for generation flow."""
-    session_id: str
-    created_at: float = field(default_factory=time.time)
-    updated_at: float = field(default_factory=time.time)
-
-    # Text generation results
-    post_text: Optional[str] = None
-    short_post: Optional[str] = None  # For post cards
-    hashtags: Optional[list] = None
-    image_recommendation: Optional[dict] = None  # AI recommendation for image type
-    image_strategy: Optional[dict] = None
-    tone: Optional[str] = None
-    audience: Optional[list] = None
-    text_model_used: Optional[str] = None
-
-    # Infographic text structure (pre-extracted to avoid second LLM call)
-    infographic_text: Optional[dict] = None
-
-    # Image prompt results
-    image_prompts: Optional[list] = None
-    image_fingerprint: Optional[dict] = None
-
-    # Image generation results
-    generated_images: Optional[list] = None
-    pdf_data: Optional[str] = None
-    image_model_used: Optional[str] = None
-
-    def is_expired(self, ttl_seconds: int) -> bool:
-        """Check if session has expired."""
-        return (time.time() - self.updated_at) > ttl_seconds
-
-    def touch(self):
-        """Update the last access time."""
-        self.updated_at = time.time()
+logger = logging.getLogger(__name__)
 
 
 class SessionManager:
     """
-    In-memory session manager.
+    Session manager.
 
-    Designed with Redis-compatible interface for easy migration.
+    Async facade over a SessionBackend: applies the TTL, keeps hit/miss
+    counters and removes the generated files of sessions that expire,
+    get evicted or are deleted.
     Sessions are identified by session_id only (no multi-tenancy).
-
-    Note: Uses a regular dict with thread-safe operations.
-    For high-concurrency scenarios, consider using asyncio.Lock()
-    or migrating to Redis.
     """
 
-    def __init__(self, ttl_seconds: int = None):
-        """Initialize with optional TTL override."""
+    def __init__(
+        self,
+        ttl_seconds: int = None,
+        max_bytes: int = None,
+        sweep_interval_seconds: int = None,
+        backend: SessionBackend = None,
+    ):
+        """Initialize with optional TTL / memory budget / sweep interval / backend overrides."""
         self.ttl = ttl_seconds or settings.session_ttl_seconds
-        self._store: dict[str, SessionData] = {}
-        # Note: For simple in-memory storage with FastAPI, we use sync operations
-        # since the session operations are fast (no I/O). For Redis migration,
-        # these would become async operations.
+        self.max_bytes = max_bytes or settings.session_max_mb * 1024 * 1024
+        self.sweep_interval = sweep_interval_seconds or settings.session_sweep_interval_seconds
+
+        self.backend = backend or create_session_backend(
+            settings.session_backend,
+            ttl_seconds=self.ttl,
+            max_bytes=self.max_bytes,
+            sqlite_path=settings.session_sqlite_path,
+            redis_url=settings.session_redis_url,
+        )
 
-    def get(self, session_id: str) -> Optional[SessionData]:
+        self._lock = Lock()
+        self._sweeper: Optional[asyncio.Task] = None
+        self._stats = {"hits": 0, "misses": 0, "created": 0, "expired": 0, "evicted": 0, "sweeps": 0}
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    async def _remove_files(self, session_ids: list[str]):
+        """Drop generated files of removed sessions (off the event loop)."""
+        for session_id in session_ids:
+            await asyncio.to_thread(session_files.delete, session_id)
+
+    # =========================================================================
+    # SESSIONS
+    # =========================================================================
+
+    async def get(self, session_id: str) -> Optional[SessionData]:
         """
         Get session data.
 
         Returns None if not found or expired.
         """
-        session = self._store.get(session_id)
+        session = await self.backend.load(session_id)
 
         if session is None:
+            self._count("misses")
             return None
 
         if session.is_expired(self.ttl):
-            del self._store[session_id]
+            await self.backend.delete(session_id)
+            await self._remove_files([session_id])
+            self._count("expired")
+            self._count("misses")
             return None
 
+        self._count("hits")
         session.touch()
         return session
 
-    def create(self, session_id: str) -> SessionData:
+    async def create(self, session_id: str) -> SessionData:
         """Create a new session."""
         session = SessionData(session_id=session_id)
-        self._store[session_id] = session
+        evicted = await self.backend.save(session)
+        self._count("created")
+        self._count("evicted", len(evicted))
+        await self._remove_files(evicted)
         return session
 
-    def get_or_create(self, session_id: str) -> SessionData:
+    async def get_or_create(self, session_id: str) -> SessionData:
         """Get existing session or create new one."""
-        session = self.get(session_id)
+        session = await self.get(session_id)
         if session is None:
-            session = self.create(session_id)
+            session = await self.create(session_id)
         return session
 
-    def update(self, session_id: str, **kwargs: Any) -> Optional[SessionData]:
+    async def update(self, session_id: str, **kwargs: Any) -> Optional[SessionData]:
         """
         Update session data.
 
         Only updates provided fields.
         """
-        session = self.get_or_create(session_id)
+        session = await self.get_or_create(session_id)
 
         for key, value in kwargs.items():
             if hasattr(session, key):
                 setattr(session, key, value)
         session.touch()
 
+        evicted = await self.backend.save(session)
+        self._count("evicted", len(evicted))
+        await self._remove_files(evicted)
+
         return session
 
-    def delete(self, session_id: str) -> bool:
+    async def delete(self, session_id: str) -> bool:
         """Delete a session."""
-        if session_id in self._store:
-            del self._store[session_id]
-            return True
-        return False
+        if not await self.backend.delete(session_id):
+            return False
+        await self._remove_files([session_id])
+        return True
 
-    def cleanup_expired(self) -> int:
+    async def cleanup_expired(self) -> int:
         """
         Remove all expired sessions.
 
-        Call periodically to prevent memory leaks.
+        Called periodically by the background sweeper.
         Returns count of removed sessions.
         """
-        expired_keys = [
-            key for key, session in self._store.items()
-            if session.is_expired(self.ttl)
-        ]
-
-        for key in expired_keys:
-            del self._store[key]
-
-        return len(expired_keys)
-
-    def get_stats(self) -> dict:
+        expired = await self.backend.cleanup_expired()
+        self._count("expired", len(expired))
+        await self._remove_files(expired)
+        return len(expired)
+
+    async def close(self):
+        """Close the backend (called from main.lifespan)."""
+        await self.backend.close()
+
+    # =========================================================================
+    # BACKGROUND SWEEPER
+    # =========================================================================
+
+    def start_sweeper(self):
+        """Start the periodic expiry task (called from main.lifespan)."""
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop(), name="session-sweeper")
+
+    async def stop_sweeper(self):
+        """Stop the periodic expiry task."""
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        await asyncio.gather(self._sweeper, return_exceptions=True)
+        self._sweeper = None
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = await self.cleanup_expired()
+                self._count("sweeps")
+                if removed:
+                    logger.info(f"Session sweeper removed {removed} expired session(s)")
+            except Exception as e:
+                logger.error(f"Session sweep failed: {e}", exc_info=True)
+
+    # =========================================================================
+    # STATS
+    # =========================================================================
+
+    async def get_stats(self) -> dict:
         """Get session store statistics."""
-        active = sum(
-            1 for s in self._store.values()
-            if not s.is_expired(self.ttl)
-        )
+        backend_stats = await self.backend.get_stats()
+        with self._lock:
+            stats = dict(self._stats)
 
+        lookups = stats["hits"] + stats["misses"]
         return {
-            "total_sessions": len(self._store),
-            "active_sessions": active,
+            "backend": self.backend.name,
+            **backend_stats,
             "ttl_seconds": self.ttl,
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "sweeper_running": self._sweeper is not None,
+            "sweep_interval_seconds": self.sweep_interval,
+            **stats,
         }
 
 
@@ -0,0 +1,347 @@
+"""
+Text Response Cache
+====================
+Content-addressed cache for text generation results.
+
+Regenerating after a UI refresh sends the same idea/angle/tone/audience/
+CTA and model again; without a cache that re-runs the whole Ollama
+pipeline or Claude call. Entries are keyed on a SHA-256 of the
+normalized TextGenerationRequest, the provider/model, the token limit
+and a hash of the system prompt (so prompt edits invalidate old entries).
+
+Backends:
+- memory: OrderedDict LRU, per-process
+- sqlite: on-disk, survives restarts (LRU by last access)
+
+Both evict by TTL and max entry count. Routes use the async methods
+(aget/aset/aget_stats): SQLite lookups commit an access-time update and
+stores run eviction sweeps, so they run in a thread instead of on the
+event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from ..config import settings
+from ..providers import TextGenerationRequest, TextGenerationResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fields that change the generated text (session_id only tags logs)
+_KEY_FIELDS = ("idea", "post_angle", "draft_post", "post_length", "tone", "audience", "cta_style")
+
+
+def _normalize(value):
+    """Normalize a request field: trim strings, drop empty ones."""
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def hash_prompt(prompt: str) -> str:
+    """SHA-256 of a system prompt (or prompt fingerprint source)."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+    request: TextGenerationRequest,
+    provider: str,
+    model: str,
+    prompt_hash: str,
+    max_tokens: int,
+    extra: Optional[dict] = None,
+) -> str:
+    """
+    Build the content-addressed cache key for a text generation call.
+
+    extra holds any other option that changes the result (e.g. combined
+    image prompt generation settings).
+    """
+    data = request.model_dump()
+    payload = {
+        "request": {field: _normalize(data.get(field)) for field in _KEY_FIELDS},
+        "provider": provider,
+        "model": model,
+        "prompt_hash": prompt_hash,
+        "max_tokens": max_tokens,
+        "extra": extra,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class TextCacheBackend(ABC):
+    """Storage for serialized TextGenerationResponse entries."""
+
+    name: str = "base"
+    blocking: bool = False  # Calls do disk I/O (run off the event loop)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Get a stored value, or None if missing/expired."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Remove all entries. Returns count removed."""
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        """Number of stored entries."""
+        pass
+
+
+class MemoryTextCache(TextCacheBackend):
+    """In-process LRU + TTL cache."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            created_at, value = entry
+            if time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteTextCache(TextCacheBackend):
+    """On-disk LRU + TTL cache backed by a single SQLite table."""
+
+    name = "sqlite"
+    blocking = True
+
+    def __init__(self, path: Path, max_entries: int, ttl_seconds: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS text_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_text_cache_accessed ON text_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM text_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM text_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE text_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO text_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            # Expired entries first, then least recently used beyond the cap
+            self._conn.execute(
+                "DELETE FROM text_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                """
+                DELETE FROM text_cache WHERE key IN (
+                    SELECT key FROM text_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM text_cache")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM text_cache").fetchone()[0]
+
+
+class TextResponseCache:
+    """
+    Result cache in front of TextModelProvider.generate.
+
+    Failed generations are never stored; only successful
+    TextGenerationResponse objects are cached.
+    """
+
+    def __init__(self, backend: TextCacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self._lock = Lock()
+        self._stats = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "errors": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key: str, bypass: bool = False) -> Optional[TextGenerationResponse]:
+        """Look up a cached response (counts a hit, miss or bypass)."""
+        if not self.enabled or bypass:
+            self._count("bypassed")
+            return None
+
+        try:
+            value = self.backend.get(key)
+            if value is None:
+                self._count("misses")
+                return None
+
+            response = TextGenerationResponse.model_validate_json(value)
+            self._count("hits")
+            return response
+        except Exception as e:
+            # A broken cache must never fail generation
+            logger.warning(f"Text cache read failed: {e}")
+            self._count("errors")
+            return None
+
+    def set(self, key: str, response: TextGenerationResponse, bypass: bool = False):
+        """Store a successful response (not when the request bypassed the cache)."""
+        if not self.enabled or bypass:
+            return
+
+        try:
+            self.backend.set(key, response.model_dump_json())
+            self._count("stores")
+        except Exception as e:
+            logger.warning(f"Text cache write failed: {e}")
+            self._count("errors")
+
+    def clear(self) -> int:
+        """Remove all cached responses."""
+        return self.backend.clear()
+
+    async def _offload(self, func, *args, **kwargs):
+        if self.backend.blocking:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    async def aget(self, key: str, bypass: bool = False) -> Optional[TextGenerationResponse]:
+        """get() for async handlers (blocking backends run in a thread)."""
+        if not self.enabled or bypass:
+            return self.get(key, bypass=bypass)
+        return await self._offload(self.get, key)
+
+    async def aset(self, key: str, response: TextGenerationResponse, bypass: bool = False):
+        """set() for async handlers (blocking backends run in a thread)."""
+        if self.enabled and not bypass:
+            await self._offload(self.set, key, response)
+
+    async def aget_stats(self) -> dict:
+        """get_stats() for async handlers (the entry count may hit the disk)."""
+        return await self._offload(self.get_stats)
+
+    def get_stats(self, include_entries: bool = True) -> dict:
+        """Get hit/miss counters and backend info (entries: stored count, if requested)."""
+        with self._lock:
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["backend"] = self.backend.name
+        if include_entries:
+            try:
+                stats["entries"] = self.backend.size()
+            except Exception:
+                stats["entries"] = None
+        return stats
+
+
+def _create_backend() -> TextCacheBackend:
+    """Create the configured cache backend."""
+    if settings.text_cache_backend == "sqlite":
+        return SQLiteTextCache(
+            path=Path(settings.text_cache_path),
+            max_entries=settings.text_cache_max_entries,
+            ttl_seconds=settings.text_cache_ttl_seconds,
+        )
+    return MemoryTextCache(
+        max_entries=settings.text_cache_max_entries,
+        ttl_seconds=settings.text_cache_ttl_seconds,
+    )
+
+
+# Global instance
+text_cache = TextResponseCache(_create_backend(), enabled=settings.text_cache_enabled)
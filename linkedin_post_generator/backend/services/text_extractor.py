@@ -9,7 +9,7 @@ import logging
 from typing import Optional, Dict, List
 
 from ..providers import BedrockTextProvider, ProviderError
-from ..api.provider_factory import get_text_provider
+from ..providers.bedrock_executor import run_bedrock_call
 from ..utils.constants import TextProvider
 
 logger = logging.getLogger(__name__)
@@ -71,14 +71,18 @@ async def extract_text_structure_llm(
     Returns:
         Dict with title, subtitle, sections, takeaway
     """
+    # Imported here: backend.api imports backend.services (import cycle)
+    from ..api.provider_factory import get_text_provider
+
     if not text_provider:
         text_provider = get_text_provider(TextProvider.BEDROCK)
 
+    short_section = f"# Short Version\n{short_post}" if short_post else ""
     user_message = f"""# LinkedIn Post Text
 
 {post_text}
 
-{f"# Short Version\n{short_post}" if short_post else ""}
+{short_section}
 
 Extract structured content for infographic overlay."""
 
@@ -93,8 +97,9 @@ Extract structured content for infographic overlay."""
         # Get model ID
         model_id = text_provider._get_model_id(model)
 
-        # Call Bedrock Converse API
-        response = text_provider.client.converse(
+        # Call Bedrock Converse API (off the event loop)
+        response = await run_bedrock_call(
+            text_provider.client.converse,
             modelId=model_id,
             messages=[{"role": "user", "content": [{"text": user_message}]}],
             system=[{"text": TEXT_EXTRACTION_PROMPT}],
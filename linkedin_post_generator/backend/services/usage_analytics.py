@@ -0,0 +1,364 @@
+"""
+Usage Analytics
+================
+Indexed, time-bucketed queries over the usage logs.
+
+The daily JSONL files written by UsageLogger stay the source of truth.
+This module ingests them incrementally into a SQLite table
+(settings.usage_analytics_path) with indexes on timestamp, provider and
+model, and serves aggregate queries such as "p95 latency per model over
+the last 24h" (GET /usage/query).
+
+Ingestion keeps a byte offset per day file (uncompressed bytes, so it
+carries over when log storage gzips the file). On startup it catches up
+with everything written since the last run, then again every
+settings.usage_analytics_ingest_interval_seconds and before each query.
+Each pass runs in one IMMEDIATE transaction: offsets and rows are
+updated together, so several workers can ingest into the same database
+without duplicates.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import math
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from ..config import settings
+from ..utils.jsonl import COMPRESSED_SUFFIX, dated_logs
+from .usage_logger import usage_logger
+
+
+logger = logging.getLogger(__name__)
+
+
+# Query vocabulary: group_by name -> SQL expression
+GROUP_BY = {
+    "provider": "provider",
+    "model": "model",
+    "operation": "operation",
+    "success": "success",
+    "cached": "cached",
+    "day": "substr(timestamp, 1, 10)",
+    "hour": "substr(timestamp, 1, 13) || ':00'",
+}
+
+# Aggregates computed in SQL: metric name -> SQL expression
+SQL_METRICS = {
+    "count": "COUNT(*)",
+    "errors": "SUM(success = 0)",
+    "error_rate": "ROUND(AVG(success = 0), 4)",
+    "tokens": "COALESCE(SUM(tokens_used), 0)",
+    "images": "COALESCE(SUM(image_count), 0)",
+    "cached": "SUM(cached)",
+    "avg_ms": "ROUND(AVG(duration_ms), 1)",
+    "max_ms": "MAX(duration_ms)",
+}
+
+# Latency percentiles over duration_ms (nearest rank, computed in Python)
+PERCENTILES = {"p50": 50, "p90": 90, "p95": 95, "p99": 99}
+
+FILTERS = ("provider", "model", "operation")
+
+
+def _parse_time(value: str) -> float:
+    """ISO date/datetime (local time like the logs) -> epoch seconds."""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _percentile(sorted_values: list[int], pct: int) -> Optional[int]:
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class UsageAnalytics:
+    """SQLite store of usage records with incremental JSONL ingestion."""
+
+    def __init__(
+        self,
+        log_dir: Path,
+        db_path: Optional[str] = None,
+        ingest_interval_seconds: Optional[int] = None,
+    ):
+        self.log_dir = Path(log_dir)
+        self.db_path = Path(db_path or settings.usage_analytics_path)
+        self.interval = ingest_interval_seconds or settings.usage_analytics_ingest_interval_seconds
+
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._records: Optional[int] = None  # Table size as of the last ingest pass
+        self._stats = {"ingest_runs": 0, "ingested_records": 0, "skipped_lines": 0, "queries": 0}
+
+    # =========================================================================
+    # DATABASE
+    # =========================================================================
+
+    def _db(self) -> sqlite3.Connection:
+        """Connection (opened and migrated on first use; lock held)."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, timeout=30.0, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS usage_records (
+                    ts REAL NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    session_id TEXT,
+                    operation TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    tokens_used INTEGER,
+                    image_count INTEGER,
+                    duration_ms INTEGER,
+                    success INTEGER NOT NULL,
+                    cached INTEGER NOT NULL,
+                    error_message TEXT
+                );
+                CREATE INDEX IF NOT EXISTS usage_ts ON usage_records (ts);
+                CREATE INDEX IF NOT EXISTS usage_provider_ts ON usage_records (provider, ts);
+                CREATE INDEX IF NOT EXISTS usage_model_ts ON usage_records (model, ts);
+
+                CREATE TABLE IF NOT EXISTS ingested_files (
+                    stem TEXT PRIMARY KEY,
+                    offset INTEGER NOT NULL,
+                    closed INTEGER NOT NULL DEFAULT 0
+                );
+            """)
+            self._conn = conn
+        return self._conn
+
+    # =========================================================================
+    # INGESTION
+    # =========================================================================
+
+    @staticmethod
+    def _row(record: dict) -> tuple:
+        timestamp = record["timestamp"]
+        return (
+            _parse_time(timestamp),
+            timestamp,
+            record.get("session_id"),
+            record["operation"],
+            record["provider"],
+            record["model"],
+            record.get("tokens_used"),
+            record.get("image_count"),
+            record.get("duration_ms"),
+            int(bool(record.get("success", True))),
+            int(bool(record.get("cached", False))),
+            record.get("error_message"),
+        )
+
+    def _read_from(self, path: Path, offset: int) -> tuple[list[tuple], int, int]:
+        """Complete lines after offset -> (rows, new offset, unparseable lines)."""
+        opener = gzip.open if path.name.endswith(COMPRESSED_SUFFIX) else open
+        with opener(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+
+        end = data.rfind(b"\n") + 1  # A partially flushed last line waits for the next pass
+        rows, skipped = [], 0
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(self._row(json.loads(line)))
+            except (ValueError, KeyError, TypeError):
+                skipped += 1
+        return rows, offset + end, skipped
+
+    def ingest(self) -> int:
+        """Ingest new usage records from the JSONL files. Blocking; returns count added."""
+        added = skipped = 0
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                state = {
+                    stem: (offset, closed)
+                    for stem, offset, closed in conn.execute(
+                        "SELECT stem, offset, closed FROM ingested_files"
+                    )
+                }
+                for path in dated_logs(self.log_dir, prefix="usage_"):
+                    stem = path.name.split(".")[0]
+                    compressed = path.name.endswith(COMPRESSED_SUFFIX)
+                    offset, closed = state.get(stem, (0, 0))
+                    if closed:
+                        continue
+                    if not compressed and path.stat().st_size <= offset:
+                        continue
+
+                    rows, new_offset, bad = self._read_from(path, offset)
+                    if rows:
+                        conn.executemany(
+                            "INSERT INTO usage_records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            rows,
+                        )
+                    conn.execute(
+                        "INSERT INTO ingested_files (stem, offset, closed) VALUES (?, ?, ?)"
+                        " ON CONFLICT(stem) DO UPDATE SET offset = excluded.offset, closed = excluded.closed",
+                        (stem, new_offset, int(compressed)),  # gzipped = the day is complete
+                    )
+                    added += len(rows)
+                    skipped += bad
+                records = conn.execute("SELECT COUNT(*) FROM usage_records").fetchone()[0]
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._records = records
+            self._stats["ingest_runs"] += 1
+            self._stats["ingested_records"] += added
+            self._stats["skipped_lines"] += skipped
+        return added
+
+    async def _loop(self):
+        while True:
+            try:
+                added = await asyncio.to_thread(self.ingest)
+                if added:
+                    logger.info(f"Usage analytics ingested {added} record(s)")
+            except Exception as e:
+                logger.error(f"Usage analytics ingestion failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Catch up with the logs and keep ingesting (called from main.lifespan)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="usage-analytics")
+
+    async def stop(self):
+        """Stop ingesting and close the database."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # =========================================================================
+    # QUERIES
+    # =========================================================================
+
+    def query(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        group_by: Optional[list[str]] = None,
+        metrics: Optional[list[str]] = None,
+        filters: Optional[dict[str, str]] = None,
+    ) -> dict:
+        """
+        Aggregate usage between start and end (ISO, local time; default last 24h).
+
+        Raises ValueError for unknown group_by/metric names or bad times.
+        """
+        group_by = group_by or []
+        metrics = metrics or ["count", "errors", "tokens", "p50", "p95"]
+        filters = {k: v for k, v in (filters or {}).items() if v}
+
+        unknown = [g for g in group_by if g not in GROUP_BY]
+        if unknown:
+            raise ValueError(f"Unknown group_by {unknown}; expected any of {sorted(GROUP_BY)}")
+        unknown = [m for m in metrics if m not in SQL_METRICS and m not in PERCENTILES]
+        if unknown:
+            raise ValueError(
+                f"Unknown metrics {unknown}; expected any of {sorted(SQL_METRICS) + sorted(PERCENTILES)}"
+            )
+        unknown = [f for f in filters if f not in FILTERS]
+        if unknown:
+            raise ValueError(f"Unknown filters {unknown}; expected any of {list(FILTERS)}")
+
+        end_ts = _parse_time(end) if end else time.time()
+        start_ts = _parse_time(start) if start else end_ts - timedelta(days=1).total_seconds()
+        if start_ts > end_ts:
+            raise ValueError("'from' must not be after 'to'")
+
+        where = ["ts >= ?", "ts < ?"] + [f"{name} = ?" for name in filters]
+        params = [start_ts, end_ts, *filters.values()]
+        group_exprs = [GROUP_BY[g] for g in group_by]
+        group_sql = f" GROUP BY {', '.join(group_exprs)}" if group_exprs else ""
+        select = [f"{expr} AS g{i}" for i, expr in enumerate(group_exprs)]
+        select += [f"{SQL_METRICS[m]} AS {m}" for m in metrics if m in SQL_METRICS]
+        select_sql = ", ".join(select) if select else "COUNT(*)"
+
+        with self._lock:
+            conn = self._db()
+            rows = conn.execute(
+                f"SELECT {select_sql} FROM usage_records WHERE {' AND '.join(where)}{group_sql}",
+                params,
+            ).fetchall()
+
+            durations: dict[tuple, list[int]] = {}
+            if any(m in PERCENTILES for m in metrics):
+                key_sql = ", ".join(group_exprs) + ", " if group_exprs else ""
+                for row in conn.execute(
+                    f"SELECT {key_sql}duration_ms FROM usage_records"
+                    f" WHERE {' AND '.join(where)} AND duration_ms IS NOT NULL"
+                    f" ORDER BY {key_sql}duration_ms",
+                    params,
+                ):
+                    durations.setdefault(tuple(row[:-1]), []).append(row[-1])
+
+            self._stats["queries"] += 1
+
+        sql_metrics = [m for m in metrics if m in SQL_METRICS]
+        results = []
+        for row in rows:
+            key = tuple(row[:len(group_by)])
+            values = dict(zip(sql_metrics, row[len(group_by):]))
+            if not group_by and values.get("count", 1) == 0:
+                continue  # Empty range
+            entry = dict(zip(group_by, key))
+            for metric in metrics:
+                if metric in PERCENTILES:
+                    entry[metric] = _percentile(durations.get(key, []), PERCENTILES[metric])
+                else:
+                    entry[metric] = values[metric]
+            results.append(entry)
+
+        return {
+            "from": datetime.fromtimestamp(start_ts).isoformat(),
+            "to": datetime.fromtimestamp(end_ts).isoformat(),
+            "group_by": group_by,
+            "metrics": metrics,
+            "filters": filters,
+            "rows": results,
+        }
+
+    async def aquery(self, **kwargs) -> dict:
+        """Ingest what was logged since the last pass, then query (off the event loop)."""
+        def run():
+            self.ingest()
+            return self.query(**kwargs)
+        return await asyncio.to_thread(run)
+
+    def get_stats(self) -> dict:
+        """Get ingestion statistics (never waits for an ingest pass or touches the database)."""
+        return {
+            "path": str(self.db_path),
+            "records": self._records,
+            "running": self._task is not None,
+            "ingest_interval_seconds": self.interval,
+            **self._stats,
+        }
+
+
+# Global instance
+usage_analytics = UsageAnalytics(log_dir=usage_logger.log_dir)
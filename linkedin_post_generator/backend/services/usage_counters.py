@@ -0,0 +1,226 @@
+"""
+Usage Counters
+===============
+Aggregated /usage counters, kept where every worker can see them.
+
+The counters live in the same store as sessions (settings.session_backend):
+
+- memory: a dict in this process (single worker only)
+- sqlite: a usage_counters table in the session database
+- redis:  one hash ({prefix}counters) updated with HINCRBY
+
+Increments come from synchronous logging calls and never touch the
+store on the event loop. The memory store applies them immediately. The
+SQLite store merges them into pending deltas that a background task
+writes in one upsert (in a thread) every flush interval. The Redis
+store sends each batch as a background task on the running event loop.
+Reads flush this worker's pending deltas first.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from .redis_client import RedisClient, RedisError
+
+
+logger = logging.getLogger(__name__)
+
+
+class UsageCounters(ABC):
+    """Named integer counters."""
+
+    name: str = "base"
+
+    def __init__(self, keys: list[str]):
+        self.keys = list(keys)
+
+    @abstractmethod
+    def add(self, deltas: dict[str, int]):
+        """Increment counters (non-blocking for remote stores)."""
+        pass
+
+    @abstractmethod
+    async def get(self) -> dict[str, int]:
+        """Current values of all counters."""
+        pass
+
+    async def close(self):
+        """Flush pending increments and release connections."""
+        pass
+
+
+class MemoryUsageCounters(UsageCounters):
+    """Counters in a dict (per process)."""
+
+    name = "memory"
+
+    def __init__(self, keys: list[str]):
+        super().__init__(keys)
+        self._values = {key: 0 for key in self.keys}
+        self._lock = Lock()
+
+    def add(self, deltas: dict[str, int]):
+        with self._lock:
+            for key, delta in deltas.items():
+                self._values[key] = self._values.get(key, 0) + delta
+
+    async def get(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._values)
+
+
+class SQLiteUsageCounters(UsageCounters):
+    """Counters in a SQLite table (WAL), shared by all workers on the host."""
+
+    name = "sqlite"
+
+    def __init__(self, keys: list[str], path: str, flush_interval_ms: int = 200):
+        super().__init__(keys)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval_ms / 1000
+        self._lock = Lock()  # Guards the connection
+        self._pending_lock = Lock()
+        self._pending: dict[str, int] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._conn = sqlite3.connect(
+            path, timeout=10.0, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS usage_counters ("
+            " name TEXT PRIMARY KEY,"
+            " value INTEGER NOT NULL)"
+        )
+
+    def add(self, deltas: dict[str, int]):
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        with self._pending_lock:
+            for key, delta in deltas.items():
+                self._pending[key] = self._pending.get(key, 0) + delta
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush()  # Scripts: no loop to flush from later
+            return
+        if self._flusher is None:
+            self._flusher = loop.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._flusher = None  # Deltas added from here on schedule the next flush
+        try:
+            await asyncio.to_thread(self._flush)
+        except Exception as e:
+            logger.error(f"Usage counter flush failed: {e}", exc_info=True)
+
+    def _flush(self):
+        """Write all pending deltas in one upsert (put back if the write fails)."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT INTO usage_counters (name, value) VALUES (?, ?)"
+                    " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    list(pending.items()),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to update usage counters: {e}")
+            with self._pending_lock:
+                for key, delta in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + delta
+
+    def _get(self) -> dict[str, int]:
+        self._flush()
+        with self._lock:
+            rows = self._conn.execute("SELECT name, value FROM usage_counters").fetchall()
+        return {**{key: 0 for key in self.keys}, **dict(rows)}
+
+    async def get(self) -> dict[str, int]:
+        return await asyncio.to_thread(self._get)
+
+    async def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await asyncio.to_thread(self._flush)
+        with self._lock:
+            self._conn.close()
+
+
+class RedisUsageCounters(UsageCounters):
+    """Counters in a Redis hash, shared by all workers and hosts."""
+
+    name = "redis"
+
+    def __init__(self, keys: list[str], url: str, prefix: str = "usage:"):
+        super().__init__(keys)
+        self.client = RedisClient(url)
+        self.hash_key = f"{prefix}counters"
+        self._pending: set[asyncio.Task] = set()
+
+    def add(self, deltas: dict[str, int]):
+        commands = [
+            ("HINCRBY", self.hash_key, key, delta)
+            for key, delta in deltas.items() if delta
+        ]
+        if not commands:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning(f"Usage counters not updated (no event loop): {deltas}")
+            return
+        task = loop.create_task(self._send(commands))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _send(self, commands: list[tuple]):
+        try:
+            # HINCRBY is not idempotent: never resend a batch the server may have applied
+            await self.client.pipeline(commands, idempotent=False)
+        except RedisError as e:
+            logger.error(f"Failed to update usage counters: {e}")
+
+    async def get(self) -> dict[str, int]:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        values = await self.client.execute("HGETALL", self.hash_key) or []
+        stored = {
+            values[i].decode("utf-8"): int(values[i + 1])
+            for i in range(0, len(values), 2)
+        }
+        return {**{key: 0 for key in self.keys}, **stored}
+
+    async def close(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.client.close()
+
+
+def create_usage_counters(
+    name: str,
+    keys: list[str],
+    sqlite_path: str,
+    redis_url: str,
+    flush_interval_ms: int = 200,
+) -> UsageCounters:
+    """Counter store for a settings.session_backend value."""
+    if name == "memory":
+        return MemoryUsageCounters(keys)
+    if name == "sqlite":
+        return SQLiteUsageCounters(keys, sqlite_path, flush_interval_ms)
+    if name == "redis":
+        return RedisUsageCounters(keys, redis_url)
+    raise ValueError(f"Unknown usage counter backend: {name} (expected memory, sqlite or redis)")
@@ -4,16 +4,21 @@ Usage Logger
 Tracks usage per session for analytics.
 
 Simplified single-user architecture (no multi-tenancy).
+
+Records are appended to daily JSONL files by the background log writer
+(services.log_writer), off the request path. The aggregated /usage counters live in
+the shared store selected by settings.session_backend
+(services.usage_counters), so every worker reports the same totals.
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, asdict
-from threading import Lock
 
 from ..config import settings
+from .log_writer import log_writer
+from .usage_counters import UsageCounters, create_usage_counters
 
 
 @dataclass
@@ -29,6 +34,7 @@ class UsageRecord:
     duration_ms: Optional[int] = None
     success: bool = True
     error_message: Optional[str] = None
+    cached: bool = False  # Served from the text response cache (no model call)
 
 
 class UsageLogger:
@@ -39,20 +45,28 @@ class UsageLogger:
     For now, we use file-based logging that can be easily extended.
     """
 
-    def __init__(self, log_dir: Optional[Path] = None):
-        """Initialize with log directory."""
+    COUNTERS = [
+        "text_generations",
+        "image_generations",
+        "total_tokens",
+        "total_images",
+        "errors",
+        "cached_text_generations",
+    ]
+
+    def __init__(self, log_dir: Optional[Path] = None, counters: Optional[UsageCounters] = None):
+        """Initialize with log directory and optional counter store override."""
         self.log_dir = log_dir or Path("logs")
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        self._lock = Lock()
 
-        # In-memory aggregation for quick access
-        self._usage: dict = {
-            "text_generations": 0,
-            "image_generations": 0,
-            "total_tokens": 0,
-            "total_images": 0,
-            "errors": 0,
-        }
+        # Aggregation for quick access (shared between workers unless memory)
+        self._counters = counters or create_usage_counters(
+            settings.session_backend,
+            keys=self.COUNTERS,
+            sqlite_path=settings.session_sqlite_path,
+            redis_url=settings.session_redis_url,
+            flush_interval_ms=settings.log_flush_interval_ms,
+        )
 
     def _get_log_file(self) -> Path:
         """Get the log file for today."""
@@ -68,6 +82,7 @@ class UsageLogger:
         duration_ms: Optional[int] = None,
         success: bool = True,
         error_message: Optional[str] = None,
+        cached: bool = False,
     ):
         """Log a text generation event."""
         record = UsageRecord(
@@ -80,6 +95,7 @@ class UsageLogger:
             duration_ms=duration_ms,
             success=success,
             error_message=error_message,
+            cached=cached,
         )
 
         self._write_record(record)
@@ -113,30 +129,34 @@ class UsageLogger:
 
     def _write_record(self, record: UsageRecord):
         """Write record to log file."""
-        with self._lock:
-            log_file = self._get_log_file()
-            with open(log_file, "a") as f:
-                f.write(json.dumps(asdict(record)) + "\n")
+        log_writer.write(self._get_log_file(), asdict(record))
 
     def _update_aggregation(self, record: UsageRecord):
-        """Update in-memory aggregation."""
-        with self._lock:
-            if record.operation == "text_generation":
-                self._usage["text_generations"] += 1
-                if record.tokens_used:
-                    self._usage["total_tokens"] += record.tokens_used
-            elif record.operation == "image_generation":
-                self._usage["image_generations"] += 1
-                if record.image_count:
-                    self._usage["total_images"] += record.image_count
-
-            if not record.success:
-                self._usage["errors"] += 1
-
-    def get_usage(self) -> dict:
+        """Update the shared aggregation."""
+        deltas: dict[str, int] = {}
+        if record.operation == "text_generation":
+            deltas["text_generations"] = 1
+            if record.cached:
+                deltas["cached_text_generations"] = 1
+            elif record.tokens_used:
+                deltas["total_tokens"] = record.tokens_used
+        elif record.operation == "image_generation":
+            deltas["image_generations"] = 1
+            if record.image_count:
+                deltas["total_images"] = record.image_count
+
+        if not record.success:
+            deltas["errors"] = 1
+
+        self._counters.add(deltas)
+
+    async def get_usage(self) -> dict:
         """Get aggregated usage."""
-        with self._lock:
-            return dict(self._usage)
+        return await self._counters.get()
+
+    async def close(self):
+        """Flush pending counter updates and close the store (called from main.lifespan)."""
+        await self._counters.close()
 
 
 # Global instance
@@ -0,0 +1,67 @@
+"""
+Deployment Detection
+=====================
+How many server worker processes share this deployment.
+
+settings.web_concurrency (WEB_CONCURRENCY) is what uvicorn and gunicorn
+use as their default worker count, but a --workers flag overrides it
+without the app being told. The worker count is therefore the largest of:
+
+- settings.web_concurrency
+- --workers N / -w N on this process's command line (uvicorn's spawned
+  workers inherit the parent's sys.argv; gunicorn forks)
+- the same flags on the parent process's command line, when the parent
+  is a uvicorn or gunicorn server (Linux /proc only)
+
+Worker counts set only in a gunicorn config file cannot be seen from
+here: such deployments must set WEB_CONCURRENCY.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ..config import settings
+
+
+_SERVERS = ("uvicorn", "gunicorn")
+
+
+def workers_from_argv(argv: Sequence[str]) -> Optional[int]:
+    """Worker count from a uvicorn/gunicorn command line (None if not given)."""
+    if not any(server in arg for arg in argv for server in _SERVERS):
+        return None
+
+    for i, arg in enumerate(argv):
+        if arg in ("--workers", "-w") and i + 1 < len(argv):
+            value = argv[i + 1]
+        elif arg.startswith("--workers="):
+            value = arg.split("=", 1)[1]
+        elif arg.startswith("-w") and arg[2:].isdigit():
+            value = arg[2:]
+        else:
+            continue
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _parent_argv() -> list[str]:
+    try:
+        cmdline = Path(f"/proc/{os.getppid()}/cmdline").read_bytes()
+    except OSError:
+        return []
+    return [arg.decode("utf-8", "replace") for arg in cmdline.split(b"\0") if arg]
+
+
+def detect_worker_count(argv: Optional[Sequence[str]] = None) -> int:
+    """Number of server workers (at least settings.web_concurrency)."""
+    counts = [
+        settings.web_concurrency,
+        workers_from_argv(sys.argv if argv is None else argv),
+        workers_from_argv(_parent_argv()),
+    ]
+    return max(count for count in counts if count)
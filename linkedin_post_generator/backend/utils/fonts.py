@@ -0,0 +1,145 @@
+"""
+Font Registry
+==============
+Process-wide, thread-safe cache of Pillow fonts shared by every renderer.
+
+Renderers used to walk their font fallback lists and call
+ImageFont.truetype on every instantiation (and InfographicRenderer on
+every layout fitting attempt). Now each renderer module registers its
+fallback lists once as a named family:
+
+    fonts.register_family("infographic", {"bold": [...], "regular": [...]}, preload_sizes=(16, 24))
+
+and asks the registry for fonts:
+
+    fonts.get("infographic", "bold", 24)
+
+The first path of a (family, weight) that exists and loads is memoized,
+and every loaded font is kept per (family, weight, size), so after
+warmup a render loads no fonts at all. Render pool workers call
+fonts.preload() once at startup (every registered family at its
+preload sizes).
+
+Fonts are immutable once loaded and shared read-only.
+"""
+
+import logging
+import os
+from threading import Lock
+from typing import Iterable, Optional, Union
+
+from PIL import ImageFont
+
+
+logger = logging.getLogger(__name__)
+
+Font = Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]
+
+# Sentinel for a (family, weight) with no loadable candidate
+_DEFAULT = "<default>"
+
+
+class FontRegistry:
+    """Fonts by (family, weight, size), with memoized path resolution."""
+
+    def __init__(self):
+        self._families: dict[str, dict[str, list[str]]] = {}
+        self._preload_sizes: dict[str, tuple[int, ...]] = {}
+        self._paths: dict[tuple[str, str], str] = {}
+        self._fonts: dict[tuple[str, str, int], Font] = {}
+        self._lock = Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def register_family(
+        self,
+        family: str,
+        weights: dict[str, list[str]],
+        preload_sizes: Iterable[int] = (),
+    ):
+        """Register a family's candidate paths per weight (first loadable path wins)."""
+        with self._lock:
+            self._families[family] = {weight: list(paths) for weight, paths in weights.items()}
+            self._preload_sizes[family] = tuple(preload_sizes)
+            # Re-registering changes the candidates: drop what was resolved from the old ones
+            for key in [k for k in self._paths if k[0] == family]:
+                del self._paths[key]
+            for key in [k for k in self._fonts if k[0] == family]:
+                del self._fonts[key]
+
+    def _load(self, family: str, weight: str, size: int) -> Font:
+        """Load a font (caller holds the lock)."""
+        path = self._paths.get((family, weight))
+        if path is not None:
+            if path != _DEFAULT:
+                return ImageFont.truetype(path, size)
+            return ImageFont.load_default()
+
+        candidates = self._families.get(family, {}).get(weight)
+        if candidates is None:
+            raise KeyError(f"Unknown font: family={family!r} weight={weight!r}")
+
+        for candidate in candidates:
+            if not os.path.exists(candidate):
+                continue
+            try:
+                font = ImageFont.truetype(candidate, size)
+            except (OSError, IOError) as e:
+                logger.debug(f"Failed to load font {candidate}: {e}")
+                continue
+            self._paths[(family, weight)] = candidate
+            logger.debug(f"Resolved font {family}/{weight}: {candidate}")
+            return font
+
+        logger.warning(f"Using default font for {family}/{weight} - no candidate fonts found")
+        self._paths[(family, weight)] = _DEFAULT
+        return ImageFont.load_default()
+
+    def get(self, family: str, weight: str, size: int) -> Font:
+        """Get a font, loading it on first use."""
+        key = (family, weight, size)
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._stats["hits"] += 1
+                return font
+            self._stats["misses"] += 1
+            font = self._fonts[key] = self._load(family, weight, size)
+            return font
+
+    def resolve(self, family: str, weight: str) -> Optional[str]:
+        """Resolved path of a (family, weight), or None if only the default font is available."""
+        with self._lock:
+            if (family, weight) not in self._paths:
+                self._load(family, weight, 12)
+            path = self._paths[(family, weight)]
+        return None if path == _DEFAULT else path
+
+    def preload(self) -> int:
+        """Load every registered family at its preload sizes. Returns fonts loaded."""
+        with self._lock:
+            wanted = [
+                (family, weight, size)
+                for family, weights in self._families.items()
+                for weight in weights
+                for size in self._preload_sizes.get(family, ())
+            ]
+            loaded = 0
+            for key in wanted:
+                if key not in self._fonts:
+                    self._fonts[key] = self._load(*key)
+                    loaded += 1
+        return loaded
+
+    def get_stats(self) -> dict:
+        """Get hit/miss counters and cache size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["fonts"] = len(self._fonts)
+            stats["families"] = len(self._families)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Global instance
+fonts = FontRegistry()
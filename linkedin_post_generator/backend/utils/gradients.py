@@ -0,0 +1,26 @@
+"""
+Gradient Overlays
+==================
+Black overlays whose alpha changes row by row (footer and carousel cover
+fades).
+
+The renderers used to draw these ramps as one 1-pixel draw.rectangle
+per row, i.e. hundreds of Python-level draw calls per image. Here
+the per-row alphas become a 1-pixel-wide RGBA column that is stretched
+to the full width in one C-level resize. The result is pixel-identical.
+
+Canvas sizes are fixed, so renderers cache the finished overlay (see
+ImageProcessor / CarouselBuilder) and draw text on a copy.
+"""
+
+from typing import Sequence
+
+from PIL import Image
+
+
+def vertical_alpha_overlay(width: int, alphas: Sequence[int]) -> Image.Image:
+    """Black RGBA overlay of width x len(alphas), row y having alpha alphas[y]."""
+    height = len(alphas)
+    column = Image.new("RGBA", (1, height))
+    column.putdata([(0, 0, 0, alpha) for alpha in alphas])
+    return column.resize((width, height), Image.Resampling.NEAREST)
@@ -0,0 +1,52 @@
+"""
+Image Data Helpers
+===================
+Raw image handling for the render pipeline.
+
+Generated images flow from providers through the renderers to the PDF
+merge (and into the session) as raw PNG bytes; within a single render
+step they stay PIL images. Base64 only exists at the edges: providers
+decode the model API's base64 once, and the API routes encode once when
+building the response schemas.
+"""
+
+import base64
+import io
+from typing import Optional, Union
+
+from PIL import Image
+
+from .metrics import metrics
+
+
+# Anything a renderer accepts as an input image
+ImageInput = Union[bytes, Image.Image]
+
+
+def open_image(data: ImageInput, mode: Optional[str] = None) -> Image.Image:
+    """Open raw image bytes (or pass a PIL image through), optionally converting mode."""
+    image = data if isinstance(data, Image.Image) else Image.open(io.BytesIO(data))
+    if mode and image.mode != mode:
+        image = image.convert(mode)
+    return image
+
+
+def png_bytes(image: Image.Image, optimize: bool = False) -> bytes:
+    """Encode a PIL image as PNG bytes."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=optimize)
+    return buffer.getvalue()
+
+
+def encode_base64(data: Optional[bytes]) -> Optional[str]:
+    """Encode raw bytes as a base64 string (API boundary only)."""
+    if data is None:
+        return None
+    with metrics.stage("codec.base64_encode"):
+        return base64.b64encode(data).decode("utf-8")
+
+
+def decode_base64(data: str) -> bytes:
+    """Decode a base64 string from a model API (provider boundary only)."""
+    with metrics.stage("codec.base64_decode"):
+        return base64.b64decode(data)
@@ -0,0 +1,74 @@
+"""
+JSONL Helpers
+==============
+Append-only JSON Lines logs shared by several worker processes.
+
+Records are encoded to complete lines up front; services.log_writer
+appends them in batches with a single write() per file on an O_APPEND
+descriptor, so lines from concurrent processes never interleave
+(buffered text files may split a long line across several writes).
+
+Closed day files are gzip-compressed by services.log_storage
+(usage_2026-01-01.jsonl -> usage_2026-01-01.jsonl.gz); the readers
+below handle both forms.
+"""
+
+import gzip
+import json
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterator, Optional, TextIO
+
+
+COMPRESSED_SUFFIX = ".gz"
+
+_DATED_NAME = re.compile(r"_(\d{4}-\d{2}-\d{2})\.jsonl(\.gz)?$")
+
+
+def jsonl_line(record: dict[str, Any], ensure_ascii: bool = True) -> bytes:
+    """One JSON record as a newline-terminated UTF-8 line."""
+    return (json.dumps(record, ensure_ascii=ensure_ascii) + "\n").encode("utf-8")
+
+
+def log_date(path: Path) -> Optional[date]:
+    """Day of a dated log file (name_YYYY-MM-DD.jsonl[.gz]), or None."""
+    match = _DATED_NAME.search(Path(path).name)
+    if not match:
+        return None
+    try:
+        return date.fromisoformat(match.group(1))
+    except ValueError:
+        return None
+
+
+def dated_logs(directory: Path, prefix: str = "") -> list[Path]:
+    """Dated log files in a directory (plain and compressed), oldest day first."""
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    files = [
+        path for path in directory.iterdir()
+        if path.is_file() and path.name.startswith(prefix) and log_date(path)
+    ]
+    return sorted(files, key=lambda p: (log_date(p), p.name))
+
+
+def open_jsonl(path: Path) -> TextIO:
+    """Open a plain or gzip-compressed JSONL file for reading."""
+    path = Path(path)
+    if path.name.endswith(COMPRESSED_SUFFIX):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def read_jsonl(path: Path) -> Iterator[dict]:
+    """Records of a plain or compressed JSONL file (a torn last line is skipped)."""
+    with open_jsonl(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -0,0 +1,315 @@
+"""
+Metrics
+========
+Per-stage latency histograms and gauges, exposed in the Prometheus text
+format on GET /metrics.
+
+A request used to report a single generation_time_ms. Stages are now
+timed separately:
+
+    with metrics.stage("render.footer"):
+        ...
+
+    @metrics.timed("ollama.step1")
+    async def _run_step1(...): ...
+
+Stage names used by the app:
+
+- provider.text / provider.text_stream / provider.image_prompts /
+  provider.image (label provider)
+- ollama.step1 / ollama.step2 / ollama.step3, json_repair
+- render.process_images / render.footer / render.pdf / render.infographic /
+  render.carousel / render.post_card / render.quote_card,
+  render_pool.wait (pool queueing + process hand-off)
+- codec.base64_encode / codec.base64_decode
+
+Render pool workers are separate processes: worker functions run under
+metrics.capture() and hand their timings back with the result, and the
+render executor records them in the server process.
+
+Gauges (in-flight provider calls, cache hit ratios, pool sizes) come
+from collectors registered with metrics.register_collector() and are
+read at scrape time.
+
+Set METRICS_ENABLED=false for a no-op mode: stage() returns a shared
+do-nothing context manager and /metrics answers 404. With several
+uvicorn workers every process keeps its own metrics (like the in-memory
+caches); scrape them per worker or run a single worker.
+
+Implemented without prometheus_client to keep the dependency set small.
+"""
+
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Callable, Iterator, Optional
+
+from ..config import settings
+
+
+METRIC_PREFIX = "linkedin"
+
+# Upper bounds (seconds): base64 of one image is ~1 ms, an Ollama step ~60 s
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+# Labels as a hashable, ordered key
+LabelKey = tuple[tuple[str, str], ...]
+
+# Collector output: (name, help, type, [(labels, value), ...])
+MetricFamily = tuple[str, str, str, list[tuple[dict[str, Any], float]]]
+
+# Timings captured in a render worker: (stage, labels, seconds)
+Timing = tuple[str, dict[str, str], float]
+
+_captured: ContextVar[Optional[list[Timing]]] = ContextVar("metrics_captured", default=None)
+
+
+def _label_key(labels: dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        k + '="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for k, v in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelKey, list] = {}  # key -> [bucket counts..., sum, count]
+        self._lock = Lock()
+
+    def observe(self, seconds: float, labels: LabelKey = ()):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+
+        for key in sorted(series):
+            values = series[key]
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {values[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {values[-1]}")
+        return lines
+
+    def summary(self) -> dict[str, dict]:
+        """Count, total and mean per series (for JSON stats)."""
+        with self._lock:
+            series = {key: (values[-2], values[-1]) for key, values in self._series.items()}
+        return {
+            ",".join(f"{k}={v}" for k, v in key): {
+                "count": count,
+                "sum_seconds": round(total, 6),
+                "mean_ms": round(total / count * 1000, 3) if count else 0.0,
+            }
+            for key, (total, count) in sorted(series.items())
+        }
+
+
+class _NoopStage:
+    """Shared do-nothing context manager returned when metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_STAGE = _NoopStage()
+
+
+class _Stage:
+    """Times one stage with perf_counter (errors are timed too)."""
+
+    __slots__ = ("_registry", "_name", "_labels", "_start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: dict[str, str]):
+        self._registry = registry
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._registry.observe(self._name, time.perf_counter() - self._start, **self._labels)
+        return False
+
+
+class MetricsRegistry:
+    """Stage histograms, in-flight gauges and scrape-time collectors."""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = settings.metrics_enabled if enabled is None else enabled
+        self.stages = Histogram(
+            f"{METRIC_PREFIX}_stage_duration_seconds",
+            "Duration of one pipeline stage (provider call, pipeline step, renderer, codec).",
+        )
+        self._in_flight: dict[tuple[str, LabelKey], int] = {}
+        self._in_flight_lock = Lock()
+        self._collectors: list[Callable[[], list[MetricFamily]]] = []
+
+    # =========================================================================
+    # TIMING
+    # =========================================================================
+
+    def stage(self, name: str, **labels: str):
+        """Context manager timing one stage (no-op when disabled)."""
+        if not self.enabled:
+            return _NOOP_STAGE
+        return _Stage(self, name, labels)
+
+    def observe(self, name: str, seconds: float, **labels: str):
+        """Record one stage duration (buffered instead inside metrics.capture())."""
+        if not self.enabled:
+            return
+        captured = _captured.get()
+        if captured is not None:
+            captured.append((name, labels, seconds))
+            return
+        self.stages.observe(seconds, _label_key({"stage": name, **labels}))
+
+    def timed(self, name: str, **labels: str):
+        """Decorator timing every call of a function or coroutine function."""
+        def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.stage(name, **labels):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def capture(self) -> Iterator[list[Timing]]:
+        """Collect the timings observed inside the block instead of recording them."""
+        timings: list[Timing] = []
+        token = _captured.set(timings)
+        try:
+            yield timings
+        finally:
+            _captured.reset(token)
+
+    def record(self, timings: list[Timing]):
+        """Record timings captured elsewhere (e.g. in a render worker process)."""
+        for name, labels, seconds in timings:
+            self.observe(name, seconds, **labels)
+
+    # =========================================================================
+    # GAUGES
+    # =========================================================================
+
+    @contextmanager
+    def in_flight(self, name: str, **labels: str) -> Iterator[None]:
+        """Count the block as in flight in the gauge <prefix>_<name>_in_flight."""
+        if not self.enabled:
+            yield
+            return
+        key = (name, _label_key(labels))
+        with self._in_flight_lock:
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._in_flight_lock:
+                self._in_flight[key] -= 1
+
+    @contextmanager
+    def provider_call(self, operation: str, provider: str) -> Iterator[None]:
+        """Time a model provider call (stage provider.<operation>) and count it in flight."""
+        with self.in_flight("provider_calls", provider=provider), self.stage(f"provider.{operation}", provider=provider):
+            yield
+
+    def register_collector(self, collector: Callable[[], list[MetricFamily]]):
+        """Add a function returning metric families, called on every scrape."""
+        self._collectors.append(collector)
+
+    # =========================================================================
+    # EXPOSITION
+    # =========================================================================
+
+    def _in_flight_families(self) -> list[MetricFamily]:
+        with self._in_flight_lock:
+            current = dict(self._in_flight)
+        families: dict[str, list] = {}
+        for (name, key), value in sorted(current.items()):
+            families.setdefault(name, []).append((dict(key), value))
+        return [
+            (f"{name}_in_flight", f"{name.replace('_', ' ').capitalize()} currently in flight.", "gauge", samples)
+            for name, samples in families.items()
+        ]
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = self.stages.render()
+
+        families = self._in_flight_families()
+        for collector in self._collectors:
+            families.extend(collector())
+
+        for name, help_text, kind, samples in families:
+            full_name = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                if value is None:
+                    continue
+                lines.append(f"{full_name}{_format_labels(_label_key(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def get_stats(self) -> dict:
+        """Per-stage counts and mean latency (JSON view of the histograms)."""
+        return {"enabled": self.enabled, "stages": self.stages.summary()}
+
+
+# Global instance
+metrics = MetricsRegistry()
@@ -0,0 +1,91 @@
+"""
+Prompt Dictionary
+==================
+Content-addressed storage for prompts in the prompt logs.
+
+System prompts are hundreds of lines and almost never change, yet they
+used to be written into every record. PromptLogger now writes each
+distinct prompt once to logs/prompts/prompt_dictionary.jsonl:
+
+    {"sha256": "<hex>", "prompt": "<full text>"}
+
+and records reference it as "system_prompt_sha256". The reader below
+puts the full text back:
+
+    python -m backend.utils.prompt_dictionary logs/prompts/text_prompts_2026-01-01.jsonl | jq .
+
+(files default to every prompt log in --log-dir; compressed day files
+are read transparently)
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .jsonl import dated_logs, read_jsonl
+
+
+DICTIONARY_NAME = "prompt_dictionary.jsonl"
+
+# Record fields stored by reference: <field> -> <field>_sha256
+DEDUPLICATED_FIELDS = ("system_prompt",)
+
+
+def prompt_hash(prompt: str) -> str:
+    """SHA-256 hex digest of a prompt."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def load_prompt_dictionary(log_dir: Path) -> dict[str, str]:
+    """All stored prompts by hash."""
+    path = Path(log_dir) / DICTIONARY_NAME
+    if not path.exists():
+        return {}
+    return {
+        entry["sha256"]: entry["prompt"]
+        for entry in read_jsonl(path)
+        if "sha256" in entry and "prompt" in entry
+    }
+
+
+def hydrate_record(record: dict, prompts: dict[str, str]) -> dict:
+    """Record with referenced prompts replaced by their text (unknown hashes are kept)."""
+    record = dict(record)
+    for name in DEDUPLICATED_FIELDS:
+        digest = record.get(f"{name}_sha256")
+        if digest in prompts:
+            del record[f"{name}_sha256"]
+            record[name] = prompts[digest]
+    return record
+
+
+def read_prompt_log(path: Path, prompts: Optional[dict[str, str]] = None) -> Iterator[dict]:
+    """Full records of a prompt log file (dictionary loaded from its directory by default)."""
+    path = Path(path)
+    if prompts is None:
+        prompts = load_prompt_dictionary(path.parent)
+    for record in read_jsonl(path):
+        yield hydrate_record(record, prompts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print prompt log records with full prompts (JSONL).")
+    parser.add_argument("files", nargs="*", type=Path, help="prompt log files (default: all in --log-dir)")
+    parser.add_argument("--log-dir", type=Path, default=Path("logs/prompts"))
+    args = parser.parse_args()
+
+    files = args.files or dated_logs(args.log_dir)
+    dictionaries: dict[Path, dict[str, str]] = {}
+    for path in files:
+        directory = path.parent
+        if directory not in dictionaries:
+            dictionaries[directory] = load_prompt_dictionary(directory)
+        for record in read_prompt_log(path, dictionaries[directory]):
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Bedrock Concurrency Load Test
+==============================
+Proves that concurrent Bedrock calls overlap instead of queueing on the
+event loop: N concurrent /generate-text requests (and N concurrent Nova /
+Titan image generations) against a stubbed boto3 client whose every call
+sleeps --delay seconds must finish in about the time of one call.
+
+The stub replaces only the boto3 client; requests go through the real
+app (ASGI transport), the real providers and the shared Bedrock thread
+pool. While the burst runs, /health is polled to show the event loop
+stays responsive. Exits non-zero if the speedup is missing.
+
+Run from linkedin_post_generator/:
+
+    PYTHONPATH=. python benchmarks/bench_bedrock_concurrency.py --requests 8 --delay 1.0
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import time
+
+import httpx
+from PIL import Image
+
+from backend.api.provider_factory import provider_registry
+from backend.config import settings
+from backend.main import app
+from backend.providers import (
+    BedrockTextProvider,
+    ImageFingerprint,
+    ImageGenerationRequest,
+    ImagePrompt,
+    NovaCanvasProvider,
+    TitanImageProvider,
+)
+
+
+# A run counts as concurrent if N calls take less than this many single-call durations
+MAX_SLOWDOWN = 2.0
+
+POST_JSON = json.dumps({
+    "post_text": "Most teams don't have a scaling problem, they have a queueing problem.",
+    "short_post": "Queueing, not scaling.",
+    "hashtags": ["#performance", "#engineering", "#latency"],
+})
+
+
+def _png_base64() -> str:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (40, 80, 120)).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+class SleepyBedrockClient:
+    """boto3 bedrock-runtime stand-in: every call blocks its thread for `delay` seconds."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._image = _png_base64()
+
+    def converse(self, **kwargs):
+        time.sleep(self.delay)
+        return {
+            "output": {"message": {"content": [{"text": POST_JSON}]}},
+            "usage": {"inputTokens": 100, "outputTokens": 50},
+        }
+
+    def invoke_model(self, body: str, modelId: str, **kwargs):
+        time.sleep(self.delay)
+        return {"body": io.BytesIO(json.dumps({"images": [self._image]}).encode())}
+
+
+def _text_request(i: int) -> dict:
+    return {
+        "session_id": f"bench-bedrock-{i}",
+        "idea": f"Why queueing theory explains most latency problems ({i})",
+        "text_model": {"provider": "bedrock"},
+        "generate_images": False,
+        "bypass_cache": True,
+    }
+
+
+def _image_request(i: int) -> ImageGenerationRequest:
+    return ImageGenerationRequest(
+        prompts=[ImagePrompt(id=1, prompt=f"Abstract queue of people, minimal ({i})")],
+        fingerprint=ImageFingerprint(
+            visual_style="minimal",
+            color_palette="neutral",
+            composition="centered",
+            lighting="soft",
+            concept_type="abstract",
+        ),
+        post_text="Queueing, not scaling.",
+    )
+
+
+async def _timed(coro_factory, count: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(coro_factory(i) for i in range(count)))
+    return time.perf_counter() - start
+
+
+async def _health_latency(client: httpx.AsyncClient, stop: asyncio.Event) -> float:
+    """Worst /health latency observed until stop is set."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(f"{settings.api_prefix}/health")
+        response.raise_for_status()
+        worst = max(worst, time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+    return worst
+
+
+async def _run(requests: int, delay: float) -> bool:
+    stub = SleepyBedrockClient(delay)
+    provider_registry.start()
+    provider_registry._text_providers["bedrock"] = BedrockTextProvider(client=stub)
+    ok = True
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def generate_text(i: int):
+            response = await client.post(f"{settings.api_prefix}/generate-text", json=_text_request(i))
+            response.raise_for_status()
+
+        single = await _timed(generate_text, 1)
+
+        stop = asyncio.Event()
+        health = asyncio.create_task(_health_latency(client, stop))
+        burst = await _timed(generate_text, requests)
+        stop.set()
+        worst_health = await health
+
+        print(f"/generate-text      1 request : {single:6.2f}s")
+        print(f"/generate-text {requests:2d} concurrent: {burst:6.2f}s  (worst /health latency {worst_health * 1000:.0f} ms)")
+        ok &= burst < single * MAX_SLOWDOWN and worst_health < delay / 2
+
+    for provider in (NovaCanvasProvider(client=stub), TitanImageProvider(client=stub)):
+        async def generate_image(i: int, provider=provider):
+            response = await provider.generate(_image_request(i), model=provider.available_models[0])
+            assert response.images, "no image generated"
+
+        single = await _timed(generate_image, 1)
+        burst = await _timed(generate_image, requests)
+        print(f"{provider.provider_name:<6} image  1 call    : {single:6.2f}s")
+        print(f"{provider.provider_name:<6} image {requests:2d} concurrent: {burst:6.2f}s")
+        ok &= burst < single * MAX_SLOWDOWN
+
+    await provider_registry.aclose()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=8, help="concurrent requests per burst")
+    parser.add_argument("--delay", type=float, default=1.0, help="seconds each stubbed Bedrock call blocks")
+    args = parser.parse_args()
+
+    if args.requests > settings.bedrock_max_workers:
+        parser.error(f"--requests must be <= BEDROCK_MAX_WORKERS ({settings.bedrock_max_workers})")
+
+    ok = asyncio.run(_run(args.requests, args.delay))
+    print("PASS: concurrent calls overlap" if ok else "FAIL: concurrent calls did not overlap (see timings above)")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Gradient Overlay Benchmark
+===========================
+Per renderer (footer, carousel cover): time to build the gradient
+overlay with the old one-draw.rectangle-per-row loop vs the cached alpha
+mask, plus the full render time.
+
+Run from linkedin_post_generator/:
+
+    PYTHONPATH=. python benchmarks/bench_gradients.py --iterations 50
+"""
+
+import argparse
+import time
+
+from backend.services import CarouselBuilder, ImageProcessor
+from backend.services.carousel_builder import (
+    AI_IMAGE_CONTENT_PERCENT,
+    CAROUSEL_HEIGHT,
+    CAROUSEL_WIDTH,
+    OVERLAY_OPACITY,
+    _cover_gradient,
+)
+from backend.services.image_processor import _footer_gradient
+
+from PIL import Image, ImageDraw
+
+
+FOOTER_SIZE = (1024, 1024)
+
+
+def _rows_overlay(width: int, height: int, rows: list[tuple[int, int]]) -> Image.Image:
+    """The old approach: one 1-pixel rectangle per (y, alpha) row."""
+    overlay = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    for y_pos, alpha in rows:
+        draw.rectangle([(0, y_pos), (width, y_pos + 1)], fill=(0, 0, 0, alpha))
+    return overlay
+
+
+def _footer_rows(width: int, height: int, opacity: float) -> Image.Image:
+    footer_height = int(height * 0.08)
+    footer_y = height - footer_height
+    max_alpha = int(255 * opacity)
+    gradient_zone = int(height * 0.06)
+    rows = [
+        (footer_y - gradient_zone + i, int(max_alpha * 0.4 * (i / gradient_zone) ** 2))
+        for i in range(gradient_zone)
+        if footer_y - gradient_zone + i >= 0
+    ]
+    rows += [(footer_y + i, int(max_alpha * (0.3 + 0.3 * i / footer_height))) for i in range(footer_height)]
+    return _rows_overlay(width, height, rows)
+
+
+def _cover_rows(width: int, height: int, opacity: float) -> Image.Image:
+    overlay_start_y = int(height * AI_IMAGE_CONTENT_PERCENT)
+    overlay_height = height - overlay_start_y
+    max_alpha = int(255 * opacity)
+    gradient_zone = int(height * 0.08)
+    rows = [
+        (overlay_start_y - gradient_zone + i, int(max_alpha * (i / gradient_zone) ** 2))
+        for i in range(gradient_zone)
+        if overlay_start_y - gradient_zone + i >= 0
+    ]
+    rows += [(overlay_start_y + i, int(max_alpha * (0.90 + 0.10 * i / overlay_height))) for i in range(overlay_height)]
+    return _rows_overlay(width, height, rows)
+
+
+def _ms(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="runs per measurement")
+    args = parser.parse_args()
+    n = args.iterations
+
+    processor = ImageProcessor()
+    footer_args = (*FOOTER_SIZE, processor.footer_opacity)
+    footer_image = Image.new("RGBA", FOOTER_SIZE, (40, 80, 120, 255))
+    assert _footer_rows(*footer_args).tobytes() == _footer_gradient(*footer_args).tobytes()
+
+    builder = CarouselBuilder()
+    cover_args = (CAROUSEL_WIDTH, CAROUSEL_HEIGHT, OVERLAY_OPACITY)
+    cover_image = Image.new("RGBA", (CAROUSEL_WIDTH, CAROUSEL_HEIGHT), (40, 80, 120, 255))
+    assert _cover_rows(*cover_args).tobytes() == _cover_gradient(*cover_args).tobytes()
+
+    print(f"{n} iterations (ms per call)")
+    print(f"footer {FOOTER_SIZE[0]}x{FOOTER_SIZE[1]}")
+    print(f"  overlay, row loop    : {_ms(lambda: _footer_rows(*footer_args), n):8.3f}")
+    print(f"  overlay, mask        : {_ms(lambda: _footer_gradient.__wrapped__(*footer_args), n):8.3f}")
+    print(f"  overlay, cached copy : {_ms(lambda: _footer_gradient(*footer_args).copy(), n):8.3f}")
+    print(f"  full add_footer      : {_ms(lambda: processor._render_footer(footer_image), n):8.3f}")
+
+    print(f"carousel cover {CAROUSEL_WIDTH}x{CAROUSEL_HEIGHT}")
+    print(f"  overlay, row loop    : {_ms(lambda: _cover_rows(*cover_args), n):8.3f}")
+    print(f"  overlay, mask        : {_ms(lambda: _cover_gradient.__wrapped__(*cover_args), n):8.3f}")
+    print(f"  overlay, cached copy : {_ms(lambda: _cover_gradient(*cover_args).copy(), n):8.3f}")
+    print(f"  full cover render    : {_ms(lambda: builder._render_carousel_cover(cover_image, 'Title', 'Subtitle'), n):8.3f}")
+
+
+if __name__ == "__main__":
+    main()
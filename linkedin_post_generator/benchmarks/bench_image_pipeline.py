@@ -0,0 +1,161 @@
+"""
+Image Pipeline Benchmark
+=========================
+Per-request CPU time and peak Python memory of the /generate-images
+post-processing (footer / infographic overlay / carousel, PDF merge,
+session store, response serialization), with the model call replaced
+by a fake provider that returns a fixed PNG.
+
+Rendering runs in threads (RENDER_POOL_ENABLED=false) so all CPU time
+is counted in this process. Peak memory comes from a separate
+tracemalloc pass, which tracks Python objects (bytes/str copies of
+images) but not Pillow's internal pixel buffers.
+
+Run from linkedin_post_generator/, e.g. on two commits to compare:
+
+    PYTHONPATH=. python benchmarks/bench_image_pipeline.py --runs 5
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import statistics
+import time
+import tracemalloc
+
+from backend.api import routes_image
+from backend.api.schemas import ImageGenerationRequestSchema
+from backend.config import settings
+from backend.providers import GeneratedImage, ImageGenerationResponse
+from backend.services.session_manager import session_manager
+
+from PIL import Image
+
+
+POST_TEXT = (
+    "Most teams don't have a scaling problem, they have a queueing problem.\n\n"
+    "Measure where requests wait, not just where they run.\n"
+    "What's the slowest hop in your stack?"
+)
+
+INFOGRAPHIC_TEXT = {
+    "title": "Queueing beats scaling",
+    "subtitle": "Where requests actually wait",
+    "sections": [
+        {"title": "Measure", "bullets": ["Queue time per hop", "Tail latency, not averages"]},
+        {"title": "Offload", "bullets": ["CPU work off the event loop", "Warm worker pools"]},
+        {"title": "Bound", "bullets": ["Backpressure", "Caps on in-flight work"]},
+    ],
+    "takeaway": "Fix the waits before buying more machines.",
+}
+
+SCENARIOS = {
+    # name: (provider, image count, carousel)
+    "images": ("nova", 3, False),
+    "infographic": ("sdxl", 2, False),
+    "carousel": ("sdxl", 1, True),
+}
+
+
+def _sample_png_base64(width: int, height: int) -> str:
+    """Gradient + grain PNG (roughly model-output sized), as the model API returns it."""
+    gradient = Image.linear_gradient("L").resize((width, height))
+    grain = Image.effect_noise((width, height), 12)
+    image = Image.merge("RGB", (gradient, Image.blend(gradient, grain, 0.3), grain))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+class FakeImageProvider:
+    """Returns the same API-style base64 PNG for every prompt."""
+
+    def __init__(self, api_base64: str, width: int, height: int):
+        self.api_base64 = api_base64
+        self.width = width
+        self.height = height
+
+    async def generate(self, request, model):
+        images = []
+        for prompt in request.prompts:
+            # Build the image the way the providers do in the tree being measured
+            if "data" in GeneratedImage.model_fields:
+                payload = {"data": base64.b64decode(self.api_base64)}
+            else:
+                payload = {"base64_data": self.api_base64}
+            images.append(GeneratedImage(
+                id=prompt.id,
+                prompt_used=prompt.prompt,
+                width=self.width,
+                height=self.height,
+                **payload,
+            ))
+        return ImageGenerationResponse(images=images, model_used=model)
+
+
+def _request(scenario: str, session_id: str) -> ImageGenerationRequestSchema:
+    provider, count, carousel = SCENARIOS[scenario]
+    asyncio.run(session_manager.update(
+        session_id=session_id,
+        post_text=POST_TEXT,
+        short_post=POST_TEXT.split("\n")[0],
+        infographic_text=INFOGRAPHIC_TEXT,
+    ))
+    return ImageGenerationRequestSchema(
+        session_id=session_id,
+        image_prompts=[
+            {"id": i, "concept": f"concept {i}", "prompt": f"flat editorial illustration {i}"}
+            for i in range(1, count + 1)
+        ],
+        image_model={"provider": provider, "model": provider},
+        generate_carousel=carousel,
+        deterministic=False,
+    )
+
+
+async def _handle(request: ImageGenerationRequestSchema) -> str:
+    response = await routes_image.run_image_generation(request)
+    return response.model_dump_json()  # Include the boundary encoding/serialization
+
+
+def _timed(scenario: str, run: int) -> tuple[float, float]:
+    request = _request(scenario, f"bench-{scenario}-{run}")
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    asyncio.run(_handle(request))
+    return time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def _peak_memory(scenario: str) -> int:
+    request = _request(scenario, f"bench-{scenario}-mem")
+    tracemalloc.start()
+    asyncio.run(_handle(request))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="requests per scenario")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append", help="default: all")
+    args = parser.parse_args()
+
+    settings.render_pool_enabled = False
+
+    for scenario in args.scenario or list(SCENARIOS):
+        provider, _, carousel = SCENARIOS[scenario]
+        width, height = (512, 768) if carousel else (768, 1344) if provider == "sdxl" else (1024, 1024)
+        fake = FakeImageProvider(_sample_png_base64(width, height), width, height)
+        routes_image.get_image_provider = lambda _provider: fake
+
+        results = [_timed(scenario, run) for run in range(args.runs)]
+        cpu = statistics.median(r[0] for r in results)
+        wall = statistics.median(r[1] for r in results)
+        peak = _peak_memory(scenario)
+        print(f"{scenario:12s} cpu {cpu * 1000:8.1f} ms   wall {wall * 1000:8.1f} ms   peak py mem {peak / 1024 / 1024:7.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Render Pool Benchmark
+======================
+Times N concurrent post card + footer renders through the render
+executor with 1..cpu_count worker processes, plus the inline
+(on-event-loop) baseline.
+
+Run from linkedin_post_generator/:
+
+    PYTHONPATH=. python benchmarks/bench_render_pool.py --renders 16
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import time
+
+from backend.config import settings
+from backend.services import ImageProcessor, PostCardBuilder, PostCardStyle
+from backend.services.render_executor import RenderExecutor
+
+from PIL import Image
+
+
+POST_TEXT = (
+    "Most teams don't have a scaling problem, they have a queueing problem.\n\n"
+    "→ Measure where requests wait, not just where they run\n"
+    "→ Move CPU work off the event loop\n"
+    "→ Keep workers warm so the first request isn't the slow one\n\n"
+    "What's the slowest hop in your stack?"
+)
+
+
+def _sample_image() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (1024, 1024), (40, 80, 120)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _inline(renders: int, image: bytes) -> float:
+    start = time.perf_counter()
+    processor = ImageProcessor()
+    for _ in range(renders):
+        PostCardBuilder(PostCardStyle()).build(post_text=POST_TEXT)
+        processor.process_images([{"id": 1, "data": image}], add_footer=True, create_pdf=False)
+    return time.perf_counter() - start
+
+
+async def _pooled(executor: RenderExecutor, renders: int, image: bytes) -> float:
+    start = time.perf_counter()
+    tasks = []
+    for _ in range(renders):
+        tasks.append(executor.build_post_card(PostCardStyle(), post_text=POST_TEXT))
+        tasks.append(executor.process_images([{"id": 1, "data": image}], create_pdf=False))
+    await asyncio.gather(*tasks)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=16, help="post card + footer pairs per run")
+    args = parser.parse_args()
+
+    image = _sample_image()
+    cpus = os.cpu_count() or 1
+    print(f"{args.renders} renders, {cpus} CPU(s)")
+
+    print(f"inline (event loop)   : {_inline(args.renders, image):7.2f}s")
+
+    for workers in sorted({1, 2, max(cpus // 2, 1), cpus}):
+        settings.render_workers = workers
+        executor = RenderExecutor()
+
+        start = time.perf_counter()
+        executor.start()
+        warmup = time.perf_counter() - start
+
+        elapsed = asyncio.run(_pooled(executor, args.renders, image))
+        executor.shutdown()
+        print(f"pool, {workers:2d} worker(s)   : {elapsed:7.2f}s  (startup {warmup:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Multi-Worker Benchmark
+=======================
+POST /generate-post-card throughput with 1..N uvicorn workers.
+
+Each run starts `uvicorn backend.main:app` with WEB_CONCURRENCY=N and a
+shared SQLite session store in a temp directory, sends a fixed number
+of post card requests with a fixed client concurrency, and reports
+requests/second. Afterwards it checks that every session written by one
+worker can be read back (through whichever worker answers).
+
+Post cards are pure CPU (Pillow), so throughput can only scale up to
+the number of cores; on a 1-core machine all rows will be about equal.
+
+Run from linkedin_post_generator/:
+
+    PYTHONPATH=. python benchmarks/bench_workers.py --workers 1 2 4 --requests 200
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+
+POST_TEXT = (
+    "Most teams don't have a scaling problem, they have a queueing problem.\n\n"
+    "→ Measure where requests wait, not just where they run\n"
+    "→ Move CPU work off the event loop\n"
+    "→ Keep workers warm so the first request isn't the slow one\n\n"
+    "What's the slowest hop in your stack?"
+)
+
+API = "/api/v1"
+
+
+def _start_server(workers: int, port: int, state_dir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "SESSION_BACKEND": "sqlite",
+        "SESSION_SQLITE_PATH": os.path.join(state_dir, "sessions.db"),
+        "SESSION_FILES_DIR": os.path.join(state_dir, "sessions"),
+        "JOB_DIR": os.path.join(state_dir, "jobs"),
+        "RENDER_POOL_ENABLED": "false",  # One render thread pool per worker, no nested processes
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(f"{API}/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+async def _run(client: httpx.AsyncClient, requests: int, concurrency: int, tag: str) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            response = await client.post(f"{API}/generate-post-card", json={
+                "session_id": f"{tag}-{i}",
+                "post_text": POST_TEXT,
+            })
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - start
+
+
+async def _check_sessions(client: httpx.AsyncClient, requests: int, tag: str) -> int:
+    missing = 0
+    for i in range(requests):
+        response = await client.get(f"{API}/session/{tag}-{i}")
+        if response.status_code != 200 or not response.json().get("post_card_url"):
+            missing += 1
+    return missing
+
+
+async def _bench(workers: int, args) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as state_dir:
+        server = _start_server(workers, args.port, state_dir)
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=120.0
+            ) as client:
+                await _wait_ready(client)
+                await _run(client, args.concurrency * 2, args.concurrency, "warmup")
+                elapsed = await _run(client, args.requests, args.concurrency, "bench")
+                missing = await _check_sessions(client, args.requests, "bench")
+        finally:
+            server.terminate()
+            server.wait()
+    return args.requests / elapsed, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=5199)
+    args = parser.parse_args()
+
+    print(f"{args.requests} post cards, concurrency {args.concurrency}, {os.cpu_count()} CPU(s)")
+    baseline = None
+    for workers in args.workers:
+        throughput, missing = asyncio.run(_bench(workers, args))
+        baseline = baseline or throughput
+        print(
+            f"{workers:2d} worker(s): {throughput:7.1f} req/s  "
+            f"(x{throughput / baseline:.2f})  sessions missing: {missing}"
+        )
+
+
+if __name__ == "__main__":
+    main()
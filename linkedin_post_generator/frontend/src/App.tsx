@@ -27,7 +27,7 @@ import { PostcardCreator } from './components/PostcardCreator';
 import { useGenerateText } from './hooks/useGenerateText';
 import { useGenerateImages } from './hooks/useGenerateImages';
 import { useGeneratePostCard } from './hooks/useGeneratePostCard';
-import { generateId } from './lib/utils';
+import { fileSrc, generateId } from './lib/utils';
 import type {
   PostLength,
   Tone,
@@ -274,14 +274,15 @@ function App() {
       setImageData({
         images: [{
           id: 1,
-          base64_data: result.post_card_base64,
+          url: result.url,
+          etag: result.etag,
           prompt_used: 'Post card generated with code',
           concept: `${cardTheme} theme post card`,
           format: 'png',
           width: result.width,
           height: result.height,
         }],
-        pdf_base64: null,
+        pdf_url: null,
         session_id: result.session_id,
         model_used: `PostCardBuilder (${cardTheme})`,
         image_count: 1,
@@ -490,8 +491,8 @@ function App() {
         verified: PROFILE_CONFIG.verified,
       });
 
-      // Store the generated image for the Postcard tab
-      setPostcardImage(result.post_card_base64);
+      // Store the generated image URL for the Postcard tab
+      setPostcardImage(fileSrc(result.url, result.etag));
     } catch (err) {
       const message = err instanceof Error ? err.message : 'Failed to generate post card';
       setError(message);
@@ -20,7 +20,7 @@ import type {
   ImageModelConfig,
   TextGenerationResponse,
 } from '../types';
-import { cn, downloadImage, downloadPDF, formatDuration, getFilenameFromContent } from '../lib/utils';
+import { cn, downloadImage, downloadPDF, fileSrc, formatDuration, getFilenameFromContent } from '../lib/utils';
 
 interface ImagePreviewProps {
   textData: TextGenerationResponse | null;
@@ -50,7 +50,7 @@ export function ImagePreview({
 }: ImagePreviewProps) {
   const [selectedImage, setSelectedImage] = useState<number | null>(null);
 
-  const handleDownloadImage = (base64: string, index: number) => {
+  const handleDownloadImage = (url: string, index: number) => {
     // Use shared utility for consistent filename generation
     const concept = textData?.image_prompts?.[index]?.concept || imageData?.images[index]?.concept;
     const filename = getFilenameFromContent({
@@ -61,11 +61,11 @@ export function ImagePreview({
       extension: 'png',
     });
 
-    downloadImage(base64, filename);
+    downloadImage(url, filename).catch((err) => console.error('Image download failed:', err));
   };
 
   const handleDownloadPDF = () => {
-    if (imageData?.pdf_base64) {
+    if (imageData?.pdf_url) {
       let filename = imageData.pdf_title || 'linkedin-carousel.pdf';
 
       // If filename doesn't have .pdf extension, ensure it's clean
@@ -74,14 +74,14 @@ export function ImagePreview({
       }
 
       // Backend now sends sanitized filenames, so this should be fine
-      downloadPDF(imageData.pdf_base64, filename);
+      downloadPDF(imageData.pdf_url, filename).catch((err) => console.error('PDF download failed:', err));
     }
   };
 
   const handleDownloadAll = () => {
     imageData?.images.forEach((img, idx) => {
       setTimeout(() => {
-        handleDownloadImage(img.base64_data, idx);
+        handleDownloadImage(img.url, idx);
       }, idx * 200);
     });
   };
@@ -167,9 +167,9 @@ export function ImagePreview({
             </div>
           </div>
 
-          {(hasImages || imageData?.pdf_base64) && (
+          {(hasImages || imageData?.pdf_url) && (
             <div className="flex items-center gap-2">
-              {imageData?.pdf_base64 && (
+              {imageData?.pdf_url && (
                 <button
                   onClick={handleDownloadPDF}
                   className="btn-secondary text-xs py-1.5 px-3 flex items-center gap-1"
@@ -222,7 +222,7 @@ export function ImagePreview({
                   className="relative group"
                 >
                   <img
-                    src={`data:image/${img.format};base64,${img.base64_data}`}
+                    src={fileSrc(img.url, img.etag)}
                     alt={`Generated image ${idx + 1}`}
                     className="w-full aspect-square object-cover rounded-lg border border-linkedin-border"
                   />
@@ -237,7 +237,7 @@ export function ImagePreview({
                         <Maximize2 className="w-4 h-4 text-linkedin-text" />
                       </button>
                       <button
-                        onClick={() => handleDownloadImage(img.base64_data, idx)}
+                        onClick={() => handleDownloadImage(img.url, idx)}
                         className="p-2 bg-white rounded-full shadow-lg hover:scale-110 transition-transform"
                       >
                         <ImageIcon className="w-4 h-4 text-linkedin-text" />
@@ -366,7 +366,7 @@ export function ImagePreview({
               initial={{ scale: 0.9 }}
               animate={{ scale: 1 }}
               exit={{ scale: 0.9 }}
-              src={`data:image/${imageData.images[selectedImage].format};base64,${imageData.images[selectedImage].base64_data}`}
+              src={fileSrc(imageData.images[selectedImage].url, imageData.images[selectedImage].etag)}
               alt="Full size preview"
               className="max-w-full max-h-full object-contain rounded-lg"
               onClick={(e) => e.stopPropagation()}
@@ -374,7 +374,7 @@ export function ImagePreview({
 
             <div className="absolute bottom-4 left-1/2 -translate-x-1/2 flex items-center gap-2">
               {/* PDF Download button */}
-              {imageData.pdf_base64 && (
+              {imageData.pdf_url && (
                 <button
                   onClick={(e) => {
                     e.stopPropagation();
@@ -390,7 +390,7 @@ export function ImagePreview({
               <button
                 onClick={(e) => {
                   e.stopPropagation();
-                  handleDownloadImage(imageData.images[selectedImage].base64_data, selectedImage);
+                  handleDownloadImage(imageData.images[selectedImage].url, selectedImage);
                 }}
                 className="px-4 py-2 bg-white rounded-full text-sm font-medium text-linkedin-text flex items-center gap-2 hover:bg-gray-100 transition-colors"
               >
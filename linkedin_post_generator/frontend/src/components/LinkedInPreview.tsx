@@ -35,7 +35,7 @@ import {
   Send,
 } from 'lucide-react';
 import type { TextGenerationResponse, ImageGenerationResponse } from '../types';
-import { cn, copyToClipboard, formatNumber, formatDuration, downloadImage, downloadPDF, getFilenameFromContent } from '../lib/utils';
+import { cn, copyToClipboard, formatNumber, formatDuration, downloadImage, downloadPDF, fileSrc, getFilenameFromContent } from '../lib/utils';
 import {
   removeUnicodeFormatting,
   toggleBold,
@@ -266,7 +266,7 @@ export function LinkedInPreview({
     }
   }, [applyFormatting, resetFormatting, handleUndo, handleRedo]);
 
-  const handleDownloadImage = (base64: string, index: number) => {
+  const handleDownloadImage = (url: string, index: number) => {
     // Use shared utility for consistent filename generation
     const concept = textData?.image_prompts?.[index]?.concept || imageData?.images[index]?.concept;
     const filename = getFilenameFromContent({
@@ -277,11 +277,11 @@ export function LinkedInPreview({
       extension: 'png',
     });
 
-    downloadImage(base64, filename);
+    downloadImage(url, filename).catch((err) => console.error('Image download failed:', err));
   };
 
   const handleDownloadPDF = () => {
-    if (imageData?.pdf_base64) {
+    if (imageData?.pdf_url) {
       let filename = imageData.pdf_title || 'linkedin-carousel.pdf';
 
       // If filename doesn't have .pdf extension or needs sanitization, ensure it's clean
@@ -291,7 +291,7 @@ export function LinkedInPreview({
 
       // Ensure filename is already sanitized (backend should handle this, but double-check)
       // Backend now sends sanitized filenames, so this should be fine
-      downloadPDF(imageData.pdf_base64, filename);
+      downloadPDF(imageData.pdf_url, filename).catch((err) => console.error('PDF download failed:', err));
     }
   };
 
@@ -612,7 +612,7 @@ export function LinkedInPreview({
                 <div className="relative group">
                   {/* Current image display */}
                   <img
-                    src={`data:image/${imageData.images[selectedImage].format};base64,${imageData.images[selectedImage].base64_data}`}
+                    src={fileSrc(imageData.images[selectedImage].url, imageData.images[selectedImage].etag)}
                     alt="Post image"
                     className="w-full object-cover cursor-pointer"
                     onClick={() => setIsGalleryOpen(true)}
@@ -621,7 +621,7 @@ export function LinkedInPreview({
                   {/* Download buttons overlay - appears on hover */}
                   <div className="absolute top-4 right-4 opacity-0 group-hover:opacity-100 transition-opacity z-20 flex items-center gap-2">
                     {/* PDF Download button */}
-                    {imageData.pdf_base64 && (
+                    {imageData.pdf_url && (
                       <button
                         onClick={(e) => {
                           e.stopPropagation();
@@ -637,7 +637,7 @@ export function LinkedInPreview({
                     <button
                       onClick={(e) => {
                         e.stopPropagation();
-                        handleDownloadImage(imageData.images[selectedImage].base64_data, selectedImage);
+                        handleDownloadImage(imageData.images[selectedImage].url, selectedImage);
                       }}
                       className="p-2 bg-white/90 hover:bg-white rounded-full shadow-lg transition-all hover:scale-110"
                       title="Download image"
@@ -697,7 +697,7 @@ export function LinkedInPreview({
                   {imageData.images.length > 1 && (
                     <div className={cn(
                       "absolute top-4 bg-black/70 text-white text-xs px-2 py-1 rounded-full",
-                      imageData.pdf_base64 ? "right-28" : "right-16"
+                      imageData.pdf_url ? "right-28" : "right-16"
                     )}>
                       {selectedImage + 1} / {imageData.images.length}
                     </div>
@@ -710,7 +710,7 @@ export function LinkedInPreview({
                     {imageData.images.map((img, idx) => (
                       <img
                         key={img.id}
-                        src={`data:image/${img.format};base64,${img.base64_data}`}
+                        src={fileSrc(img.url, img.etag)}
                         alt={`Image ${idx + 1}`}
                         className={cn(
                           'w-16 h-16 object-cover rounded cursor-pointer border-2 transition-all',
@@ -875,7 +875,7 @@ export function LinkedInPreview({
             {/* Close and Download buttons */}
             <div className="absolute top-20 right-4 flex items-center gap-2 z-[60]">
               {/* PDF Download button */}
-              {!isZoomed && imageData.pdf_base64 && (
+              {!isZoomed && imageData.pdf_url && (
                 <button
                   className="p-2 bg-white/20 hover:bg-white/30 rounded-full transition-colors"
                   onClick={(e) => {
@@ -894,7 +894,7 @@ export function LinkedInPreview({
                   onClick={(e) => {
                     e.stopPropagation();
                     const currentImage = imageData.images[selectedImage];
-                    handleDownloadImage(currentImage.base64_data, selectedImage);
+                    handleDownloadImage(currentImage.url, selectedImage);
                   }}
                   title="Download image"
                 >
@@ -930,7 +930,7 @@ export function LinkedInPreview({
               }}
               exit={{ scale: 0.9, opacity: 0 }}
               transition={{ duration: 0.2 }}
-              src={`data:image/${imageData.images[selectedImage].format};base64,${imageData.images[selectedImage].base64_data}`}
+              src={fileSrc(imageData.images[selectedImage].url, imageData.images[selectedImage].etag)}
               alt={`Full size preview ${selectedImage + 1}`}
               className={cn(
                 'object-contain rounded-lg select-none',
@@ -20,7 +20,7 @@ import { cn, copyToClipboard, downloadImage, sanitizeFilename } from '../lib/uti
 
 interface PostcardCreatorProps {
   onGeneratePostcard: (text: string, theme: 'dark' | 'light') => Promise<void>;
-  generatedImage: string | null;
+  generatedImage: string | null;  // Post card URL (see fileSrc)
   isGenerating: boolean;
 }
 
@@ -53,7 +53,7 @@ export function PostcardCreator({
       // Use shared utility for consistent filename generation
       const firstLine = postText.split('\n').find(line => line.trim()) || '';
       const filename = `${sanitizeFilename(firstLine, 'postcard')}.png`;
-      downloadImage(generatedImage, filename);
+      downloadImage(generatedImage, filename).catch((err) => console.error('Image download failed:', err));
     }
   }, [generatedImage, postText]);
 
@@ -213,7 +213,7 @@ What makes a great leader in your experience?`}
               </div>
             ) : generatedImage ? (
               <img
-                src={`data:image/png;base64,${generatedImage}`}
+                src={generatedImage}
                 alt="Generated postcard"
                 className="w-full h-auto"
               />
@@ -72,45 +72,46 @@ export function formatLinkedInPreview(text: string): string {
 }
 
 /**
- * Download a file from base64 data
+ * Browser URL for a generated session file (/session/{id}/...).
+ * The ETag is appended as a version so a regenerated file is never served
+ * from the browser's image cache under the same URL.
  */
-export function downloadBase64File(
-  base64Data: string,
-  filename: string,
-  mimeType: string
-): void {
-  const byteCharacters = atob(base64Data);
-  const byteNumbers = new Array(byteCharacters.length);
-
-  for (let i = 0; i < byteCharacters.length; i++) {
-    byteNumbers[i] = byteCharacters.charCodeAt(i);
-  }
+export function fileSrc(url: string, etag?: string | null): string {
+  return etag ? `${url}?v=${encodeURIComponent(etag)}` : url;
+}
 
-  const byteArray = new Uint8Array(byteNumbers);
-  const blob = new Blob([byteArray], { type: mimeType });
+/**
+ * Download a file served by the API under the given filename
+ */
+export async function downloadFile(url: string, filename: string): Promise<void> {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`Download failed: ${response.status}`);
+  }
+  const blob = await response.blob();
 
-  const url = URL.createObjectURL(blob);
+  const objectUrl = URL.createObjectURL(blob);
   const link = document.createElement('a');
-  link.href = url;
+  link.href = objectUrl;
   link.download = filename;
   document.body.appendChild(link);
   link.click();
   document.body.removeChild(link);
-  URL.revokeObjectURL(url);
+  URL.revokeObjectURL(objectUrl);
 }
 
 /**
- * Download image from base64
+ * Download image from its session file URL
  */
-export function downloadImage(base64Data: string, filename: string): void {
-  downloadBase64File(base64Data, filename, 'image/png');
+export function downloadImage(url: string, filename: string): Promise<void> {
+  return downloadFile(url, filename);
 }
 
 /**
- * Download PDF from base64
+ * Download PDF from its session file URL
  */
-export function downloadPDF(base64Data: string, filename: string): void {
-  downloadBase64File(base64Data, filename, 'application/pdf');
+export function downloadPDF(url: string, filename: string): Promise<void> {
+  return downloadFile(url, filename);
 }
 
 /**
@@ -115,13 +115,17 @@ export interface ImageGenerationRequest {
   image_fingerprint?: ImageFingerprint | null;
   image_model: ImageModelConfig;
   generate_carousel?: boolean;  // Generate carousel: AI cover + post card sections (default: false)
+  inline_data?: boolean;  // Also return base64 data (default: URLs only)
   // Note: post_text, short_post, and infographic_text are read from session
   // (stored during text generation) to avoid duplication
 }
 
 export interface GeneratedImage {
   id: number;
-  base64_data: string;
+  url: string;  // Binary PNG: /session/{id}/images/{n}.png
+  etag?: string | null;
+  size_bytes?: number | null;
+  base64_data?: string | null;  // Only set when requested via inline_data
   prompt_used: string;
   concept: string;
   format: string;
@@ -131,6 +135,7 @@ export interface GeneratedImage {
 
 export interface ImageGenerationResponse {
   images: GeneratedImage[];
+  pdf_url?: string | null;  // Binary PDF: /session/{id}/carousel.pdf
   pdf_base64?: string | null;
   pdf_title?: string | null;  // Title for PDF filename (for carousels)
   session_id: string;
@@ -152,10 +157,13 @@ export interface PostCardGenerationRequest {
   handle?: string;
   verified?: boolean;
   theme?: 'dark' | 'light';
+  inline_data?: boolean;  // Also return base64 data (default: URL only)
 }
 
 export interface PostCardGenerationResponse {
-  post_card_base64: string;
+  url: string;  // Binary PNG: /session/{id}/post-card.png
+  etag?: string | null;
+  post_card_base64?: string | null;  // Only set when requested via inline_data
   format: string;
   width: number;
   height: number;
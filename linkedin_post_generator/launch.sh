@@ -115,9 +115,13 @@ if [ "$FRONTEND_ONLY" = false ]; then
         echo -e "${GREEN}✅ Backend running on http://localhost:5170 (PID: $BACKEND_PID)${NC}"
         echo -e "${GREEN}   📚 API Docs: http://localhost:5170/docs${NC}"
     else
-        uvicorn backend.main:app --host 0.0.0.0 --port 5170 --workers 4 &
+        # Worker count from WEB_CONCURRENCY (environment, then .env); >1 needs SESSION_BACKEND=sqlite|redis.
+        # Always change the worker count through WEB_CONCURRENCY, not by editing --workers below.
+        WORKERS="${WEB_CONCURRENCY:-$(grep -E '^WEB_CONCURRENCY=' .env 2>/dev/null | cut -d= -f2)}"
+        export WEB_CONCURRENCY="${WORKERS:-1}"
+        uvicorn backend.main:app --host 0.0.0.0 --port 5170 --workers "$WEB_CONCURRENCY" &
         BACKEND_PID=$!
-        echo -e "${GREEN}✅ Backend running on http://localhost:5170 (Production, PID: $BACKEND_PID)${NC}"
+        echo -e "${GREEN}✅ Backend running on http://localhost:5170 (Production, $WEB_CONCURRENCY worker(s), PID: $BACKEND_PID)${NC}"
     fi
 fi
 
@@ -0,0 +1,26 @@
+"""Shared test fixtures."""
+
+import time
+
+import pytest
+
+
+class Clock:
+    """Controllable time.time(), starting at the real current time."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    """Patch time.time() (as seen by every module) with a clock tests move by hand."""
+    fake = Clock()
+    monkeypatch.setattr(time, "time", fake)
+    return fake
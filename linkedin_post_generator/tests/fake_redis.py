@@ -0,0 +1,191 @@
+"""
+In-process fake Redis server (RESP2) for tests.
+
+Implements only the commands the app sends (strings with EX, key expiry,
+sorted sets, hashes, AUTH/SELECT). Expiry follows time.time(), so tests
+can move the clock instead of sleeping. drop_connections() and
+drop_next_reply simulate a server that goes away.
+"""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+
+class _Simple(str):
+    """Simple string reply (+OK)."""
+
+
+class FakeRedisServer:
+    """RESP2 server on 127.0.0.1 with an ephemeral port."""
+
+    def __init__(self):
+        self.strings: dict[bytes, bytes] = {}
+        self.hashes: dict[bytes, dict[bytes, int]] = {}
+        self.zsets: dict[bytes, dict[bytes, float]] = {}
+        self.expires: dict[bytes, float] = {}
+        self.commands: list[str] = []  # Names of the commands received, in order
+        self.drop_next_reply = False  # Execute the next command, then close without replying
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+
+    @property
+    def url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self):
+        self._server.close()
+        self.drop_connections()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def drop_connections(self):
+        """Close every client connection (as a server restart or idle timeout would)."""
+        for writer in list(self._writers):
+            writer.close()
+        self._writers.clear()
+
+    # =========================================================================
+    # PROTOCOL
+    # =========================================================================
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                reply = self._execute(args)
+                if self.drop_next_reply:
+                    self.drop_next_reply = False
+                    break
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> Optional[list[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        assert line.startswith(b"*"), line
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _encode(self, reply: Any) -> bytes:
+        if isinstance(reply, _Simple):
+            return f"+{reply}\r\n".encode()
+        if isinstance(reply, Exception):
+            return f"-ERR {reply}\r\n".encode()
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        if isinstance(reply, bytes):
+            return f"${len(reply)}\r\n".encode() + reply + b"\r\n"
+        if isinstance(reply, list):
+            return f"*{len(reply)}\r\n".encode() + b"".join(self._encode(item) for item in reply)
+        raise TypeError(f"Cannot encode {reply!r}")
+
+    # =========================================================================
+    # COMMANDS
+    # =========================================================================
+
+    def _expire_keys(self):
+        now = time.time()
+        for key in [k for k, at in self.expires.items() if at <= now]:
+            self._delete(key)
+
+    def _delete(self, key: bytes) -> bool:
+        self.expires.pop(key, None)
+        found = False
+        for store in (self.strings, self.hashes, self.zsets):
+            found = store.pop(key, None) is not None or found
+        return found
+
+    def _exists(self, key: bytes) -> bool:
+        return key in self.strings or key in self.hashes or key in self.zsets
+
+    @staticmethod
+    def _score_range(zset: dict[bytes, float], low: bytes, high: bytes) -> list[tuple[bytes, float]]:
+        low_value, high_value = float(low), float(high)
+        return sorted(
+            ((member, score) for member, score in zset.items() if low_value <= score <= high_value),
+            key=lambda item: item[1],
+        )
+
+    def _execute(self, args: list[bytes]) -> Any:
+        name, args = args[0].decode().upper(), args[1:]
+        self.commands.append(name)
+        self._expire_keys()
+
+        if name in ("AUTH", "SELECT", "PING"):
+            return _Simple("OK")
+        if name == "GET":
+            return self.strings.get(args[0])
+        if name == "SET":
+            key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+            self._delete(key)
+            self.strings[key] = value
+            if b"EX" in options:
+                self.expires[key] = time.time() + int(args[2 + options.index(b"EX") + 1])
+            return _Simple("OK")
+        if name == "EXPIRE":
+            if not self._exists(args[0]):
+                return 0
+            self.expires[args[0]] = time.time() + int(args[1])
+            return 1
+        if name == "DEL":
+            return sum(self._delete(key) for key in args)
+        if name == "ZADD":
+            key, rest = args[0], args[1:]
+            only_existing = rest[0].upper() == b"XX"
+            if only_existing:
+                rest = rest[1:]
+            zset = self.zsets.setdefault(key, {})
+            added = 0
+            for score, member in zip(rest[::2], rest[1::2]):
+                if only_existing and member not in zset:
+                    continue
+                added += member not in zset
+                zset[member] = float(score)
+            if not zset:
+                del self.zsets[key]
+            return added
+        if name == "ZREM":
+            zset = self.zsets.get(args[0], {})
+            removed = sum(zset.pop(member, None) is not None for member in args[1:])
+            if args[0] in self.zsets and not zset:
+                del self.zsets[args[0]]
+            return removed
+        if name == "ZRANGEBYSCORE":
+            return [member for member, _ in self._score_range(self.zsets.get(args[0], {}), args[1], args[2])]
+        if name == "ZCARD":
+            return len(self.zsets.get(args[0], {}))
+        if name == "ZCOUNT":
+            return len(self._score_range(self.zsets.get(args[0], {}), args[1], args[2]))
+        if name == "HINCRBY":
+            fields = self.hashes.setdefault(args[0], {})
+            fields[args[1]] = fields.get(args[1], 0) + int(args[2])
+            return fields[args[1]]
+        if name == "HGETALL":
+            return [
+                item for field, value in self.hashes.get(args[0], {}).items()
+                for item in (field, str(value).encode())
+            ]
+        return ValueError(f"unknown command '{name}'")
@@ -0,0 +1,28 @@
+"""
+Image cache: the tracked byte total follows what is on disk, also when
+an entry is overwritten, and LRU eviction keeps it under the cap.
+"""
+
+from backend.providers.image_cache import ImageCache
+
+
+def test_overwrite_counts_only_the_size_difference(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=10_000)
+    cache.put("a", b"x" * 1000)
+    cache.put("a", b"x" * 400)
+    cache.put("a", b"x" * 600)
+    cache.put("b", b"y" * 100)
+
+    on_disk = sum(p.stat().st_size for p in tmp_path.glob("*.png"))
+    assert cache.get_stats()["total_bytes"] == on_disk == 700
+    assert cache.get("a") == b"x" * 600
+
+
+def test_evicts_least_recently_used_over_cap(tmp_path):
+    cache = ImageCache(tmp_path, max_bytes=2500)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.encode() * 1000)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == b"c" * 1000
+    assert cache.get_stats()["total_bytes"] <= 2500
@@ -0,0 +1,188 @@
+"""
+Job manager: submit -> progress -> result, re-queueing after a restart,
+status reads from a second worker, and the owner/recovery lock handover
+between workers sharing one job directory.
+"""
+
+import asyncio
+import os
+
+from backend.providers.base import image_progress
+from backend.services.job_manager import JobManager, JobStatus
+
+
+async def _wait_for(predicate, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def _manager(job_dir, **runners) -> JobManager:
+    manager = JobManager(job_dir=job_dir, num_workers=1, save_interval_ms=10, recovery_interval_seconds=0.1)
+    for kind, runner in runners.items():
+        manager.register_runner(kind, runner)
+    return manager
+
+
+async def _done(job, on_stage):
+    return {"ok": True}
+
+
+async def _forever(job, on_stage):
+    on_stage("generating")
+    await asyncio.sleep(3600)
+
+
+def _crash(manager: JobManager):
+    """Kill a manager the way a worker exit would: tasks die, no cleanup, the owner lock is freed."""
+    for task in [*manager._workers, manager._recovery_task]:
+        task.cancel()
+    os.close(manager._owner_lock)
+    manager._owner_lock = None
+
+
+def test_submit_progress_result(tmp_path):
+    async def check():
+        release = asyncio.Event()
+
+        async def runner(job, on_stage):
+            on_stage("generating")
+            image_progress.get()(1, "done", None)
+            await release.wait()
+            return {"images": [1, 2]}
+
+        manager = _manager(tmp_path, images=runner)
+        await manager.start()
+        try:
+            job = await manager.submit("images", "s1", {"prompt": "x"}, image_ids=[1, 2])
+            assert job.status == JobStatus.QUEUED
+
+            async def progressed():
+                current = await manager.aget(job.job_id)
+                return current.stage == "generating" and current.images[0]["status"] == "done"
+
+            await _wait_for(progressed)
+            assert (await manager.aget(job.job_id)).status == JobStatus.RUNNING
+            assert await manager.aget_result(job.job_id) is None
+
+            release.set()
+
+            async def finished():
+                return (await manager.aget(job.job_id)).is_finished
+
+            await _wait_for(finished)
+            assert (await manager.aget(job.job_id)).status == JobStatus.SUCCEEDED
+            assert await manager.aget_result(job.job_id) == {"images": [1, 2]}
+            assert await manager.aget("missing") is None
+        finally:
+            await manager.stop()
+
+    asyncio.run(check())
+
+
+def test_restart_requeues_unfinished_jobs(tmp_path):
+    async def check():
+        first = _manager(tmp_path, images=_forever)
+        await first.start()
+        job = await first.submit("images", "s1", {}, image_ids=[1])
+
+        async def running():
+            return (await first.aget(job.job_id)).status == JobStatus.RUNNING
+
+        await _wait_for(running)
+        await first.stop()  # Leaves the job persisted as running
+
+        second = _manager(tmp_path, images=_done)
+        await second.start()
+        try:
+            async def finished():
+                current = await second.aget(job.job_id)
+                return current is not None and current.is_finished
+
+            await _wait_for(finished)
+            recovered = await second.aget(job.job_id)
+            assert recovered.status == JobStatus.SUCCEEDED
+            assert recovered.owner == second._owner
+            assert await second.aget_result(job.job_id) == {"ok": True}
+        finally:
+            await second.stop()
+
+    asyncio.run(check())
+
+
+def test_second_worker_reads_job_from_disk(tmp_path):
+    async def check():
+        release = asyncio.Event()
+
+        async def runner(job, on_stage):
+            await release.wait()
+            return {"ok": True}
+
+        owner, other = _manager(tmp_path, images=runner), _manager(tmp_path, images=runner)
+        await owner.start()
+        await other.start()
+        try:
+            job = await owner.submit("images", "s1", {}, image_ids=[1])
+
+            async def running_on_disk():
+                current = await other.aget(job.job_id)
+                return current is not None and current.status == JobStatus.RUNNING
+
+            await _wait_for(running_on_disk)
+            assert job.job_id not in other._jobs
+            assert await other.aget_result(job.job_id) is None
+
+            release.set()
+
+            async def finished_on_disk():
+                return (await other.aget(job.job_id)).is_finished
+
+            await _wait_for(finished_on_disk)
+            assert await other.aget_result(job.job_id) == {"ok": True}
+        finally:
+            await owner.stop()
+            await other.stop()
+
+    asyncio.run(check())
+
+
+def test_recovery_adopts_exited_workers_jobs_and_hands_over(tmp_path):
+    async def check():
+        holder = _manager(tmp_path, images=_forever)
+        worker = _manager(tmp_path, images=_forever)
+        await holder.start()
+        await worker.start()
+        assert holder._recovery_lock is not None and worker._recovery_lock is None
+
+        job = await worker.submit("images", "s1", {}, image_ids=[1])
+        await asyncio.sleep(0.3)
+        assert job.job_id not in holder._jobs  # Its owner is alive
+
+        _crash(worker)
+
+        async def adopted():
+            current = holder._jobs.get(job.job_id)
+            return current is not None and current.status == JobStatus.RUNNING
+
+        await _wait_for(adopted)
+        assert holder._jobs[job.job_id].owner == holder._owner
+        assert not (tmp_path / "owners" / f"{worker._owner}.lock").exists()
+
+        # The recovery holder exits; a worker that started without the lock takes over
+        successor = _manager(tmp_path, images=_done)
+        await successor.start()
+        assert successor._recovery_lock is None
+        await holder.stop()
+        try:
+            async def taken_over():
+                current = successor._jobs.get(job.job_id)
+                return successor._recovery_lock is not None and current is not None and current.is_finished
+
+            await _wait_for(taken_over)
+            assert successor._jobs[job.job_id].status == JobStatus.SUCCEEDED
+            assert [p.stem for p in (tmp_path / "owners").iterdir()] == [successor._owner]
+        finally:
+            await successor.stop()
+
+    asyncio.run(check())
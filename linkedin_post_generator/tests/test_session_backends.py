@@ -0,0 +1,179 @@
+"""
+Session backends: the same get/save/touch/delete/expiry/stats checks
+against the memory, SQLite and Redis backends (Redis via the in-process
+RESP fake), plus the memory byte budget and the RESP client itself.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from backend.services.redis_client import RedisClient, RedisError
+from backend.services.session_backends import (
+    MemorySessionBackend,
+    RedisSessionBackend,
+    SessionData,
+    SQLiteSessionBackend,
+    estimate_session_size,
+)
+from backend.services.session_files import session_files
+from backend.services.session_manager import SessionManager
+from tests.fake_redis import FakeRedisServer
+
+
+BACKENDS = ["memory", "sqlite", "redis"]
+TTL = 600
+
+
+@pytest.fixture(autouse=True)
+def _session_files_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_files, "root", tmp_path / "files")
+
+
+@asynccontextmanager
+async def _manager(name: str, tmp_path):
+    fake = None
+    if name == "memory":
+        backend = MemorySessionBackend(TTL, max_bytes=1 << 20)
+    elif name == "sqlite":
+        backend = SQLiteSessionBackend(TTL, str(tmp_path / "sessions.db"))
+    else:
+        fake = FakeRedisServer()
+        await fake.start()
+        backend = RedisSessionBackend(TTL, fake.url)
+
+    manager = SessionManager(ttl_seconds=TTL, backend=backend)
+    try:
+        yield manager
+    finally:
+        await manager.close()
+        if fake is not None:
+            await fake.stop()
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_save_load_delete(name, tmp_path):
+    async def check():
+        async with _manager(name, tmp_path) as manager:
+            images = [{"id": 1, "url": "/api/v1/session/s1/images/1.png", "etag": '"abc"'}]
+            await manager.update("s1", post_text="Hello", hashtags=["#a"], generated_images=images)
+
+            session = await manager.get("s1")
+            assert session.post_text == "Hello"
+            assert session.hashtags == ["#a"]
+            assert session.generated_images == images
+            assert await manager.get("missing") is None
+
+            assert await manager.delete("s1") is True
+            assert await manager.delete("s1") is False
+            assert await manager.get("s1") is None
+
+    asyncio.run(check())
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_expiry_and_touch(name, tmp_path, clock):
+    async def check():
+        async with _manager(name, tmp_path) as manager:
+            await manager.create("read")
+            await manager.create("idle")
+
+            clock.advance(TTL - 100)
+            assert await manager.get("read") is not None  # Records the access
+            clock.advance(200)
+
+            assert await manager.cleanup_expired() == 1
+            assert await manager.get("idle") is None
+            assert await manager.get("read") is not None
+
+            stats = await manager.get_stats()
+            assert stats["backend"] == name
+            assert stats["total_sessions"] == 1
+            assert stats["active_sessions"] == 1
+
+    asyncio.run(check())
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_expired_session_is_a_miss(name, tmp_path, clock):
+    async def check():
+        async with _manager(name, tmp_path) as manager:
+            await manager.create("s1")
+            clock.advance(TTL + 1)
+
+            assert await manager.get("s1") is None
+            stats = await manager.get_stats()
+            assert stats["misses"] == 1 and stats["hits"] == 0
+
+    asyncio.run(check())
+
+
+def test_memory_budget_evicts_least_recently_used():
+    async def check():
+        text = "x" * 20_000
+        size = estimate_session_size(SessionData(session_id="a", post_text=text))
+        backend = MemorySessionBackend(TTL, max_bytes=size * 2 + size // 2)
+
+        assert await backend.save(SessionData(session_id="a", post_text=text)) == []
+        assert await backend.save(SessionData(session_id="b", post_text=text)) == []
+        await backend.load("a")  # "b" is now the least recently used
+        assert await backend.save(SessionData(session_id="c", post_text=text)) == ["b"]
+
+        stats = await backend.get_stats()
+        assert stats["total_sessions"] == 2
+        assert stats["total_bytes"] <= backend.max_bytes
+
+        # Rewriting a session replaces its size instead of adding to it
+        await backend.save(SessionData(session_id="c", post_text="short"))
+        assert (await backend.get_stats())["total_bytes"] < size + size // 2
+
+    asyncio.run(check())
+
+
+def test_redis_client_replies_and_errors():
+    async def check():
+        fake = FakeRedisServer()
+        await fake.start()
+        client = RedisClient(fake.url)
+        try:
+            assert await client.execute("SET", "k", "v", "EX", 10) == "OK"
+            assert await client.execute("GET", "k") == b"v"
+            assert await client.execute("GET", "nope") is None
+            assert await client.pipeline([("HINCRBY", "h", "a", 2), ("HGETALL", "h")]) == [2, [b"a", b"2"]]
+            with pytest.raises(RedisError, match="unknown command"):
+                await client.execute("NOSUCHCOMMAND")
+        finally:
+            await client.close()
+            await fake.stop()
+
+    asyncio.run(check())
+
+
+def test_redis_client_reconnects_and_never_resends_non_idempotent_batches():
+    async def check():
+        fake = FakeRedisServer()
+        await fake.start()
+        client = RedisClient(fake.url, timeout=1.0)
+        try:
+            await client.execute("SET", "k", "v")
+
+            # Connection closed while idle: reconnect before sending
+            fake.drop_connections()
+            await asyncio.sleep(0.05)
+            assert await client.execute("GET", "k") == b"v"
+
+            # Reply lost after the server applied the batch: an idempotent read is retried...
+            fake.drop_next_reply = True
+            assert await client.execute("GET", "k") == b"v"
+
+            # ...but an increment is not sent twice
+            fake.drop_next_reply = True
+            with pytest.raises(RedisError):
+                await client.execute("HINCRBY", "h", "n", 1, idempotent=False)
+            assert await client.execute("HGETALL", "h") == [b"n", b"1"]
+        finally:
+            await client.close()
+            await fake.stop()
+
+    asyncio.run(check())
@@ -0,0 +1,28 @@
+"""
+Session file delivery: stored images are served with their content
+ETag, also when the ETag is not cached (after a restart), and a
+matching If-None-Match gets a 304.
+"""
+
+from fastapi.testclient import TestClient
+
+from backend.config import settings
+from backend.main import app
+from backend.services.session_files import session_files
+
+
+def test_image_served_with_content_etag(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_files, "root", tmp_path)
+    (stored,), _ = session_files.save_generation("s1", [b"\x89PNG fake image"])
+    session_files._etags.clear()  # As after a restart
+
+    client = TestClient(app)
+    url = f"{settings.api_prefix}/session/s1/images/1.png"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG fake image"
+    assert response.headers["etag"] == stored.etag
+
+    assert client.get(url, headers={"If-None-Match": stored.etag}).status_code == 304
+    assert client.get(f"{settings.api_prefix}/session/s1/images/2.png").status_code == 404
@@ -0,0 +1,103 @@
+"""
+Startup smoke tests: the app must boot with the default settings
+(warm render process pool) the way uvicorn imports it.
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from fastapi.testclient import TestClient
+
+from backend.config import settings
+from backend.main import app
+from backend.services.post_card_builder import PostCardStyle
+from backend.services.render_executor import RenderExecutor, render_executor
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_app_starts_with_render_pool():
+    with TestClient(app) as client:
+        assert client.get(f"{settings.api_prefix}/health").status_code == 200
+
+        pool = client.get(f"{settings.api_prefix}/providers/stats").json()["render_pool"]
+        assert pool["started"] and pool["mode"] == "process"
+        assert render_executor.workers >= 1
+
+
+def test_service_module_import_does_not_build_app_singletons():
+    # What a render worker does: no session manager, usage logger or text cache
+    code = (
+        "import sys, backend.services.image_processor; "
+        "print(sorted(m for m in ('backend.services.session_manager', 'backend.services.usage_logger', "
+        "'backend.services.text_cache', 'backend.api') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_uvicorn_serves_requests():
+    port = 5199
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            assert server.poll() is None, server.stderr.read().decode()
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}{settings.api_prefix}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                assert time.monotonic() < deadline, "uvicorn did not start within 60s"
+                time.sleep(0.5)
+        assert response.status_code == 200
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def test_uvicorn_workers_flag_requires_shared_sessions():
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", "5198", "--workers", "2"],
+        cwd=ROOT,
+        env={**os.environ, "WEB_CONCURRENCY": "1", "SESSION_BACKEND": "memory"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        for line in server.stderr:
+            if "need a shared session store" in line:
+                break
+            assert time.monotonic() < deadline, "workers started with split session state"
+        else:
+            raise AssertionError("server exited without the shared session store error")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def test_render_pool_recovers_from_dead_worker():
+    executor = RenderExecutor()
+    executor.start()
+    try:
+        for process in executor._executor._processes.values():
+            os.kill(process.pid, signal.SIGKILL)
+
+        png, height = asyncio.run(executor.build_post_card(PostCardStyle(), post_text="Still rendering."))
+        assert png.startswith(b"\x89PNG") and height > 0
+        assert executor.get_stats()["pool_restarts"] == 1
+    finally:
+        executor.shutdown()
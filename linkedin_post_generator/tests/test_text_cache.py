@@ -0,0 +1,98 @@
+"""
+Text response cache: the content-addressed key, LRU and TTL eviction in
+the memory and SQLite backends, and bypass_cache.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.providers import TextGenerationRequest, TextGenerationResponse
+from backend.services.text_cache import (
+    MemoryTextCache,
+    SQLiteTextCache,
+    TextResponseCache,
+    hash_prompt,
+    make_cache_key,
+)
+
+
+PROMPT_HASH = hash_prompt("You write LinkedIn posts.")
+
+
+def _key(request: TextGenerationRequest, model: str = "claude", prompt_hash: str = PROMPT_HASH) -> str:
+    return make_cache_key(request, provider="bedrock", model=model, prompt_hash=prompt_hash, max_tokens=2000)
+
+
+def _response(text: str = "Post") -> TextGenerationResponse:
+    return TextGenerationResponse(post_text=text, short_post=text, hashtags=["#a", "#b", "#c"], model_used="claude")
+
+
+def _backend(name: str, tmp_path, max_entries: int = 2, ttl_seconds: int = 60):
+    if name == "memory":
+        return MemoryTextCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    return SQLiteTextCache(tmp_path / "text_cache.sqlite3", max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+
+def test_key_normalizes_fields_and_ignores_session_id():
+    base = TextGenerationRequest(idea="Queueing beats scaling", tone="direct", session_id="s1")
+
+    same = TextGenerationRequest(idea="  Queueing beats scaling\n", tone="direct ", session_id="s2")
+    assert _key(same) == _key(base)
+    assert _key(base.model_copy(update={"post_angle": "   "})) == _key(base)
+
+    assert _key(base.model_copy(update={"idea": "Scaling beats queueing"})) != _key(base)
+    assert _key(base, model="llama") != _key(base)
+    assert _key(base, prompt_hash=hash_prompt("You write LinkedIn posts!")) != _key(base)
+
+
+@pytest.mark.parametrize("name", ["memory", "sqlite"])
+def test_backend_evicts_least_recently_used(name, tmp_path, clock):
+    backend = _backend(name, tmp_path)
+    backend.set("a", "A")
+    clock.advance(1)
+    backend.set("b", "B")
+    clock.advance(1)
+    assert backend.get("a") == "A"  # "b" is now the least recently used
+    clock.advance(1)
+    backend.set("c", "C")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == "A" and backend.get("c") == "C"
+    assert backend.size() == 2
+
+
+@pytest.mark.parametrize("name", ["memory", "sqlite"])
+def test_backend_expires_entries_after_ttl(name, tmp_path, clock):
+    backend = _backend(name, tmp_path, max_entries=10)
+    backend.set("old", "1")
+    clock.advance(40)
+    backend.set("new", "2")
+    clock.advance(30)
+
+    assert backend.get("old") is None  # Reads do not extend the TTL
+    assert backend.get("new") == "2"
+    clock.advance(31)
+    assert backend.get("new") is None
+
+
+@pytest.mark.parametrize("name", ["memory", "sqlite"])
+def test_hits_misses_and_bypass(name, tmp_path):
+    async def check():
+        cache = TextResponseCache(_backend(name, tmp_path))
+        key = _key(TextGenerationRequest(idea="Queueing beats scaling"))
+
+        # A bypassed request neither reads nor stores
+        await cache.aset(key, _response("Fresh"), bypass=True)
+        assert cache.backend.size() == 0
+
+        assert await cache.aget(key) is None
+        await cache.aset(key, _response("Stored"))
+        assert await cache.aget(key, bypass=True) is None
+        assert (await cache.aget(key)).post_text == "Stored"
+
+        stats = await cache.aget_stats()
+        assert (stats["hits"], stats["misses"], stats["bypassed"], stats["stores"]) == (1, 1, 1, 1)
+        assert stats["backend"] == name and stats["entries"] == 1
+
+    asyncio.run(check())
@@ -0,0 +1,91 @@
+"""
+Usage analytics: incremental ingestion of the daily usage JSONL files
+(appends, a torn last line, a closed day gzipped by log storage) and
+grouped queries with filters and latency percentiles.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from backend.services.log_storage import LogStorage
+from backend.services.usage_analytics import UsageAnalytics
+from backend.utils.jsonl import jsonl_line
+
+
+TODAY = date.today()
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def _record(day: date, minute: int, provider: str, model: str, duration_ms: int, **extra) -> dict:
+    return {
+        "timestamp": datetime.combine(day, time(10, minute)).isoformat(),
+        "session_id": "s1",
+        "operation": "text_generation",
+        "provider": provider,
+        "model": model,
+        "tokens_used": 100,
+        "duration_ms": duration_ms,
+        "success": True,
+        **extra,
+    }
+
+
+def _append(path, *records: dict, tail: bytes = b""):
+    with open(path, "ab") as f:
+        f.write(b"".join(jsonl_line(r) for r in records) + tail)
+
+
+def test_ingest_appends_and_gzipped_day_then_query(tmp_path):
+    yesterday_log = tmp_path / f"usage_{YESTERDAY}.jsonl"
+    today_log = tmp_path / f"usage_{TODAY}.jsonl"
+    analytics = UsageAnalytics(log_dir=tmp_path, db_path=str(tmp_path / "analytics.sqlite3"))
+
+    _append(
+        yesterday_log,
+        _record(YESTERDAY, 1, "bedrock", "claude", 100),
+        _record(YESTERDAY, 2, "bedrock", "claude", 200),
+        _record(YESTERDAY, 3, "bedrock", "claude", 900, success=False, error_message="throttled"),
+    )
+    _append(today_log, _record(TODAY, 1, "ollama", "qwen", 50))
+    assert analytics.ingest() == 4
+
+    # More lines (one still being written), then yesterday's file is closed and gzipped
+    _append(
+        yesterday_log,
+        _record(YESTERDAY, 4, "bedrock", "claude", 300),
+        _record(YESTERDAY, 5, "nova", "canvas", 5000, operation="image_generation", image_count=2),
+    )
+    partial = jsonl_line(_record(TODAY, 3, "ollama", "qwen", 70))
+    _append(today_log, _record(TODAY, 2, "ollama", "qwen", 60), tail=partial[:20])
+    assert LogStorage(log_dirs=[tmp_path], grace_seconds=0, compress=True).compress_closed() == 1
+    assert not yesterday_log.exists()
+
+    assert analytics.ingest() == 3
+    with open(today_log, "ab") as f:
+        f.write(partial[20:])
+    assert analytics.ingest() == 1
+    assert analytics.ingest() == 0
+    assert analytics.get_stats()["records"] == 8
+
+    result = analytics.query(
+        start=YESTERDAY.isoformat(),
+        end=(TODAY + timedelta(days=1)).isoformat(),
+        group_by=["provider", "model"],
+        metrics=["count", "errors", "tokens", "p50", "p95"],
+        filters={"operation": "text_generation"},
+    )
+    rows = sorted(result["rows"], key=lambda r: r["provider"])
+    assert rows == [
+        {"provider": "bedrock", "model": "claude", "count": 4, "errors": 1, "tokens": 400, "p50": 200, "p95": 900},
+        {"provider": "ollama", "model": "qwen", "count": 3, "errors": 0, "tokens": 300, "p50": 60, "p95": 70},
+    ]
+
+    by_day = analytics.query(
+        start=YESTERDAY.isoformat(),
+        end=(TODAY + timedelta(days=1)).isoformat(),
+        group_by=["day"],
+        metrics=["count", "images"],
+    )
+    assert sorted((r["day"], r["count"], r["images"]) for r in by_day["rows"]) == [
+        (YESTERDAY.isoformat(), 5, 2),
+        (TODAY.isoformat(), 3, 0),
+    ]